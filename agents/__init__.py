@@ -28,6 +28,7 @@ from .entity_matcher import (
     entity_matcher,
     get_entity_matcher,
     match_entities,
+    match_entities_with_candidates,
     match_single_company,
 )
 
@@ -53,5 +54,6 @@ __all__ = [
     "entity_matcher",
     "get_entity_matcher",
     "match_entities",
+    "match_entities_with_candidates",
     "match_single_company",
 ]
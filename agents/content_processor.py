@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 from pydantic_ai.models.anthropic import AnthropicModel
 
+from services.llm_gateway import get_llm_gateway, CHARS_PER_TOKEN
+
 
 class ProcessedContentOutput(BaseModel):
     """Structured output from content processing agent"""
@@ -37,6 +39,7 @@ class ContentProcessorAgent:
 
         # Initialize Anthropic model (pydantic-ai v1.x uses string model name)
         self.model = 'anthropic:claude-sonnet-4-5-20250929'
+        self.gateway = get_llm_gateway()
 
         # Create agent with structured output
         self.agent = Agent(
@@ -147,8 +150,13 @@ Please provide a comprehensive analysis with:
 Remember to translate any tech stack terms to our specific stack when applicable.
 """
 
-        # Run agent
-        result = await self.agent.run(user_prompt)
+        # Run agent within the shared LLM concurrency/rate limits
+        model_name = self.model.split(':', 1)[-1]
+        estimated_tokens = (len(user_prompt) + len(self._get_base_system_prompt())) // CHARS_PER_TOKEN
+        async with self.gateway.slot(model_name, estimated_tokens) as call:
+            result = await self.agent.run(user_prompt)
+            usage = result.usage()
+            call.record_usage(usage.input_tokens, usage.output_tokens)
 
         # pydantic-ai v1.x returns result.output instead of result.data
         return result.output
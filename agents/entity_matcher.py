@@ -178,23 +178,28 @@ async def match_entities(
         existing_companies=[
             ExistingCompany(
                 id=str(c.get('id', c.get('airtable_id', ''))),
-                name=c.get('compname', c.get('name', '')),
-                company_type=c.get('comptype'),
-                phone=c.get('compphone'),
-                email=c.get('compemail'),
+                name=c.get('compname') or c.get('name', ''),
+                company_type=_first_value(c.get('comptype')),
+                phone=_first_value(c.get('primaryphone') or c.get('compphone')),
+                email=_first_value(c.get('primaryemail') or c.get('compemail')),
                 website=c.get('websiteurl'),
-                address=c.get('compaddress'),
+                address=c.get('streetaddress', c.get('compaddress')),
             )
             for c in existing_companies if c.get('compname') or c.get('name')
         ],
         existing_contacts=[
             ExistingContact(
                 id=str(c.get('id', c.get('airtable_id', ''))),
-                first_name=c.get('contactfirstname'),
-                last_name=c.get('contactlastname'),
-                full_name=f"{c.get('contactfirstname', '')} {c.get('contactlastname', '')}".strip(),
-                email=c.get('contactemail'),
-                phone=c.get('contactphone'),
+                first_name=c.get('firstname', c.get('contactfirstname')),
+                last_name=c.get('lastname', c.get('contactlastname')),
+                full_name=" ".join(
+                    part for part in (
+                        c.get('firstname', c.get('contactfirstname')),
+                        c.get('lastname', c.get('contactlastname')),
+                    ) if part
+                ),
+                email=_first_value(c.get('email') or c.get('contactemail')),
+                phone=_first_value(c.get('phonenumber') or c.get('contactphone')),
                 company=c.get('compname'),
             )
             for c in existing_contacts
@@ -202,12 +207,13 @@ async def match_entities(
         existing_properties=[
             ExistingProperty(
                 id=str(p.get('id', p.get('airtable_id', ''))),
-                address=p.get('propertyaddress', p.get('address', '')),
-                city=p.get('propertycity'),
-                state=p.get('propertystate'),
-                zip_code=p.get('propertyzip'),
+                address=p.get('full_address') or p.get('propertyaddress') or p.get('address', ''),
+                city=p.get('city', p.get('propertycity')),
+                state=p.get('state', p.get('propertystate')),
+                zip_code=p.get('zip', p.get('propertyzip')),
             )
-            for p in existing_properties if p.get('propertyaddress') or p.get('address')
+            for p in existing_properties
+            if p.get('full_address') or p.get('propertyaddress') or p.get('address')
         ],
     )
 
@@ -259,6 +265,101 @@ For each extracted entity, determine if it matches an existing record and recomm
     return matching_result
 
 
+async def match_entities_with_candidates(
+    extraction: DocumentExtraction,
+    candidates: Any,
+) -> MatchingResult:
+    """
+    Match extracted entities using a pre-filtered candidate shortlist.
+
+    Entities with an unambiguous exact hit (same email, phone or normalized
+    address as exactly one existing record) are linked without an LLM call.
+    The rest go to match_entities() with only their shortlisted candidates.
+
+    Args:
+        extraction: The document extraction result
+        candidates: CandidateSet from services.entity_candidates
+
+    Returns:
+        MatchingResult with one match per extracted entity, in extraction order
+    """
+    groups = {
+        "company": candidates.companies,
+        "contact": candidates.contacts,
+        "property": candidates.properties,
+    }
+    pending = {
+        entity_type: [g for g in type_groups if not g.exact_match]
+        for entity_type, type_groups in groups.items()
+    }
+
+    llm_result = MatchingResult()
+    if any(pending.values()):
+        remaining = extraction.model_copy(update={
+            "companies": [g.extracted for g in pending["company"]],
+            "contacts": [g.extracted for g in pending["contact"]],
+            "properties": [g.extracted for g in pending["property"]],
+        })
+        llm_result = await match_entities(
+            remaining,
+            candidates.records(pending["company"]),
+            candidates.records(pending["contact"]),
+            candidates.records(pending["property"]),
+        )
+
+    # The LLM may drop or reorder entries, so merge by extracted name
+    llm_matches: Dict[str, Dict[str, List[EntityMatch]]] = {}
+    for entity_type, matches in (
+        ("company", llm_result.company_matches),
+        ("contact", llm_result.contact_matches),
+        ("property", llm_result.property_matches),
+    ):
+        by_name = llm_matches[entity_type] = {}
+        for match in matches:
+            by_name.setdefault(_match_key(match.extracted_name), []).append(match)
+
+    merged: Dict[str, List[EntityMatch]] = {}
+    for entity_type, type_groups in groups.items():
+        merged[entity_type] = []
+        for group in type_groups:
+            name = _extracted_name(entity_type, group.extracted)
+            if group.exact_match:
+                merged[entity_type].append(EntityMatch(
+                    entity_type=entity_type,
+                    extracted_name=name,
+                    matched_id=str(group.exact_match.get('id')),
+                    matched_name=f"{_record_name(entity_type, group.exact_match)} (exact {group.exact_reason} match)",
+                    match_confidence=0.97,
+                    is_new_entity=False,
+                    suggested_action="link_existing",
+                ))
+            else:
+                same_name = llm_matches[entity_type].get(_match_key(name))
+                if same_name:
+                    merged[entity_type].append(same_name.pop(0))
+                else:
+                    # The LLM returned nothing for this entity: leave it unmatched
+                    merged[entity_type].append(EntityMatch(
+                        entity_type=entity_type,
+                        extracted_name=name,
+                        match_confidence=0.0,
+                        is_new_entity=True,
+                        suggested_action="needs_review",
+                    ))
+
+    matching_result = MatchingResult(
+        company_matches=merged["company"],
+        contact_matches=merged["contact"],
+        property_matches=merged["property"],
+    )
+    all_matches = matching_result.company_matches + matching_result.contact_matches + matching_result.property_matches
+    matching_result.auto_linkable = sum(1 for m in all_matches if m.suggested_action == "link_existing")
+    matching_result.needs_review = sum(1 for m in all_matches if m.suggested_action == "needs_review")
+    matching_result.new_entities = sum(1 for m in all_matches if m.suggested_action == "create_new")
+
+    return matching_result
+
+
 async def match_single_company(
     company: ExtractedCompany,
     existing_companies: List[Dict[str, Any]],
@@ -287,6 +388,41 @@ async def match_single_company(
 # Formatting Helpers
 # =============================================================================
 
+def _first_value(value: Any) -> Optional[str]:
+    """
+    First entry of an Airtable lookup/link column, or the value itself
+
+    DocumentStore writes phone/email columns as {"value": ...} objects, so
+    those (alone or inside a list) are unwrapped too.
+    """
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('value')
+    return str(value) if value not in (None, '') else None
+
+
+def _match_key(name: Optional[str]) -> str:
+    """Case- and whitespace-insensitive key for pairing LLM matches with entities"""
+    return " ".join((name or "").lower().split())
+
+
+def _extracted_name(entity_type: str, entity: Any) -> str:
+    if entity_type == "company":
+        return entity.name
+    if entity_type == "contact":
+        return entity.full_name
+    return entity.address
+
+
+def _record_name(entity_type: str, record: Dict[str, Any]) -> str:
+    if entity_type == "company":
+        return record.get('compname') or record.get('name', '')
+    if entity_type == "contact":
+        return " ".join(p for p in (record.get('firstname'), record.get('lastname')) if p)
+    return record.get('full_address') or record.get('address', '')
+
+
 def _format_extracted_companies(companies: List[ExtractedCompany]) -> str:
     if not companies:
         return "(none)"
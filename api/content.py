@@ -220,6 +220,6 @@ async def delete_content(
     # Note: This should also clean up files, Neo4j nodes, and vector embeddings
     # TODO: Implement cascade delete for associated data
 
-    await supabase_service.client.table('processed_content').delete().eq('id', content_id).execute()
+    await supabase_service.execute(supabase_service.client.table('processed_content').delete().eq('id', content_id))
 
     return None
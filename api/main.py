@@ -7,6 +7,8 @@ and productivity tools.
 
 Run with: uv run uvicorn main:app --port 8000 --reload
 """
+import os
+import asyncio
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -330,6 +332,55 @@ async def startup_event():
     """Validate configuration on startup."""
     validate_startup_config()
 
+    # Sweep expired transcripts in the background instead of only on read
+    try:
+        from services.transcript_cache import get_transcript_cache, DEFAULT_SWEEP_SECONDS
+        get_transcript_cache().start_expiry_sweeper(
+            float(os.getenv("TRANSCRIPT_CACHE_SWEEP_SECONDS", DEFAULT_SWEEP_SECONDS))
+        )
+    except Exception as e:
+        print(f"Transcript cache sweeper not started: {e}")
+
+    # Build the PARA index once and keep it current from directory mtimes
+    try:
+        from services.para_index import get_para_index
+        asyncio.get_running_loop().run_in_executor(None, get_para_index().start_poller)
+    except Exception as e:
+        print(f"PARA index poller not started: {e}")
+
+    # Keep the PARA full-text index in sync (reads only files that changed)
+    try:
+        from services.para_search import get_para_content_index, DEFAULT_SYNC_SECONDS
+        get_para_content_index().start_sync_loop(
+            float(os.getenv("PARA_SEARCH_SYNC_SECONDS", DEFAULT_SYNC_SECONDS))
+        )
+    except Exception as e:
+        print(f"PARA content index sync not started: {e}")
+
+    # Optionally load the Whisper model now instead of on the first fallback
+    if os.getenv("WHISPER_PRELOAD", "false").lower() == "true":
+        try:
+            from services.transcription_engine import get_transcription_engine
+        except ImportError:
+            return
+        asyncio.get_running_loop().run_in_executor(None, get_transcription_engine().warm_up)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the shared DB executor and Whisper workers on shutdown."""
+    try:
+        from services.transcription_engine import shutdown_transcription_engines
+        shutdown_transcription_engines(wait=False)
+    except ImportError:
+        pass
+
+    try:
+        from services.db_pool import shutdown_db_executor
+    except ImportError:
+        return
+    shutdown_db_executor(wait=False)
+
 
 @app.get("/api/health", response_model=APIResponse[HealthStatus], tags=["System"])
 async def health_check(request: Request) -> APIResponse[HealthStatus]:
@@ -84,7 +84,7 @@ class MemorySearchRequest(BaseModel):
         default=0.7,
         ge=0.0,
         le=1.0,
-        description="Minimum similarity threshold for results",
+        description="Minimum similarity threshold for results (rescaled for the local store's embedder)",
     )
 
 
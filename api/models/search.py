@@ -1,7 +1,7 @@
 """
 Search Request/Response Models
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Literal
 from pydantic import BaseModel, Field
 
 
@@ -15,13 +15,20 @@ class SearchRequest(BaseModel):
         le=0.99,
         description="Minimum similarity score threshold (0.5-0.99)"
     )
+    mode: Literal["hybrid", "vector"] = Field(
+        default="hybrid",
+        description="hybrid: full-text + vector + graph fused by rank; vector: embedding similarity only"
+    )
+    include_graph: bool = Field(default=True, description="Include knowledge graph facts (hybrid mode)")
+    rerank: bool = Field(default=False, description="Re-score top hybrid results with a local cross-encoder")
 
     model_config = {
         "json_schema_extra": {
             "example": {
                 "query": "How to implement authentication in FastAPI",
                 "limit": 10,
-                "threshold": 0.7
+                "threshold": 0.7,
+                "mode": "hybrid"
             }
         }
     }
@@ -37,6 +44,9 @@ class SearchResult(BaseModel):
     tags: List[str] = Field(default=[], description="Content tags")
     similarity: float = Field(..., ge=0, le=1, description="Similarity score (0-1)")
     source_url: Optional[str] = Field(None, description="Original source URL")
+    score: Optional[float] = Field(None, description="Reciprocal-rank fusion score (hybrid mode)")
+    matched_by: List[str] = Field(default=[], description="Stages that returned this result: fulltext, vector, graph")
+    rerank_score: Optional[float] = Field(None, description="Cross-encoder relevance (when reranked)")
 
     model_config = {
         "json_schema_extra": {
@@ -59,6 +69,10 @@ class SearchResponse(BaseModel):
     results: List[SearchResult] = Field(..., description="Matching content")
     query: str = Field(..., description="Original query")
     total: int = Field(..., description="Number of results returned")
+    mode: Optional[str] = Field(None, description="Search mode used")
+    timings_ms: Dict[str, float] = Field(default={}, description="Latency per stage (hybrid mode)")
+    stage_errors: Dict[str, str] = Field(default={}, description="Stages that failed or timed out (hybrid mode)")
+    cached: bool = Field(default=False, description="Served from the search result cache")
 
     model_config = {
         "json_schema_extra": {
@@ -76,3 +90,31 @@ class SearchResponse(BaseModel):
             }
         }
     }
+
+
+class RelatedContentRequest(BaseModel):
+    """Request model for batched related-content lookup."""
+    content_ids: List[str] = Field(..., min_length=1, max_length=50, description="Content IDs to find related content for")
+    limit: int = Field(default=5, ge=1, le=20, description="Related items per content ID")
+    threshold: float = Field(
+        default=0.7,
+        ge=0.5,
+        le=0.99,
+        description="Minimum similarity score threshold (0.5-0.99)"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "content_ids": ["abc123", "def456"],
+                "limit": 5,
+                "threshold": 0.7
+            }
+        }
+    }
+
+
+class RelatedContentResponse(BaseModel):
+    """Related content keyed by source content ID."""
+    related: Dict[str, List[SearchResult]] = Field(..., description="Related content per source content ID")
+    total: int = Field(..., description="Total related items returned")
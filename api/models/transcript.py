@@ -32,6 +32,10 @@ class TranscriptRequest(BaseModel):
         default=False,
         description="Skip YouTube API and use Whisper directly"
     )
+    include_segments: bool = Field(
+        default=True,
+        description="Include timestamped segments"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -67,6 +71,13 @@ class TranscriptMetadata(BaseModel):
     }
 
 
+class TranscriptSegment(BaseModel):
+    """A timed span of the transcript."""
+    start: float = Field(..., description="Start time in seconds")
+    end: float = Field(..., description="End time in seconds")
+    text: str = Field(..., description="Segment text")
+
+
 class TranscriptResult(BaseModel):
     """Result of transcript extraction."""
     success: bool = Field(..., description="Whether extraction succeeded")
@@ -76,6 +87,10 @@ class TranscriptResult(BaseModel):
     language: str = Field(default="en", description="Transcript language code")
     error: Optional[str] = Field(None, description="Error message if failed")
     metadata: Optional[TranscriptMetadata] = Field(None, description="Transcript metadata")
+    segments: Optional[List[TranscriptSegment]] = Field(
+        None,
+        description="Timestamped segments (omitted when include_segments=false)"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -86,6 +101,9 @@ class TranscriptResult(BaseModel):
                 "source": "youtube_api",
                 "language": "en",
                 "error": None,
+                "segments": [
+                    {"start": 0.0, "end": 3.2, "text": "Never gonna give you up,"}
+                ],
                 "metadata": {
                     "char_count": 2500,
                     "word_count": 450,
@@ -153,6 +171,7 @@ class TranscriptBatchRequest(BaseModel):
     )
     languages: Optional[List[str]] = Field(default=None)
     skip_cache: bool = Field(default=False)
+    include_segments: bool = Field(default=False, description="Include timestamped segments")
 
     model_config = {
         "json_schema_extra": {
@@ -184,3 +203,51 @@ class TranscriptBatchResult(BaseModel):
             }
         }
     }
+
+
+class TranscriptBatchJobRequest(BaseModel):
+    """Request for streaming or background batch extraction."""
+    video_ids: List[str] = Field(
+        ...,
+        description="List of video IDs or URLs",
+        min_length=1,
+        max_length=500
+    )
+    languages: Optional[List[str]] = Field(default=None)
+    skip_cache: bool = Field(default=False)
+    include_segments: bool = Field(default=False, description="Include timestamped segments")
+
+
+class TranscriptBatchJob(BaseModel):
+    """Status of a background batch extraction."""
+    job_id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="queued, running, completed or failed")
+    total: int = Field(..., description="Total videos requested")
+    completed: int = Field(default=0, description="Videos finished so far")
+    succeeded: int = Field(default=0, description="Successfully extracted")
+    failed: int = Field(default=0, description="Failed extractions")
+    from_cache: int = Field(default=0, description="Retrieved from cache")
+    created_at: str = Field(..., description="When the job was created (Pacific time)")
+    finished_at: Optional[str] = Field(None, description="When the job finished")
+    error: Optional[str] = Field(None, description="Job-level error")
+    results: List[Optional[TranscriptResult]] = Field(
+        default_factory=list,
+        description="Results in request order (null until that video finishes)"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "job_id": "3f2c9a6e1b7d4f0e8a5c2b1d9e7f6a4c",
+                "status": "running",
+                "total": 120,
+                "completed": 45,
+                "succeeded": 43,
+                "failed": 2,
+                "from_cache": 30,
+                "created_at": "2025-12-27T10:30:00-08:00",
+                "finished_at": None,
+                "results": []
+            }
+        }
+    }
@@ -348,7 +348,7 @@ async def execute_agent(
 
     try:
         # Insert into processing_queue table
-        result = supabase.client.table("agent_jobs").insert(job_data).execute()
+        result = await supabase.execute(supabase.client.table("agent_jobs").insert(job_data))
 
         if not result.data:
             # Fallback to processing_queue if agent_jobs doesn't exist
@@ -362,7 +362,7 @@ async def execute_agent(
                 "metadata": job_data,
                 "created_at": now.isoformat(),
             }
-            result = supabase.client.table("processing_queue").insert(queue_data).execute()
+            result = await supabase.execute(supabase.client.table("processing_queue").insert(queue_data))
 
         job = parse_db_job(job_data)
 
@@ -439,9 +439,9 @@ async def list_agent_jobs(
         if tag:
             query = query.contains("tags", [tag])
 
-        result = query.range(offset, offset + page_size - 1).order(
+        result = await supabase.execute(query.range(offset, offset + page_size - 1).order(
             "created_at", desc=True
-        ).execute()
+        ))
 
         total = result.count or 0
         jobs = [parse_db_job_summary(item) for item in (result.data or [])]
@@ -454,9 +454,9 @@ async def list_agent_jobs(
                 count="exact"
             ).eq("tenant_id", tenant_id).eq("job_type", "agent")
 
-            result = query.range(offset, offset + page_size - 1).order(
+            result = await supabase.execute(query.range(offset, offset + page_size - 1).order(
                 "created_at", desc=True
-            ).execute()
+            ))
 
             total = result.count or 0
             jobs = []
@@ -515,9 +515,9 @@ async def get_agent_job(
 
     try:
         # Try agent_jobs table first
-        result = supabase.client.table("agent_jobs").select(
+        result = await supabase.execute(supabase.client.table("agent_jobs").select(
             "*"
-        ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", job_id).eq("tenant_id", tenant_id))
 
         if result.data:
             job = parse_db_job(result.data[0])
@@ -528,9 +528,9 @@ async def get_agent_job(
             )
 
         # Fallback to processing_queue
-        result = supabase.client.table("processing_queue").select(
+        result = await supabase.execute(supabase.client.table("processing_queue").select(
             "*"
-        ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", job_id).eq("tenant_id", tenant_id))
 
         if result.data:
             item = result.data[0]
@@ -593,15 +593,15 @@ async def get_agent_job_logs(
 
     try:
         # Get job with logs
-        result = supabase.client.table("agent_jobs").select(
+        result = await supabase.execute(supabase.client.table("agent_jobs").select(
             "id, agent_type, status, logs"
-        ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", job_id).eq("tenant_id", tenant_id))
 
         if not result.data:
             # Try processing_queue
-            result = supabase.client.table("processing_queue").select(
+            result = await supabase.execute(supabase.client.table("processing_queue").select(
                 "id, status, metadata"
-            ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+            ).eq("id", job_id).eq("tenant_id", tenant_id))
 
             if not result.data:
                 raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
@@ -682,16 +682,16 @@ async def cancel_agent_job(
 
     try:
         # Get current status
-        result = supabase.client.table("agent_jobs").select(
+        result = await supabase.execute(supabase.client.table("agent_jobs").select(
             "id, status, logs"
-        ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", job_id).eq("tenant_id", tenant_id))
 
         table_name = "agent_jobs"
 
         if not result.data:
-            result = supabase.client.table("processing_queue").select(
+            result = await supabase.execute(supabase.client.table("processing_queue").select(
                 "id, status"
-            ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+            ).eq("id", job_id).eq("tenant_id", tenant_id))
             table_name = "processing_queue"
 
         if not result.data:
@@ -729,7 +729,7 @@ async def cancel_agent_job(
             })
             update_data["logs"] = existing_logs
 
-        supabase.client.table(table_name).update(update_data).eq("id", job_id).execute()
+        await supabase.execute(supabase.client.table(table_name).update(update_data).eq("id", job_id))
 
         return APIResponse(
             success=True,
@@ -774,15 +774,15 @@ async def get_agent_stats(
 
     try:
         # Get all jobs
-        result = supabase.client.table("agent_jobs").select(
+        result = await supabase.execute(supabase.client.table("agent_jobs").select(
             "status, agent_type, started_at, completed_at"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         if not result.data:
             # Fallback
-            result = supabase.client.table("processing_queue").select(
+            result = await supabase.execute(supabase.client.table("processing_queue").select(
                 "status, metadata"
-            ).eq("tenant_id", tenant_id).eq("job_type", "agent").execute()
+            ).eq("tenant_id", tenant_id).eq("job_type", "agent"))
 
         execution_times = []
 
@@ -27,7 +27,7 @@ from typing import Optional, Dict, Any, List
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Request, HTTPException, Header, BackgroundTasks
-from supabase import create_client, Client
+from supabase import Client
 
 from models.response import APIResponse, ResponseMeta
 from models.crons import (
@@ -40,6 +40,7 @@ from models.crons import (
     CronLogEntry,
     CronLogsResponse,
 )
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 router = APIRouter(prefix="/api/crons", tags=["Crons"])
@@ -94,13 +95,11 @@ CRON_JOBS: Dict[CronJobType, dict] = {
 
 
 def get_supabase_client() -> Optional[Client]:
-    """Get Supabase client for database operations."""
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY', os.getenv('SUPABASE_KEY'))
-
-    if url and key:
-        return create_client(url, key)
-    return None
+    """Get the shared Supabase client (None if not configured)."""
+    try:
+        return get_shared_supabase_client()
+    except ValueError:
+        return None
 
 
 def verify_cron_secret(secret: str) -> bool:
@@ -147,7 +146,7 @@ async def log_cron_execution(
     try:
         duration_ms = int((completed_at - started_at).total_seconds() * 1000)
 
-        client.table('cron_logs').insert({
+        await run_query(client.table('cron_logs').insert({
             'id': str(uuid.uuid4()),
             'job_type': job_type.value,
             'status': status.value,
@@ -155,7 +154,7 @@ async def log_cron_execution(
             'duration_ms': duration_ms,
             'message': message,
             'error': error,
-        }).execute()
+        }))
 
         logger.info(f"Logged cron execution: {job_type.value} - {status.value}")
 
@@ -230,9 +229,9 @@ async def execute_queue_process(params: Optional[dict] = None) -> Dict[str, Any]
             return {'processed': 0, 'error': 'Supabase not configured'}
 
         # Get pending items
-        result = client.table('processing_queue').select('*').eq(
+        result = await run_query(client.table('processing_queue').select('*').eq(
             'status', 'pending'
-        ).order('scheduled_at').limit(10).execute()
+        ).order('scheduled_at').limit(10))
 
         items = result.data if result.data else []
         processed = 0
@@ -241,26 +240,26 @@ async def execute_queue_process(params: Optional[dict] = None) -> Dict[str, Any]
         for item in items:
             try:
                 # Mark as processing
-                client.table('processing_queue').update({
+                await run_query(client.table('processing_queue').update({
                     'status': 'processing',
                     'started_at': datetime.now(PACIFIC).isoformat(),
-                }).eq('id', item['id']).execute()
+                }).eq('id', item['id']))
 
                 # TODO: Process item based on type
                 # For now, just mark as completed
-                client.table('processing_queue').update({
+                await run_query(client.table('processing_queue').update({
                     'status': 'completed',
                     'completed_at': datetime.now(PACIFIC).isoformat(),
-                }).eq('id', item['id']).execute()
+                }).eq('id', item['id']))
 
                 processed += 1
 
             except Exception as e:
                 logger.error(f"Failed to process queue item {item['id']}: {e}")
-                client.table('processing_queue').update({
+                await run_query(client.table('processing_queue').update({
                     'status': 'failed',
                     'error': str(e),
-                }).eq('id', item['id']).execute()
+                }).eq('id', item['id']))
                 failed += 1
 
         return {
@@ -293,18 +292,18 @@ async def execute_cleanup_expired(params: Optional[dict] = None) -> Dict[str, An
             expiry_date = (datetime.now(PACIFIC) - timedelta(days=30)).isoformat()
 
             try:
-                result = client.table('sessions').delete().lt(
+                result = await run_query(client.table('sessions').delete().lt(
                     'last_active', expiry_date
-                ).execute()
+                ))
                 cleaned['sessions'] = len(result.data) if result.data else 0
             except Exception as e:
                 logger.warning(f"Session cleanup failed: {e}")
 
             # Clean expired tokens
             try:
-                result = client.table('refresh_tokens').delete().lt(
+                result = await run_query(client.table('refresh_tokens').delete().lt(
                     'expires_at', datetime.now(PACIFIC).isoformat()
-                ).execute()
+                ))
                 cleaned['tokens'] = len(result.data) if result.data else 0
             except Exception as e:
                 logger.warning(f"Token cleanup failed: {e}")
@@ -393,7 +392,7 @@ async def execute_health_check(params: Optional[dict] = None) -> Dict[str, Any]:
         client = get_supabase_client()
         if client:
             # Simple query to check connection
-            client.table('energy_tracking').select('id').limit(1).execute()
+            await run_query(client.table('energy_tracking').select('id').limit(1))
             health['supabase'] = True
     except Exception as e:
         logger.warning(f"Supabase health check failed: {e}")
@@ -435,9 +434,9 @@ async def execute_daily_analysis(params: Optional[dict] = None) -> Dict[str, Any
         today = datetime.now(PACIFIC).date()
 
         # Get today's energy entries
-        result = client.table('energy_tracking').select('*').gte(
+        result = await run_query(client.table('energy_tracking').select('*').gte(
             'recorded_at', today.isoformat()
-        ).execute()
+        ))
 
         entries = result.data if result.data else []
 
@@ -482,16 +481,16 @@ async def execute_okr_rollup(params: Optional[dict] = None) -> Dict[str, Any]:
             return {'rolled_up': False, 'error': 'Supabase not configured'}
 
         # Get all OKRs
-        result = client.table('okrs').select('*').execute()
+        result = await run_query(client.table('okrs').select('*'))
         okrs = result.data if result.data else []
 
         updated = 0
         for okr in okrs:
             try:
                 # Get key results for this OKR
-                kr_result = client.table('key_results').select('*').eq(
+                kr_result = await run_query(client.table('key_results').select('*').eq(
                     'okr_id', okr['id']
-                ).execute()
+                ))
                 key_results = kr_result.data if kr_result.data else []
 
                 if key_results:
@@ -500,10 +499,10 @@ async def execute_okr_rollup(params: Optional[dict] = None) -> Dict[str, Any]:
                     avg_progress = total_progress / len(key_results)
 
                     # Update OKR overall progress
-                    client.table('okrs').update({
+                    await run_query(client.table('okrs').update({
                         'overall_progress': round(avg_progress, 2),
                         'updated_at': datetime.now(PACIFIC).isoformat(),
-                    }).eq('id', okr['id']).execute()
+                    }).eq('id', okr['id']))
 
                     updated += 1
 
@@ -534,9 +533,9 @@ async def execute_embedding_refresh(params: Optional[dict] = None) -> Dict[str,
         # Find documents with stale embeddings (older than 30 days)
         stale_date = (datetime.now(PACIFIC) - timedelta(days=30)).isoformat()
 
-        result = client.table('documents').select('id,content').lt(
+        result = await run_query(client.table('documents').select('id,content').lt(
             'embedding_updated_at', stale_date
-        ).limit(50).execute()
+        ).limit(50))
 
         stale_docs = result.data if result.data else []
         refreshed = 0
@@ -553,10 +552,10 @@ async def execute_embedding_refresh(params: Optional[dict] = None) -> Dict[str,
                         embedding = embeddings_service.generate_embedding(content)
 
                         # Update document
-                        client.table('documents').update({
+                        await run_query(client.table('documents').update({
                             'embedding': embedding,
                             'embedding_updated_at': datetime.now(PACIFIC).isoformat(),
-                        }).eq('id', doc['id']).execute()
+                        }).eq('id', doc['id']))
 
                         refreshed += 1
 
@@ -798,9 +797,9 @@ async def get_cron_status(
         # Get last execution from logs
         if client:
             try:
-                result = client.table('cron_logs').select('*').eq(
+                result = await run_query(client.table('cron_logs').select('*').eq(
                     'job_type', job_type.value
-                ).order('executed_at', desc=True).limit(1).execute()
+                ).order('executed_at', desc=True).limit(1))
 
                 if result.data:
                     last = result.data[0]
@@ -815,9 +814,9 @@ async def get_cron_status(
     last_execution = None
     if client:
         try:
-            result = client.table('cron_logs').select('*').order(
+            result = await run_query(client.table('cron_logs').select('*').order(
                 'executed_at', desc=True
-            ).limit(1).execute()
+            ).limit(1))
 
             if result.data:
                 log = result.data[0]
@@ -894,7 +893,7 @@ async def get_cron_logs(
         offset = (page - 1) * page_size
         query = query.order('executed_at', desc=True).range(offset, offset + page_size - 1)
 
-        result = query.execute()
+        result = await run_query(query)
 
         logs = []
         for row in result.data or []:
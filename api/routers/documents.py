@@ -162,7 +162,7 @@ async def queue_for_processing(
 
     try:
         # Insert into processed_content
-        supabase.client.table("processed_content").insert(content_data).execute()
+        await supabase.execute(supabase.client.table("processed_content").insert(content_data))
 
         # Add to processing queue
         queue_data = {
@@ -179,10 +179,10 @@ async def queue_for_processing(
             }
         }
 
-        supabase.client.table("processing_queue").insert(queue_data).execute()
+        await supabase.execute(supabase.client.table("processing_queue").insert(queue_data))
 
         # Get queue position
-        queue_result = supabase.client.table("processing_queue").select("id").eq("status", "queued").execute()
+        queue_result = await supabase.execute(supabase.client.table("processing_queue").select("id").eq("status", "queued"))
         queue_position = len(queue_result.data) if queue_result.data else 1
 
         # Estimate ~15 seconds per document in queue
@@ -288,7 +288,7 @@ async def get_document_status(
     supabase = SupabaseService()
 
     # Get content record
-    result = supabase.client.table("processed_content").select("*").eq("id", document_id).execute()
+    result = await supabase.execute(supabase.client.table("processed_content").select("*").eq("id", document_id))
 
     if not result.data:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -300,7 +300,7 @@ async def get_document_status(
         raise HTTPException(status_code=403, detail="Access denied")
 
     # Get queue info if still processing
-    queue_result = supabase.client.table("processing_queue").select("*").eq("content_id", document_id).execute()
+    queue_result = await supabase.execute(supabase.client.table("processing_queue").select("*").eq("content_id", document_id))
 
     status_str = doc.get("processing_status", "queued")
     progress = None
@@ -358,7 +358,7 @@ async def list_documents(
     query = query.range(offset, offset + page_size - 1)
     query = query.order("created_at", desc=True)
 
-    result = query.execute()
+    result = await supabase.execute(query)
 
     total = result.count or 0
     documents = []
@@ -410,7 +410,7 @@ async def delete_document(
     supabase = SupabaseService()
 
     # Get document
-    result = supabase.client.table("processed_content").select("*").eq("id", document_id).execute()
+    result = await supabase.execute(supabase.client.table("processed_content").select("*").eq("id", document_id))
 
     if not result.data:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -426,10 +426,10 @@ async def delete_document(
         raise HTTPException(status_code=400, detail="Cannot delete document while processing")
 
     # Delete from queue
-    supabase.client.table("processing_queue").delete().eq("content_id", document_id).execute()
+    await supabase.execute(supabase.client.table("processing_queue").delete().eq("content_id", document_id))
 
     # Delete content record
-    supabase.client.table("processed_content").delete().eq("id", document_id).execute()
+    await supabase.execute(supabase.client.table("processed_content").delete().eq("id", document_id))
 
     # Delete file from storage
     doc_dir = UPLOAD_DIR / document_id
@@ -4,7 +4,6 @@ Energy Tracking Router
 Endpoints for tracking energy levels and focus quality.
 Works directly with Supabase energy_tracking table.
 """
-import os
 import sys
 from pathlib import Path
 from typing import List, Optional
@@ -13,10 +12,11 @@ from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, Request, Query
 from pydantic import BaseModel, Field
-from supabase import create_client, Client
+from supabase import Client
 
 from models.response import APIResponse, ResponseMeta
 from middleware.auth import get_current_user, UserContext
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 # Add services to path for imports
 services_path = Path(__file__).parent.parent.parent / "services"
@@ -30,13 +30,11 @@ PACIFIC = ZoneInfo("America/Los_Angeles")
 
 
 def get_supabase_client() -> Optional[Client]:
-    """Get Supabase client for database operations."""
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY', os.getenv('SUPABASE_KEY'))
-
-    if url and key:
-        return create_client(url, key)
-    return None
+    """Get the shared Supabase client (None if not configured)."""
+    try:
+        return get_shared_supabase_client()
+    except ValueError:
+        return None
 
 
 # === Request/Response Models ===
@@ -151,7 +149,7 @@ async def record_energy(
         now = datetime.now(PACIFIC)
 
         # Insert tracking entry
-        result = client.table('energy_tracking').insert({
+        result = await run_query(client.table('energy_tracking').insert({
             'tenant_id': tenant_id,
             'user_id': user.email or user.uid,
             'timestamp': now.isoformat(),
@@ -159,7 +157,7 @@ async def record_energy(
             'focus_quality': tracking_request.focus_quality,
             'source': tracking_request.source,
             'notes': tracking_request.notes,
-        }).execute()
+        }))
 
         if result.data:
             entry = result.data[0]
@@ -229,11 +227,11 @@ async def get_energy_history(
         now = datetime.now(PACIFIC)
         start_date = now - timedelta(days=days)
 
-        result = client.table('energy_tracking').select('*').eq(
+        result = await run_query(client.table('energy_tracking').select('*').eq(
             'tenant_id', tenant_id
         ).eq('user_id', user_id).gte(
             'timestamp', start_date.isoformat()
-        ).order('timestamp', desc=True).execute()
+        ).order('timestamp', desc=True))
 
         entries = []
         for row in result.data or []:
@@ -310,11 +308,11 @@ async def get_energy_summary(
         now = datetime.now(PACIFIC)
         start_date = now - timedelta(days=days)
 
-        result = client.table('energy_tracking').select('*').eq(
+        result = await run_query(client.table('energy_tracking').select('*').eq(
             'tenant_id', tenant_id
         ).eq('user_id', user_id).gte(
             'timestamp', start_date.isoformat()
-        ).execute()
+        ))
 
         data = result.data or []
 
@@ -432,11 +430,11 @@ async def get_energy_patterns(
         now = datetime.now(PACIFIC)
         start_date = now - timedelta(days=days)
 
-        result = client.table('energy_tracking').select('*').eq(
+        result = await run_query(client.table('energy_tracking').select('*').eq(
             'tenant_id', tenant_id
         ).eq('user_id', user_id).gte(
             'timestamp', start_date.isoformat()
-        ).execute()
+        ))
 
         data = result.data or []
 
@@ -542,11 +540,11 @@ async def get_energy_forecast(
         now = datetime.now(PACIFIC)
         start_date = now - timedelta(days=60)
 
-        result = client.table('energy_tracking').select('*').eq(
+        result = await run_query(client.table('energy_tracking').select('*').eq(
             'tenant_id', tenant_id
         ).eq('user_id', user_id).gte(
             'timestamp', start_date.isoformat()
-        ).execute()
+        ))
 
         data = result.data or []
 
@@ -671,11 +669,11 @@ async def get_today_energy(
         now = datetime.now(PACIFIC)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        result = client.table('energy_tracking').select('*').eq(
+        result = await run_query(client.table('energy_tracking').select('*').eq(
             'tenant_id', tenant_id
         ).eq('user_id', user_id).gte(
             'timestamp', today_start.isoformat()
-        ).order('timestamp', desc=True).execute()
+        ).order('timestamp', desc=True))
 
         data = result.data or []
 
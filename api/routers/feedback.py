@@ -228,17 +228,17 @@ async def get_feedback_queue(
         if document_type:
             query = query.eq("document_type", document_type)
 
-        result = query.range(offset, offset + page_size - 1).order(
+        result = await supabase.execute(query.range(offset, offset + page_size - 1).order(
             "priority"  # Will need custom sorting
-        ).order("created_at", desc=True).execute()
+        ).order("created_at", desc=True))
 
         items_data = result.data or []
         total = result.count or 0
 
         # Get stats
-        stats_result = supabase.client.table("extraction_feedback").select(
+        stats_result = await supabase.execute(supabase.client.table("extraction_feedback").select(
             "status"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         stats = {"pending": 0, "in_review": 0, "approved": 0, "corrected": 0, "rejected": 0, "example": 0}
         for item in (stats_result.data or []):
@@ -312,9 +312,9 @@ async def get_feedback_item(
     supabase = get_supabase()
 
     try:
-        result = supabase.client.table("extraction_feedback").select(
+        result = await supabase.execute(supabase.client.table("extraction_feedback").select(
             "*"
-        ).eq("id", feedback_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", feedback_id).eq("tenant_id", tenant_id))
 
         if not result.data:
             raise HTTPException(status_code=404, detail=f"Feedback item not found: {feedback_id}")
@@ -375,9 +375,9 @@ async def claim_feedback_item(
 
     try:
         # Check current status
-        result = supabase.client.table("extraction_feedback").select(
+        result = await supabase.execute(supabase.client.table("extraction_feedback").select(
             "id, status"
-        ).eq("id", feedback_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", feedback_id).eq("tenant_id", tenant_id))
 
         if not result.data:
             raise HTTPException(status_code=404, detail=f"Feedback item not found: {feedback_id}")
@@ -391,11 +391,11 @@ async def claim_feedback_item(
             )
 
         # Update status and assign reviewer
-        update_result = supabase.client.table("extraction_feedback").update({
+        update_result = await supabase.execute(supabase.client.table("extraction_feedback").update({
             "status": "in_review",
             "reviewer_id": user.uid,
             "updated_at": datetime.now(PACIFIC).isoformat(),
-        }).eq("id", feedback_id).execute()
+        }).eq("id", feedback_id))
 
         # Return updated item
         updated = update_result.data[0] if update_result.data else result.data[0]
@@ -460,9 +460,9 @@ async def submit_corrections(
 
     try:
         # Get current item
-        result = supabase.client.table("extraction_feedback").select(
+        result = await supabase.execute(supabase.client.table("extraction_feedback").select(
             "*"
-        ).eq("id", feedback_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", feedback_id).eq("tenant_id", tenant_id))
 
         if not result.data:
             raise HTTPException(status_code=404, detail=f"Feedback item not found: {feedback_id}")
@@ -513,7 +513,7 @@ async def submit_corrections(
         total_corrections = num_field_corrections + num_entity_corrections + len(corrections.new_entities)
 
         # Update the item
-        update_result = supabase.client.table("extraction_feedback").update({
+        update_result = await supabase.execute(supabase.client.table("extraction_feedback").update({
             "status": new_status,
             "fields": current_fields,
             "entities": current_entities,
@@ -522,7 +522,7 @@ async def submit_corrections(
             "corrections_count": total_corrections,
             "updated_at": datetime.now(PACIFIC).isoformat(),
             "reviewed_at": datetime.now(PACIFIC).isoformat(),
-        }).eq("id", feedback_id).execute()
+        }).eq("id", feedback_id))
 
         # If marked as example, create training example
         if corrections.mark_as_example:
@@ -589,9 +589,9 @@ async def approve_extraction(
 
     try:
         # Get current item
-        result = supabase.client.table("extraction_feedback").select(
+        result = await supabase.execute(supabase.client.table("extraction_feedback").select(
             "*"
-        ).eq("id", feedback_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", feedback_id).eq("tenant_id", tenant_id))
 
         if not result.data:
             raise HTTPException(status_code=404, detail=f"Feedback item not found: {feedback_id}")
@@ -600,14 +600,14 @@ async def approve_extraction(
         new_status = "example" if approval.mark_as_example else "approved"
 
         # Update the item
-        update_result = supabase.client.table("extraction_feedback").update({
+        update_result = await supabase.execute(supabase.client.table("extraction_feedback").update({
             "status": new_status,
             "reviewer_id": user.uid,
             "reviewer_notes": approval.reviewer_notes,
             "corrections_count": 0,
             "updated_at": datetime.now(PACIFIC).isoformat(),
             "reviewed_at": datetime.now(PACIFIC).isoformat(),
-        }).eq("id", feedback_id).execute()
+        }).eq("id", feedback_id))
 
         # If marked as example, create training example
         if approval.mark_as_example:
@@ -698,7 +698,7 @@ async def _create_training_example(
             "created_by": user_id,
         }
 
-        supabase.client.table("extraction_examples").insert(example_data).execute()
+        await supabase.execute(supabase.client.table("extraction_examples").insert(example_data))
 
         return example_id
 
@@ -737,7 +737,7 @@ async def list_training_examples(
         if document_type:
             query = query.eq("document_type", document_type)
 
-        result = query.limit(limit).order("created_at", desc=True).execute()
+        result = await supabase.execute(query.limit(limit).order("created_at", desc=True))
 
         examples = []
         for item in (result.data or []):
@@ -804,9 +804,9 @@ async def get_feedback_stats(
 
     try:
         # Queue stats
-        queue_result = supabase.client.table("extraction_feedback").select(
+        queue_result = await supabase.execute(supabase.client.table("extraction_feedback").select(
             "status, priority"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         for item in (queue_result.data or []):
             stats["queue"]["total"] += 1
@@ -818,9 +818,9 @@ async def get_feedback_stats(
                 stats["queue"]["by_priority"][priority] += 1
 
         # Example stats
-        example_result = supabase.client.table("extraction_examples").select(
+        example_result = await supabase.execute(supabase.client.table("extraction_examples").select(
             "corrections_made"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         for item in (example_result.data or []):
             stats["examples"]["total"] += 1
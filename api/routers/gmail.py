@@ -19,6 +19,7 @@ from pydantic import BaseModel, Field
 
 from models.response import APIResponse, ResponseMeta
 from middleware.auth import get_current_user, UserContext
+from services.db_pool import run_query
 
 # Add services to path for imports
 services_path = Path(__file__).parent.parent.parent / "services"
@@ -384,15 +385,15 @@ async def list_labels(
             await save_gmail_credentials(user_id, credentials)
 
         service = build('gmail', 'v1', credentials=credentials)
-        results = service.users().labels().list(userId='me').execute()
+        results = await run_query(service.users().labels().list(userId='me'))
 
         labels = []
         for label in results.get('labels', []):
             # Get label details for counts
             try:
-                label_info = service.users().labels().get(
+                label_info = await run_query(service.users().labels().get(
                     userId='me', id=label['id']
-                ).execute()
+                ))
 
                 labels.append(GmailLabel(
                     id=label['id'],
@@ -562,23 +563,23 @@ async def run_sync(
         for label in sync_labels:
             try:
                 # Get messages with this label
-                results = service.users().messages().list(
+                results = await run_query(service.users().messages().list(
                     userId='me',
                     labelIds=[label] if label.startswith('Label_') else None,
                     q=f"label:{label}" if not label.startswith('Label_') else None,
                     maxResults=max_messages
-                ).execute()
+                ))
 
                 messages = results.get('messages', [])
 
                 for msg_ref in messages:
                     try:
                         # Get full message
-                        msg = service.users().messages().get(
+                        msg = await run_query(service.users().messages().get(
                             userId='me',
                             id=msg_ref['id'],
                             format='full'
-                        ).execute()
+                        ))
 
                         # Here you would ingest the message to knowledge base
                         # For now, just count it
@@ -677,22 +678,22 @@ async def list_messages(
         if label and label != "INBOX":
             full_query = f"label:{label} {query}".strip()
 
-        results = service.users().messages().list(
+        results = await run_query(service.users().messages().list(
             userId='me',
             q=full_query,
             maxResults=max_results,
             labelIds=['INBOX'] if label == "INBOX" else None,
-        ).execute()
+        ))
 
         messages = []
         for msg_ref in results.get('messages', []):
             try:
-                msg = service.users().messages().get(
+                msg = await run_query(service.users().messages().get(
                     userId='me',
                     id=msg_ref['id'],
                     format='metadata',
                     metadataHeaders=['Subject', 'From', 'Date']
-                ).execute()
+                ))
 
                 headers = {h['name']: h['value'] for h in msg.get('payload', {}).get('headers', [])}
 
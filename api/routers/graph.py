@@ -18,6 +18,11 @@ from middleware.auth import get_current_user, UserContext
 services_path = Path(__file__).parent.parent.parent / "services"
 sys.path.insert(0, str(services_path))
 
+try:
+    from services.search_cache import get_search_cache
+except ImportError:
+    from search_cache import get_search_cache
+
 
 router = APIRouter(prefix="/api/graph", tags=["Knowledge Graph"])
 
@@ -94,7 +99,9 @@ async def search_graph(
     Search the knowledge graph using semantic similarity.
 
     Searches for entities and relationships matching the query.
-    Uses Graphiti's vector-based search on graph content.
+    Uses Graphiti's vector-based search on graph content. Identical
+    queries within the search cache TTL are served from the cache until
+    new content is ingested for the tenant.
 
     **Request Body:**
     - query: Search text (required)
@@ -116,10 +123,15 @@ async def search_graph(
         kg = get_knowledge_graph()
 
         # Search the graph
-        raw_results = await kg.search_similar_content(
-            query=search_request.query,
-            tenant_id=tenant_id,
+        raw_results, _ = await get_search_cache().get_or_compute(
+            "graph", tenant_id, search_request.query,
+            lambda: kg.search_similar_content(
+                query=search_request.query,
+                tenant_id=tenant_id,
+                limit=search_request.limit,
+            ),
             limit=search_request.limit,
+            stores=["graph"],
         )
 
         # Transform to response models
@@ -43,6 +43,7 @@ from models.group import (
 )
 from middleware.auth import get_current_user, UserContext, require_roles
 from config import get_settings
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 router = APIRouter(prefix="/api/groups", tags=["Groups"])
@@ -61,9 +62,7 @@ def get_supabase():
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service not configured"
         )
-
-    from supabase import create_client
-    return create_client(settings.supabase_url, settings.supabase_service_key)
+    return get_shared_supabase_client()
 
 
 # === Helper Functions ===
@@ -81,16 +80,16 @@ def now_pacific() -> str:
 async def get_user_workspace_id(user: UserContext, supabase) -> Optional[str]:
     """Get user's active workspace ID."""
     try:
-        result = supabase.table("user_preferences").select(
+        result = await run_query(supabase.table("user_preferences").select(
             "active_workspace_id"
-        ).eq("user_id", user.uid).single().execute()
+        ).eq("user_id", user.uid).single())
         return result.data.get("active_workspace_id") if result.data else None
     except Exception:
         # Try to get from tenant_users if no preference set
         try:
-            result = supabase.table("tenant_users").select(
+            result = await run_query(supabase.table("tenant_users").select(
                 "tenant_id"
-            ).eq("user_id", user.uid).limit(1).execute()
+            ).eq("user_id", user.uid).limit(1))
             return result.data[0].get("tenant_id") if result.data else None
         except Exception:
             return None
@@ -99,9 +98,9 @@ async def get_user_workspace_id(user: UserContext, supabase) -> Optional[str]:
 async def user_can_manage_groups(user: UserContext, workspace_id: str, supabase) -> bool:
     """Check if user has permission to manage groups in workspace."""
     try:
-        result = supabase.table("tenant_users").select("role").eq(
+        result = await run_query(supabase.table("tenant_users").select("role").eq(
             "user_id", user.uid
-        ).eq("tenant_id", workspace_id).single().execute()
+        ).eq("tenant_id", workspace_id).single())
 
         if result.data:
             role = result.data.get("role", "")
@@ -114,7 +113,7 @@ async def user_can_manage_groups(user: UserContext, workspace_id: str, supabase)
 async def get_group_by_id(group_id: str, supabase) -> Optional[dict]:
     """Get group by ID."""
     try:
-        result = supabase.table("groups").select("*").eq("id", group_id).single().execute()
+        result = await run_query(supabase.table("groups").select("*").eq("id", group_id).single())
         return result.data
     except Exception:
         return None
@@ -123,9 +122,9 @@ async def get_group_by_id(group_id: str, supabase) -> Optional[dict]:
 async def get_group_member_count(group_id: str, supabase) -> int:
     """Get count of members in a group."""
     try:
-        result = supabase.table("group_members").select(
+        result = await run_query(supabase.table("group_members").select(
             "user_id", count="exact"
-        ).eq("group_id", group_id).execute()
+        ).eq("group_id", group_id))
         return result.count or 0
     except Exception:
         return 0
@@ -187,9 +186,9 @@ async def build_group_tree(workspace_id: str, supabase) -> List[GroupTreeNode]:
     """Build hierarchical tree of groups for a workspace."""
     try:
         # Get all groups for workspace
-        result = supabase.table("groups").select("*").eq(
+        result = await run_query(supabase.table("groups").select("*").eq(
             "workspace_id", workspace_id
-        ).execute()
+        ))
 
         groups = result.data or []
 
@@ -259,7 +258,7 @@ async def list_groups(
         if group_type:
             query = query.eq("group_type", group_type.value)
 
-        result = query.order("name").execute()
+        result = await run_query(query.order("name"))
         groups_data = result.data or []
 
         # Get member counts
@@ -363,9 +362,9 @@ async def get_my_groups(
             )
 
         # Get user's direct group memberships
-        result = supabase.table("group_members").select(
+        result = await run_query(supabase.table("group_members").select(
             "group_id, role, joined_at, groups(*)"
-        ).eq("user_id", user.uid).execute()
+        ).eq("user_id", user.uid))
 
         memberships = result.data or []
 
@@ -507,7 +506,7 @@ async def create_group(
             "created_by": user.uid,
         }
 
-        result = supabase.table("groups").insert(new_group).execute()
+        result = await run_query(supabase.table("groups").insert(new_group))
 
         if not result.data:
             return APIResponse(
@@ -604,7 +603,7 @@ async def update_group(
         if group_data.settings is not None:
             updates["settings"] = {**group.get("settings", {}), **group_data.settings}
 
-        result = supabase.table("groups").update(updates).eq("id", group_id).execute()
+        result = await run_query(supabase.table("groups").update(updates).eq("id", group_id))
 
         if not result.data:
             return APIResponse(
@@ -666,29 +665,29 @@ async def delete_group(
             )
 
         # Handle child groups
-        children_result = supabase.table("groups").select("id").eq(
+        children_result = await run_query(supabase.table("groups").select("id").eq(
             "parent_group_id", group_id
-        ).execute()
+        ))
         children = children_result.data or []
         orphaned_count = len(children)
 
         if children:
             if orphan_children:
                 # Move children to root (remove parent)
-                supabase.table("groups").update({
+                await run_query(supabase.table("groups").update({
                     "parent_group_id": None,
                     "updated_at": now_pacific()
-                }).eq("parent_group_id", group_id).execute()
+                }).eq("parent_group_id", group_id))
             else:
                 # Cascade delete - recursively delete children
                 for child in children:
                     await delete_group_recursive(child["id"], supabase)
 
         # Delete group members first
-        supabase.table("group_members").delete().eq("group_id", group_id).execute()
+        await run_query(supabase.table("group_members").delete().eq("group_id", group_id))
 
         # Delete the group
-        supabase.table("groups").delete().eq("id", group_id).execute()
+        await run_query(supabase.table("groups").delete().eq("id", group_id))
 
         return APIResponse(
             success=True,
@@ -712,19 +711,19 @@ async def delete_group(
 async def delete_group_recursive(group_id: str, supabase):
     """Recursively delete a group and all its children."""
     # Get children first
-    children_result = supabase.table("groups").select("id").eq(
+    children_result = await run_query(supabase.table("groups").select("id").eq(
         "parent_group_id", group_id
-    ).execute()
+    ))
 
     # Delete children recursively
     for child in children_result.data or []:
         await delete_group_recursive(child["id"], supabase)
 
     # Delete members
-    supabase.table("group_members").delete().eq("group_id", group_id).execute()
+    await run_query(supabase.table("group_members").delete().eq("group_id", group_id))
 
     # Delete group
-    supabase.table("groups").delete().eq("id", group_id).execute()
+    await run_query(supabase.table("groups").delete().eq("id", group_id))
 
 
 # === Member Management Endpoints ===
@@ -752,9 +751,9 @@ async def list_group_members(
             )
 
         # Get members
-        result = supabase.table("group_members").select("*").eq(
+        result = await run_query(supabase.table("group_members").select("*").eq(
             "group_id", group_id
-        ).execute()
+        ))
 
         memberships = result.data or []
 
@@ -762,9 +761,9 @@ async def list_group_members(
         members = []
         for m in memberships:
             # Try to get user details
-            user_result = supabase.table("users").select(
+            user_result = await run_query(supabase.table("users").select(
                 "email, display_name"
-            ).eq("id", m["user_id"]).single().execute()
+            ).eq("id", m["user_id"]).single())
 
             user_data = user_result.data or {}
 
@@ -829,9 +828,9 @@ async def add_group_member(
             )
 
         # Check if user is already a member
-        existing = supabase.table("group_members").select("id").eq(
+        existing = await run_query(supabase.table("group_members").select("id").eq(
             "group_id", group_id
-        ).eq("user_id", member_data.user_id).execute()
+        ).eq("user_id", member_data.user_id))
 
         if existing.data:
             return APIResponse(
@@ -849,7 +848,7 @@ async def add_group_member(
             "joined_at": now,
         }
 
-        result = supabase.table("group_members").insert(new_member).execute()
+        result = await run_query(supabase.table("group_members").insert(new_member))
 
         if not result.data:
             return APIResponse(
@@ -859,9 +858,9 @@ async def add_group_member(
             )
 
         # Get user details for response
-        user_result = supabase.table("users").select(
+        user_result = await run_query(supabase.table("users").select(
             "email, display_name"
-        ).eq("id", member_data.user_id).single().execute()
+        ).eq("id", member_data.user_id).single())
 
         user_data = user_result.data or {}
 
@@ -929,21 +928,21 @@ async def add_bulk_group_members(
 
         for member in bulk_data.members:
             # Check if already exists
-            existing = supabase.table("group_members").select("id").eq(
+            existing = await run_query(supabase.table("group_members").select("id").eq(
                 "group_id", group_id
-            ).eq("user_id", member.user_id).execute()
+            ).eq("user_id", member.user_id))
 
             if existing.data:
                 skipped += 1
                 continue
 
             # Add member
-            supabase.table("group_members").insert({
+            await run_query(supabase.table("group_members").insert({
                 "group_id": group_id,
                 "user_id": member.user_id,
                 "role": member.role.value,
                 "joined_at": now,
-            }).execute()
+            }))
             added += 1
 
         return APIResponse(
@@ -1001,9 +1000,9 @@ async def update_group_member(
             )
 
         # Update member role
-        result = supabase.table("group_members").update({
+        result = await run_query(supabase.table("group_members").update({
             "role": member_data.role.value
-        }).eq("group_id", group_id).eq("user_id", member_user_id).execute()
+        }).eq("group_id", group_id).eq("user_id", member_user_id))
 
         if not result.data:
             return APIResponse(
@@ -1014,9 +1013,9 @@ async def update_group_member(
 
         # Get updated member info
         member = result.data[0]
-        user_result = supabase.table("users").select(
+        user_result = await run_query(supabase.table("users").select(
             "email, display_name"
-        ).eq("id", member_user_id).single().execute()
+        ).eq("id", member_user_id).single())
 
         user_data = user_result.data or {}
 
@@ -1075,9 +1074,9 @@ async def remove_group_member(
             )
 
         # Remove member
-        result = supabase.table("group_members").delete().eq(
+        result = await run_query(supabase.table("group_members").delete().eq(
             "group_id", group_id
-        ).eq("user_id", member_user_id).execute()
+        ).eq("user_id", member_user_id))
 
         if not result.data:
             return APIResponse(
@@ -6,6 +6,7 @@ Voice server, queue depth, and error logs.
 """
 import os
 import sys
+import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
@@ -15,10 +16,11 @@ from zoneinfo import ZoneInfo
 import httpx
 from fastapi import APIRouter, Depends, Request, Query
 from pydantic import BaseModel, Field
-from supabase import create_client, Client
+from supabase import Client
 
 from models.response import APIResponse, ResponseMeta
 from middleware.auth import get_current_user, get_optional_user, UserContext
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 logger = logging.getLogger("flourisha.api.health_dashboard")
@@ -38,13 +40,11 @@ SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 
 
 def get_supabase_client() -> Optional[Client]:
-    """Get Supabase client for database operations."""
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY', os.getenv('SUPABASE_KEY'))
-
-    if url and key:
-        return create_client(url, key)
-    return None
+    """Get the shared Supabase client (None if not configured)."""
+    try:
+        return get_shared_supabase_client()
+    except ValueError:
+        return None
 
 
 # === Request/Response Models ===
@@ -100,7 +100,7 @@ async def check_supabase_health() -> ServiceHealth:
             )
 
         # Simple query to test connection
-        result = supabase.table('embeddings').select('id').limit(1).execute()
+        result = await run_query(supabase.table('embeddings').select('id').limit(1))
         latency = (datetime.now() - start).total_seconds() * 1000
 
         return ServiceHealth(
@@ -217,25 +217,21 @@ async def get_queue_metrics() -> QueueMetrics:
 
         today = datetime.now(PACIFIC).strftime("%Y-%m-%d")
 
-        # Get pending jobs
-        pending = supabase.table('processing_queue').select(
-            'id', count='exact'
-        ).eq('status', 'pending').execute()
-
-        # Get processing jobs
-        processing = supabase.table('processing_queue').select(
-            'id', count='exact'
-        ).eq('status', 'processing').execute()
-
-        # Get completed today
-        completed = supabase.table('processing_queue').select(
-            'id', count='exact'
-        ).eq('status', 'completed').gte('completed_at', today).execute()
-
-        # Get failed today
-        failed = supabase.table('processing_queue').select(
-            'id', count='exact'
-        ).eq('status', 'failed').gte('updated_at', today).execute()
+        # Pending, processing, completed today and failed today, in parallel
+        pending, processing, completed, failed = await asyncio.gather(
+            run_query(supabase.table('processing_queue').select(
+                'id', count='exact'
+            ).eq('status', 'pending')),
+            run_query(supabase.table('processing_queue').select(
+                'id', count='exact'
+            ).eq('status', 'processing')),
+            run_query(supabase.table('processing_queue').select(
+                'id', count='exact'
+            ).eq('status', 'completed').gte('completed_at', today)),
+            run_query(supabase.table('processing_queue').select(
+                'id', count='exact'
+            ).eq('status', 'failed').gte('updated_at', today)),
+        )
 
         return QueueMetrics(
             pending=pending.count or 0,
@@ -496,3 +492,34 @@ async def get_error_logs(
             error=f"Failed to get logs: {str(e)}",
             meta=ResponseMeta(**meta_dict),
         )
+
+
+@router.get("/llm", response_model=APIResponse[dict])
+async def get_llm_metrics(
+    request: Request,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[dict]:
+    """
+    Get LLM gateway metrics.
+
+    Returns per-model call counts, errors, in-flight calls, token usage,
+    throttled time and latency percentiles for this API process.
+
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
+
+    try:
+        from services.llm_gateway import get_llm_gateway
+
+        return APIResponse(
+            success=True,
+            data=get_llm_gateway().get_stats(),
+            meta=ResponseMeta(**meta_dict),
+        )
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            error=f"Failed to get LLM metrics: {str(e)}",
+            meta=ResponseMeta(**meta_dict),
+        )
@@ -63,9 +63,9 @@ async def get_ingestion_status(
     ).eq("tenant_id", tenant_id)
 
     # Get counts by status
-    stats_result = supabase.client.table("processed_content").select(
+    stats_result = await supabase.execute(supabase.client.table("processed_content").select(
         "processing_status"
-    ).eq("tenant_id", tenant_id).execute()
+    ).eq("tenant_id", tenant_id))
 
     status_counts = {
         "pending": 0,
@@ -92,9 +92,9 @@ async def get_ingestion_status(
     )
 
     # Get counts by content type
-    type_result = supabase.client.table("processed_content").select(
+    type_result = await supabase.execute(supabase.client.table("processed_content").select(
         "source_type"
-    ).eq("tenant_id", tenant_id).execute()
+    ).eq("tenant_id", tenant_id))
 
     type_counts = {}
     for item in type_result.data or []:
@@ -107,11 +107,11 @@ async def get_ingestion_status(
     ]
 
     # Get queue items
-    queue_result = supabase.client.table("processing_queue").select(
+    queue_result = await supabase.execute(supabase.client.table("processing_queue").select(
         "content_id, priority, status, retry_count, created_at, metadata"
     ).eq("tenant_id", tenant_id).in_(
         "status", ["queued", "processing"]
-    ).order("priority", desc=True).order("created_at").limit(20).execute()
+    ).order("priority", desc=True).order("created_at").limit(20))
 
     queue_items = []
     for item in queue_result.data or []:
@@ -121,9 +121,9 @@ async def get_ingestion_status(
         # Try to get title from content table
         title = None
         if content_id:
-            content = supabase.client.table("processed_content").select(
+            content = await supabase.execute(supabase.client.table("processed_content").select(
                 "title, source_type"
-            ).eq("id", content_id).single().execute()
+            ).eq("id", content_id).single())
             if content.data:
                 title = content.data.get("title")
 
@@ -138,11 +138,11 @@ async def get_ingestion_status(
         ))
 
     # Get recently processed items (last 20)
-    recent_result = supabase.client.table("processed_content").select(
+    recent_result = await supabase.execute(supabase.client.table("processed_content").select(
         "id, title, source_type, processing_status, updated_at, embedding, graph_node_id, error_message"
     ).eq("tenant_id", tenant_id).in_(
         "processing_status", ["completed", "failed"]
-    ).order("updated_at", desc=True).limit(20).execute()
+    ).order("updated_at", desc=True).limit(20))
 
     recent_items = []
     for item in recent_result.data or []:
@@ -187,11 +187,11 @@ async def get_queue(
     tenant_id = user.tenant_id or "default"
     now = datetime.now(PACIFIC)
 
-    queue_result = supabase.client.table("processing_queue").select(
+    queue_result = await supabase.execute(supabase.client.table("processing_queue").select(
         "content_id, priority, status, retry_count, created_at, metadata"
     ).eq("tenant_id", tenant_id).in_(
         "status", ["queued", "processing"]
-    ).order("priority", desc=True).order("created_at").limit(limit).execute()
+    ).order("priority", desc=True).order("created_at").limit(limit))
 
     queue_items = []
     for item in queue_result.data or []:
@@ -202,9 +202,9 @@ async def get_queue(
         title = None
         source_type = "upload"
         if content_id:
-            content = supabase.client.table("processed_content").select(
+            content = await supabase.execute(supabase.client.table("processed_content").select(
                 "title, source_type"
-            ).eq("id", content_id).single().execute()
+            ).eq("id", content_id).single())
             if content.data:
                 title = content.data.get("title")
                 source_type = content.data.get("source_type", "upload")
@@ -260,7 +260,7 @@ async def get_recent(
     else:
         query = query.in_("processing_status", ["completed", "failed"])
 
-    result = query.order("updated_at", desc=True).limit(limit).execute()
+    result = await supabase.execute(query.order("updated_at", desc=True).limit(limit))
 
     recent_items = []
     for item in result.data or []:
@@ -298,9 +298,9 @@ async def get_stats(
     tenant_id = user.tenant_id or "default"
 
     # Get counts by status
-    stats_result = supabase.client.table("processed_content").select(
+    stats_result = await supabase.execute(supabase.client.table("processed_content").select(
         "processing_status"
-    ).eq("tenant_id", tenant_id).execute()
+    ).eq("tenant_id", tenant_id))
 
     status_counts = {
         "pending": 0,
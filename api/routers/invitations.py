@@ -39,6 +39,7 @@ from models.invitation import (
 )
 from middleware.auth import get_current_user, get_optional_user, UserContext
 from config import get_settings
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 router = APIRouter(prefix="/api/invitations", tags=["Invitations"])
@@ -57,8 +58,7 @@ def get_supabase():
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service not configured"
         )
-    from supabase import create_client
-    return create_client(settings.supabase_url, settings.supabase_service_key)
+    return get_shared_supabase_client()
 
 
 # === Helper Functions ===
@@ -87,7 +87,7 @@ def now_pacific_str() -> str:
 async def get_workspace_by_id(workspace_id: str, supabase) -> Optional[dict]:
     """Get workspace by ID."""
     try:
-        result = supabase.table("tenants").select("*").eq("tenant_id", workspace_id).single().execute()
+        result = await run_query(supabase.table("tenants").select("*").eq("tenant_id", workspace_id).single())
         return result.data
     except Exception:
         return None
@@ -96,9 +96,9 @@ async def get_workspace_by_id(workspace_id: str, supabase) -> Optional[dict]:
 async def get_user_role_in_workspace(user_id: str, workspace_id: str, supabase) -> Optional[str]:
     """Get user's role in a specific workspace."""
     try:
-        result = supabase.table("tenant_users").select("role").eq(
+        result = await run_query(supabase.table("tenant_users").select("role").eq(
             "user_id", user_id
-        ).eq("tenant_id", workspace_id).single().execute()
+        ).eq("tenant_id", workspace_id).single())
         return result.data.get("role") if result.data else None
     except Exception:
         return None
@@ -107,9 +107,9 @@ async def get_user_role_in_workspace(user_id: str, workspace_id: str, supabase)
 async def is_user_in_workspace(user_id: str, workspace_id: str, supabase) -> bool:
     """Check if a user is already a member of a workspace."""
     try:
-        result = supabase.table("tenant_users").select("user_id").eq(
+        result = await run_query(supabase.table("tenant_users").select("user_id").eq(
             "tenant_id", workspace_id
-        ).eq("user_id", user_id).single().execute()
+        ).eq("user_id", user_id).single())
         return result.data is not None
     except Exception:
         return False
@@ -118,9 +118,9 @@ async def is_user_in_workspace(user_id: str, workspace_id: str, supabase) -> boo
 async def get_user_by_email(email: str, supabase) -> Optional[dict]:
     """Find a user by their email address."""
     try:
-        result = supabase.table("users").select(
+        result = await run_query(supabase.table("users").select(
             "id, email, display_name"
-        ).eq("email", email.lower()).single().execute()
+        ).eq("email", email.lower()).single())
         return result.data
     except Exception:
         return None
@@ -129,9 +129,9 @@ async def get_user_by_email(email: str, supabase) -> Optional[dict]:
 async def get_user_by_id(user_id: str, supabase) -> Optional[dict]:
     """Get user by their ID."""
     try:
-        result = supabase.table("users").select(
+        result = await run_query(supabase.table("users").select(
             "id, email, display_name"
-        ).eq("id", user_id).single().execute()
+        ).eq("id", user_id).single())
         return result.data
     except Exception:
         return None
@@ -140,9 +140,9 @@ async def get_user_by_id(user_id: str, supabase) -> Optional[dict]:
 async def get_invitation_by_token(token: str, supabase) -> Optional[dict]:
     """Get an invitation by its token."""
     try:
-        result = supabase.table("workspace_invitations").select(
+        result = await run_query(supabase.table("workspace_invitations").select(
             "*, tenants(tenant_id, name)"
-        ).eq("token", token).single().execute()
+        ).eq("token", token).single())
         return result.data
     except Exception:
         return None
@@ -151,9 +151,9 @@ async def get_invitation_by_token(token: str, supabase) -> Optional[dict]:
 async def get_invitation_by_id(invitation_id: str, supabase) -> Optional[dict]:
     """Get an invitation by its ID."""
     try:
-        result = supabase.table("workspace_invitations").select(
+        result = await run_query(supabase.table("workspace_invitations").select(
             "*, tenants(tenant_id, name)"
-        ).eq("id", invitation_id).single().execute()
+        ).eq("id", invitation_id).single())
         return result.data
     except Exception:
         return None
@@ -164,9 +164,9 @@ async def check_existing_pending_invitation(
 ) -> Optional[dict]:
     """Check if there's already a pending invitation for this email."""
     try:
-        result = supabase.table("workspace_invitations").select("*").eq(
+        result = await run_query(supabase.table("workspace_invitations").select("*").eq(
             "workspace_id", workspace_id
-        ).eq("email", email.lower()).eq("status", "pending").single().execute()
+        ).eq("email", email.lower()).eq("status", "pending").single())
         return result.data
     except Exception:
         return None
@@ -261,7 +261,7 @@ async def list_workspace_invitations(
         if status_filter:
             query = query.eq("status", status_filter)
 
-        result = query.execute()
+        result = await run_query(query)
         invitations_data = result.data or []
 
         # Convert to summaries
@@ -376,7 +376,7 @@ async def create_invitation(
             "expires_at": expires_at.isoformat(),
         }
 
-        supabase.table("workspace_invitations").insert(invitation_record).execute()
+        await run_query(supabase.table("workspace_invitations").insert(invitation_record))
 
         workspace_name = workspace.get("name", "Unknown")
         invite_url = get_invite_url(token)
@@ -492,7 +492,7 @@ async def create_bulk_invitations(
                     "expires_at": expires_at.isoformat(),
                 }
 
-                supabase.table("workspace_invitations").insert(invitation_record).execute()
+                await run_query(supabase.table("workspace_invitations").insert(invitation_record))
                 created.append(invitation_to_info(
                     invitation_record,
                     workspace_name=workspace_name,
@@ -575,9 +575,9 @@ async def validate_invitation(
         # Check expiration
         if is_invitation_expired(invitation.get("expires_at", "")):
             # Update status to expired
-            supabase.table("workspace_invitations").update({
+            await run_query(supabase.table("workspace_invitations").update({
                 "status": "expired"
-            }).eq("id", invitation.get("id")).execute()
+            }).eq("id", invitation.get("id")))
 
             return APIResponse(
                 success=True,
@@ -642,9 +642,9 @@ async def accept_invitation(
         # Check expiration FIRST - return 410 Gone for expired
         if is_invitation_expired(invitation.get("expires_at", "")):
             # Update status
-            supabase.table("workspace_invitations").update({
+            await run_query(supabase.table("workspace_invitations").update({
                 "status": "expired"
-            }).eq("id", invitation.get("id")).execute()
+            }).eq("id", invitation.get("id")))
 
             raise HTTPException(
                 status_code=status.HTTP_410_GONE,
@@ -681,10 +681,10 @@ async def accept_invitation(
         # Check if user is already a member
         if await is_user_in_workspace(user.uid, workspace_id, supabase):
             # Mark invitation as accepted anyway
-            supabase.table("workspace_invitations").update({
+            await run_query(supabase.table("workspace_invitations").update({
                 "status": "accepted",
                 "accepted_at": now_pacific_str(),
-            }).eq("id", invitation.get("id")).execute()
+            }).eq("id", invitation.get("id")))
 
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -695,19 +695,19 @@ async def accept_invitation(
         role = invitation.get("role", "member")
         now = now_pacific_str()
 
-        supabase.table("tenant_users").insert({
+        await run_query(supabase.table("tenant_users").insert({
             "tenant_id": workspace_id,
             "user_id": user.uid,
             "role": role,
             "groups": [],
             "created_at": now,
-        }).execute()
+        }))
 
         # Update invitation status
-        supabase.table("workspace_invitations").update({
+        await run_query(supabase.table("workspace_invitations").update({
             "status": "accepted",
             "accepted_at": now,
-        }).eq("id", invitation.get("id")).execute()
+        }).eq("id", invitation.get("id")))
 
         # Get workspace name
         workspace = await get_workspace_by_id(workspace_id, supabase)
@@ -779,9 +779,9 @@ async def cancel_invitation(
             )
 
         # Update status to cancelled
-        supabase.table("workspace_invitations").update({
+        await run_query(supabase.table("workspace_invitations").update({
             "status": "cancelled",
-        }).eq("id", invitation_id).execute()
+        }).eq("id", invitation_id))
 
         email = invitation.get("email", "")
         logger.info(f"Cancelled invitation {invitation_id} for {email}")
@@ -857,11 +857,11 @@ async def resend_invitation(
         new_expires_at = now + timedelta(hours=extends_hours)
 
         # Update invitation
-        supabase.table("workspace_invitations").update({
+        await run_query(supabase.table("workspace_invitations").update({
             "token": new_token,
             "status": "pending",
             "expires_at": new_expires_at.isoformat(),
-        }).eq("id", invitation_id).execute()
+        }).eq("id", invitation_id))
 
         # Fetch updated invitation
         updated = await get_invitation_by_id(invitation_id, supabase)
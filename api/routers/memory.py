@@ -10,10 +10,16 @@ Acceptance Criteria:
 - List all memories with pagination
 - Delete/update individual memories
 - Get memory statistics
+
+The Mem0 client is created once per process and shared
+(services/memory_backend.py). Without Mem0, or while it is failing,
+memories go to a persistent local store with embedding-based search.
+Memories stored locally during a Mem0 outage are copied into Mem0 (with
+new IDs) once it is reachable again, then removed from the local store.
 """
 import sys
 import uuid
-import os
+import asyncio
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -39,7 +45,11 @@ from models.memory import (
     MemoryHistoryItem,
 )
 from middleware.auth import get_current_user, UserContext
-from config import get_settings
+
+try:
+    from services.memory_backend import get_memory_backend
+except ImportError:
+    from memory_backend import get_memory_backend
 
 
 router = APIRouter(prefix="/api/memory", tags=["Memory System"])
@@ -48,62 +58,6 @@ router = APIRouter(prefix="/api/memory", tags=["Memory System"])
 PACIFIC = ZoneInfo("America/Los_Angeles")
 
 
-def get_mem0_client():
-    """
-    Get Mem0 client instance.
-
-    Supports both cloud (MemoryClient) and self-hosted (Memory) modes.
-    Falls back to in-memory storage if Mem0 is not configured.
-    """
-    settings = get_settings()
-
-    # Check for Mem0 API key (cloud mode)
-    mem0_api_key = os.getenv("MEM0_API_KEY")
-
-    if mem0_api_key:
-        try:
-            from mem0 import MemoryClient
-            return MemoryClient(api_key=mem0_api_key), "cloud"
-        except ImportError:
-            pass
-
-    # Try self-hosted mode with local config
-    try:
-        from mem0 import Memory
-
-        # Use Supabase pgvector as the vector store
-        config = {
-            "vector_store": {
-                "provider": "qdrant",
-                "config": {
-                    "collection_name": "flourisha_memories",
-                    "embedding_model_dims": 1536,
-                    "on_disk": True,
-                }
-            },
-            "llm": {
-                "provider": "anthropic",
-                "config": {
-                    "model": "claude-sonnet-4-20250514",
-                    "temperature": 0.1,
-                }
-            },
-            "embedder": {
-                "provider": "openai",
-                "config": {
-                    "model": "text-embedding-3-small",
-                }
-            }
-        }
-
-        return Memory.from_config(config), "self-hosted"
-    except (ImportError, Exception):
-        pass
-
-    # Fallback to None - will use in-memory mock
-    return None, "mock"
-
-
 def get_supabase():
     """Get Supabase client for fallback storage."""
     sys.path.insert(0, "/root/flourisha/00_AI_Brain")
@@ -121,65 +75,21 @@ def generate_memory_id() -> str:
     return f"mem_{uuid.uuid4().hex[:12]}"
 
 
-# In-memory fallback storage
-_memory_store: Dict[str, Dict[str, Any]] = {}
-
-
-def mock_add_memory(user_id: str, content: str, metadata: Optional[Dict] = None) -> str:
-    """Add memory to mock store."""
-    memory_id = generate_memory_id()
-    _memory_store[memory_id] = {
-        "id": memory_id,
-        "user_id": user_id,
-        "memory": content,
-        "metadata": metadata or {},
-        "created_at": format_timestamp(),
-        "updated_at": format_timestamp(),
-    }
-    return memory_id
-
-
-def mock_search_memories(user_id: str, query: str, limit: int = 10) -> List[Dict]:
-    """Search memories in mock store (simple substring matching)."""
-    results = []
-    query_lower = query.lower()
-
-    for mem_id, mem_data in _memory_store.items():
-        if mem_data.get("user_id") == user_id:
-            if query_lower in mem_data.get("memory", "").lower():
-                results.append({
-                    **mem_data,
-                    "score": 0.9,  # Mock score
-                })
-
-    return results[:limit]
-
-
-def mock_get_all_memories(user_id: str) -> List[Dict]:
-    """Get all memories for a user from mock store."""
-    return [
-        mem_data for mem_data in _memory_store.values()
-        if mem_data.get("user_id") == user_id
-    ]
-
-
-def mock_delete_memory(memory_id: str, user_id: str) -> bool:
-    """Delete memory from mock store."""
-    if memory_id in _memory_store:
-        if _memory_store[memory_id].get("user_id") == user_id:
-            del _memory_store[memory_id]
-            return True
-    return False
-
-
-def mock_update_memory(memory_id: str, user_id: str, content: str) -> bool:
-    """Update memory in mock store."""
-    if memory_id in _memory_store:
-        if _memory_store[memory_id].get("user_id") == user_id:
-            _memory_store[memory_id]["memory"] = content
-            _memory_store[memory_id]["updated_at"] = format_timestamp()
-            return True
-    return False
+def _local_item(item: Dict[str, Any], user_id: str) -> MemoryItem:
+    """MemoryItem from a local store record."""
+    meta = item.get("metadata", {})
+    return MemoryItem(
+        id=item.get("id", ""),
+        memory=item.get("memory", ""),
+        score=item.get("score"),
+        memory_type=meta.get("memory_type", "user"),
+        user_id=user_id,
+        session_id=meta.get("session_id"),
+        agent_id=meta.get("agent_id"),
+        created_at=item.get("created_at"),
+        updated_at=item.get("updated_at"),
+        metadata=meta,
+    )
 
 
 # === Endpoints ===
@@ -234,20 +144,23 @@ async def add_memory(
             )
         identifiers["agent_id"] = body.agent_id
 
-    # Add metadata
+    # Add metadata (session/agent IDs are kept for filtering)
     full_metadata = {
         "memory_type": body.memory_type.value,
         "tenant_id": user.tenant_id or "default",
+        **{key: value for key, value in identifiers.items() if key != "user_id"},
         **(body.metadata or {}),
     }
 
     # Get Mem0 client
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
 
     try:
         if client and mode == "cloud":
             # Use Mem0 cloud API
-            result = client.add(
+            result = await asyncio.to_thread(
+                client.add,
                 body.content,
                 user_id=user_id,
                 metadata=full_metadata,
@@ -256,7 +169,8 @@ async def add_memory(
 
         elif client and mode == "self-hosted":
             # Use self-hosted Mem0
-            result = client.add(
+            result = await asyncio.to_thread(
+                client.add,
                 body.content,
                 user_id=user_id,
                 metadata=full_metadata,
@@ -264,12 +178,16 @@ async def add_memory(
             memory_id = result.get("id", generate_memory_id())
 
         else:
-            # Use mock storage
-            memory_id = mock_add_memory(user_id, body.content, full_metadata)
+            # Use local store
+            memory_id = (await backend.local.add(user_id, body.content, full_metadata))["id"]
+
+        if client:
+            backend.record_success()
 
     except Exception as e:
-        # Fallback to mock on any error
-        memory_id = mock_add_memory(user_id, body.content, full_metadata)
+        # Fallback to local store on any error
+        backend.record_failure(e)
+        memory_id = (await backend.local.add(user_id, body.content, full_metadata))["id"]
 
     return APIResponse(
         success=True,
@@ -303,7 +221,8 @@ async def search_memories(
     - session_id: Filter by session ID (optional)
     - agent_id: Filter by agent ID (optional)
     - limit: Maximum results (default: 10, max: 50)
-    - threshold: Minimum similarity score (default: 0.7)
+    - threshold: Minimum similarity score (default: 0.7). The local store
+      rescales it for its embedder, so the default works in both modes.
 
     **Response:**
     - memories: List of matching memories with scores
@@ -325,12 +244,24 @@ async def search_memories(
     if body.agent_id:
         filters["agent_id"] = body.agent_id
 
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
     memories = []
 
+    async def local_search() -> List[MemoryItem]:
+        results = await backend.local.search(
+            user_id,
+            body.query,
+            limit=body.limit,
+            threshold=body.threshold,
+            filters={key: value for key, value in filters.items() if key != "user_id"},
+        )
+        return [_local_item(item, user_id) for item in results]
+
     try:
         if client and mode == "cloud":
-            result = client.search(
+            result = await asyncio.to_thread(
+                client.search,
                 body.query,
                 user_id=user_id,
                 limit=body.limit,
@@ -353,7 +284,8 @@ async def search_memories(
                     ))
 
         elif client and mode == "self-hosted":
-            result = client.search(
+            result = await asyncio.to_thread(
+                client.search,
                 body.query,
                 user_id=user_id,
                 limit=body.limit,
@@ -372,30 +304,16 @@ async def search_memories(
                         metadata=item.get("metadata"),
                     ))
         else:
-            # Mock search
-            results = mock_search_memories(user_id, body.query, body.limit)
-            for item in results:
-                memories.append(MemoryItem(
-                    id=item.get("id", ""),
-                    memory=item.get("memory", ""),
-                    score=item.get("score", 0.9),
-                    memory_type=item.get("metadata", {}).get("memory_type", "user"),
-                    user_id=user_id,
-                    created_at=item.get("created_at"),
-                    metadata=item.get("metadata"),
-                ))
+            # Local vector search
+            memories = await local_search()
+
+        if client:
+            backend.record_success()
 
     except Exception as e:
-        # Fallback to mock
-        results = mock_search_memories(user_id, body.query, body.limit)
-        for item in results:
-            memories.append(MemoryItem(
-                id=item.get("id", ""),
-                memory=item.get("memory", ""),
-                score=item.get("score", 0.9),
-                user_id=user_id,
-                created_at=item.get("created_at"),
-            ))
+        # Fallback to local store
+        backend.record_failure(e)
+        memories = await local_search()
 
     return APIResponse(
         success=True,
@@ -442,13 +360,14 @@ async def list_memories(
     meta_dict = request.state.get_meta()
     user_id = user.uid
 
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
     memories = []
     total = 0
 
     try:
         if client and mode == "cloud":
-            result = client.get_all(user_id=user_id)
+            result = await asyncio.to_thread(client.get_all, user_id=user_id)
             all_memories = result if isinstance(result, list) else result.get("memories", [])
 
             # Apply filters
@@ -481,7 +400,7 @@ async def list_memories(
                 ))
 
         elif client and mode == "self-hosted":
-            result = client.get_all(user_id=user_id)
+            result = await asyncio.to_thread(client.get_all, user_id=user_id)
             all_memories = result if isinstance(result, list) else result.get("results", [])
 
             total = len(all_memories)
@@ -498,8 +417,8 @@ async def list_memories(
                     metadata=item.get("metadata"),
                 ))
         else:
-            # Mock storage
-            all_memories = mock_get_all_memories(user_id)
+            # Local store
+            all_memories = await asyncio.to_thread(backend.local.get_all, user_id)
 
             # Apply filters
             filtered = []
@@ -518,18 +437,14 @@ async def list_memories(
             page_items = filtered[offset:offset + page_size]
 
             for item in page_items:
-                memories.append(MemoryItem(
-                    id=item.get("id", ""),
-                    memory=item.get("memory", ""),
-                    memory_type=item.get("metadata", {}).get("memory_type", "user"),
-                    user_id=user_id,
-                    created_at=item.get("created_at"),
-                    metadata=item.get("metadata"),
-                ))
+                memories.append(_local_item(item, user_id))
+
+        if client:
+            backend.record_success()
 
-    except Exception:
+    except Exception as e:
         # Fallback to empty
-        pass
+        backend.record_failure(e)
 
     has_more = (page * page_size) < total
 
@@ -566,12 +481,13 @@ async def get_memory(
     meta_dict = request.state.get_meta()
     user_id = user.uid
 
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
 
     try:
         if client and mode in ("cloud", "self-hosted"):
             # Search for the specific memory
-            result = client.get_all(user_id=user_id)
+            result = await asyncio.to_thread(client.get_all, user_id=user_id)
             all_memories = result if isinstance(result, list) else result.get("memories", result.get("results", []))
 
             for item in all_memories:
@@ -592,25 +508,17 @@ async def get_memory(
                         meta=ResponseMeta(**meta_dict),
                     )
         else:
-            # Mock storage
-            if memory_id in _memory_store:
-                item = _memory_store[memory_id]
-                if item.get("user_id") == user_id:
-                    return APIResponse(
-                        success=True,
-                        data=MemoryItem(
-                            id=item.get("id", ""),
-                            memory=item.get("memory", ""),
-                            memory_type=item.get("metadata", {}).get("memory_type", "user"),
-                            user_id=user_id,
-                            created_at=item.get("created_at"),
-                            metadata=item.get("metadata"),
-                        ),
-                        meta=ResponseMeta(**meta_dict),
-                    )
+            # Local store
+            item = await asyncio.to_thread(backend.local.get, memory_id, user_id)
+            if item:
+                return APIResponse(
+                    success=True,
+                    data=_local_item(item, user_id),
+                    meta=ResponseMeta(**meta_dict),
+                )
 
-    except Exception:
-        pass
+    except Exception as e:
+        backend.record_failure(e)
 
     raise HTTPException(status_code=404, detail=f"Memory not found: {memory_id}")
 
@@ -646,15 +554,16 @@ async def update_memory(
             detail="At least one of content or metadata must be provided"
         )
 
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
 
     try:
         if client and mode == "cloud":
             if body.content:
-                client.update(memory_id, body.content)
+                await asyncio.to_thread(client.update, memory_id, body.content)
 
             # Get updated memory
-            result = client.get_all(user_id=user_id)
+            result = await asyncio.to_thread(client.get_all, user_id=user_id)
             all_memories = result if isinstance(result, list) else result.get("memories", [])
 
             for item in all_memories:
@@ -675,7 +584,7 @@ async def update_memory(
 
         elif client and mode == "self-hosted":
             if body.content:
-                client.update(memory_id=memory_id, data=body.content)
+                await asyncio.to_thread(client.update, memory_id=memory_id, data=body.content)
 
             return APIResponse(
                 success=True,
@@ -689,26 +598,22 @@ async def update_memory(
                 meta=ResponseMeta(**meta_dict),
             )
         else:
-            # Mock update
-            if body.content:
-                success = mock_update_memory(memory_id, user_id, body.content)
-                if success:
-                    item = _memory_store[memory_id]
-                    return APIResponse(
-                        success=True,
-                        data=MemoryItem(
-                            id=memory_id,
-                            memory=item.get("memory", ""),
-                            user_id=user_id,
-                            created_at=item.get("created_at"),
-                            updated_at=item.get("updated_at"),
-                            metadata=item.get("metadata"),
-                        ),
-                        meta=ResponseMeta(**meta_dict),
-                    )
+            # Local update (new content is re-embedded)
+            item = await backend.local.update(
+                memory_id,
+                user_id,
+                content=body.content,
+                metadata=body.metadata,
+            )
+            if item:
+                return APIResponse(
+                    success=True,
+                    data=_local_item(item, user_id),
+                    meta=ResponseMeta(**meta_dict),
+                )
 
-    except Exception:
-        pass
+    except Exception as e:
+        backend.record_failure(e)
 
     raise HTTPException(status_code=404, detail=f"Memory not found: {memory_id}")
 
@@ -735,11 +640,12 @@ async def delete_memory(
     meta_dict = request.state.get_meta()
     user_id = user.uid
 
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
 
     try:
         if client and mode == "cloud":
-            client.delete(memory_id)
+            await asyncio.to_thread(client.delete, memory_id)
             return APIResponse(
                 success=True,
                 data=MemoryDeleteResponse(
@@ -751,7 +657,7 @@ async def delete_memory(
             )
 
         elif client and mode == "self-hosted":
-            client.delete(memory_id=memory_id)
+            await asyncio.to_thread(client.delete, memory_id=memory_id)
             return APIResponse(
                 success=True,
                 data=MemoryDeleteResponse(
@@ -762,9 +668,8 @@ async def delete_memory(
                 meta=ResponseMeta(**meta_dict),
             )
         else:
-            # Mock delete
-            success = mock_delete_memory(memory_id, user_id)
-            if success:
+            # Local delete
+            if await asyncio.to_thread(backend.local.delete, memory_id, user_id):
                 return APIResponse(
                     success=True,
                     data=MemoryDeleteResponse(
@@ -776,6 +681,7 @@ async def delete_memory(
                 )
 
     except Exception as e:
+        backend.record_failure(e)
         return APIResponse(
             success=True,
             data=MemoryDeleteResponse(
@@ -817,7 +723,9 @@ async def bulk_add_memories(
     added_ids = []
     errors = []
 
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
+    local_items = []
 
     for memory in body.memories:
         try:
@@ -833,20 +741,30 @@ async def bulk_add_memories(
                 metadata["agent_id"] = memory.agent_id
 
             if client and mode in ("cloud", "self-hosted"):
-                result = client.add(
+                result = await asyncio.to_thread(
+                    client.add,
                     memory.content,
                     user_id=user_id,
                     metadata=metadata,
                 )
                 memory_id = result.get("id", generate_memory_id())
+                backend.record_success()
+                added_ids.append(memory_id)
             else:
-                memory_id = mock_add_memory(user_id, memory.content, metadata)
-
-            added_ids.append(memory_id)
+                local_items.append((memory.content, metadata))
 
         except Exception as e:
+            backend.record_failure(e)
             errors.append(f"Failed to add memory: {str(e)}")
 
+    if local_items:
+        # One embedding request for the whole batch
+        try:
+            stored = await backend.local.add_many(user_id, local_items)
+            added_ids.extend(item["id"] for item in stored)
+        except Exception as e:
+            errors.append(f"Failed to add {len(local_items)} memories: {str(e)}")
+
     return APIResponse(
         success=True,
         data=MemoryBulkAddResponse(
@@ -884,11 +802,12 @@ async def get_memory_stats(
 
     stats = MemoryStatsResponse(total_memories=0)
 
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
 
     try:
         if client and mode in ("cloud", "self-hosted"):
-            result = client.get_all(user_id=user_id)
+            result = await asyncio.to_thread(client.get_all, user_id=user_id)
             all_memories = result if isinstance(result, list) else result.get("memories", result.get("results", []))
 
             stats.total_memories = len(all_memories)
@@ -913,10 +832,12 @@ async def get_memory_stats(
                 stats.oldest_memory = timestamps[0]
                 stats.newest_memory = timestamps[-1]
         else:
-            # Mock stats
-            all_memories = mock_get_all_memories(user_id)
+            # Local stats
+            all_memories = await asyncio.to_thread(backend.local.get_all, user_id)
             stats.total_memories = len(all_memories)
 
+            timestamps = []
+
             for item in all_memories:
                 meta = item.get("metadata", {})
                 memory_type = meta.get("memory_type", "user")
@@ -928,8 +849,15 @@ async def get_memory_stats(
                 elif memory_type == "agent":
                     stats.agent_memories += 1
 
-    except Exception:
-        pass
+                if item.get("created_at"):
+                    timestamps.append(item["created_at"])
+
+            if timestamps:
+                stats.oldest_memory = timestamps[0]
+                stats.newest_memory = timestamps[-1]
+
+    except Exception as e:
+        backend.record_failure(e)
 
     return APIResponse(
         success=True,
@@ -938,6 +866,29 @@ async def get_memory_stats(
     )
 
 
+@router.get("/backend/status", response_model=APIResponse[dict])
+async def get_memory_backend_status(
+    request: Request,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[dict]:
+    """
+    Memory backend status.
+
+    Reports whether the shared Mem0 client is connected (and in which
+    mode), recent Mem0 failures, and local store metrics (size, embedding
+    model, average search latency).
+
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
+
+    return APIResponse(
+        success=True,
+        data=await asyncio.to_thread(get_memory_backend().get_status),
+        meta=ResponseMeta(**meta_dict),
+    )
+
+
 @router.delete("/clear/all", response_model=APIResponse[MemoryDeleteResponse])
 async def clear_all_memories(
     request: Request,
@@ -968,33 +919,29 @@ async def clear_all_memories(
             detail="Must set confirm=true to delete all memories"
         )
 
-    client, mode = get_mem0_client()
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()
     deleted_count = 0
 
     try:
         if client and mode == "cloud":
             # Delete all for user
-            client.delete_all(user_id=user_id)
+            await asyncio.to_thread(client.delete_all, user_id=user_id)
             deleted_count = -1  # Unknown count
 
         elif client and mode == "self-hosted":
-            result = client.get_all(user_id=user_id)
+            result = await asyncio.to_thread(client.get_all, user_id=user_id)
             all_memories = result if isinstance(result, list) else result.get("results", [])
 
             for item in all_memories:
-                client.delete(memory_id=item.get("id"))
+                await asyncio.to_thread(client.delete, memory_id=item.get("id"))
                 deleted_count += 1
         else:
-            # Mock clear
-            to_delete = [
-                mid for mid, mdata in _memory_store.items()
-                if mdata.get("user_id") == user_id
-            ]
-            for mid in to_delete:
-                del _memory_store[mid]
-                deleted_count += 1
+            # Local clear
+            deleted_count = await asyncio.to_thread(backend.local.delete_all, user_id)
 
     except Exception as e:
+        backend.record_failure(e)
         return APIResponse(
             success=True,
             data=MemoryDeleteResponse(
@@ -24,7 +24,7 @@ from typing import Optional, List
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Request, HTTPException, Header, Depends
-from supabase import create_client, Client
+from supabase import Client
 
 from models.response import APIResponse, ResponseMeta
 from models.migrations import (
@@ -39,6 +39,7 @@ from models.migrations import (
     SQLExecuteResult,
 )
 from middleware.auth import get_current_user, UserContext
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 router = APIRouter(prefix="/api/migrations", tags=["Migrations"])
@@ -52,13 +53,11 @@ MIGRATIONS_DIR = Path("/root/flourisha/00_AI_Brain/database/migrations")
 
 
 def get_supabase_client() -> Optional[Client]:
-    """Get Supabase client for database operations."""
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY', os.getenv('SUPABASE_KEY'))
-
-    if url and key:
-        return create_client(url, key)
-    return None
+    """Get the shared Supabase client (None if not configured)."""
+    try:
+        return get_shared_supabase_client()
+    except ValueError:
+        return None
 
 
 def verify_admin_secret(secret: str) -> bool:
@@ -124,7 +123,7 @@ async def get_applied_migrations(client: Client) -> dict:
     """Get dictionary of applied migrations from database."""
     try:
         # Try to query migration tracking table
-        result = client.table('schema_migrations').select('*').execute()
+        result = await run_query(client.table('schema_migrations').select('*'))
         return {m['migration_id']: m for m in (result.data or [])}
     except Exception:
         # Table might not exist yet
@@ -199,12 +198,12 @@ async def get_database_status(
     if client:
         try:
             # Get PostgreSQL version
-            result = client.rpc('get_pg_version').execute()
+            result = await run_query(client.rpc('get_pg_version'))
             if result.data:
                 version = result.data
 
             # Get table information
-            result = client.rpc('get_table_info').execute()
+            result = await run_query(client.rpc('get_table_info'))
             if result.data:
                 for row in result.data:
                     tables.append(TableInfo(
@@ -217,7 +216,7 @@ async def get_database_status(
                     ))
 
             # Get extensions
-            result = client.rpc('get_extensions').execute()
+            result = await run_query(client.rpc('get_extensions'))
             if result.data:
                 extensions = [e['extname'] for e in result.data]
 
@@ -227,7 +226,7 @@ async def get_database_status(
             # Fallback: Direct queries for basic info
             try:
                 # Try simple table list query
-                result = client.table('processed_content').select('id').limit(0).execute()
+                result = await run_query(client.table('processed_content').select('id').limit(0))
                 tables.append(TableInfo(name='processed_content', schema='public'))
             except Exception:
                 pass
@@ -371,7 +370,7 @@ async def apply_migrations(
                 for statement in statements:
                     try:
                         # Execute via RPC or direct query
-                        client.rpc('exec_sql', {'sql': statement}).execute()
+                        await run_query(client.rpc('exec_sql', {'sql': statement}))
                         statements_executed += 1
                     except Exception as stmt_error:
                         # Handle "already exists" gracefully
@@ -384,11 +383,11 @@ async def apply_migrations(
 
                 # Record migration as applied
                 try:
-                    client.table('schema_migrations').upsert({
+                    await run_query(client.table('schema_migrations').upsert({
                         'migration_id': migration_id,
                         'applied_at': datetime.now(PACIFIC).isoformat(),
                         'checksum': calculate_file_checksum(filepath),
-                    }).execute()
+                    }))
                 except Exception as e:
                     logger.warning(f"Failed to record migration: {e}")
 
@@ -465,7 +464,7 @@ async def execute_sql(
 
     try:
         # Execute SQL
-        result = client.rpc('exec_sql', {'sql': payload.sql}).execute()
+        result = await run_query(client.rpc('exec_sql', {'sql': payload.sql}))
 
         success = True
 
@@ -526,13 +525,13 @@ async def get_table_info(
         # Get table columns
         columns = []
         try:
-            result = client.rpc('get_table_columns', {'p_table_name': table_name}).execute()
+            result = await run_query(client.rpc('get_table_columns', {'p_table_name': table_name}))
             if result.data:
                 columns = [c['column_name'] for c in result.data]
         except Exception:
             # Fallback - try to query table
             try:
-                result = client.table(table_name).select('*').limit(0).execute()
+                result = await run_query(client.table(table_name).select('*').limit(0))
                 # Can't easily get column names this way
             except Exception:
                 raise HTTPException(status_code=404, detail=f"Table not found: {table_name}")
@@ -540,7 +539,7 @@ async def get_table_info(
         # Get indexes
         indexes = []
         try:
-            result = client.rpc('get_table_indexes', {'p_table_name': table_name}).execute()
+            result = await run_query(client.rpc('get_table_indexes', {'p_table_name': table_name}))
             if result.data:
                 indexes = [i['indexname'] for i in result.data]
         except Exception:
@@ -549,7 +548,7 @@ async def get_table_info(
         # Check RLS
         has_rls = False
         try:
-            result = client.rpc('check_table_rls', {'p_table_name': table_name}).execute()
+            result = await run_query(client.rpc('check_table_rls', {'p_table_name': table_name}))
             if result.data:
                 has_rls = result.data.get('has_rls', False)
         except Exception:
@@ -558,7 +557,7 @@ async def get_table_info(
         # Get row count
         row_count = None
         try:
-            result = client.table(table_name).select('*', count='exact').limit(0).execute()
+            result = await run_query(client.table(table_name).select('*', count='exact').limit(0))
             row_count = result.count
         except Exception:
             pass
@@ -600,7 +599,7 @@ async def migrations_health(request: Request) -> APIResponse[dict]:
     db_connected = False
     if client:
         try:
-            client.table('processed_content').select('id').limit(1).execute()
+            await run_query(client.table('processed_content').select('id').limit(1))
             db_connected = True
         except Exception:
             pass
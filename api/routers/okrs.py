@@ -16,6 +16,7 @@ from pydantic import BaseModel, Field
 
 from models.response import APIResponse, ResponseMeta
 from middleware.auth import get_current_user, UserContext
+from services.db_pool import run_query
 
 # Add services to path for imports
 services_path = Path(__file__).parent.parent.parent / "services"
@@ -225,7 +226,7 @@ async def create_objective(
         # Persist to Supabase
         if tracker._client:
             # Insert objective
-            tracker._client.table('okr_objectives').insert({
+            await run_query(tracker._client.table('okr_objectives').insert({
                 'id': obj_id,
                 'tenant_id': tenant_id,
                 'quarter': quarter,
@@ -235,11 +236,11 @@ async def create_objective(
                 'target_completion': objective_create.target_completion,
                 'created_at': now.isoformat(),
                 'updated_at': now.isoformat(),
-            }).execute()
+            }))
 
             # Insert key results
             for kr in key_results:
-                tracker._client.table('okr_key_results').insert({
+                await run_query(tracker._client.table('okr_key_results').insert({
                     'id': kr.id,
                     'objective_id': obj_id,
                     'tenant_id': tenant_id,
@@ -249,7 +250,7 @@ async def create_objective(
                     'unit': kr.unit,
                     'created_at': now.isoformat(),
                     'updated_at': now.isoformat(),
-                }).execute()
+                }))
 
         return APIResponse(
             success=True,
@@ -437,9 +438,9 @@ async def update_objective(
         # Persist to Supabase
         if tracker._client and updates:
             updates['updated_at'] = now.isoformat()
-            tracker._client.table('okr_objectives').update(updates).eq(
+            await run_query(tracker._client.table('okr_objectives').update(updates).eq(
                 'id', objective_id
-            ).eq('tenant_id', tenant_id).execute()
+            ).eq('tenant_id', tenant_id))
 
         # Build response
         key_results = []
@@ -1019,9 +1020,9 @@ async def get_available_quarters(
 
         if tracker._client:
             try:
-                result = tracker._client.table('okr_tracking').select(
+                result = await run_query(tracker._client.table('okr_tracking').select(
                     'quarter'
-                ).eq('tenant_id', tenant_id).execute()
+                ).eq('tenant_id', tenant_id))
 
                 if result.data:
                     quarters = set(row['quarter'] for row in result.data)
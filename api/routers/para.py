@@ -3,8 +3,15 @@ PARA Browser Router
 
 Endpoints for browsing the PARA (Projects, Areas, Resources, Archives) folder structure.
 Provides tree navigation, category listing, and file content retrieval.
+
+Tree, category and search endpoints read from the in-memory PARA index
+(services/para_index.py), which is refreshed incrementally from directory
+mtimes instead of walking the vault on every request. Content search uses
+the SQLite FTS5 index in services/para_search.py.
 """
 import os
+import sys
+import asyncio
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -16,20 +23,26 @@ from pydantic import BaseModel, Field
 from models.response import APIResponse, ResponseMeta
 from middleware.auth import get_current_user, UserContext
 
+# Add services to path for imports
+services_path = Path(__file__).parent.parent.parent / "services"
+sys.path.insert(0, str(services_path))
+
+try:
+    from services.para_index import PARA_ROOT, PARA_FOLDERS, PARAIndex, get_para_index
+    from services.para_search import get_para_content_index
+except ImportError:
+    from para_index import PARA_ROOT, PARA_FOLDERS, PARAIndex, get_para_index
+    from para_search import get_para_content_index
+
 
 router = APIRouter(prefix="/api/para", tags=["PARA Browser"])
 
 # PARA directory configuration
-FLOURISHA_ROOT = Path("/root/flourisha")
+FLOURISHA_ROOT = Path(PARA_ROOT)
 PACIFIC = ZoneInfo("America/Los_Angeles")
 
 # PARA category mappings
-PARA_CATEGORIES = {
-    "projects": "01f_Flourisha_Projects",
-    "areas": "02f_Flourisha_Areas",
-    "resources": "03f_Flourisha_Resources",
-    "archives": "04f_Flourisha_Archives",
-}
+PARA_CATEGORIES = PARA_FOLDERS
 
 
 # === Request/Response Models ===
@@ -76,6 +89,18 @@ class CategoryListingResponse(BaseModel):
     file_count: int = Field(..., description="Total files in category")
 
 
+class ContentSearchHit(BaseModel):
+    """A document matched by full-text search."""
+    name: str = Field(..., description="File name")
+    path: str = Field(..., description="Relative path from PARA root")
+    category: str = Field(..., description="PARA category")
+    title: str = Field(..., description="Document title (first heading or file name), HTML-escaped, matches in <mark>")
+    snippet: str = Field(..., description="Best matching passage, HTML-escaped, matches in <mark>")
+    score: float = Field(..., description="BM25 relevance (higher is better)")
+    size_bytes: int = Field(..., description="File size in bytes")
+    last_modified: Optional[str] = Field(None, description="Last modification time")
+
+
 class FileContentResponse(BaseModel):
     """Response for file content."""
     path: str = Field(..., description="File path")
@@ -131,31 +156,40 @@ def get_folder_stats(folder_path: Path) -> Dict[str, int]:
     return {"files": files, "subfolders": subfolders}
 
 
-def build_folder_tree(folder_path: Path, base_path: Path, max_depth: int = 2, current_depth: int = 0) -> FolderInfo:
-    """Build a folder tree structure up to max_depth."""
-    stats = get_folder_stats(folder_path)
-    rel_path = str(folder_path.relative_to(base_path))
+async def get_index() -> PARAIndex:
+    """Shared PARA index, built or refreshed off the event loop when stale."""
+    index = get_para_index()
+    if index.needs_refresh():
+        await asyncio.to_thread(index.ensure_fresh)
+    return index
 
-    folder_info = FolderInfo(
-        name=folder_path.name,
-        path=rel_path,
-        file_count=stats["files"],
-        subfolder_count=stats["subfolders"],
-        total_items=count_files_recursive(folder_path),
+
+def empty_folder(folder_name: str) -> FolderInfo:
+    """Folder info for a category folder that does not exist."""
+    return FolderInfo(
+        name=folder_name,
+        path=folder_name,
+        file_count=0,
+        subfolder_count=0,
+        total_items=0,
         children=[],
     )
 
-    # Add children if within depth limit
-    if current_depth < max_depth:
-        try:
-            for item in sorted(folder_path.iterdir()):
-                if item.is_dir() and not item.name.startswith("."):
-                    child = build_folder_tree(item, base_path, max_depth, current_depth + 1)
-                    folder_info.children.append(child)
-        except PermissionError:
-            pass
 
-    return folder_info
+def file_info(rel_path: str) -> Optional[FileInfo]:
+    """Stat a file relative to the PARA root (None if it is gone)."""
+    file_path = FLOURISHA_ROOT / rel_path
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return FileInfo(
+        name=file_path.name,
+        path=rel_path,
+        size_bytes=stat.st_size,
+        is_markdown=file_path.suffix.lower() in {".md", ".markdown"},
+        last_modified=format_timestamp(stat.st_mtime),
+    )
 
 
 def format_timestamp(timestamp: float) -> str:
@@ -221,25 +255,19 @@ async def get_para_tree(
     """
     meta_dict = request.state.get_meta()
 
+    index = await get_index()
+
     categories = {}
     total_files = 0
 
     for category_key, folder_name in PARA_CATEGORIES.items():
-        folder_path = FLOURISHA_ROOT / folder_name
-        if folder_path.exists():
-            tree = build_folder_tree(folder_path, FLOURISHA_ROOT, max_depth=depth)
-            categories[category_key] = tree
-            total_files += tree.total_items
+        tree = index.tree(folder_name, depth=depth)
+        if tree is not None:
+            categories[category_key] = FolderInfo(**tree)
+            total_files += tree["total_items"]
         else:
             # Return empty folder info for missing categories
-            categories[category_key] = FolderInfo(
-                name=folder_name,
-                path=folder_name,
-                file_count=0,
-                subfolder_count=0,
-                total_items=0,
-                children=[],
-            )
+            categories[category_key] = empty_folder(folder_name)
 
     response_data = PARATreeResponse(
         categories=categories,
@@ -279,23 +307,18 @@ async def list_categories(
         "archives": "Archives",
     }
 
+    index = await get_index()
+
     categories = []
     for category_key, folder_name in PARA_CATEGORIES.items():
-        folder_path = FLOURISHA_ROOT / folder_name
-
-        if folder_path.exists():
-            stats = get_folder_stats(folder_path)
-            total_files = count_files_recursive(folder_path)
-        else:
-            stats = {"files": 0, "subfolders": 0}
-            total_files = 0
+        summary = index.tree(folder_name) or empty_folder(folder_name).model_dump()
 
         categories.append(PARACategory(
             category=category_key,
             display_name=display_names.get(category_key, category_key.title()),
             folder_name=folder_name,
-            file_count=total_files,
-            subfolder_count=stats["subfolders"],
+            file_count=summary["total_items"],
+            subfolder_count=summary["subfolder_count"],
         ))
 
     return APIResponse(
@@ -335,45 +358,32 @@ async def get_category_listing(
         )
 
     folder_name = PARA_CATEGORIES[category]
-    folder_path = FLOURISHA_ROOT / folder_name
 
-    if not folder_path.exists():
+    index = await get_index()
+    listing = index.listing(folder_name)
+
+    if listing is None:
         raise HTTPException(status_code=404, detail=f"Category folder not found: {folder_name}")
 
     items = []
     total_files = 0
 
-    try:
-        for item in sorted(folder_path.iterdir()):
-            if item.name.startswith("."):
-                continue
-
-            if item.is_dir():
-                stats = get_folder_stats(item)
-                item_total = count_files_recursive(item)
-                total_files += item_total
-
-                items.append(FolderInfo(
-                    name=item.name,
-                    path=str(item.relative_to(FLOURISHA_ROOT)),
-                    file_count=stats["files"],
-                    subfolder_count=stats["subfolders"],
-                    total_items=item_total,
-                    children=[],  # Don't include children at this level
-                ))
-            elif item.is_file():
-                total_files += 1
-                # Include files as folder items with zero children
-                items.append(FolderInfo(
-                    name=item.name,
-                    path=str(item.relative_to(FLOURISHA_ROOT)),
-                    file_count=0,
-                    subfolder_count=0,
-                    total_items=1,
-                    children=[],
-                ))
-    except PermissionError:
-        raise HTTPException(status_code=403, detail="Permission denied reading category")
+    for item in listing:
+        if item["is_dir"]:
+            total_files += item["total_items"]
+            # Don't include children at this level
+            items.append(FolderInfo(**{k: v for k, v in item.items() if k != "is_dir"}))
+        else:
+            total_files += 1
+            # Include files as folder items with zero children
+            items.append(FolderInfo(
+                name=item["name"],
+                path=item["path"],
+                file_count=0,
+                subfolder_count=0,
+                total_items=1,
+                children=[],
+            ))
 
     response_data = CategoryListingResponse(
         category=category,
@@ -420,6 +430,8 @@ async def get_folder_contents(
     if not folder_path.is_dir():
         raise HTTPException(status_code=400, detail="Path is not a folder")
 
+    index = await get_index()
+
     files = []
     subfolders = []
 
@@ -443,6 +455,11 @@ async def get_folder_contents(
                 except OSError:
                     continue
             elif item.is_dir():
+                summary = index.tree(rel_path)
+                if summary is not None:
+                    subfolders.append(FolderInfo(**summary))
+                    continue
+                # Outside the PARA categories: count on disk
                 stats = get_folder_stats(item)
                 subfolders.append(FolderInfo(
                     name=item.name,
@@ -553,17 +570,20 @@ async def search_files(
     query: str = Query(..., description="Search query for file names", min_length=1),
     category: Optional[str] = Query(None, description="Limit search to category"),
     limit: int = Query(default=50, ge=1, le=200, description="Maximum results"),
+    prefix: bool = Query(default=False, description="Match file name prefixes instead of substrings"),
     user: UserContext = Depends(get_current_user),
 ) -> APIResponse[List[FileInfo]]:
     """
     Search for files by name within PARA folders.
 
-    Searches file names for the query string (case-insensitive).
+    Searches file names for the query string (case-insensitive) using the
+    PARA filename index. Results are sorted by path.
 
     **Query Parameters:**
     - query: Search text (required)
     - category: Limit to specific category (optional)
     - limit: Max results (default 50, max 200)
+    - prefix: Only match names starting with the query (default false)
 
     **Response:**
     - List of matching files
@@ -578,51 +598,109 @@ async def search_files(
             detail=f"Invalid category. Must be one of: {', '.join(PARA_CATEGORIES.keys())}"
         )
 
-    query_lower = query.lower()
-    results = []
-
-    # Determine which categories to search
     if category:
-        categories_to_search = {category: PARA_CATEGORIES[category]}
+        folders = [PARA_CATEGORIES[category]]
     else:
-        categories_to_search = PARA_CATEGORIES
+        folders = list(PARA_CATEGORIES.values())
 
-    for cat_key, folder_name in categories_to_search.items():
-        folder_path = FLOURISHA_ROOT / folder_name
-        if not folder_path.exists():
-            continue
+    index = await get_index()
+    results = []
+    for rel_path in index.search(query, folders=folders, limit=limit, prefix=prefix):
+        info = file_info(rel_path)
+        if info is not None:
+            results.append(info)
 
-        try:
-            for file_path in folder_path.rglob("*"):
-                if len(results) >= limit:
-                    break
+    return APIResponse(
+        success=True,
+        data=results,
+        meta=ResponseMeta(**meta_dict),
+    )
 
-                if not file_path.is_file():
-                    continue
 
-                if file_path.name.startswith("."):
-                    continue
+@router.get("/search/content", response_model=APIResponse[List[ContentSearchHit]])
+async def search_content(
+    request: Request,
+    query: str = Query(..., description="Words to find; \"quoted text\" matches as a phrase", min_length=1),
+    category: Optional[str] = Query(None, description="Limit search to category"),
+    limit: int = Query(default=20, ge=1, le=100, description="Maximum results"),
+    offset: int = Query(default=0, ge=0, description="Results to skip"),
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[List[ContentSearchHit]]:
+    """
+    Full-text search inside PARA markdown and text files.
+
+    Every word must appear in the document (stemmed, case- and
+    accent-insensitive); results are ranked by BM25 with title matches
+    weighted above body matches. Matches are wrapped in <mark> tags in the
+    title and snippet.
+
+    **Query Parameters:**
+    - query: Search text (required)
+    - category: Limit to specific category (optional)
+    - limit: Max results (default 20, max 100)
+    - offset: Pagination offset (default 0)
 
-                if query_lower in file_path.name.lower():
-                    try:
-                        stat = file_path.stat()
-                        results.append(FileInfo(
-                            name=file_path.name,
-                            path=str(file_path.relative_to(FLOURISHA_ROOT)),
-                            size_bytes=stat.st_size,
-                            is_markdown=file_path.suffix.lower() in {".md", ".markdown"},
-                            last_modified=format_timestamp(stat.st_mtime),
-                        ))
-                    except OSError:
-                        continue
-        except PermissionError:
-            continue
-
-        if len(results) >= limit:
-            break
+    **Response:**
+    - List of matching documents with snippets
+
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
+
+    if category and category not in PARA_CATEGORIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid category. Must be one of: {', '.join(PARA_CATEGORIES.keys())}"
+        )
+
+    hits = await asyncio.to_thread(
+        get_para_content_index().search,
+        query,
+        categories=[category] if category else None,
+        limit=limit,
+        offset=offset,
+    )
+
+    results = [
+        ContentSearchHit(
+            name=hit["name"],
+            path=hit["path"],
+            category=hit["category"],
+            title=hit["title"],
+            snippet=hit["snippet"],
+            score=hit["score"],
+            size_bytes=hit["size_bytes"],
+            last_modified=format_timestamp(hit["modified"]),
+        )
+        for hit in hits
+    ]
 
     return APIResponse(
         success=True,
         data=results,
         meta=ResponseMeta(**meta_dict),
     )
+
+
+@router.get("/index/stats", response_model=APIResponse[dict])
+async def get_index_stats(
+    request: Request,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[dict]:
+    """
+    Get PARA index statistics.
+
+    Returns indexed folder/file counts, build time and refresh counters,
+    plus document counts and last sync of the content search index.
+
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
+
+    index = await get_index()
+    content_stats = await asyncio.to_thread(get_para_content_index().get_stats)
+    return APIResponse(
+        success=True,
+        data={**index.get_stats(), "content": content_stats},
+        meta=ResponseMeta(**meta_dict),
+    )
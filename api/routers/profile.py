@@ -47,6 +47,7 @@ from models.profile import (
 )
 from middleware.auth import get_current_user, get_optional_user, UserContext
 from config import get_settings
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 router = APIRouter(prefix="/api/profile", tags=["Profile"])
@@ -65,9 +66,7 @@ def get_supabase():
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service not configured"
         )
-
-    from supabase import create_client
-    return create_client(settings.supabase_url, settings.supabase_service_key)
+    return get_shared_supabase_client()
 
 
 # === Helper Functions ===
@@ -80,7 +79,7 @@ def now_pacific() -> str:
 async def get_user_data(user_id: str, supabase) -> Optional[dict]:
     """Get user data from users table."""
     try:
-        result = supabase.table("users").select("*").eq("id", user_id).single().execute()
+        result = await run_query(supabase.table("users").select("*").eq("id", user_id).single())
         return result.data
     except Exception as e:
         logger.warning(f"User {user_id} not found: {e}")
@@ -90,7 +89,7 @@ async def get_user_data(user_id: str, supabase) -> Optional[dict]:
 async def get_user_preferences(user_id: str, supabase) -> dict:
     """Get user preferences from user_preferences table."""
     try:
-        result = supabase.table("user_preferences").select("*").eq("user_id", user_id).single().execute()
+        result = await run_query(supabase.table("user_preferences").select("*").eq("user_id", user_id).single())
         return result.data or {}
     except Exception:
         return {}
@@ -99,14 +98,14 @@ async def get_user_preferences(user_id: str, supabase) -> dict:
 async def get_user_workspaces(user_id: str, supabase) -> List[ProfileWorkspaceSummary]:
     """Get user's workspace memberships."""
     try:
-        result = supabase.table("tenant_users").select(
+        result = await run_query(supabase.table("tenant_users").select(
             "tenant_id, role, created_at, tenants(tenant_id, name, settings)"
-        ).eq("user_id", user_id).execute()
+        ).eq("user_id", user_id))
 
         # Get active workspace
-        pref_result = supabase.table("user_preferences").select(
+        pref_result = await run_query(supabase.table("user_preferences").select(
             "active_workspace_id"
-        ).eq("user_id", user_id).single().execute()
+        ).eq("user_id", user_id).single())
         active_ws_id = pref_result.data.get("active_workspace_id") if pref_result.data else None
 
         workspaces = []
@@ -119,9 +118,9 @@ async def get_user_workspaces(user_id: str, supabase) -> List[ProfileWorkspaceSu
             settings = tenant.get("settings", {}) or {}
 
             # Get member count
-            count_result = supabase.table("tenant_users").select(
+            count_result = await run_query(supabase.table("tenant_users").select(
                 "user_id", count="exact"
-            ).eq("tenant_id", ws_id).execute()
+            ).eq("tenant_id", ws_id))
 
             workspaces.append(ProfileWorkspaceSummary(
                 id=ws_id,
@@ -158,16 +157,16 @@ async def get_user_stats(user_id: str, supabase) -> ProfileStats:
     """Get user activity statistics."""
     try:
         # Get workspace count
-        ws_result = supabase.table("tenant_users").select(
+        ws_result = await run_query(supabase.table("tenant_users").select(
             "tenant_id", count="exact"
-        ).eq("user_id", user_id).execute()
+        ).eq("user_id", user_id))
 
         # Get document count (if documents table exists)
         doc_count = 0
         try:
-            doc_result = supabase.table("documents").select(
+            doc_result = await run_query(supabase.table("documents").select(
                 "id", count="exact"
-            ).eq("uploaded_by", user_id).execute()
+            ).eq("uploaded_by", user_id))
             doc_count = doc_result.count or 0
         except Exception:
             pass
@@ -253,8 +252,8 @@ async def determine_visibility(viewer_id: str, target_id: str, supabase) -> Prof
 
     # Check if in same workspace
     try:
-        viewer_ws = supabase.table("tenant_users").select("tenant_id").eq("user_id", viewer_id).execute()
-        target_ws = supabase.table("tenant_users").select("tenant_id").eq("user_id", target_id).execute()
+        viewer_ws = await run_query(supabase.table("tenant_users").select("tenant_id").eq("user_id", viewer_id))
+        target_ws = await run_query(supabase.table("tenant_users").select("tenant_id").eq("user_id", target_id))
 
         viewer_tenant_ids = {m.get("tenant_id") for m in viewer_ws.data or []}
         target_tenant_ids = {m.get("tenant_id") for m in target_ws.data or []}
@@ -273,13 +272,13 @@ async def determine_visibility(viewer_id: str, target_id: str, supabase) -> Prof
 async def get_shared_workspace(viewer_id: str, target_id: str, supabase) -> Optional[dict]:
     """Get the first shared workspace between two users."""
     try:
-        viewer_ws = supabase.table("tenant_users").select(
+        viewer_ws = await run_query(supabase.table("tenant_users").select(
             "tenant_id, role, tenants(name)"
-        ).eq("user_id", viewer_id).execute()
+        ).eq("user_id", viewer_id))
 
-        target_ws = supabase.table("tenant_users").select(
+        target_ws = await run_query(supabase.table("tenant_users").select(
             "tenant_id, role"
-        ).eq("user_id", target_id).execute()
+        ).eq("user_id", target_id))
 
         viewer_map = {m.get("tenant_id"): m for m in viewer_ws.data or []}
         for membership in target_ws.data or []:
@@ -383,10 +382,10 @@ async def update_my_profile(
 
         # Update users table if there are changes
         if len(user_updates) > 1:  # More than just updated_at
-            supabase.table("users").upsert({
+            await run_query(supabase.table("users").upsert({
                 "id": user.uid,
                 **user_updates,
-            }, on_conflict="id").execute()
+            }, on_conflict="id"))
 
         # Handle preferences updates
         prefs_updates = {}
@@ -403,9 +402,9 @@ async def update_my_profile(
         if prefs_updates:
             prefs_updates["user_id"] = user.uid
             prefs_updates["updated_at"] = now_pacific()
-            supabase.table("user_preferences").upsert(
+            await run_query(supabase.table("user_preferences").upsert(
                 prefs_updates, on_conflict="user_id"
-            ).execute()
+            ))
 
         # Fetch updated profile
         profile = await build_user_profile(user, supabase)
@@ -495,9 +494,9 @@ async def update_my_preferences(
         update_data.update(updates_dict)
 
         # Upsert preferences
-        supabase.table("user_preferences").upsert(
+        await run_query(supabase.table("user_preferences").upsert(
             update_data, on_conflict="user_id"
-        ).execute()
+        ))
 
         # Fetch updated preferences
         prefs_data = await get_user_preferences(user.uid, supabase)
@@ -718,18 +717,18 @@ async def delete_my_account(
         scheduled_deletion = (deletion_date + timedelta(days=30)).isoformat()
 
         # Mark account for deletion
-        supabase.table("users").update({
+        await run_query(supabase.table("users").update({
             "status": "pending_deletion",
             "scheduled_deletion": scheduled_deletion,
             "deletion_feedback": delete_request.feedback,
             "updated_at": now_pacific(),
-        }).eq("id", user.uid).execute()
+        }).eq("id", user.uid))
 
         # Handle workspace ownership
         # 1. Get workspaces where user is owner
-        owned_ws = supabase.table("tenant_users").select(
+        owned_ws = await run_query(supabase.table("tenant_users").select(
             "tenant_id, tenants(settings)"
-        ).eq("user_id", user.uid).eq("role", "owner").execute()
+        ).eq("user_id", user.uid).eq("role", "owner"))
 
         for membership in owned_ws.data or []:
             tenant = membership.get("tenants", {}) or {}
@@ -741,22 +740,22 @@ async def delete_my_account(
                 pass
             else:
                 # Non-personal - check for other owners
-                other_owners = supabase.table("tenant_users").select(
+                other_owners = await run_query(supabase.table("tenant_users").select(
                     "user_id", count="exact"
-                ).eq("tenant_id", ws_id).eq("role", "owner").neq("user_id", user.uid).execute()
+                ).eq("tenant_id", ws_id).eq("role", "owner").neq("user_id", user.uid))
 
                 if other_owners.count == 0:
                     # No other owners - check for admins to promote
-                    admins = supabase.table("tenant_users").select(
+                    admins = await run_query(supabase.table("tenant_users").select(
                         "user_id"
-                    ).eq("tenant_id", ws_id).eq("role", "admin").limit(1).execute()
+                    ).eq("tenant_id", ws_id).eq("role", "admin").limit(1))
 
                     if admins.data:
                         # Promote first admin to owner
                         new_owner_id = admins.data[0]["user_id"]
-                        supabase.table("tenant_users").update({
+                        await run_query(supabase.table("tenant_users").update({
                             "role": "owner"
-                        }).eq("tenant_id", ws_id).eq("user_id", new_owner_id).execute()
+                        }).eq("tenant_id", ws_id).eq("user_id", new_owner_id))
 
         logger.info(f"Scheduled deletion for user {user.uid} on {scheduled_deletion}")
 
@@ -807,11 +806,11 @@ async def cancel_account_deletion(
             )
 
         # Cancel deletion
-        supabase.table("users").update({
+        await run_query(supabase.table("users").update({
             "status": "active",
             "scheduled_deletion": None,
             "updated_at": now_pacific(),
-        }).eq("id", user.uid).execute()
+        }).eq("id", user.uid))
 
         # Fetch updated profile
         profile = await build_user_profile(user, supabase)
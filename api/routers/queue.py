@@ -215,9 +215,9 @@ async def get_queue_status(
 
     try:
         # First try the processing_queue table
-        queue_result = supabase.client.table("processing_queue").select(
+        queue_result = await supabase.execute(supabase.client.table("processing_queue").select(
             "id, content_id, priority, retry_count, status, created_at"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         queue_data = queue_result.data or []
 
@@ -242,9 +242,9 @@ async def get_queue_status(
     except Exception:
         # Fall back to processed_content table
         try:
-            content_result = supabase.client.table("processed_content").select(
+            content_result = await supabase.execute(supabase.client.table("processed_content").select(
                 "id, processing_status, source_type, title, created_at, updated_at"
-            ).eq("tenant_id", tenant_id).limit(500).execute()
+            ).eq("tenant_id", tenant_id).limit(500))
 
             content_data = content_result.data or []
 
@@ -349,9 +349,9 @@ async def list_jobs(
             query = query.eq("source_type", job_type)
 
         # Execute with pagination
-        result = query.range(offset, offset + page_size - 1).order(
+        result = await supabase.execute(query.range(offset, offset + page_size - 1).order(
             "created_at", desc=True
-        ).execute()
+        ))
 
         total = result.count or 0
         jobs = [parse_db_job(item) for item in (result.data or [])]
@@ -400,9 +400,9 @@ async def get_job_status(
 
     try:
         # Try processing_queue first
-        result = supabase.client.table("processing_queue").select(
+        result = await supabase.execute(supabase.client.table("processing_queue").select(
             "*"
-        ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", job_id).eq("tenant_id", tenant_id))
 
         if result.data:
             job = parse_db_job(result.data[0])
@@ -413,9 +413,9 @@ async def get_job_status(
             )
 
         # Fall back to processed_content
-        result = supabase.client.table("processed_content").select(
+        result = await supabase.execute(supabase.client.table("processed_content").select(
             "*"
-        ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", job_id).eq("tenant_id", tenant_id))
 
         if result.data:
             job = parse_db_job(result.data[0])
@@ -463,18 +463,18 @@ async def cancel_job(
 
     try:
         # Get current job status - try processing_queue first
-        result = supabase.client.table("processing_queue").select(
+        result = await supabase.execute(supabase.client.table("processing_queue").select(
             "id, status"
-        ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", job_id).eq("tenant_id", tenant_id))
 
         table_name = "processing_queue"
         status_column = "status"
 
         if not result.data:
             # Fall back to processed_content
-            result = supabase.client.table("processed_content").select(
+            result = await supabase.execute(supabase.client.table("processed_content").select(
                 "id, processing_status"
-            ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+            ).eq("id", job_id).eq("tenant_id", tenant_id))
             table_name = "processed_content"
             status_column = "processing_status"
 
@@ -499,10 +499,10 @@ async def cancel_job(
             )
 
         # Update status to cancelled
-        update_result = supabase.client.table(table_name).update({
+        update_result = await supabase.execute(supabase.client.table(table_name).update({
             status_column: "cancelled",
             "updated_at": datetime.now(PACIFIC).isoformat(),
-        }).eq("id", job_id).execute()
+        }).eq("id", job_id))
 
         return APIResponse(
             success=True,
@@ -548,9 +548,9 @@ async def retry_job(
 
     try:
         # Get current job
-        result = supabase.client.table("processed_content").select(
+        result = await supabase.execute(supabase.client.table("processed_content").select(
             "*"
-        ).eq("id", job_id).eq("tenant_id", tenant_id).execute()
+        ).eq("id", job_id).eq("tenant_id", tenant_id))
 
         if not result.data:
             raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
@@ -575,12 +575,12 @@ async def retry_job(
                 detail=f"Maximum retries ({max_retries}) exceeded"
             )
 
-        update_result = supabase.client.table("processed_content").update({
+        update_result = await supabase.execute(supabase.client.table("processed_content").update({
             "processing_status": "pending",
             "retry_count": current_retries + 1,
             "error_message": None,
             "updated_at": datetime.now(PACIFIC).isoformat(),
-        }).eq("id", job_id).execute()
+        }).eq("id", job_id))
 
         # Return updated job
         updated_data = update_result.data[0] if update_result.data else job_data
@@ -624,9 +624,9 @@ async def get_queue_stats(
 
     try:
         # Get counts from processed_content
-        result = supabase.client.table("processed_content").select(
+        result = await supabase.execute(supabase.client.table("processed_content").select(
             "processing_status"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         for item in (result.data or []):
             status = item.get("processing_status", "pending").lower()
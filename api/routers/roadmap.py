@@ -13,10 +13,11 @@ from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, Request, Query
 from pydantic import BaseModel, Field
-from supabase import create_client, Client
+from supabase import Client
 
 from models.response import APIResponse, ResponseMeta
 from middleware.auth import get_current_user, UserContext
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 # Add services to path for imports
@@ -37,13 +38,11 @@ SESSIONS_DIR = HISTORY_DIR / "sessions"
 
 
 def get_supabase_client() -> Optional[Client]:
-    """Get Supabase client for database operations."""
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY', os.getenv('SUPABASE_KEY'))
-
-    if url and key:
-        return create_client(url, key)
-    return None
+    """Get the shared Supabase client (None if not configured)."""
+    try:
+        return get_shared_supabase_client()
+    except ValueError:
+        return None
 
 
 # === Request/Response Models ===
@@ -106,9 +105,9 @@ async def get_okr_summary(supabase: Client, user_id: str) -> Optional[dict]:
         quarter = get_current_quarter()
 
         # Get objectives for current quarter
-        result = supabase.table('objectives').select(
+        result = await run_query(supabase.table('objectives').select(
             'id, title, progress_pct'
-        ).eq('quarter', quarter).eq('user_id', user_id).execute()
+        ).eq('quarter', quarter).eq('user_id', user_id))
 
         if not result.data:
             return None
@@ -116,11 +115,11 @@ async def get_okr_summary(supabase: Client, user_id: str) -> Optional[dict]:
         objectives = result.data
 
         # Get lagging key results
-        kr_result = supabase.table('key_results').select(
+        kr_result = await run_query(supabase.table('key_results').select(
             'title, progress_pct, is_lagging, objective_id'
         ).eq('is_lagging', True).in_(
             'objective_id', [o['id'] for o in objectives]
-        ).execute()
+        ))
 
         lagging_krs = kr_result.data if kr_result.data else []
 
@@ -142,11 +141,11 @@ async def get_energy_summary(supabase: Client, user_id: str) -> Optional[dict]:
         week_ago = (now - timedelta(days=7)).isoformat()
 
         # Get energy entries from last week
-        result = supabase.table('energy_tracking').select(
+        result = await run_query(supabase.table('energy_tracking').select(
             'energy_level, focus_quality, timestamp'
         ).eq('user_id', user_id).gte('timestamp', week_ago).order(
             'timestamp', desc=True
-        ).limit(20).execute()
+        ).limit(20))
 
         if not result.data:
             return None
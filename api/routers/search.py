@@ -1,17 +1,27 @@
 """
 Unified Search Router
 
-Single endpoint for semantic search across all content.
-Wraps the embeddings_service for vector similarity search.
+Single endpoint for search across all content.
+Hybrid mode (default) fuses full-text, vector and knowledge graph results
+via services/hybrid_search.py; vector mode wraps the embeddings_service
+similarity search.
 """
 import sys
+import asyncio
+import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Request
 
 from models.response import APIResponse, ResponseMeta
-from models.search import SearchRequest, SearchResult, SearchResponse
+from models.search import (
+    SearchRequest,
+    SearchResult,
+    SearchResponse,
+    RelatedContentRequest,
+    RelatedContentResponse,
+)
 from middleware.auth import get_current_user, UserContext
 
 # Add services to path for imports
@@ -19,6 +29,14 @@ services_path = Path(__file__).parent.parent.parent / "services"
 sys.path.insert(0, str(services_path))
 
 
+try:
+    from services.search_cache import get_search_cache
+except ImportError:
+    from search_cache import get_search_cache
+
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/search", tags=["Search"])
 
 
@@ -29,38 +47,68 @@ async def unified_search(
     user: UserContext = Depends(get_current_user),
 ) -> APIResponse[SearchResponse]:
     """
-    Unified semantic search across all content.
+    Unified search across all content.
 
-    Searches the Vector Store (pgvector) using embedding similarity.
-    Returns ranked results above the threshold.
+    Hybrid mode runs Postgres full-text search, pgvector similarity and
+    knowledge graph search concurrently and fuses the ranked lists with
+    reciprocal-rank fusion, so exact-name queries match even where
+    embeddings are weak. Vector mode searches the Vector Store (pgvector)
+    only, returning results above the threshold.
 
     **Request Body:**
     - query: Search text (required)
     - limit: Max results (default 10, max 100)
-    - threshold: Min similarity score (default 0.7, range 0.5-0.99)
+    - threshold: Min similarity score for vector results (default 0.7, range 0.5-0.99)
+    - mode: "hybrid" (default) or "vector"
+    - include_graph: Include knowledge graph facts (default true)
+    - rerank: Re-score top results with a local cross-encoder (default false)
 
     **Response:**
-    - results: List of matching content with similarity scores
+    - results: List of matching content with similarity / fusion scores
     - query: The original query
     - total: Number of results
+    - timings_ms: Per-stage latency (hybrid mode)
+    - stage_errors: Stages that failed; results come from the others
+      ("hybrid" if hybrid search failed and vector results are returned)
+    - cached: True when served from the search result cache (identical
+      query for the same tenant within the TTL, no ingestion since)
 
     **Requires:** Valid Firebase JWT
     """
     meta_dict = request.state.get_meta()
 
+    if search_request.mode == "hybrid":
+        return await hybrid_search(search_request, user, meta_dict)
+    return await vector_search(search_request, user, meta_dict)
+
+
+async def vector_search(
+    search_request: SearchRequest,
+    user: UserContext,
+    meta_dict: dict,
+    fallback_error: Optional[str] = None,
+) -> APIResponse[SearchResponse]:
+    """Vector similarity search (also the fallback when hybrid search fails)."""
     try:
         # Import embeddings service (lazy import to avoid startup issues)
-        from embeddings_service import get_embeddings_service
+        from services.embeddings_service import get_embeddings_service
 
         embeddings = get_embeddings_service()
+        tenant_id = user.tenant_id or user.uid  # Fallback to uid if no tenant
 
         # Search using vector similarity
         # The service uses tenant_id from custom claims for data isolation
-        raw_results = await embeddings.search_similar_content(
-            query=search_request.query,
-            tenant_id=user.tenant_id or user.uid,  # Fallback to uid if no tenant
+        raw_results, cached = await get_search_cache().get_or_compute(
+            "search", tenant_id, search_request.query,
+            lambda: embeddings.search_similar_content(
+                query=search_request.query,
+                tenant_id=tenant_id,
+                limit=search_request.limit,
+                similarity_threshold=search_request.threshold,
+            ),
             limit=search_request.limit,
-            similarity_threshold=search_request.threshold,
+            threshold=search_request.threshold,
+            stores=["vector"],
         )
 
         # Transform to SearchResult models
@@ -85,6 +133,9 @@ async def unified_search(
             results=results,
             query=search_request.query,
             total=len(results),
+            mode="vector",
+            stage_errors={"hybrid": fallback_error} if fallback_error else {},
+            cached=cached,
         )
 
         return APIResponse(
@@ -121,3 +172,210 @@ async def unified_search(
             error=f"Search failed: {str(e)}",
             meta=ResponseMeta(**meta_dict),
         )
+
+
+async def hybrid_search(
+    search_request: SearchRequest,
+    user: UserContext,
+    meta_dict: dict,
+) -> APIResponse[SearchResponse]:
+    """Full-text + vector + graph search fused by reciprocal rank (vector-only if it fails)."""
+    tenant_id = user.tenant_id or user.uid  # Fallback to uid if no tenant
+    stores = ["fulltext", "vector"] + (["graph"] if search_request.include_graph else [])
+
+    try:
+        try:
+            from services.hybrid_search import get_hybrid_search_engine
+        except ImportError:
+            from hybrid_search import get_hybrid_search_engine
+
+        # Partial results (a stage failed or timed out) are not cached
+        response, cached = await get_search_cache().get_or_compute(
+            "search", tenant_id, search_request.query,
+            lambda: get_hybrid_search_engine().search(
+                query=search_request.query,
+                tenant_id=tenant_id,
+                limit=search_request.limit,
+                threshold=search_request.threshold,
+                include_graph=search_request.include_graph,
+                rerank=search_request.rerank,
+            ),
+            cacheable=lambda response: not response["stage_errors"],
+            limit=search_request.limit,
+            threshold=search_request.threshold,
+            stores=stores,
+            rerank=search_request.rerank,
+        )
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        logger.warning(f"Hybrid search failed, falling back to vector search: {error}")
+        return await vector_search(search_request, user, meta_dict, fallback_error=error)
+
+    stage_errors = response["stage_errors"]
+    if not response["results"] and all(stage in stage_errors for stage in response["stage_hits"]):
+        # Every stage failed: report instead of an empty result set
+        return APIResponse(
+            success=False,
+            data=None,
+            error="Search failed: " + "; ".join(f"{k}: {v}" for k, v in stage_errors.items()),
+            meta=ResponseMeta(**meta_dict),
+        )
+
+    results: List[SearchResult] = []
+    for item in response["results"]:
+        summary = item.get("summary") or ""
+        preview = summary[:200] + "..." if len(summary) > 200 else summary
+
+        results.append(SearchResult(
+            id=item["id"],
+            title=item["title"],
+            content_type=item["content_type"],
+            summary=summary or None,
+            preview=preview or None,
+            tags=item.get("tags", []),
+            similarity=round(item.get("similarity") or 0, 4),
+            source_url=item.get("source_url"),
+            score=item["score"],
+            matched_by=item["matched_by"],
+            rerank_score=item.get("rerank_score"),
+        ))
+
+    return APIResponse(
+        success=True,
+        data=SearchResponse(
+            results=results,
+            query=search_request.query,
+            total=len(results),
+            mode="hybrid",
+            timings_ms=response["timings_ms"],
+            stage_errors=stage_errors,
+            cached=cached,
+        ),
+        meta=ResponseMeta(**meta_dict),
+    )
+
+
+@router.post("/related", response_model=APIResponse[RelatedContentResponse])
+async def related_content(
+    request: Request,
+    related_request: RelatedContentRequest,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[RelatedContentResponse]:
+    """
+    Related content for many items in one call.
+
+    Uses each item's stored embedding directly in the database, so no
+    query embedding is generated. Intended for related-content panels.
+
+    **Request Body:**
+    - content_ids: Content IDs (1-50)
+    - limit: Related items per content ID (default 5, max 20)
+    - threshold: Min similarity score (default 0.7)
+
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
+
+    try:
+        from services.embeddings_service import get_embeddings_service
+
+        embeddings = get_embeddings_service()
+        raw_related = await embeddings.get_content_neighbors_batch(
+            content_ids=related_request.content_ids,
+            tenant_id=user.tenant_id or user.uid,
+            limit=related_request.limit,
+            similarity_threshold=related_request.threshold,
+        )
+
+        related = {}
+        for content_id, items in raw_related.items():
+            related[content_id] = [
+                SearchResult(
+                    id=str(item["id"]),
+                    title=item.get("title") or "Untitled",
+                    content_type=item.get("content_type") or "unknown",
+                    summary=item.get("summary") or None,
+                    tags=item.get("tags") or [],
+                    similarity=round(item.get("similarity", 0), 4),
+                    source_url=item.get("source_url"),
+                )
+                for item in items
+            ]
+
+        return APIResponse(
+            success=True,
+            data=RelatedContentResponse(
+                related=related,
+                total=sum(len(items) for items in related.values()),
+            ),
+            meta=ResponseMeta(**meta_dict),
+        )
+
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            data=None,
+            error=f"Related content lookup failed: {str(e)}",
+            meta=ResponseMeta(**meta_dict),
+        )
+
+
+@router.get("/cache-stats", response_model=APIResponse[dict])
+async def embedding_cache_stats(
+    request: Request,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[dict]:
+    """
+    Embedding cache metrics.
+
+    Returns hit/miss counters, hit rate and tier sizes for the query
+    embedding cache (in-process LRU + on-disk SQLite store).
+
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
+
+    try:
+        from services.embeddings_service import get_embeddings_service
+
+        # COUNT(*) on the SQLite tier; keep it off the event loop
+        stats = await asyncio.to_thread(get_embeddings_service().get_cache_stats)
+        return APIResponse(success=True, data=stats, meta=ResponseMeta(**meta_dict))
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            data=None,
+            error=f"Embedding cache unavailable: {str(e)}",
+            meta=ResponseMeta(**meta_dict),
+        )
+
+
+@router.get("/result-cache-stats", response_model=APIResponse[dict])
+async def result_cache_stats(
+    request: Request,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[dict]:
+    """
+    Search result cache metrics.
+
+    Returns hit/miss counters, hit rate, mean hit and miss latency and
+    estimated time saved, overall and per caller (search, graph,
+    knowledge), plus invalidation counts and tier sizes.
+
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
+
+    try:
+        return APIResponse(
+            success=True,
+            data=await asyncio.to_thread(get_search_cache().get_stats),
+            meta=ResponseMeta(**meta_dict),
+        )
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            data=None,
+            error=f"Search result cache unavailable: {str(e)}",
+            meta=ResponseMeta(**meta_dict),
+        )
@@ -25,6 +25,7 @@ from models.skills_db import (
     SkillAssetDB, SkillSyncResult, SkillSyncStatus, SkillMigrationRequest,
 )
 from middleware.auth import get_current_user, UserContext
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 router = APIRouter(prefix="/api/skills-db", tags=["Skills Database"])
 
@@ -44,17 +45,9 @@ def get_supabase_client():
     Returns None if not configured, falling back to in-memory storage.
     """
     try:
-        import os
-        from supabase import create_client
-
-        url = os.environ.get("SUPABASE_URL")
-        key = os.environ.get("SUPABASE_SERVICE_KEY") or os.environ.get("SUPABASE_KEY")
-
-        if url and key:
-            return create_client(url, key)
+        return get_shared_supabase_client()
     except Exception:
-        pass
-    return None
+        return None
 
 
 def compute_skill_hash(skill_path: Path) -> str:
@@ -204,14 +197,14 @@ async def list_skills_db(
             if search:
                 query = query.or_(f'name.ilike.%{search}%,description.ilike.%{search}%')
 
-            result = query.execute()
+            result = await run_query(query)
             skills_data = result.data or []
 
             # Get workflow counts
             skills = []
             for s in skills_data:
-                wf_result = supabase.table('skill_workflows').select('id', count='exact').eq('skill_id', s['id']).execute()
-                asset_result = supabase.table('skill_assets').select('id', count='exact').eq('skill_id', s['id']).execute()
+                wf_result = await run_query(supabase.table('skill_workflows').select('id', count='exact').eq('skill_id', s['id']))
+                asset_result = await run_query(supabase.table('skill_assets').select('id', count='exact').eq('skill_id', s['id']))
 
                 skills.append(SkillSummaryDB(
                     id=s['id'],
@@ -301,9 +294,9 @@ async def get_skill_db(
             # Try by UUID first, then by name
             try:
                 UUID(skill_id)
-                result = supabase.table('skills').select('*').eq('id', skill_id).single().execute()
+                result = await run_query(supabase.table('skills').select('*').eq('id', skill_id).single())
             except ValueError:
-                result = supabase.table('skills').select('*').eq('name', skill_id).single().execute()
+                result = await run_query(supabase.table('skills').select('*').eq('name', skill_id).single())
 
             if not result.data:
                 return APIResponse(
@@ -315,7 +308,7 @@ async def get_skill_db(
             skill = SkillDB(**result.data)
 
             if include_workflows:
-                wf_result = supabase.table('skill_workflows').select('*').eq('skill_id', skill.id).execute()
+                wf_result = await run_query(supabase.table('skill_workflows').select('*').eq('skill_id', skill.id))
                 skill.workflows = [SkillWorkflowDB(**w) for w in (wf_result.data or [])]
 
         else:
@@ -391,7 +384,7 @@ async def create_skill_db(
         )
 
         if supabase:
-            result = supabase.table('skills').insert({
+            result = await run_query(supabase.table('skills').insert({
                 'name': new_skill.name,
                 'display_name': new_skill.display_name,
                 'description': new_skill.description,
@@ -400,7 +393,7 @@ async def create_skill_db(
                 'status': new_skill.status.value,
                 'source': new_skill.source.value,
                 'tenant_id': 'default',
-            }).execute()
+            }))
 
             if result.data:
                 new_skill = SkillDB(**result.data[0])
@@ -476,9 +469,9 @@ async def update_skill_db(
             # Try by UUID first, then by name
             try:
                 UUID(skill_id)
-                result = supabase.table('skills').update(update_data).eq('id', skill_id).execute()
+                result = await run_query(supabase.table('skills').update(update_data).eq('id', skill_id))
             except ValueError:
-                result = supabase.table('skills').update(update_data).eq('name', skill_id).execute()
+                result = await run_query(supabase.table('skills').update(update_data).eq('name', skill_id))
 
             if not result.data:
                 return APIResponse(
@@ -546,9 +539,9 @@ async def delete_skill_db(
             # Try by UUID first, then by name
             try:
                 UUID(skill_id)
-                result = supabase.table('skills').delete().eq('id', skill_id).execute()
+                result = await run_query(supabase.table('skills').delete().eq('id', skill_id))
             except ValueError:
-                result = supabase.table('skills').delete().eq('name', skill_id).execute()
+                result = await run_query(supabase.table('skills').delete().eq('name', skill_id))
 
             deleted_count = len(result.data) if result.data else 0
 
@@ -613,7 +606,7 @@ async def get_skill_workflows_db(
                 UUID(skill_id)
                 skill_uuid = skill_id
             except ValueError:
-                skill_result = supabase.table('skills').select('id').eq('name', skill_id).single().execute()
+                skill_result = await run_query(supabase.table('skills').select('id').eq('name', skill_id).single())
                 if not skill_result.data:
                     return APIResponse(
                         success=False,
@@ -622,7 +615,7 @@ async def get_skill_workflows_db(
                     )
                 skill_uuid = skill_result.data['id']
 
-            result = supabase.table('skill_workflows').select('*').eq('skill_id', skill_uuid).execute()
+            result = await run_query(supabase.table('skill_workflows').select('*').eq('skill_id', skill_uuid))
             workflows = [SkillWorkflowDB(**w) for w in (result.data or [])]
 
         else:
@@ -673,7 +666,7 @@ async def create_workflow_db(
                 UUID(skill_id)
                 skill_uuid = skill_id
             except ValueError:
-                skill_result = supabase.table('skills').select('id').eq('name', skill_id).single().execute()
+                skill_result = await run_query(supabase.table('skills').select('id').eq('name', skill_id).single())
                 if not skill_result.data:
                     return APIResponse(
                         success=False,
@@ -682,12 +675,12 @@ async def create_workflow_db(
                     )
                 skill_uuid = skill_result.data['id']
 
-            result = supabase.table('skill_workflows').insert({
+            result = await run_query(supabase.table('skill_workflows').insert({
                 'skill_id': skill_uuid,
                 'name': workflow.name,
                 'description': workflow.description,
                 'content': workflow.content,
-            }).execute()
+            }))
 
             new_workflow = SkillWorkflowDB(**result.data[0])
 
@@ -765,7 +758,7 @@ async def sync_skills_from_filesystem(
         # Get existing skills from database
         existing_skills = {}
         if supabase:
-            existing_result = supabase.table('skills').select('name, filesystem_hash').execute()
+            existing_result = await run_query(supabase.table('skills').select('name, filesystem_hash'))
             existing_skills = {s['name']: s['filesystem_hash'] for s in (existing_result.data or [])}
         else:
             existing_skills = {name: s.filesystem_hash for name, s in _skills_store.items()}
@@ -829,13 +822,13 @@ async def sync_skills_from_filesystem(
                 if supabase:
                     if name in existing_skills:
                         # Update
-                        update_result = supabase.table('skills').update(skill_data).eq('name', name).execute()
+                        update_result = await run_query(supabase.table('skills').update(skill_data).eq('name', name))
                         skill_id = update_result.data[0]['id'] if update_result.data else None
                         action = "updated"
                         result.updated += 1
                     else:
                         # Create
-                        insert_result = supabase.table('skills').insert(skill_data).execute()
+                        insert_result = await run_query(supabase.table('skills').insert(skill_data))
                         skill_id = insert_result.data[0]['id'] if insert_result.data else None
                         action = "created"
                         result.created += 1
@@ -843,17 +836,17 @@ async def sync_skills_from_filesystem(
                     # Sync workflows if requested
                     if migration.include_workflows and skill_id:
                         # Delete existing workflows
-                        supabase.table('skill_workflows').delete().eq('skill_id', skill_id).execute()
+                        await run_query(supabase.table('skill_workflows').delete().eq('skill_id', skill_id))
 
                         # Insert new workflows
                         workflows = read_workflows_from_filesystem(skill_path, UUID(skill_id))
                         for wf in workflows:
-                            supabase.table('skill_workflows').insert({
+                            await run_query(supabase.table('skill_workflows').insert({
                                 'skill_id': skill_id,
                                 'name': wf.name,
                                 'description': wf.description,
                                 'content': wf.content,
-                            }).execute()
+                            }))
 
                 else:
                     # In-memory storage
@@ -932,7 +925,7 @@ async def get_sync_status(
         # Get database skills
         db_skills = {}
         if supabase:
-            result = supabase.table('skills').select('name, filesystem_hash, source').execute()
+            result = await run_query(supabase.table('skills').select('name, filesystem_hash, source'))
             for s in (result.data or []):
                 db_skills[s['name']] = {
                     'hash': s.get('filesystem_hash'),
@@ -2,7 +2,12 @@
 Transcript Service API Router
 
 REST API for YouTube transcript extraction with caching.
-Wraps transcript_service.py with file-based caching layer.
+Wraps transcript_service.py with an indexed SQLite caching layer.
+
+Batches fan out concurrently: YouTube API fetches run in parallel up to
+TRANSCRIPT_API_CONCURRENCY, Whisper fallbacks are bounded by the shared
+transcription engine, and concurrent requests for the same video share
+one in-flight fetch.
 
 Acceptance Criteria:
 - Returns cached if exists
@@ -12,14 +17,15 @@ Acceptance Criteria:
 import sys
 import os
 import json
-import hashlib
+import uuid
+import asyncio
 from pathlib import Path
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from typing import Optional, List
+from typing import AsyncIterator, Dict, Optional, List
 
-from fastapi import APIRouter, Depends, Request, Query, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Request, Query
+from fastapi.responses import StreamingResponse
 
 from models.response import APIResponse, ResponseMeta
 from models.transcript import (
@@ -31,6 +37,9 @@ from models.transcript import (
     TranscriptCacheStats,
     TranscriptBatchRequest,
     TranscriptBatchResult,
+    TranscriptBatchJobRequest,
+    TranscriptBatchJob,
+    TranscriptSegment,
 )
 from middleware.auth import get_current_user, UserContext
 
@@ -43,81 +52,50 @@ router = APIRouter(prefix="/api/transcripts", tags=["Transcripts"])
 # Pacific timezone for timestamps
 PACIFIC = ZoneInfo("America/Los_Angeles")
 
-# Cache configuration
-CACHE_DIR = Path("/root/flourisha/00_AI_Brain/data/transcripts")
-CACHE_EXPIRY_DAYS = 30  # Cache transcripts for 30 days
-
+# Cache configuration (SQLite store: services/transcript_cache.py)
+CACHE_EXPIRY_DAYS = int(os.getenv("TRANSCRIPT_CACHE_EXPIRY_DAYS", "30"))
 
-def ensure_cache_dir():
-    """Ensure cache directory exists."""
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-
-def get_cache_path(video_id: str) -> Path:
-    """Get cache file path for a video ID."""
-    # Use MD5 hash to handle any special characters
-    safe_id = hashlib.md5(video_id.encode()).hexdigest()[:16]
-    return CACHE_DIR / f"{video_id}_{safe_id}.json"
+def get_cache():
+    """Shared SQLite transcript cache store."""
+    try:
+        from services.transcript_cache import get_transcript_cache
+    except ImportError:
+        from transcript_cache import get_transcript_cache
+    return get_transcript_cache()
 
 
 def read_from_cache(video_id: str) -> Optional[dict]:
     """Read transcript from cache if exists and not expired."""
-    cache_path = get_cache_path(video_id)
-
-    if not cache_path.exists():
-        return None
-
-    try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Check expiry
-        expires_at = datetime.fromisoformat(data.get('expires_at', ''))
-        if datetime.now(PACIFIC) > expires_at:
-            # Cache expired
-            cache_path.unlink(missing_ok=True)
-            return None
-
-        return data
-    except (json.JSONDecodeError, ValueError, KeyError):
-        return None
+    return get_cache().get(video_id)
 
 
 def write_to_cache(video_id: str, transcript: str, source: str, language: str, metadata: dict = None):
     """Write transcript to cache."""
-    ensure_cache_dir()
-    cache_path = get_cache_path(video_id)
-
-    now = datetime.now(PACIFIC)
-    expires = now + timedelta(days=CACHE_EXPIRY_DAYS)
-
-    cache_data = {
-        'video_id': video_id,
-        'transcript': transcript,
-        'source': source,
-        'language': language,
-        'cached_at': now.isoformat(),
-        'expires_at': expires.isoformat(),
-        'metadata': metadata or {}
-    }
-
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(cache_data, f, ensure_ascii=False, indent=2)
+    get_cache().put(
+        video_id=video_id,
+        transcript=transcript,
+        source=source,
+        language=language,
+        metadata=metadata,
+    )
 
 
 def delete_from_cache(video_id: str) -> bool:
     """Delete transcript from cache."""
-    cache_path = get_cache_path(video_id)
-    if cache_path.exists():
-        cache_path.unlink()
-        return True
-    return False
+    return get_cache().delete(video_id)
+
+
+_transcript_service = None
 
 
 def get_transcript_service():
-    """Lazy import TranscriptService."""
-    from transcript_service import TranscriptService
-    return TranscriptService()
+    """Lazy import and share one TranscriptService (its Whisper engine stays warm)."""
+    global _transcript_service
+    if _transcript_service is None:
+        from transcript_service import TranscriptService
+        _transcript_service = TranscriptService()
+    return _transcript_service
 
 
 def extract_video_id(video_id_or_url: str) -> str:
@@ -143,6 +121,217 @@ def extract_video_id(video_id_or_url: str) -> str:
     return video_id_or_url  # Return as-is if no pattern matches
 
 
+# =============================================================================
+# Fetching (shared by single, batch, streaming and background extraction)
+# =============================================================================
+
+DEFAULT_LANGUAGES = ['en', 'en-US', 'a.en']
+
+# Concurrent YouTube Transcript API fetches (Whisper is bounded by its engine)
+API_CONCURRENCY = int(os.getenv("TRANSCRIPT_API_CONCURRENCY", "8"))
+
+# In-flight fetches keyed by (video_id, languages, skip_api); concurrent
+# requests for the same video await the same task instead of refetching
+_inflight: Dict[tuple, asyncio.Task] = {}
+_api_slots: Optional[asyncio.Semaphore] = None
+_whisper_slots: Optional[asyncio.Semaphore] = None
+
+
+def _stage_slots() -> tuple:
+    """Per-stage semaphores (created lazily on the running loop)."""
+    global _api_slots, _whisper_slots
+    if _api_slots is None:
+        _api_slots = asyncio.Semaphore(API_CONCURRENCY)
+        # Each fallback keeps up to `workers` chunks in the engine at once
+        # (ChunkedTranscriber's window), so size the limit in fallbacks:
+        # all of them together never exceed what the engine will admit
+        engine = get_transcript_service().engine
+        chunks_per_fallback = max(1, engine.config.workers)
+        _whisper_slots = asyncio.Semaphore(max(1, engine.capacity // chunks_per_fallback))
+    return _api_slots, _whisper_slots
+
+
+async def _fetch_uncached(video_id: str, languages: List[str], skip_api: bool):
+    """Tier 1 under the API limit, then Whisper under the engine limit; caches successes."""
+    service = get_transcript_service()
+    api_slots, whisper_slots = _stage_slots()
+
+    result = None
+    if not skip_api:
+        async with api_slots:
+            result = await asyncio.to_thread(service._try_youtube_api, video_id, languages)
+
+    if result is None or not result.success:
+        async with whisper_slots:
+            result = await asyncio.to_thread(service._try_whisper_fallback, video_id)
+
+    if result.success:
+        await asyncio.to_thread(
+            write_to_cache,
+            video_id=video_id,
+            transcript=result.transcript,
+            source=result.source.value,
+            language=result.language,
+            metadata=result.metadata,
+        )
+    return result
+
+
+async def fetch_transcript(video_id: str, languages: List[str], skip_api: bool = False):
+    """
+    Fetch a transcript from the service, sharing in-flight work per video.
+
+    Returns:
+        transcript_service.TranscriptResult
+    """
+    key = (video_id, tuple(languages), skip_api)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_uncached(video_id, languages, skip_api))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one cancelled client doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
+def _segments(metadata: Optional[dict], include: bool) -> Optional[List[TranscriptSegment]]:
+    """Timestamped segments stored in service/cache metadata."""
+    if not include or not metadata or not metadata.get('segments'):
+        return None
+    return [TranscriptSegment(**segment) for segment in metadata['segments']]
+
+
+def cached_result(video_id: str, cached: dict, include_segments: bool = True) -> TranscriptResult:
+    """Build an API result from a cache entry."""
+    return TranscriptResult(
+        success=True,
+        video_id=video_id,
+        transcript=cached['transcript'],
+        source=TranscriptSource.CACHE,
+        language=cached.get('language', 'en'),
+        metadata=TranscriptMetadata(
+            char_count=len(cached['transcript']),
+            word_count=len(cached['transcript'].split()),
+            duration=cached.get('metadata', {}).get('duration'),
+            audio_size_mb=cached.get('metadata', {}).get('audio_size_mb'),
+            cached_at=cached.get('cached_at'),
+            expires_at=cached.get('expires_at'),
+        ),
+        segments=_segments(cached.get('metadata'), include_segments),
+    )
+
+
+def service_result(video_id: str, transcript_result, include_segments: bool = True) -> TranscriptResult:
+    """Build an API result from a transcript_service.TranscriptResult."""
+    if not transcript_result.success:
+        return TranscriptResult(
+            success=False,
+            video_id=video_id,
+            transcript=None,
+            source=TranscriptSource.FAILED,
+            error=transcript_result.error or "Failed to extract transcript",
+        )
+
+    now = datetime.now(PACIFIC)
+    expires = now + timedelta(days=CACHE_EXPIRY_DAYS)
+
+    # Map service source to API source
+    source_map = {
+        'youtube_api': TranscriptSource.YOUTUBE_API,
+        'whisper': TranscriptSource.WHISPER,
+        'failed': TranscriptSource.FAILED,
+    }
+    api_source = source_map.get(
+        transcript_result.source.value,
+        TranscriptSource.YOUTUBE_API
+    )
+    service_meta = transcript_result.metadata or {}
+
+    return TranscriptResult(
+        success=True,
+        video_id=video_id,
+        transcript=transcript_result.transcript,
+        source=api_source,
+        language=transcript_result.language,
+        metadata=TranscriptMetadata(
+            char_count=len(transcript_result.transcript),
+            word_count=len(transcript_result.transcript.split()),
+            duration=service_meta.get('duration'),
+            audio_size_mb=service_meta.get('audio_size_mb'),
+            cached_at=now.isoformat(),
+            expires_at=expires.isoformat(),
+        ),
+        segments=_segments(service_meta, include_segments),
+    )
+
+
+async def resolve_transcript(
+    video_id_or_url: str,
+    languages: Optional[List[str]] = None,
+    skip_cache: bool = False,
+    skip_api: bool = False,
+    include_segments: bool = True,
+) -> TranscriptResult:
+    """Cache lookup, then a (deduplicated) fetch; never raises."""
+    clean_video_id = extract_video_id(video_id_or_url)
+    try:
+        if not skip_cache:
+            cached = await asyncio.to_thread(read_from_cache, clean_video_id)
+            if cached:
+                return cached_result(clean_video_id, cached, include_segments)
+
+        transcript_result = await fetch_transcript(
+            clean_video_id, languages or DEFAULT_LANGUAGES, skip_api
+        )
+        return service_result(clean_video_id, transcript_result, include_segments)
+
+    except Exception as e:
+        return TranscriptResult(
+            success=False,
+            video_id=clean_video_id,
+            source=TranscriptSource.FAILED,
+            error=str(e),
+        )
+
+
+async def iter_batch_results(
+    video_ids: List[str],
+    languages: Optional[List[str]] = None,
+    skip_cache: bool = False,
+    include_segments: bool = False,
+) -> AsyncIterator[tuple]:
+    """
+    Resolve videos concurrently, yielding (input index, result) as each finishes.
+
+    Fetches are staged through the API/Whisper limits, so a large batch
+    never starts more work than those allow.
+    """
+    async def resolve(index: int, vid: str) -> tuple:
+        return index, await resolve_transcript(
+            vid, languages, skip_cache, include_segments=include_segments
+        )
+
+    tasks = [asyncio.ensure_future(resolve(i, vid)) for i, vid in enumerate(video_ids)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away: stop waiting (shared fetches keep running)
+        for task in tasks:
+            task.cancel()
+
+
+def summarize_batch(total: int, results: List[TranscriptResult]) -> TranscriptBatchResult:
+    """Aggregate counters for a batch."""
+    return TranscriptBatchResult(
+        total=total,
+        succeeded=sum(1 for r in results if r.success),
+        failed=sum(1 for r in results if not r.success),
+        from_cache=sum(1 for r in results if r.source == TranscriptSource.CACHE),
+        results=results,
+    )
+
+
 @router.get("/{video_id}", response_model=APIResponse[TranscriptResult])
 async def get_transcript(
     video_id: str,
@@ -150,6 +339,7 @@ async def get_transcript(
     skip_cache: bool = Query(False, description="Skip cache and fetch fresh"),
     skip_api: bool = Query(False, description="Skip YouTube API, use Whisper"),
     languages: Optional[str] = Query(None, description="Comma-separated language codes"),
+    include_segments: bool = Query(True, description="Include timestamped segments"),
     user: UserContext = Depends(get_current_user),
 ) -> APIResponse[TranscriptResult]:
     """
@@ -169,128 +359,30 @@ async def get_transcript(
     - skip_cache: Bypass cache and fetch fresh (default: false)
     - skip_api: Skip YouTube API and use Whisper directly (default: false)
     - languages: Comma-separated language codes (default: en,en-US)
+    - include_segments: Include timestamped segments (default: true)
 
     **Returns:**
     - transcript: The full transcript text
     - source: Where it came from (cache, youtube_api, whisper)
     - metadata: Character count, word count, cache info
+    - segments: Timestamped segments (start/end seconds, text)
     """
     meta_dict = request.state.get_meta()
 
-    try:
-        # Clean video ID
-        clean_video_id = extract_video_id(video_id)
-
-        # Parse languages
-        lang_list = languages.split(',') if languages else ['en', 'en-US', 'a.en']
-
-        # Check cache first (unless skipping)
-        if not skip_cache:
-            cached = read_from_cache(clean_video_id)
-            if cached:
-                char_count = len(cached['transcript'])
-                word_count = len(cached['transcript'].split())
-
-                result = TranscriptResult(
-                    success=True,
-                    video_id=clean_video_id,
-                    transcript=cached['transcript'],
-                    source=TranscriptSource.CACHE,
-                    language=cached.get('language', 'en'),
-                    metadata=TranscriptMetadata(
-                        char_count=char_count,
-                        word_count=word_count,
-                        cached_at=cached.get('cached_at'),
-                        expires_at=cached.get('expires_at'),
-                        duration=cached.get('metadata', {}).get('duration'),
-                        audio_size_mb=cached.get('metadata', {}).get('audio_size_mb'),
-                    )
-                )
-
-                return APIResponse(
-                    success=True,
-                    data=result,
-                    meta=ResponseMeta(**meta_dict),
-                )
-
-        # Fetch from service
-        service = get_transcript_service()
-        transcript_result = service.get_transcript(
-            video_id=clean_video_id,
-            languages=lang_list,
-            skip_tier1=skip_api,
-        )
-
-        if transcript_result.success:
-            # Cache the result
-            write_to_cache(
-                video_id=clean_video_id,
-                transcript=transcript_result.transcript,
-                source=transcript_result.source.value,
-                language=transcript_result.language,
-                metadata=transcript_result.metadata,
-            )
-
-            # Build metadata
-            char_count = len(transcript_result.transcript)
-            word_count = len(transcript_result.transcript.split())
-            now = datetime.now(PACIFIC)
-            expires = now + timedelta(days=CACHE_EXPIRY_DAYS)
-
-            # Map service source to API source
-            source_map = {
-                'youtube_api': TranscriptSource.YOUTUBE_API,
-                'whisper': TranscriptSource.WHISPER,
-                'failed': TranscriptSource.FAILED,
-            }
-            api_source = source_map.get(
-                transcript_result.source.value,
-                TranscriptSource.YOUTUBE_API
-            )
-
-            result = TranscriptResult(
-                success=True,
-                video_id=clean_video_id,
-                transcript=transcript_result.transcript,
-                source=api_source,
-                language=transcript_result.language,
-                metadata=TranscriptMetadata(
-                    char_count=char_count,
-                    word_count=word_count,
-                    duration=transcript_result.metadata.get('duration') if transcript_result.metadata else None,
-                    audio_size_mb=transcript_result.metadata.get('audio_size_mb') if transcript_result.metadata else None,
-                    cached_at=now.isoformat(),
-                    expires_at=expires.isoformat(),
-                )
-            )
-        else:
-            result = TranscriptResult(
-                success=False,
-                video_id=clean_video_id,
-                transcript=None,
-                source=TranscriptSource.FAILED,
-                error=transcript_result.error or "Failed to extract transcript",
-            )
-
-        return APIResponse(
-            success=result.success,
-            data=result,
-            error=result.error if not result.success else None,
-            meta=ResponseMeta(**meta_dict),
-        )
+    result = await resolve_transcript(
+        video_id,
+        languages=languages.split(',') if languages else None,
+        skip_cache=skip_cache,
+        skip_api=skip_api,
+        include_segments=include_segments,
+    )
 
-    except Exception as e:
-        return APIResponse(
-            success=False,
-            data=TranscriptResult(
-                success=False,
-                video_id=video_id,
-                source=TranscriptSource.FAILED,
-                error=str(e),
-            ),
-            error=str(e),
-            meta=ResponseMeta(**meta_dict),
-        )
+    return APIResponse(
+        success=result.success,
+        data=result,
+        error=result.error if not result.success else None,
+        meta=ResponseMeta(**meta_dict),
+    )
 
 
 @router.post("/extract", response_model=APIResponse[TranscriptResult])
@@ -311,262 +403,223 @@ async def extract_transcript(
     - languages: List of preferred languages
     - skip_cache: Skip cache lookup
     - skip_api: Skip YouTube API
+    - include_segments: Include timestamped segments
     """
     meta_dict = request.state.get_meta()
 
-    try:
-        # Clean video ID
-        clean_video_id = extract_video_id(body.video_id)
-        lang_list = body.languages or ['en', 'en-US', 'a.en']
+    result = await resolve_transcript(
+        body.video_id,
+        languages=body.languages,
+        skip_cache=body.skip_cache,
+        skip_api=body.skip_api,
+        include_segments=body.include_segments,
+    )
 
-        # Check cache first (unless skipping)
-        if not body.skip_cache:
-            cached = read_from_cache(clean_video_id)
-            if cached:
-                char_count = len(cached['transcript'])
-                word_count = len(cached['transcript'].split())
-
-                result = TranscriptResult(
-                    success=True,
-                    video_id=clean_video_id,
-                    transcript=cached['transcript'],
-                    source=TranscriptSource.CACHE,
-                    language=cached.get('language', 'en'),
-                    metadata=TranscriptMetadata(
-                        char_count=char_count,
-                        word_count=word_count,
-                        cached_at=cached.get('cached_at'),
-                        expires_at=cached.get('expires_at'),
-                    )
-                )
-
-                return APIResponse(
-                    success=True,
-                    data=result,
-                    meta=ResponseMeta(**meta_dict),
-                )
-
-        # Fetch from service
-        service = get_transcript_service()
-        transcript_result = service.get_transcript(
-            video_id=clean_video_id,
-            languages=lang_list,
-            skip_tier1=body.skip_api,
-        )
+    return APIResponse(
+        success=result.success,
+        data=result,
+        error=result.error if not result.success else None,
+        meta=ResponseMeta(**meta_dict),
+    )
 
-        if transcript_result.success:
-            # Cache the result
-            write_to_cache(
-                video_id=clean_video_id,
-                transcript=transcript_result.transcript,
-                source=transcript_result.source.value,
-                language=transcript_result.language,
-                metadata=transcript_result.metadata,
-            )
 
-            char_count = len(transcript_result.transcript)
-            word_count = len(transcript_result.transcript.split())
-            now = datetime.now(PACIFIC)
-            expires = now + timedelta(days=CACHE_EXPIRY_DAYS)
+@router.post("/batch", response_model=APIResponse[TranscriptBatchResult])
+async def batch_extract_transcripts(
+    request: Request,
+    body: TranscriptBatchRequest,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[TranscriptBatchResult]:
+    """
+    Extract transcripts for multiple videos.
 
-            source_map = {
-                'youtube_api': TranscriptSource.YOUTUBE_API,
-                'whisper': TranscriptSource.WHISPER,
-                'failed': TranscriptSource.FAILED,
-            }
-            api_source = source_map.get(
-                transcript_result.source.value,
-                TranscriptSource.YOUTUBE_API
-            )
+    Limited to 10 videos per request. Videos are fetched concurrently and
+    results are returned inline in request order. Use POST /batch/stream to
+    receive each result as it finishes, or POST /batch/jobs for larger batches.
 
-            result = TranscriptResult(
-                success=True,
-                video_id=clean_video_id,
-                transcript=transcript_result.transcript,
-                source=api_source,
-                language=transcript_result.language,
-                metadata=TranscriptMetadata(
-                    char_count=char_count,
-                    word_count=word_count,
-                    duration=transcript_result.metadata.get('duration') if transcript_result.metadata else None,
-                    audio_size_mb=transcript_result.metadata.get('audio_size_mb') if transcript_result.metadata else None,
-                    cached_at=now.isoformat(),
-                    expires_at=expires.isoformat(),
-                )
-            )
-        else:
-            result = TranscriptResult(
-                success=False,
-                video_id=clean_video_id,
-                source=TranscriptSource.FAILED,
-                error=transcript_result.error or "Failed to extract transcript",
-            )
+    **Requires:** Valid Firebase JWT
+
+    **Request Body:**
+    - video_ids: List of video IDs or URLs (max 10)
+    - languages: Preferred languages
+    - skip_cache: Skip cache lookups
+    """
+    meta_dict = request.state.get_meta()
+
+    try:
+        results: List[Optional[TranscriptResult]] = [None] * len(body.video_ids)
+        async for index, result in iter_batch_results(
+            body.video_ids, body.languages, body.skip_cache, body.include_segments
+        ):
+            results[index] = result
 
         return APIResponse(
-            success=result.success,
-            data=result,
-            error=result.error if not result.success else None,
+            success=True,
+            data=summarize_batch(len(body.video_ids), results),
             meta=ResponseMeta(**meta_dict),
         )
 
     except Exception as e:
         return APIResponse(
             success=False,
-            data=TranscriptResult(
-                success=False,
-                video_id=body.video_id,
-                source=TranscriptSource.FAILED,
-                error=str(e),
-            ),
             error=str(e),
             meta=ResponseMeta(**meta_dict),
         )
 
 
-@router.post("/batch", response_model=APIResponse[TranscriptBatchResult])
-async def batch_extract_transcripts(
+@router.post("/batch/stream")
+async def stream_batch_transcripts(
     request: Request,
-    body: TranscriptBatchRequest,
-    background_tasks: BackgroundTasks,
+    body: TranscriptBatchJobRequest,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson or sse"),
     user: UserContext = Depends(get_current_user),
-) -> APIResponse[TranscriptBatchResult]:
+) -> StreamingResponse:
     """
-    Extract transcripts for multiple videos.
+    Extract transcripts for multiple videos, streaming each result as it finishes.
 
-    Limited to 10 videos per request. Results returned inline.
-    For larger batches, consider processing videos one at a time.
+    Emits one `result` event per video (with its index in the request) in
+    completion order, then a final `summary` event with the batch counters.
 
     **Requires:** Valid Firebase JWT
 
-    **Request Body:**
-    - video_ids: List of video IDs or URLs (max 10)
-    - languages: Preferred languages
-    - skip_cache: Skip cache lookups
+    **Query Parameters:**
+    - format: `ndjson` (one JSON object per line, default) or `sse` (Server-Sent Events)
     """
-    meta_dict = request.state.get_meta()
+    def encode(event: str, payload: dict) -> str:
+        if stream_format == "sse":
+            return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps({"event": event, **payload}) + "\n"
 
-    try:
-        lang_list = body.languages or ['en', 'en-US', 'a.en']
+    async def events():
         results = []
-        succeeded = 0
-        failed = 0
-        from_cache = 0
-
-        for vid in body.video_ids:
-            clean_video_id = extract_video_id(vid)
-
-            # Check cache first
-            if not body.skip_cache:
-                cached = read_from_cache(clean_video_id)
-                if cached:
-                    char_count = len(cached['transcript'])
-                    word_count = len(cached['transcript'].split())
-
-                    result = TranscriptResult(
-                        success=True,
-                        video_id=clean_video_id,
-                        transcript=cached['transcript'],
-                        source=TranscriptSource.CACHE,
-                        language=cached.get('language', 'en'),
-                        metadata=TranscriptMetadata(
-                            char_count=char_count,
-                            word_count=word_count,
-                            cached_at=cached.get('cached_at'),
-                            expires_at=cached.get('expires_at'),
-                        )
-                    )
-                    results.append(result)
-                    succeeded += 1
-                    from_cache += 1
-                    continue
-
-            # Fetch from service
-            try:
-                service = get_transcript_service()
-                transcript_result = service.get_transcript(
-                    video_id=clean_video_id,
-                    languages=lang_list,
-                )
-
-                if transcript_result.success:
-                    # Cache the result
-                    write_to_cache(
-                        video_id=clean_video_id,
-                        transcript=transcript_result.transcript,
-                        source=transcript_result.source.value,
-                        language=transcript_result.language,
-                        metadata=transcript_result.metadata,
-                    )
-
-                    char_count = len(transcript_result.transcript)
-                    word_count = len(transcript_result.transcript.split())
-                    now = datetime.now(PACIFIC)
-                    expires = now + timedelta(days=CACHE_EXPIRY_DAYS)
-
-                    source_map = {
-                        'youtube_api': TranscriptSource.YOUTUBE_API,
-                        'whisper': TranscriptSource.WHISPER,
-                    }
-                    api_source = source_map.get(
-                        transcript_result.source.value,
-                        TranscriptSource.YOUTUBE_API
-                    )
-
-                    result = TranscriptResult(
-                        success=True,
-                        video_id=clean_video_id,
-                        transcript=transcript_result.transcript,
-                        source=api_source,
-                        language=transcript_result.language,
-                        metadata=TranscriptMetadata(
-                            char_count=char_count,
-                            word_count=word_count,
-                            cached_at=now.isoformat(),
-                            expires_at=expires.isoformat(),
-                        )
-                    )
-                    succeeded += 1
-                else:
-                    result = TranscriptResult(
-                        success=False,
-                        video_id=clean_video_id,
-                        source=TranscriptSource.FAILED,
-                        error=transcript_result.error,
-                    )
-                    failed += 1
-
-            except Exception as e:
-                result = TranscriptResult(
-                    success=False,
-                    video_id=clean_video_id,
-                    source=TranscriptSource.FAILED,
-                    error=str(e),
-                )
-                failed += 1
-
+        async for index, result in iter_batch_results(
+            body.video_ids, body.languages, body.skip_cache, body.include_segments
+        ):
             results.append(result)
+            yield encode("result", {"index": index, "data": result.model_dump(mode="json")})
 
-        batch_result = TranscriptBatchResult(
-            total=len(body.video_ids),
-            succeeded=succeeded,
-            failed=failed,
-            from_cache=from_cache,
-            results=results,
-        )
+        summary = summarize_batch(len(body.video_ids), results)
+        yield encode("summary", {"data": summary.model_dump(mode="json", exclude={"results"})})
 
-        return APIResponse(
-            success=True,
-            data=batch_result,
-            meta=ResponseMeta(**meta_dict),
-        )
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+# =============================================================================
+# Background batch jobs
+# =============================================================================
+
+# Finished jobs are kept this long for polling, then dropped
+BATCH_JOB_RETENTION_SECONDS = 3600
+
+_batch_jobs: Dict[str, TranscriptBatchJob] = {}
+_batch_job_owners: Dict[str, str] = {}
+_batch_job_tasks: Dict[str, asyncio.Task] = {}
 
+
+def _prune_batch_jobs():
+    """Drop finished jobs past their retention window."""
+    cutoff = datetime.now(PACIFIC) - timedelta(seconds=BATCH_JOB_RETENTION_SECONDS)
+    for job_id, job in list(_batch_jobs.items()):
+        if job.finished_at and datetime.fromisoformat(job.finished_at) < cutoff:
+            _batch_jobs.pop(job_id, None)
+            _batch_job_owners.pop(job_id, None)
+
+
+async def _run_batch_job(job: TranscriptBatchJob, body: TranscriptBatchJobRequest):
+    """Fill in job results as videos finish."""
+    job.status = "running"
+    try:
+        async for index, result in iter_batch_results(
+            body.video_ids, body.languages, body.skip_cache, body.include_segments
+        ):
+            job.results[index] = result
+            job.completed += 1
+            if result.success:
+                job.succeeded += 1
+            else:
+                job.failed += 1
+            if result.source == TranscriptSource.CACHE:
+                job.from_cache += 1
+        job.status = "completed"
     except Exception as e:
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        job.finished_at = datetime.now(PACIFIC).isoformat()
+        _batch_job_tasks.pop(job.job_id, None)
+
+
+@router.post("/batch/jobs", response_model=APIResponse[TranscriptBatchJob])
+async def create_batch_job(
+    request: Request,
+    body: TranscriptBatchJobRequest,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[TranscriptBatchJob]:
+    """
+    Start a background batch extraction.
+
+    Returns immediately with a job ID; poll GET /batch/jobs/{job_id} for
+    progress and results. Jobs are kept in memory for an hour after finishing.
+
+    **Requires:** Valid Firebase JWT
+
+    **Request Body:**
+    - video_ids: List of video IDs or URLs (max 500)
+    - languages: Preferred languages
+    - skip_cache: Skip cache lookups
+    """
+    meta_dict = request.state.get_meta()
+    _prune_batch_jobs()
+
+    job = TranscriptBatchJob(
+        job_id=uuid.uuid4().hex,
+        status="queued",
+        total=len(body.video_ids),
+        created_at=datetime.now(PACIFIC).isoformat(),
+        results=[None] * len(body.video_ids),
+    )
+    _batch_jobs[job.job_id] = job
+    _batch_job_owners[job.job_id] = user.uid
+    _batch_job_tasks[job.job_id] = asyncio.create_task(_run_batch_job(job, body))
+
+    return APIResponse(
+        success=True,
+        data=job,
+        meta=ResponseMeta(**meta_dict),
+    )
+
+
+@router.get("/batch/jobs/{job_id}", response_model=APIResponse[TranscriptBatchJob])
+async def get_batch_job(
+    job_id: str,
+    request: Request,
+    include_results: bool = Query(True, description="Include per-video results"),
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[TranscriptBatchJob]:
+    """
+    Get status and results of a background batch extraction.
+
+    Results are in request order; entries are null until that video finishes.
+
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
+
+    job = _batch_jobs.get(job_id)
+    if job is None or _batch_job_owners.get(job_id) != user.uid:
         return APIResponse(
             success=False,
-            error=str(e),
+            error=f"Batch job not found: {job_id}",
             meta=ResponseMeta(**meta_dict),
         )
 
+    data = job if include_results else job.model_copy(update={"results": []})
+    return APIResponse(
+        success=True,
+        data=data,
+        meta=ResponseMeta(**meta_dict),
+    )
+
 
 @router.get("/cache/{video_id}", response_model=APIResponse[TranscriptCacheEntry])
 async def get_cache_entry(
@@ -585,7 +638,7 @@ async def get_cache_entry(
 
     try:
         clean_video_id = extract_video_id(video_id)
-        cached = read_from_cache(clean_video_id)
+        cached = await asyncio.to_thread(get_cache().entry, clean_video_id)
 
         if cached:
             source_map = {
@@ -596,11 +649,11 @@ async def get_cache_entry(
 
             entry = TranscriptCacheEntry(
                 video_id=clean_video_id,
-                source=source_map.get(cached.get('source'), TranscriptSource.YOUTUBE_API),
-                language=cached.get('language', 'en'),
-                cached_at=cached.get('cached_at'),
-                expires_at=cached.get('expires_at'),
-                char_count=len(cached.get('transcript', '')),
+                source=source_map.get(cached['source'], TranscriptSource.YOUTUBE_API),
+                language=cached['language'],
+                cached_at=cached['cached_at'],
+                expires_at=cached['expires_at'],
+                char_count=cached['char_count'],
             )
 
             return APIResponse(
@@ -638,7 +691,7 @@ async def delete_cache_entry(
 
     try:
         clean_video_id = extract_video_id(video_id)
-        deleted = delete_from_cache(clean_video_id)
+        deleted = await asyncio.to_thread(delete_from_cache, clean_video_id)
 
         if deleted:
             return APIResponse(
@@ -661,54 +714,44 @@ async def delete_cache_entry(
         )
 
 
-@router.get("/cache", response_model=APIResponse[TranscriptCacheStats])
-async def get_cache_stats(
+@router.get("/engine/stats", response_model=APIResponse[dict])
+async def get_engine_stats(
     request: Request,
     user: UserContext = Depends(get_current_user),
-) -> APIResponse[TranscriptCacheStats]:
+) -> APIResponse[dict]:
     """
-    Get transcript cache statistics.
+    Get Whisper engine statistics.
 
-    Returns total entries, size, and breakdown by source.
+    Returns model load time, job counters, queue depth and real-time factor.
 
     **Requires:** Valid Firebase JWT
     """
     meta_dict = request.state.get_meta()
 
-    try:
-        ensure_cache_dir()
-
-        cache_files = list(CACHE_DIR.glob("*.json"))
-        total_size = 0
-        by_source = {}
-        dates = []
-
-        for cache_file in cache_files:
-            try:
-                total_size += cache_file.stat().st_size
-
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+    service = get_transcript_service()
+    return APIResponse(
+        success=True,
+        data=service.engine.get_stats(),
+        meta=ResponseMeta(**meta_dict),
+    )
 
-                source = data.get('source', 'unknown')
-                by_source[source] = by_source.get(source, 0) + 1
 
-                cached_at = data.get('cached_at')
-                if cached_at:
-                    dates.append(cached_at)
+@router.get("/cache", response_model=APIResponse[TranscriptCacheStats])
+async def get_cache_stats(
+    request: Request,
+    user: UserContext = Depends(get_current_user),
+) -> APIResponse[TranscriptCacheStats]:
+    """
+    Get transcript cache statistics.
 
-            except (json.JSONDecodeError, OSError):
-                continue
+    Returns total entries, compressed size, and breakdown by source.
 
-        dates.sort()
+    **Requires:** Valid Firebase JWT
+    """
+    meta_dict = request.state.get_meta()
 
-        stats = TranscriptCacheStats(
-            total_entries=len(cache_files),
-            total_size_bytes=total_size,
-            oldest_entry=dates[0] if dates else None,
-            newest_entry=dates[-1] if dates else None,
-            by_source=by_source,
-        )
+    try:
+        stats = TranscriptCacheStats(**await asyncio.to_thread(get_cache().get_stats))
 
         return APIResponse(
             success=True,
@@ -743,32 +786,7 @@ async def clear_cache(
     meta_dict = request.state.get_meta()
 
     try:
-        ensure_cache_dir()
-
-        cache_files = list(CACHE_DIR.glob("*.json"))
-        deleted_count = 0
-        now = datetime.now(PACIFIC)
-
-        for cache_file in cache_files:
-            try:
-                if expired_only:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-
-                    expires_at = datetime.fromisoformat(data.get('expires_at', ''))
-                    if now <= expires_at:
-                        continue  # Not expired, skip
-
-                cache_file.unlink()
-                deleted_count += 1
-
-            except (json.JSONDecodeError, ValueError, OSError):
-                # If we can't read it, delete it anyway
-                try:
-                    cache_file.unlink()
-                    deleted_count += 1
-                except OSError:
-                    pass
+        deleted_count = await asyncio.to_thread(get_cache().clear, expired_only)
 
         return APIResponse(
             success=True,
@@ -22,7 +22,7 @@ from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
 from pydantic import ValidationError
-from supabase import create_client, Client
+from supabase import Client
 
 from models.webhooks import (
     ClickUpWebhookPayload,
@@ -33,6 +33,8 @@ from models.webhooks import (
     EnergyWebhookPayload,
 )
 from services.ai_responder import handle_comment_event
+from services.work_signals import notify_work, GMAIL_CHANNEL
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 router = APIRouter(prefix="/api/webhooks", tags=["Webhooks"])
@@ -43,13 +45,11 @@ PACIFIC = ZoneInfo("America/Los_Angeles")
 
 
 def get_supabase_client() -> Optional[Client]:
-    """Get Supabase client for database operations."""
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY', os.getenv('SUPABASE_KEY'))
-
-    if url and key:
-        return create_client(url, key)
-    return None
+    """Get the shared Supabase client (None if not configured)."""
+    try:
+        return get_shared_supabase_client()
+    except ValueError:
+        return None
 
 
 # === Signature Verification Functions ===
@@ -274,11 +274,14 @@ async def clickup_webhook(
 async def process_gmail_notification(email_address: str, history_id: int) -> None:
     """Process Gmail push notification in background.
 
-    Triggers email sync for the affected mailbox.
+    Wakes the Gmail monitor worker, which syncs the mailbox history since
+    its last sync instead of waiting for its next full scan.
     """
     logger.info(f"[GMAIL] Processing notification for {email_address}, history_id={history_id}")
-    # TODO: Trigger email sync via gmail_integration service
-    # This would call the gmail sync service to fetch new messages
+    await notify_work(GMAIL_CHANNEL, {
+        "email_address": email_address,
+        "history_id": history_id,
+    })
 
 
 @router.post("/gmail", response_model=WebhookResponse)
@@ -476,7 +479,7 @@ async def energy_webhook(
         tenant_id = payload.tenant_id or "default"
 
         # Insert tracking entry
-        result = client.table('energy_tracking').insert({
+        result = await run_query(client.table('energy_tracking').insert({
             'tenant_id': tenant_id,
             'user_id': user_id,
             'timestamp': timestamp.isoformat(),
@@ -484,7 +487,7 @@ async def energy_webhook(
             'focus_quality': payload.focus_quality,
             'source': payload.source,
             'notes': payload.notes,
-        }).execute()
+        }))
 
         if result.data:
             entry_id = result.data[0].get('id', 'unknown')
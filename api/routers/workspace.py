@@ -41,6 +41,7 @@ from models.workspace import (
 )
 from middleware.auth import get_current_user, UserContext, require_roles
 from config import get_settings
+from services.db_pool import get_supabase_client as get_shared_supabase_client, run_query
 
 
 router = APIRouter(prefix="/api/workspaces", tags=["Workspaces"])
@@ -59,9 +60,7 @@ def get_supabase():
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service not configured"
         )
-
-    from supabase import create_client
-    return create_client(settings.supabase_url, settings.supabase_service_key)
+    return get_shared_supabase_client()
 
 
 # === Helper Functions ===
@@ -80,9 +79,9 @@ async def get_user_workspaces(user: UserContext, supabase) -> List[dict]:
     """Get all workspaces user belongs to."""
     try:
         # Query tenant_users to get user's workspace memberships
-        result = supabase.table("tenant_users").select(
+        result = await run_query(supabase.table("tenant_users").select(
             "tenant_id, role, created_at, tenants(tenant_id, name, settings, created_at)"
-        ).eq("user_id", user.uid).execute()
+        ).eq("user_id", user.uid))
 
         return result.data or []
     except Exception as e:
@@ -93,7 +92,7 @@ async def get_user_workspaces(user: UserContext, supabase) -> List[dict]:
 async def get_workspace_by_id(workspace_id: str, supabase) -> Optional[dict]:
     """Get workspace by ID."""
     try:
-        result = supabase.table("tenants").select("*").eq("tenant_id", workspace_id).single().execute()
+        result = await run_query(supabase.table("tenants").select("*").eq("tenant_id", workspace_id).single())
         return result.data
     except Exception as e:
         logger.warning(f"Workspace {workspace_id} not found: {e}")
@@ -103,9 +102,9 @@ async def get_workspace_by_id(workspace_id: str, supabase) -> Optional[dict]:
 async def get_user_role_in_workspace(user_id: str, workspace_id: str, supabase) -> Optional[str]:
     """Get user's role in a specific workspace."""
     try:
-        result = supabase.table("tenant_users").select("role").eq(
+        result = await run_query(supabase.table("tenant_users").select("role").eq(
             "user_id", user_id
-        ).eq("tenant_id", workspace_id).single().execute()
+        ).eq("tenant_id", workspace_id).single())
         return result.data.get("role") if result.data else None
     except Exception:
         return None
@@ -115,9 +114,9 @@ async def get_active_workspace_id(user_id: str, supabase) -> Optional[str]:
     """Get user's currently active workspace ID."""
     try:
         # Check if user_preferences table exists and has active_workspace
-        result = supabase.table("user_preferences").select(
+        result = await run_query(supabase.table("user_preferences").select(
             "active_workspace_id"
-        ).eq("user_id", user_id).single().execute()
+        ).eq("user_id", user_id).single())
         return result.data.get("active_workspace_id") if result.data else None
     except Exception:
         # If table doesn't exist or no record, return None
@@ -128,11 +127,11 @@ async def set_active_workspace(user_id: str, workspace_id: str, supabase) -> boo
     """Set user's active workspace."""
     try:
         # Upsert to user_preferences table
-        supabase.table("user_preferences").upsert({
+        await run_query(supabase.table("user_preferences").upsert({
             "user_id": user_id,
             "active_workspace_id": workspace_id,
             "updated_at": now_pacific()
-        }, on_conflict="user_id").execute()
+        }, on_conflict="user_id"))
         return True
     except Exception as e:
         logger.error(f"Error setting active workspace: {e}")
@@ -142,9 +141,9 @@ async def set_active_workspace(user_id: str, workspace_id: str, supabase) -> boo
 async def get_workspace_member_count(workspace_id: str, supabase) -> int:
     """Get count of members in a workspace."""
     try:
-        result = supabase.table("tenant_users").select(
+        result = await run_query(supabase.table("tenant_users").select(
             "user_id", count="exact"
-        ).eq("tenant_id", workspace_id).execute()
+        ).eq("tenant_id", workspace_id))
         return result.count or 1
     except Exception:
         return 1
@@ -392,16 +391,16 @@ async def create_workspace(
             "updated_at": now,
         }
 
-        supabase.table("tenants").insert(tenant_data).execute()
+        await run_query(supabase.table("tenants").insert(tenant_data))
 
         # Add creator as owner in tenant_users
-        supabase.table("tenant_users").insert({
+        await run_query(supabase.table("tenant_users").insert({
             "tenant_id": workspace_id,
             "user_id": user.uid,
             "role": "owner",
             "groups": [],
             "created_at": now,
-        }).execute()
+        }))
 
         # Set as active workspace if user has none
         current_active = await get_active_workspace_id(user.uid, supabase)
@@ -488,15 +487,15 @@ async def create_personal_workspace(
             "updated_at": now,
         }
 
-        supabase.table("tenants").insert(tenant_data).execute()
+        await run_query(supabase.table("tenants").insert(tenant_data))
 
-        supabase.table("tenant_users").insert({
+        await run_query(supabase.table("tenant_users").insert({
             "tenant_id": workspace_id,
             "user_id": user.uid,
             "role": "owner",
             "groups": [],
             "created_at": now,
-        }).execute()
+        }))
 
         # Set as active workspace
         await set_active_workspace(user.uid, workspace_id, supabase)
@@ -575,7 +574,7 @@ async def update_workspace(
             update_data["settings"] = current_settings
 
         # Perform update
-        supabase.table("tenants").update(update_data).eq("tenant_id", workspace_id).execute()
+        await run_query(supabase.table("tenants").update(update_data).eq("tenant_id", workspace_id))
 
         # Fetch updated workspace
         updated = await get_workspace_by_id(workspace_id, supabase)
@@ -723,7 +722,7 @@ async def delete_workspace(
         active_id = await get_active_workspace_id(user.uid, supabase)
 
         # Delete workspace (cascade will handle tenant_users)
-        supabase.table("tenants").delete().eq("tenant_id", workspace_id).execute()
+        await run_query(supabase.table("tenants").delete().eq("tenant_id", workspace_id))
 
         # If we deleted the active workspace, switch to another
         fallback_id = None
@@ -763,9 +762,9 @@ async def delete_workspace(
 async def get_workspace_members(workspace_id: str, supabase) -> List[dict]:
     """Get all members of a workspace with their profile info."""
     try:
-        result = supabase.table("tenant_users").select(
+        result = await run_query(supabase.table("tenant_users").select(
             "user_id, role, created_at, users(id, email, display_name)"
-        ).eq("tenant_id", workspace_id).execute()
+        ).eq("tenant_id", workspace_id))
         return result.data or []
     except Exception as e:
         logger.error(f"Error fetching workspace members: {e}")
@@ -775,9 +774,9 @@ async def get_workspace_members(workspace_id: str, supabase) -> List[dict]:
 async def get_user_by_email(email: str, supabase) -> Optional[dict]:
     """Find a user by their email address."""
     try:
-        result = supabase.table("users").select(
+        result = await run_query(supabase.table("users").select(
             "id, email, display_name"
-        ).eq("email", email).single().execute()
+        ).eq("email", email).single())
         return result.data
     except Exception:
         return None
@@ -786,9 +785,9 @@ async def get_user_by_email(email: str, supabase) -> Optional[dict]:
 async def get_user_by_id(user_id: str, supabase) -> Optional[dict]:
     """Get user by their ID."""
     try:
-        result = supabase.table("users").select(
+        result = await run_query(supabase.table("users").select(
             "id, email, display_name"
-        ).eq("id", user_id).single().execute()
+        ).eq("id", user_id).single())
         return result.data
     except Exception:
         return None
@@ -797,9 +796,9 @@ async def get_user_by_id(user_id: str, supabase) -> Optional[dict]:
 async def is_user_in_workspace(user_id: str, workspace_id: str, supabase) -> bool:
     """Check if a user is already a member of a workspace."""
     try:
-        result = supabase.table("tenant_users").select("user_id").eq(
+        result = await run_query(supabase.table("tenant_users").select("user_id").eq(
             "tenant_id", workspace_id
-        ).eq("user_id", user_id).single().execute()
+        ).eq("user_id", user_id).single())
         return result.data is not None
     except Exception:
         return False
@@ -808,9 +807,9 @@ async def is_user_in_workspace(user_id: str, workspace_id: str, supabase) -> boo
 async def count_workspace_owners(workspace_id: str, supabase) -> int:
     """Count the number of owners in a workspace."""
     try:
-        result = supabase.table("tenant_users").select(
+        result = await run_query(supabase.table("tenant_users").select(
             "user_id", count="exact"
-        ).eq("tenant_id", workspace_id).eq("role", "owner").execute()
+        ).eq("tenant_id", workspace_id).eq("role", "owner"))
         return result.count or 0
     except Exception:
         return 0
@@ -946,13 +945,13 @@ async def add_workspace_member(
         now = now_pacific()
 
         # Add member to workspace
-        supabase.table("tenant_users").insert({
+        await run_query(supabase.table("tenant_users").insert({
             "tenant_id": workspace_id,
             "user_id": target_user_id,
             "role": member_data.role.value,
             "groups": [],
             "created_at": now,
-        }).execute()
+        }))
 
         logger.info(f"Added member {target_user_id} to workspace {workspace_id} with role {member_data.role}")
 
@@ -1039,9 +1038,9 @@ async def update_member_role(
                 )
 
         # Update the role
-        supabase.table("tenant_users").update({
+        await run_query(supabase.table("tenant_users").update({
             "role": new_role,
-        }).eq("tenant_id", workspace_id).eq("user_id", member_id).execute()
+        }).eq("tenant_id", workspace_id).eq("user_id", member_id))
 
         # Fetch updated member info
         target_user = await get_user_by_id(member_id, supabase)
@@ -1135,9 +1134,9 @@ async def remove_workspace_member(
                 )
 
         # Remove the member
-        supabase.table("tenant_users").delete().eq(
+        await run_query(supabase.table("tenant_users").delete().eq(
             "tenant_id", workspace_id
-        ).eq("user_id", member_id).execute()
+        ).eq("user_id", member_id))
 
         # If user removed themselves, clear their active workspace if it was this one
         if is_self_removal:
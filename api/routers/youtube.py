@@ -27,6 +27,7 @@ from models.youtube import (
     YouTubeTemplatesResponse,
 )
 from middleware.auth import get_current_user, UserContext
+from services.db_pool import run_blocking
 
 # Add services to path for imports
 services_path = Path(__file__).parent.parent.parent / "services"
@@ -161,7 +162,7 @@ async def get_playlists(
             )
 
         # Get playlists from YouTube API
-        playlists_data = manager.get_playlists(channel_name)
+        playlists_data = await run_blocking(manager.get_playlists, channel_name)
 
         playlists = []
         for pl in playlists_data:
@@ -251,7 +252,8 @@ async def get_playlist_videos(
             )
 
         # Get videos from YouTube API
-        videos_data = manager.get_playlist_videos(
+        videos_data = await run_blocking(
+            manager.get_playlist_videos,
             playlist_id=playlist_id,
             channel_name=channel_name,
             max_results=limit,
@@ -405,7 +407,7 @@ async def process_playlist(
             )
 
         # Find playlist name by ID
-        playlists = manager.get_playlists(channel_name)
+        playlists = await run_blocking(manager.get_playlists, channel_name)
         playlist = next(
             (p for p in playlists if p["id"] == process_request.playlist_id),
             None
@@ -544,7 +546,7 @@ async def preview_playlist(
             )
 
         # Find playlist by ID to get the name
-        playlists = manager.get_playlists(channel_name)
+        playlists = await run_blocking(manager.get_playlists, channel_name)
         playlist = next(
             (p for p in playlists if p["id"] == playlist_id),
             None
@@ -560,7 +562,7 @@ async def preview_playlist(
 
         # Get preview using playlist name
         processor = get_playlist_processor(channel_name)
-        preview = processor.preview_playlist(playlist["title"])
+        preview = await run_blocking(processor.preview_playlist, playlist["title"])
 
         return APIResponse(
             success=True,
@@ -1,5 +1,7 @@
 -- Add vector embedding support to processed_content table
 -- Requires pgvector extension (already enabled in Supabase)
+-- The index and search_content_by_embedding() below are superseded by
+-- migrations/011_vector_ann_indexes.sql (HNSW, nearest-k-then-threshold)
 
 -- Add embedding column (1536 dimensions for text-embedding-3-small)
 ALTER TABLE processed_content
@@ -1,5 +1,6 @@
 -- Vector Similarity Search Function for documents_pg
 -- Follows n8n RAG pattern for semantic search
+-- Superseded by migrations/011_vector_ann_indexes.sql (HNSW, nearest-k-then-threshold)
 
 CREATE OR REPLACE FUNCTION match_documents(
   query_embedding vector(1536),
@@ -0,0 +1,31 @@
+-- ============================================================================
+-- Flourisha AI Brain - documents_pg Source Lookup Index
+-- Purpose: Keyed lookup of documents_pg rows by (tenant, source, source_id)
+-- ============================================================================
+--
+-- KnowledgeIngestionService resolves the documents_pg row for an ingested
+-- item (e.g. a Gmail message) by metadata->>'source' / metadata->>'source_id'.
+-- Without an index this is a full scan of the tenant's documents for every
+-- ingested item. The expression index below matches the PostgREST filters
+--   ?tenant_id=eq.X&metadata->>source=eq.Y&metadata->>source_id=eq.Z
+-- exactly, so the lookup becomes a single index probe.
+--
+-- CONCURRENTLY avoids locking writes on large tables; it cannot run inside a
+-- transaction block, so execute this file on its own (psql -f / SQL Editor).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_pg_source_lookup
+    ON public.documents_pg (tenant_id, (metadata->>'source'), (metadata->>'source_id'));
+
+COMMENT ON INDEX public.idx_documents_pg_source_lookup IS
+    'Keyed lookup of documents_pg by (tenant_id, metadata source, metadata source_id) for ingestion dedup';
+
+-- Verification:
+-- EXPLAIN SELECT id FROM documents_pg
+--  WHERE tenant_id = 'default'
+--    AND metadata->>'source' = 'gmail'
+--    AND metadata->>'source_id' = 'abc123'
+--  LIMIT 1;
+-- Expect: Index Scan using idx_documents_pg_source_lookup
+
+-- Rollback:
+-- DROP INDEX CONCURRENTLY IF EXISTS public.idx_documents_pg_source_lookup;
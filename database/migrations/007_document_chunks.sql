@@ -0,0 +1,102 @@
+-- ============================================================================
+-- Flourisha AI Brain - Document Chunks Migration
+-- Purpose: Chunk-level embeddings so long documents are searchable end to end
+-- Multi-Tenant with Row-Level Security (RLS)
+-- ============================================================================
+--
+-- KnowledgeIngestionService previously embedded only the first 8,000
+-- characters of each document. It now chunks the full text, embeds the
+-- chunks in batches and bulk-inserts them here. query_knowledge() searches
+-- them through match_document_chunks().
+
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS vector;
+
+-- ============================================================================
+-- Step 1: document_chunks table
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS public.document_chunks (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+
+    -- Multi-tenant identity
+    tenant_id TEXT NOT NULL,
+
+    -- Parent document: ingestion document_id (content hash) and, when the
+    -- document lives in documents_pg, its row id
+    document_id TEXT NOT NULL,
+    documents_pg_id BIGINT,
+
+    -- Chunk payload
+    chunk_index INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    char_count INTEGER NOT NULL DEFAULT 0,
+    embedding vector(1536),
+    embedding_model TEXT,
+    metadata JSONB DEFAULT '{}'::jsonb,
+
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT uq_document_chunks_position UNIQUE (tenant_id, document_id, chunk_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_document_chunks_tenant_document
+    ON public.document_chunks(tenant_id, document_id);
+
+COMMENT ON TABLE public.document_chunks IS 'Chunk-level embeddings for ingested documents (full-text coverage for semantic search)';
+COMMENT ON COLUMN public.document_chunks.document_id IS 'KnowledgeIngestionService document_id (source/content hash)';
+COMMENT ON COLUMN public.document_chunks.documents_pg_id IS 'documents_pg.id of the parent row, when stored there';
+COMMENT ON COLUMN public.document_chunks.chunk_index IS 'Zero-based position of the chunk within the document';
+
+-- ============================================================================
+-- Step 2: Row Level Security
+-- ============================================================================
+ALTER TABLE public.document_chunks ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "document_chunks_tenant_isolation" ON public.document_chunks;
+CREATE POLICY "document_chunks_tenant_isolation"
+ON public.document_chunks
+FOR SELECT
+USING (tenant_id = current_setting('request.jwt.claims', true)::json->>'tenant_id');
+
+-- ============================================================================
+-- Step 3: Chunk similarity search
+-- ============================================================================
+CREATE OR REPLACE FUNCTION match_document_chunks(
+    query_embedding vector(1536),
+    filter_tenant text,
+    match_count int DEFAULT 10
+)
+RETURNS TABLE (
+    id uuid,
+    document_id text,
+    documents_pg_id bigint,
+    chunk_index int,
+    content text,
+    metadata jsonb,
+    similarity float
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        dc.id,
+        dc.document_id,
+        dc.documents_pg_id,
+        dc.chunk_index,
+        dc.content,
+        dc.metadata,
+        1 - (dc.embedding <=> query_embedding) AS similarity
+    FROM document_chunks dc
+    WHERE dc.tenant_id = filter_tenant
+      AND dc.embedding IS NOT NULL
+    ORDER BY dc.embedding <=> query_embedding
+    LIMIT match_count;
+$$;
+
+GRANT EXECUTE ON FUNCTION match_document_chunks TO authenticated;
+GRANT EXECUTE ON FUNCTION match_document_chunks TO service_role;
+
+COMMENT ON FUNCTION match_document_chunks IS 'Top-N chunk similarity search over document_chunks for a tenant (cosine distance).';
+
+-- Rollback:
+-- DROP FUNCTION IF EXISTS match_document_chunks;
+-- DROP TABLE IF EXISTS public.document_chunks CASCADE;
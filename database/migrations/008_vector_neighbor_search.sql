@@ -0,0 +1,125 @@
+-- ============================================================================
+-- Flourisha AI Brain - Vector-In Search and Content Neighbours
+-- Purpose: Similarity search from an existing vector (no query embedding call)
+-- ============================================================================
+--
+-- search_content_by_embedding() needs a query embedding, which the API used
+-- to regenerate from embedding_text just to find "related content" for a row
+-- whose vector is already stored. These functions search from stored vectors
+-- directly, so neighbour lookups are one DB round-trip with no OpenAI call.
+
+-- ============================================================================
+-- Step 1: Search processed_content from a caller-supplied vector
+-- ============================================================================
+CREATE OR REPLACE FUNCTION search_content_by_vector(
+    query_embedding vector(1536),
+    match_tenant_id text,
+    match_threshold float DEFAULT 0.7,
+    match_count int DEFAULT 10,
+    exclude_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    content_type text,
+    summary text,
+    tags jsonb,
+    source_url text,
+    similarity float
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        pc.id,
+        pc.title::text,
+        pc.content_type::text,
+        pc.summary,
+        pc.tags,
+        pc.content_url AS source_url,
+        1 - (pc.embedding <=> query_embedding) AS similarity
+    FROM processed_content pc
+    WHERE pc.tenant_id = match_tenant_id
+      AND pc.embedding IS NOT NULL
+      AND (exclude_id IS NULL OR pc.id <> exclude_id)
+      AND 1 - (pc.embedding <=> query_embedding) > match_threshold
+    ORDER BY pc.embedding <=> query_embedding
+    LIMIT match_count;
+$$;
+
+-- ============================================================================
+-- Step 2: Neighbours of one stored content row
+-- ============================================================================
+CREATE OR REPLACE FUNCTION match_content_neighbors(
+    source_content_id uuid,
+    match_tenant_id text,
+    match_threshold float DEFAULT 0.7,
+    match_count int DEFAULT 5
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    content_type text,
+    summary text,
+    tags jsonb,
+    source_url text,
+    similarity float
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT n.*
+    FROM processed_content src
+    CROSS JOIN LATERAL search_content_by_vector(
+        src.embedding, match_tenant_id, match_threshold, match_count, src.id
+    ) n
+    WHERE src.id = source_content_id
+      AND src.tenant_id = match_tenant_id
+      AND src.embedding IS NOT NULL;
+$$;
+
+-- ============================================================================
+-- Step 3: Neighbours for many content rows in one round-trip
+-- ============================================================================
+CREATE OR REPLACE FUNCTION match_content_neighbors_batch(
+    source_content_ids uuid[],
+    match_tenant_id text,
+    match_threshold float DEFAULT 0.7,
+    match_count int DEFAULT 5
+)
+RETURNS TABLE (
+    source_id uuid,
+    id uuid,
+    title text,
+    content_type text,
+    summary text,
+    tags jsonb,
+    source_url text,
+    similarity float
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT src.id AS source_id, n.*
+    FROM processed_content src
+    CROSS JOIN LATERAL search_content_by_vector(
+        src.embedding, match_tenant_id, match_threshold, match_count, src.id
+    ) n
+    WHERE src.id = ANY(source_content_ids)
+      AND src.tenant_id = match_tenant_id
+      AND src.embedding IS NOT NULL
+    ORDER BY src.id, n.similarity DESC;
+$$;
+
+GRANT EXECUTE ON FUNCTION search_content_by_vector TO authenticated;
+GRANT EXECUTE ON FUNCTION search_content_by_vector TO service_role;
+GRANT EXECUTE ON FUNCTION match_content_neighbors TO authenticated;
+GRANT EXECUTE ON FUNCTION match_content_neighbors TO service_role;
+GRANT EXECUTE ON FUNCTION match_content_neighbors_batch TO authenticated;
+GRANT EXECUTE ON FUNCTION match_content_neighbors_batch TO service_role;
+
+COMMENT ON FUNCTION search_content_by_vector IS 'Similarity search over processed_content from a supplied vector (no query embedding needed).';
+COMMENT ON FUNCTION match_content_neighbors IS 'Nearest neighbours of a stored processed_content row, using its stored embedding.';
+COMMENT ON FUNCTION match_content_neighbors_batch IS 'Nearest neighbours for many processed_content rows in one call (related-content panels).';
+
+-- Rollback:
+-- DROP FUNCTION IF EXISTS match_content_neighbors_batch;
+-- DROP FUNCTION IF EXISTS match_content_neighbors;
+-- DROP FUNCTION IF EXISTS search_content_by_vector;
@@ -0,0 +1,262 @@
+-- ============================================================================
+-- Flourisha AI Brain - Entity Candidate Search
+-- Purpose: Indexed shortlist of existing companies/contacts/properties for
+--          each extracted entity before LLM entity matching
+-- ============================================================================
+--
+-- Document ingestion used to send every company, contact and property of the
+-- tenant to the entity matcher (three unbounded selects per document), and
+-- the prompt silently dropped everything past row 50. These functions return
+-- the top-k candidates per extracted entity using:
+--   - pg_trgm similarity on names / addresses (GIN trigram indexes)
+--   - Double Metaphone on contact last names (fuzzystrmatch)
+--   - exact normalized email / phone (last 10 digits) / shorthand / alias hits
+--
+-- The CREATE INDEX CONCURRENTLY statements cannot run inside a transaction
+-- block, so execute this file on its own (psql -f / SQL Editor).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS fuzzystrmatch;
+
+-- ============================================================================
+-- Step 1: Indexes
+-- ============================================================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mrl_companies_name_trgm
+    ON public.mrl_companies USING gin (lower(compname) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mrl_contacts_name_trgm
+    ON public.mrl_contacts USING gin (
+        lower(coalesce(firstname, '') || ' ' || coalesce(lastname, '')) gin_trgm_ops
+    );
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mrl_contacts_email
+    ON public.mrl_contacts (tenant_id, lower(email));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mrl_contacts_phone
+    ON public.mrl_contacts (tenant_id, right(regexp_replace(phonenumber, '\D', '', 'g'), 10));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mrl_contacts_lastname_dmetaphone
+    ON public.mrl_contacts (tenant_id, dmetaphone(lastname));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mrl_properties_address_trgm
+    ON public.mrl_properties USING gin (lower(full_address) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mrl_properties_shorthand
+    ON public.mrl_properties (tenant_id, lower(shorthand));
+
+-- ============================================================================
+-- Step 2: Helper - text values of a lookup column
+-- ============================================================================
+-- Accepts a scalar, a {"value": ...} object (as written by DocumentStore),
+-- or a JSON array of either.
+CREATE OR REPLACE FUNCTION mrl_jsonb_text_values(value jsonb)
+RETURNS SETOF text
+LANGUAGE sql IMMUTABLE
+AS $$
+    SELECT v
+    FROM (
+        SELECT CASE jsonb_typeof(e)
+                   WHEN 'object' THEN e ->> 'value'
+                   WHEN 'string' THEN e #>> '{}'
+                   WHEN 'number' THEN e #>> '{}'
+               END AS v
+        FROM jsonb_array_elements(
+            CASE jsonb_typeof(value) WHEN 'array' THEN value ELSE jsonb_build_array(value) END
+        ) e
+    ) elements
+    WHERE v IS NOT NULL;
+$$;
+
+-- ============================================================================
+-- Step 3: Company candidates
+-- ============================================================================
+-- query_name: lowercased name; query_email: lowercased email;
+-- query_phone: last 10 digits. NULL/empty inputs are skipped.
+CREATE OR REPLACE FUNCTION match_company_candidates(
+    filter_tenant text,
+    query_name text,
+    query_email text DEFAULT NULL,
+    query_phone text DEFAULT NULL,
+    match_count int DEFAULT 5
+)
+RETURNS TABLE (record jsonb, score real)
+LANGUAGE sql STABLE
+AS $$
+    WITH hits AS (
+        (SELECT c.id, similarity(lower(c.compname), query_name) AS score
+         FROM mrl_companies c
+         WHERE c.tenant_id = filter_tenant
+           AND coalesce(query_name, '') <> ''
+           AND lower(c.compname) % query_name
+         ORDER BY lower(c.compname) <-> query_name
+         LIMIT match_count)
+        UNION ALL
+        (SELECT c.id, 1.0::real
+         FROM mrl_companies c
+         WHERE c.tenant_id = filter_tenant
+           AND (
+               (coalesce(query_email, '') <> '' AND EXISTS (
+                   SELECT 1 FROM mrl_jsonb_text_values(c.primaryemail) v
+                   WHERE lower(v) = query_email))
+               OR (coalesce(query_phone, '') <> '' AND EXISTS (
+                   SELECT 1 FROM mrl_jsonb_text_values(c.primaryphone) v
+                   WHERE right(regexp_replace(v, '\D', '', 'g'), 10) = query_phone))
+           )
+         LIMIT match_count)
+    )
+    SELECT
+        jsonb_build_object(
+            'id', c.id,
+            'airtable_id', c.airtable_id,
+            'compname', c.compname,
+            'comptype', c.comptype,
+            'websiteurl', c.websiteurl,
+            'streetaddress', c.streetaddress,
+            'city', c.city,
+            'stateregion', c.stateregion,
+            'primaryphone', c.primaryphone,
+            'primaryemail', c.primaryemail
+        ),
+        max(h.score)::real
+    FROM hits h
+    JOIN mrl_companies c ON c.id = h.id
+    GROUP BY c.id
+    ORDER BY 2 DESC
+    LIMIT match_count;
+$$;
+
+-- ============================================================================
+-- Step 4: Contact candidates
+-- ============================================================================
+CREATE OR REPLACE FUNCTION match_contact_candidates(
+    filter_tenant text,
+    query_name text,
+    query_last_name text DEFAULT NULL,
+    query_email text DEFAULT NULL,
+    query_phone text DEFAULT NULL,
+    match_count int DEFAULT 5
+)
+RETURNS TABLE (record jsonb, score real)
+LANGUAGE sql STABLE
+AS $$
+    WITH hits AS (
+        (SELECT c.id,
+                similarity(lower(coalesce(c.firstname, '') || ' ' || coalesce(c.lastname, '')), query_name) AS score
+         FROM mrl_contacts c
+         WHERE c.tenant_id = filter_tenant
+           AND coalesce(query_name, '') <> ''
+           AND lower(coalesce(c.firstname, '') || ' ' || coalesce(c.lastname, '')) % query_name
+         ORDER BY lower(coalesce(c.firstname, '') || ' ' || coalesce(c.lastname, '')) <-> query_name
+         LIMIT match_count)
+        UNION ALL
+        (SELECT c.id, 0.5::real
+         FROM mrl_contacts c
+         WHERE c.tenant_id = filter_tenant
+           AND coalesce(query_last_name, '') <> ''
+           AND dmetaphone(c.lastname) = dmetaphone(query_last_name)
+         LIMIT match_count)
+        UNION ALL
+        (SELECT c.id, 1.0::real
+         FROM mrl_contacts c
+         WHERE c.tenant_id = filter_tenant
+           AND coalesce(query_email, '') <> ''
+           AND lower(c.email) = query_email
+         LIMIT match_count)
+        UNION ALL
+        (SELECT c.id, 1.0::real
+         FROM mrl_contacts c
+         WHERE c.tenant_id = filter_tenant
+           AND coalesce(query_phone, '') <> ''
+           AND right(regexp_replace(c.phonenumber, '\D', '', 'g'), 10) = query_phone
+         LIMIT match_count)
+    )
+    SELECT
+        jsonb_build_object(
+            'id', c.id,
+            'airtable_id', c.airtable_id,
+            'firstname', c.firstname,
+            'lastname', c.lastname,
+            'email', c.email,
+            'phonenumber', c.phonenumber
+        ),
+        max(h.score)::real
+    FROM hits h
+    JOIN mrl_contacts c ON c.id = h.id
+    GROUP BY c.id
+    ORDER BY 2 DESC
+    LIMIT match_count;
+$$;
+
+-- ============================================================================
+-- Step 5: Property candidates
+-- ============================================================================
+-- query_address: lowercased full address; query_short: lowercased short form
+CREATE OR REPLACE FUNCTION match_property_candidates(
+    filter_tenant text,
+    query_address text,
+    query_short text DEFAULT NULL,
+    match_count int DEFAULT 5
+)
+RETURNS TABLE (record jsonb, score real)
+LANGUAGE sql STABLE
+AS $$
+    WITH hits AS (
+        (SELECT p.id, similarity(lower(p.full_address), query_address) AS score
+         FROM mrl_properties p
+         WHERE p.tenant_id = filter_tenant
+           AND coalesce(query_address, '') <> ''
+           AND lower(p.full_address) % query_address
+         ORDER BY lower(p.full_address) <-> query_address
+         LIMIT match_count)
+        UNION ALL
+        (SELECT p.id, 1.0::real
+         FROM mrl_properties p
+         WHERE p.tenant_id = filter_tenant
+           AND coalesce(query_short, '') <> ''
+           AND lower(p.shorthand) = query_short
+         LIMIT match_count)
+        UNION ALL
+        (SELECT p.id, 1.0::real
+         FROM mrl_properties p
+         WHERE p.tenant_id = filter_tenant
+           AND EXISTS (
+               SELECT 1 FROM unnest(p.aliases) a
+               WHERE lower(a) IN (query_address, query_short))
+         LIMIT match_count)
+    )
+    SELECT
+        jsonb_build_object(
+            'id', p.id,
+            'shorthand', p.shorthand,
+            'full_address', p.full_address,
+            'city', p.city,
+            'state', p.state,
+            'zip', p.zip,
+            'aliases', p.aliases
+        ),
+        max(h.score)::real
+    FROM hits h
+    JOIN mrl_properties p ON p.id = h.id
+    GROUP BY p.id
+    ORDER BY 2 DESC
+    LIMIT match_count;
+$$;
+
+-- Verification:
+-- SELECT * FROM match_company_candidates('default', 'acme property management', NULL, NULL, 5);
+-- EXPLAIN SELECT id FROM mrl_contacts
+--  WHERE tenant_id = 'default' AND lower(email) = 'jane@example.com';
+-- Expect: Index Scan using idx_mrl_contacts_email
+
+-- Rollback:
+-- DROP FUNCTION IF EXISTS match_property_candidates(text, text, text, int);
+-- DROP FUNCTION IF EXISTS match_contact_candidates(text, text, text, text, text, int);
+-- DROP FUNCTION IF EXISTS match_company_candidates(text, text, text, text, int);
+-- DROP FUNCTION IF EXISTS mrl_jsonb_text_values(jsonb);
+-- DROP INDEX CONCURRENTLY IF EXISTS public.idx_mrl_properties_shorthand;
+-- DROP INDEX CONCURRENTLY IF EXISTS public.idx_mrl_properties_address_trgm;
+-- DROP INDEX CONCURRENTLY IF EXISTS public.idx_mrl_contacts_lastname_dmetaphone;
+-- DROP INDEX CONCURRENTLY IF EXISTS public.idx_mrl_contacts_phone;
+-- DROP INDEX CONCURRENTLY IF EXISTS public.idx_mrl_contacts_email;
+-- DROP INDEX CONCURRENTLY IF EXISTS public.idx_mrl_contacts_name_trgm;
+-- DROP INDEX CONCURRENTLY IF EXISTS public.idx_mrl_companies_name_trgm;
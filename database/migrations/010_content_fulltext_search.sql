@@ -0,0 +1,100 @@
+-- ============================================================================
+-- Flourisha AI Brain - Full-Text Search over processed_content
+-- Purpose: Keyword (tsvector) retrieval for hybrid search in /api/search
+-- ============================================================================
+--
+-- /api/search used only pgvector similarity, which is weak for exact names
+-- (people, properties, companies, product names). This adds a weighted
+-- tsvector over title (A), tags (B), summary (B), embedding_text (C) and the
+-- first 100k characters of the transcript (D), a GIN expression index, and a
+-- ranked search function. The API runs it concurrently with the vector and
+-- graph searches and fuses the lists with reciprocal-rank fusion
+-- (services/hybrid_search.py).
+--
+-- An expression index is used instead of a stored generated column so the
+-- table is not rewritten. The CREATE INDEX CONCURRENTLY statement cannot run
+-- inside a transaction block, so execute this file on its own
+-- (psql -f / SQL Editor).
+
+-- ============================================================================
+-- Step 1: Search vector (IMMUTABLE so it can back an index)
+-- ============================================================================
+CREATE OR REPLACE FUNCTION processed_content_search_vector(
+    title text,
+    tags jsonb,
+    summary text,
+    embedding_text text,
+    transcript text
+)
+RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(jsonb_to_tsvector('english'::regconfig, coalesce(tags, '[]'::jsonb), '["string"]'), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(summary, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(embedding_text, '')), 'C') ||
+        setweight(to_tsvector('english'::regconfig, left(coalesce(transcript, ''), 100000)), 'D');
+$$;
+
+-- ============================================================================
+-- Step 2: GIN expression index
+-- ============================================================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_processed_content_search_vector
+    ON public.processed_content USING gin (
+        processed_content_search_vector(title::text, tags, summary, embedding_text, transcript)
+    );
+
+-- ============================================================================
+-- Step 3: Ranked keyword search
+-- ============================================================================
+-- query_text uses web-search syntax: words are ANDed, "quoted phrases",
+-- OR, and -excluded words. Rank is ts_rank_cd normalized to 0..1.
+CREATE OR REPLACE FUNCTION search_content_fulltext(
+    query_text text,
+    match_tenant_id text,
+    match_count int DEFAULT 10
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    content_type text,
+    summary text,
+    tags jsonb,
+    source_url text,
+    rank float
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        pc.id,
+        pc.title::text,
+        pc.content_type::text,
+        pc.summary,
+        pc.tags,
+        pc.content_url AS source_url,
+        ts_rank_cd(
+            processed_content_search_vector(pc.title::text, pc.tags, pc.summary, pc.embedding_text, pc.transcript),
+            q,
+            32
+        ) AS rank
+    FROM processed_content pc,
+         websearch_to_tsquery('english'::regconfig, query_text) q
+    WHERE pc.tenant_id = match_tenant_id
+      AND processed_content_search_vector(pc.title::text, pc.tags, pc.summary, pc.embedding_text, pc.transcript) @@ q
+    ORDER BY rank DESC
+    LIMIT match_count;
+$$;
+
+GRANT EXECUTE ON FUNCTION processed_content_search_vector TO authenticated;
+GRANT EXECUTE ON FUNCTION processed_content_search_vector TO service_role;
+GRANT EXECUTE ON FUNCTION search_content_fulltext TO authenticated;
+GRANT EXECUTE ON FUNCTION search_content_fulltext TO service_role;
+
+COMMENT ON FUNCTION processed_content_search_vector IS 'Weighted tsvector over processed_content (title A, tags/summary B, embedding_text C, transcript D); backs idx_processed_content_search_vector.';
+COMMENT ON FUNCTION search_content_fulltext IS 'Ranked full-text search over processed_content (keyword stage of hybrid search).';
+
+-- Rollback:
+-- DROP FUNCTION IF EXISTS search_content_fulltext;
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_processed_content_search_vector;
+-- DROP FUNCTION IF EXISTS processed_content_search_vector;
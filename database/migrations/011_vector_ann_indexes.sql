@@ -0,0 +1,351 @@
+-- ============================================================================
+-- Flourisha AI Brain - Approximate Nearest Neighbour Indexes for pgvector
+-- Purpose: HNSW indexes on every embedding table; search functions that can use them
+-- ============================================================================
+--
+-- The vector search functions filtered on the threshold before ordering:
+--
+--     WHERE 1 - (embedding <=> q) > match_threshold
+--     ORDER BY embedding <=> q LIMIT k
+--
+-- pgvector only uses an ANN index for a plain ORDER BY distance LIMIT k, so
+-- the threshold predicate forced an exact sequential scan that computed the
+-- distance twice per row. processed_content's IVFFlat index (lists = 100) was
+-- also built on an empty table, so its centroids are meaningless.
+--
+-- This migration:
+-- 1. Replaces the IVFFlat index with HNSW and adds HNSW indexes to
+--    documents_pg and document_chunks (built CONCURRENTLY)
+-- 2. Rewrites the search functions as "nearest k first, threshold after"
+-- 3. Adds vector_ann_prepare() (per-query ef_search / iterative scan) and
+--    vector_index_candidates(), which emits DDL for per-tenant partial
+--    indexes on large tenants
+--
+-- Tenant filtering: a global HNSW index returns the ef_search nearest rows
+-- of ALL tenants and filters afterwards, so a small tenant can get fewer
+-- than k rows. Three things keep recall up:
+-- - The search functions put the tenant in the query text as a literal, so
+--   the planner estimates each tenant's row count: small tenants get an
+--   exact scan through the tenant btree (cheap), large tenants an ANN scan
+-- - Large tenants get their own partial HNSW index (vector_index_candidates),
+--   which the planner matches on the literal tenant predicate
+-- - On pgvector >= 0.8, hnsw.iterative_scan keeps scanning until k rows pass
+--   the filter
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so
+-- execute this file on its own (psql -f / SQL Editor). Then create the
+-- per-tenant indexes from psql (\gexec runs each statement outside a
+-- transaction):
+--
+--     SELECT ddl FROM vector_index_candidates(50000) WHERE NOT index_exists \gexec
+--
+-- Measure recall@k and p95 latency before/after with
+-- scripts/benchmarks/vector_ann_benchmark.py.
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+-- ============================================================================
+-- Step 1: Global HNSW indexes
+-- ============================================================================
+-- m = 16 / ef_construction = 64 are pgvector's defaults; recall is tuned at
+-- query time with hnsw.ef_search (vector_ann_prepare)
+DROP INDEX CONCURRENTLY IF EXISTS processed_content_embedding_idx;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_processed_content_embedding_hnsw
+    ON public.processed_content USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_pg_embedding_hnsw
+    ON public.documents_pg USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_embedding_hnsw
+    ON public.document_chunks USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- Tenant btrees: the exact-scan path for small tenants
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_pg_tenant
+    ON public.documents_pg (tenant_id);
+
+-- ============================================================================
+-- Step 2: Per-query ANN settings
+-- ============================================================================
+-- Settings are transaction-local (PostgREST runs each RPC in its own
+-- transaction). ef_search must be at least k for HNSW to return k rows.
+CREATE OR REPLACE FUNCTION vector_ann_prepare(match_count int)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    vector_version text;
+BEGIN
+    PERFORM set_config('hnsw.ef_search', GREATEST(100, match_count * 4)::text, true);
+    PERFORM set_config('ivfflat.probes', '10', true);
+
+    SELECT extversion INTO vector_version FROM pg_extension WHERE extname = 'vector';
+    IF string_to_array(vector_version, '.')::int[] >= ARRAY[0, 8] THEN
+        PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+        PERFORM set_config('ivfflat.iterative_scan', 'relaxed_order', true);
+    END IF;
+END;
+$$;
+
+-- ============================================================================
+-- Step 3: processed_content search (nearest k first, threshold after)
+-- ============================================================================
+-- The tenant is formatted into the statement as a literal (%L) so each call
+-- is planned for that tenant, which lets the planner pick a per-tenant
+-- partial index or an exact scan for a small tenant.
+CREATE OR REPLACE FUNCTION search_content_by_vector(
+    query_embedding vector(1536),
+    match_tenant_id text,
+    match_threshold float DEFAULT 0.7,
+    match_count int DEFAULT 10,
+    exclude_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    content_type text,
+    summary text,
+    tags jsonb,
+    source_url text,
+    similarity float
+)
+LANGUAGE plpgsql STABLE
+AS $$
+BEGIN
+    PERFORM vector_ann_prepare(match_count);
+
+    RETURN QUERY EXECUTE format(
+        $sql$
+        SELECT nearest.id, nearest.title, nearest.content_type, nearest.summary,
+               nearest.tags, nearest.source_url, 1 - nearest.distance
+        FROM (
+            SELECT
+                pc.id,
+                pc.title::text AS title,
+                pc.content_type::text AS content_type,
+                pc.summary,
+                pc.tags,
+                pc.content_url AS source_url,
+                pc.embedding <=> $1 AS distance
+            FROM processed_content pc
+            WHERE pc.tenant_id = %L
+              AND pc.embedding IS NOT NULL
+              AND ($3::uuid IS NULL OR pc.id <> $3)
+            ORDER BY pc.embedding <=> $1
+            LIMIT $2
+        ) nearest
+        WHERE 1 - nearest.distance > $4
+        ORDER BY nearest.distance
+        $sql$,
+        match_tenant_id
+    ) USING query_embedding, match_count, exclude_id, match_threshold;
+END;
+$$;
+
+-- search_content_by_embedding (02_add_embeddings.sql) returned text ids and
+-- text[] tags that no longer match processed_content; it now delegates, so
+-- both RPCs share one ANN-friendly query.
+DROP FUNCTION IF EXISTS search_content_by_embedding(vector, text, float, int);
+
+CREATE FUNCTION search_content_by_embedding(
+    query_embedding vector(1536),
+    match_tenant_id text,
+    match_threshold float DEFAULT 0.7,
+    match_count int DEFAULT 10
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    content_type text,
+    summary text,
+    tags jsonb,
+    source_url text,
+    similarity float
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT * FROM search_content_by_vector(
+        query_embedding, match_tenant_id, match_threshold, match_count, NULL
+    );
+$$;
+
+-- ============================================================================
+-- Step 4: documents_pg search
+-- ============================================================================
+CREATE OR REPLACE FUNCTION match_documents(
+    query_embedding vector(1536),
+    match_tenant_id text,
+    match_threshold float DEFAULT 0.6,
+    match_count int DEFAULT 25
+)
+RETURNS TABLE (
+    id integer,
+    content text,
+    metadata jsonb,
+    similarity float
+)
+LANGUAGE plpgsql STABLE
+AS $$
+BEGIN
+    PERFORM vector_ann_prepare(match_count);
+
+    RETURN QUERY EXECUTE format(
+        $sql$
+        SELECT nearest.id::integer, nearest.content::text, nearest.metadata, 1 - nearest.distance
+        FROM (
+            SELECT d.id, d.content, d.metadata, d.embedding <=> $1 AS distance
+            FROM documents_pg d
+            WHERE d.tenant_id = %L
+              AND d.is_deleted = FALSE
+              AND d.is_current = TRUE
+              AND d.embedding IS NOT NULL
+            ORDER BY d.embedding <=> $1
+            LIMIT $2
+        ) nearest
+        WHERE 1 - nearest.distance > $3
+        ORDER BY nearest.distance
+        $sql$,
+        match_tenant_id
+    ) USING query_embedding, match_count, match_threshold;
+END;
+$$;
+
+-- ============================================================================
+-- Step 5: document_chunks search (no threshold; same ANN settings)
+-- ============================================================================
+CREATE OR REPLACE FUNCTION match_document_chunks(
+    query_embedding vector(1536),
+    filter_tenant text,
+    match_count int DEFAULT 10
+)
+RETURNS TABLE (
+    id uuid,
+    document_id text,
+    documents_pg_id bigint,
+    chunk_index int,
+    content text,
+    metadata jsonb,
+    similarity float
+)
+LANGUAGE plpgsql STABLE
+AS $$
+BEGIN
+    PERFORM vector_ann_prepare(match_count);
+
+    RETURN QUERY EXECUTE format(
+        $sql$
+        SELECT nearest.id, nearest.document_id, nearest.documents_pg_id, nearest.chunk_index,
+               nearest.content, nearest.metadata, 1 - nearest.distance
+        FROM (
+            SELECT dc.id, dc.document_id, dc.documents_pg_id, dc.chunk_index,
+                   dc.content, dc.metadata, dc.embedding <=> $1 AS distance
+            FROM document_chunks dc
+            WHERE dc.tenant_id = %L
+              AND dc.embedding IS NOT NULL
+            ORDER BY dc.embedding <=> $1
+            LIMIT $2
+        ) nearest
+        ORDER BY nearest.distance
+        $sql$,
+        filter_tenant
+    ) USING query_embedding, match_count;
+END;
+$$;
+
+-- ============================================================================
+-- Step 6: Per-tenant partial index management
+-- ============================================================================
+-- Lists (table, tenant) pairs with at least min_rows embeddings and the
+-- CREATE INDEX CONCURRENTLY statement for their partial index. Run the
+-- missing ones from psql with \gexec (see header). Index names are
+-- idx_<table>_emb_<method>_<md5(tenant) prefix>.
+CREATE OR REPLACE FUNCTION vector_index_candidates(
+    min_rows bigint DEFAULT 50000,
+    index_method text DEFAULT 'hnsw'
+)
+RETURNS TABLE (
+    table_name text,
+    tenant_id text,
+    row_count bigint,
+    index_name text,
+    index_exists boolean,
+    ddl text
+)
+LANGUAGE plpgsql STABLE
+AS $$
+DECLARE
+    target text;
+BEGIN
+    IF index_method NOT IN ('hnsw', 'ivfflat') THEN
+        RAISE EXCEPTION 'index_method must be hnsw or ivfflat, got %', index_method;
+    END IF;
+
+    FOREACH target IN ARRAY ARRAY['processed_content', 'documents_pg', 'document_chunks'] LOOP
+        RETURN QUERY EXECUTE format(
+            $sql$
+            SELECT %1$L::text, counts.tenant_id::text, counts.n, names.index_name,
+                   to_regclass('public.' || names.index_name) IS NOT NULL,
+                   format(
+                       'CREATE INDEX CONCURRENTLY IF NOT EXISTS %%I ON public.%1$I USING %2$s '
+                       '(embedding vector_cosine_ops) WITH (%%s) WHERE tenant_id = %%L',
+                       names.index_name,
+                       CASE WHEN %2$L = 'hnsw' THEN 'm = 16, ef_construction = 64'
+                            -- pgvector guidance: rows / 1000 lists up to 1M rows, sqrt(rows) above
+                            ELSE 'lists = ' || GREATEST(10, CASE WHEN counts.n <= 1000000
+                                                               THEN counts.n / 1000
+                                                               ELSE sqrt(counts.n)::bigint END)
+                       END,
+                       counts.tenant_id
+                   )
+            FROM (
+                SELECT t.tenant_id, count(*) AS n
+                FROM public.%1$I t
+                WHERE t.embedding IS NOT NULL
+                GROUP BY t.tenant_id
+                HAVING count(*) >= $1
+            ) counts
+            CROSS JOIN LATERAL (
+                SELECT format('idx_%%s_emb_%%s_%%s', %1$L, %2$L,
+                              left(md5(counts.tenant_id::text), 10)) AS index_name
+            ) names
+            ORDER BY counts.n DESC
+            $sql$,
+            target, index_method
+        ) USING min_rows;
+    END LOOP;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION vector_ann_prepare TO authenticated;
+GRANT EXECUTE ON FUNCTION vector_ann_prepare TO service_role;
+GRANT EXECUTE ON FUNCTION search_content_by_vector TO authenticated;
+GRANT EXECUTE ON FUNCTION search_content_by_vector TO service_role;
+GRANT EXECUTE ON FUNCTION search_content_by_embedding TO authenticated;
+GRANT EXECUTE ON FUNCTION search_content_by_embedding TO service_role;
+GRANT EXECUTE ON FUNCTION match_documents TO authenticated;
+GRANT EXECUTE ON FUNCTION match_documents TO service_role;
+GRANT EXECUTE ON FUNCTION match_document_chunks TO authenticated;
+GRANT EXECUTE ON FUNCTION match_document_chunks TO service_role;
+GRANT EXECUTE ON FUNCTION vector_index_candidates TO service_role;
+
+COMMENT ON FUNCTION vector_ann_prepare IS 'Transaction-local ANN settings for a k-NN query (hnsw.ef_search, ivfflat.probes, iterative scan on pgvector >= 0.8).';
+COMMENT ON FUNCTION search_content_by_vector IS 'Nearest match_count processed_content rows for a tenant (ANN index), then the similarity threshold.';
+COMMENT ON FUNCTION search_content_by_embedding IS 'Alias of search_content_by_vector without exclude_id (EmbeddingsService.search_similar_content).';
+COMMENT ON FUNCTION match_documents IS 'Nearest match_count current documents_pg rows for a tenant (ANN index), then the similarity threshold.';
+COMMENT ON FUNCTION match_document_chunks IS 'Top-N chunk similarity search over document_chunks for a tenant (ANN index).';
+COMMENT ON FUNCTION vector_index_candidates IS 'Tenants large enough for a per-tenant partial ANN index, with the CREATE INDEX CONCURRENTLY DDL.';
+
+-- Rollback:
+-- DROP FUNCTION IF EXISTS vector_index_candidates;
+-- (restore search_content_by_vector / match_content_* from 008, match_document_chunks
+--  from 007, match_documents from ../match_documents_function.sql and
+--  search_content_by_embedding from ../02_add_embeddings.sql)
+-- DROP FUNCTION IF EXISTS vector_ann_prepare;
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_documents_pg_tenant;
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_document_chunks_embedding_hnsw;
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_documents_pg_embedding_hnsw;
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_processed_content_embedding_hnsw;
+-- (and any per-tenant idx_*_emb_* indexes created via vector_index_candidates)
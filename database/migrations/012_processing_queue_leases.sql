@@ -0,0 +1,214 @@
+-- ============================================================================
+-- Flourisha AI Brain - Lease-Based Processing Queue
+-- Purpose: Atomic claiming, leases/heartbeats and scheduled retries for processing_queue
+-- ============================================================================
+--
+-- scripts/content_queue_worker.py selected pending rows and then marked
+-- them 'processing' with a separate UPDATE, so two workers could claim the
+-- same row, and a worker that died left its rows in 'processing' forever.
+-- Failed items went straight back to 'pending' and were retried on the next
+-- poll.
+--
+-- Workers now go through these functions:
+-- - claim_queue_items()    FOR UPDATE SKIP LOCKED claim with a lease; rows whose
+--                          lease expired (crashed worker) are first returned to
+--                          the queue as a failed attempt
+-- - heartbeat_queue_items() extends the leases a worker still holds and reports
+--                          which ones it has lost
+-- - complete_queue_item()  marks a held row completed
+-- - fail_queue_item()      schedules a retry with exponential backoff via
+--                          scheduled_at, or fails the row after max_retries
+--
+-- Every function checks locked_by, so a worker whose lease was taken over
+-- cannot overwrite the new owner's state. Any number of worker processes can
+-- run against the same table.
+
+-- ============================================================================
+-- Step 1: Columns used by the worker (some deployments already have them)
+-- ============================================================================
+ALTER TABLE public.processing_queue
+    ADD COLUMN IF NOT EXISTS source_type TEXT,
+    ADD COLUMN IF NOT EXISTS source_id TEXT,
+    ADD COLUMN IF NOT EXISTS tenant_user_id UUID,
+    ADD COLUMN IF NOT EXISTS project_id UUID,
+    ADD COLUMN IF NOT EXISTS metadata JSONB DEFAULT '{}'::jsonb,
+    ADD COLUMN IF NOT EXISTS scheduled_at TIMESTAMPTZ DEFAULT NOW(),
+    ADD COLUMN IF NOT EXISTS processed_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS locked_by TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ;
+
+-- The worker and YouTube enqueuers write 'pending'
+ALTER TABLE public.processing_queue DROP CONSTRAINT IF EXISTS processing_queue_status_check;
+ALTER TABLE public.processing_queue ADD CONSTRAINT processing_queue_status_check
+    CHECK (status IN ('pending', 'queued', 'processing', 'completed', 'failed', 'cancelled'));
+
+COMMENT ON COLUMN public.processing_queue.locked_by IS 'Worker ID holding the lease while status = processing';
+COMMENT ON COLUMN public.processing_queue.lease_expires_at IS 'Lease end; an expired processing row is reclaimed by the next claim';
+COMMENT ON COLUMN public.processing_queue.scheduled_at IS 'Earliest time the row may be claimed (retry backoff)';
+
+-- ============================================================================
+-- Step 2: Indexes for claiming and lease expiry
+-- ============================================================================
+CREATE INDEX IF NOT EXISTS idx_queue_claim
+    ON public.processing_queue (source_type, priority DESC, scheduled_at)
+    WHERE status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_queue_lease_expiry
+    ON public.processing_queue (lease_expires_at)
+    WHERE status = 'processing';
+
+-- ============================================================================
+-- Step 3: Claim
+-- ============================================================================
+CREATE OR REPLACE FUNCTION claim_queue_items(
+    worker_id text,
+    source_types text[],
+    max_items int DEFAULT 1,
+    lease_seconds int DEFAULT 300
+)
+RETURNS SETOF public.processing_queue
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Expired leases: the holder died or stalled. Count it as an attempt so
+    -- an item that crashes its worker cannot loop forever.
+    WITH expired AS (
+        SELECT q.id
+        FROM processing_queue q
+        WHERE q.status = 'processing'
+          AND q.lease_expires_at < NOW()
+          AND q.source_type = ANY(source_types)
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE processing_queue q
+    SET status = CASE WHEN q.retry_count + 1 >= COALESCE(q.max_retries, 3)
+                      THEN 'failed' ELSE 'pending' END,
+        retry_count = q.retry_count + 1,
+        error_message = 'Lease expired (worker ' || COALESCE(q.locked_by, '?') || ')',
+        locked_by = NULL,
+        lease_expires_at = NULL,
+        scheduled_at = NOW()
+    FROM expired
+    WHERE q.id = expired.id;
+
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT q.id
+        FROM processing_queue q
+        WHERE q.status = 'pending'
+          AND q.source_type = ANY(source_types)
+          AND COALESCE(q.scheduled_at, q.created_at) <= NOW()
+        ORDER BY q.priority DESC NULLS LAST, COALESCE(q.scheduled_at, q.created_at)
+        LIMIT max_items
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE processing_queue q
+    SET status = 'processing',
+        locked_by = worker_id,
+        lease_expires_at = NOW() + make_interval(secs => lease_seconds),
+        heartbeat_at = NOW(),
+        started_at = NOW()
+    FROM candidates
+    WHERE q.id = candidates.id
+    RETURNING q.*;
+END;
+$$;
+
+-- ============================================================================
+-- Step 4: Heartbeat
+-- ============================================================================
+-- Returns the ids whose lease was extended; any id missing from the result
+-- has been reclaimed and should be abandoned by the caller.
+CREATE OR REPLACE FUNCTION heartbeat_queue_items(
+    worker_id text,
+    item_ids uuid[],
+    lease_seconds int DEFAULT 300
+)
+RETURNS SETOF uuid
+LANGUAGE sql
+AS $$
+    UPDATE processing_queue q
+    SET lease_expires_at = NOW() + make_interval(secs => lease_seconds),
+        heartbeat_at = NOW()
+    WHERE q.id = ANY(item_ids)
+      AND q.status = 'processing'
+      AND q.locked_by = worker_id
+    RETURNING q.id;
+$$;
+
+-- ============================================================================
+-- Step 5: Complete / fail
+-- ============================================================================
+CREATE OR REPLACE FUNCTION complete_queue_item(
+    item_id uuid,
+    worker_id text
+)
+RETURNS boolean
+LANGUAGE sql
+AS $$
+    WITH done AS (
+        UPDATE processing_queue q
+        SET status = 'completed',
+            processed_at = NOW(),
+            completed_at = NOW(),
+            error_message = NULL,
+            locked_by = NULL,
+            lease_expires_at = NULL
+        WHERE q.id = item_id
+          AND q.status = 'processing'
+          AND q.locked_by = worker_id
+        RETURNING 1
+    )
+    SELECT EXISTS (SELECT 1 FROM done);
+$$;
+
+-- Retry delay: retry_base_seconds * 2^(attempt - 1), capped at
+-- retry_max_seconds, with +/-25% jitter so failed batches spread out.
+-- Returns the row's new status ('pending' or 'failed'), or NULL if the
+-- worker no longer holds the lease.
+CREATE OR REPLACE FUNCTION fail_queue_item(
+    item_id uuid,
+    worker_id text,
+    error_text text,
+    retry_base_seconds int DEFAULT 30,
+    retry_max_seconds int DEFAULT 3600
+)
+RETURNS text
+LANGUAGE sql
+AS $$
+    UPDATE processing_queue q
+    SET retry_count = q.retry_count + 1,
+        status = CASE WHEN q.retry_count + 1 >= COALESCE(q.max_retries, 3)
+                      THEN 'failed' ELSE 'pending' END,
+        error_message = error_text,
+        scheduled_at = NOW() + make_interval(secs =>
+            LEAST(retry_max_seconds, retry_base_seconds * power(2, q.retry_count))
+            * (0.75 + random() * 0.5)),
+        locked_by = NULL,
+        lease_expires_at = NULL
+    WHERE q.id = item_id
+      AND q.status = 'processing'
+      AND q.locked_by = worker_id
+    RETURNING q.status;
+$$;
+
+GRANT EXECUTE ON FUNCTION claim_queue_items TO service_role;
+GRANT EXECUTE ON FUNCTION heartbeat_queue_items TO service_role;
+GRANT EXECUTE ON FUNCTION complete_queue_item TO service_role;
+GRANT EXECUTE ON FUNCTION fail_queue_item TO service_role;
+
+COMMENT ON FUNCTION claim_queue_items IS 'Atomically claim up to max_items due pending rows (FOR UPDATE SKIP LOCKED) with a lease; reclaims expired leases first.';
+COMMENT ON FUNCTION heartbeat_queue_items IS 'Extend leases held by worker_id; returns the ids still held.';
+COMMENT ON FUNCTION complete_queue_item IS 'Mark a held queue row completed; false if the lease was lost.';
+COMMENT ON FUNCTION fail_queue_item IS 'Record a failed attempt: exponential-backoff retry via scheduled_at, or failed after max_retries.';
+
+-- Rollback:
+-- DROP FUNCTION IF EXISTS fail_queue_item;
+-- DROP FUNCTION IF EXISTS complete_queue_item;
+-- DROP FUNCTION IF EXISTS heartbeat_queue_items;
+-- DROP FUNCTION IF EXISTS claim_queue_items;
+-- DROP INDEX IF EXISTS idx_queue_lease_expiry;
+-- DROP INDEX IF EXISTS idx_queue_claim;
+-- ALTER TABLE public.processing_queue DROP COLUMN IF EXISTS heartbeat_at,
+--     DROP COLUMN IF EXISTS lease_expires_at, DROP COLUMN IF EXISTS locked_by;
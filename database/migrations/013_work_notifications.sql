@@ -0,0 +1,70 @@
+-- ============================================================================
+-- Flourisha AI Brain - Work Notifications
+-- Purpose: NOTIFY workers when processing_queue rows are inserted
+-- ============================================================================
+--
+-- Workers slept a fixed poll interval between scans, so a queued item waited
+-- up to a full interval before anyone looked at it. With
+-- WORK_SIGNAL_BACKEND=postgres, workers LISTEN on a channel
+-- (services/work_signals.py) and wake as soon as work is committed:
+-- - a statement-level trigger on processing_queue sends one NOTIFY per
+--   INSERT statement (a bulk enqueue of a whole playlist is one wakeup),
+--   carrying the distinct source types inserted
+-- - notify_work() lets producers without a direct Postgres connection
+--   (PostgREST / supabase-py) signal other channels, e.g. 'gmail'
+--
+-- NOTIFY is delivered at commit, so a worker never wakes before the rows it
+-- is told about are visible. Signals are wakeups only; workers keep a long
+-- fallback poll for retries whose scheduled_at has passed.
+
+-- ============================================================================
+-- Step 1: Insert trigger
+-- ============================================================================
+CREATE OR REPLACE FUNCTION notify_processing_queue_insert()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    types jsonb;
+BEGIN
+    SELECT COALESCE(jsonb_agg(DISTINCT source_type), '[]'::jsonb)
+    INTO types
+    FROM inserted
+    WHERE status = 'pending';
+
+    IF types <> '[]'::jsonb THEN
+        PERFORM pg_notify('processing_queue', jsonb_build_object('source_types', types)::text);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS processing_queue_notify_insert ON public.processing_queue;
+CREATE TRIGGER processing_queue_notify_insert
+    AFTER INSERT ON public.processing_queue
+    REFERENCING NEW TABLE AS inserted
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_processing_queue_insert();
+
+-- ============================================================================
+-- Step 2: Generic notify RPC
+-- ============================================================================
+CREATE OR REPLACE FUNCTION notify_work(
+    channel text,
+    payload text DEFAULT '{}'
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+    SELECT pg_notify(channel, payload);
+$$;
+
+GRANT EXECUTE ON FUNCTION notify_work TO service_role;
+
+COMMENT ON FUNCTION notify_processing_queue_insert IS 'NOTIFY processing_queue once per INSERT statement with the pending source types.';
+COMMENT ON FUNCTION notify_work IS 'pg_notify wrapper so REST clients can wake LISTENing workers.';
+
+-- Rollback:
+-- DROP FUNCTION IF EXISTS notify_work;
+-- DROP TRIGGER IF EXISTS processing_queue_notify_insert ON public.processing_queue;
+-- DROP FUNCTION IF EXISTS notify_processing_queue_insert;
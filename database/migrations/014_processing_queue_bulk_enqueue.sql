@@ -0,0 +1,99 @@
+-- ============================================================================
+-- Flourisha AI Brain - Bulk Enqueue for processing_queue
+-- Purpose: One-round-trip deduplicated enqueue of source items (playlist/channel expansion)
+-- ============================================================================
+--
+-- Expanding a YouTube playlist or channel ran one SELECT against
+-- processed_content and one INSERT into processing_queue per video, so a
+-- 500-video playlist cost 1,000 sequential round-trips, and two expansions
+-- of the same playlist could queue the same video twice.
+--
+-- - A partial unique index on (tenant_id, source_type, source_id) over
+--   ACTIVE jobs (status pending, queued or processing) allows at most one
+--   live job per source item. Finished rows don't count: a video whose job
+--   failed or was cancelled can be queued again, and a playlist or channel
+--   can be rechecked once its previous expansion job has finished. Rows
+--   without a source_id (document and agent jobs) are unaffected: NULLs
+--   never conflict.
+-- - enqueue_queue_items() takes the whole candidate list as JSON, skips
+--   items already in processed_content (anti-join) or with an active job
+--   (ON CONFLICT DO NOTHING), inserts the rest in one statement and returns
+--   the source_ids it queued. With migration 013 the insert fires a single
+--   NOTIFY for the batch.
+-- - SupabaseService.add_to_queue() returns the existing active job instead
+--   of raising when the same item is queued while still active.
+
+-- ============================================================================
+-- Step 1: Remove existing duplicates
+-- ============================================================================
+-- Keep one active row per key, preferring the one a worker already holds,
+-- then the oldest. Finished rows (history) are left alone.
+DELETE FROM public.processing_queue q
+USING (
+    SELECT id,
+           row_number() OVER (
+               PARTITION BY tenant_id, source_type, source_id
+               ORDER BY CASE status WHEN 'processing' THEN 0 ELSE 1 END,
+                        created_at
+           ) AS rn
+    FROM public.processing_queue
+    WHERE source_id IS NOT NULL
+      AND status IN ('pending', 'queued', 'processing')
+) ranked
+WHERE q.id = ranked.id
+  AND ranked.rn > 1;
+
+-- ============================================================================
+-- Step 2: Active-job unique index and dedup index
+-- ============================================================================
+-- Partial: only active statuses conflict, so an item whose job finished
+-- (failed, cancelled or completed) can be enqueued again
+CREATE UNIQUE INDEX IF NOT EXISTS idx_queue_active_source
+    ON public.processing_queue (tenant_id, source_type, source_id)
+    WHERE status IN ('pending', 'queued', 'processing');
+
+-- Anti-join lookup against already processed content
+CREATE INDEX IF NOT EXISTS idx_content_tenant_source
+    ON public.processed_content (tenant_id, source_id);
+
+-- ============================================================================
+-- Step 3: Bulk enqueue
+-- ============================================================================
+-- items: JSON array of processing_queue rows, e.g.
+--   [{"tenant_id": "...", "tenant_user_id": "...", "source_type": "youtube_video",
+--     "source_id": "dQw4w9WgXcQ", "project_id": null}]
+-- Columns not given take their defaults; status is always 'pending'.
+CREATE OR REPLACE FUNCTION enqueue_queue_items(items jsonb)
+RETURNS SETOF text
+LANGUAGE sql
+AS $$
+    INSERT INTO processing_queue (
+        tenant_id, tenant_user_id, source_type, source_id, project_id,
+        priority, metadata, status, scheduled_at
+    )
+    SELECT i.tenant_id, i.tenant_user_id, i.source_type, i.source_id, i.project_id,
+           COALESCE(i.priority, 5), COALESCE(i.metadata, '{}'::jsonb),
+           'pending', COALESCE(i.scheduled_at, NOW())
+    FROM jsonb_populate_recordset(NULL::processing_queue, items) i
+    WHERE i.source_id IS NOT NULL
+      AND NOT EXISTS (
+          SELECT 1
+          FROM processed_content c
+          WHERE c.tenant_id = i.tenant_id
+            AND c.source_id = i.source_id
+      )
+    ON CONFLICT (tenant_id, source_type, source_id)
+        WHERE status IN ('pending', 'queued', 'processing')
+        DO NOTHING
+    RETURNING source_id;
+$$;
+
+GRANT EXECUTE ON FUNCTION enqueue_queue_items TO service_role;
+
+COMMENT ON INDEX idx_queue_active_source IS 'At most one active (pending/queued/processing) job per tenant and source item';
+COMMENT ON FUNCTION enqueue_queue_items IS 'Insert pending jobs for items not yet processed and without an active job; returns the source_ids queued.';
+
+-- Rollback:
+-- DROP FUNCTION IF EXISTS enqueue_queue_items;
+-- DROP INDEX IF EXISTS idx_content_tenant_source;
+-- DROP INDEX IF EXISTS idx_queue_active_source;
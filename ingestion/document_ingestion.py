@@ -19,8 +19,10 @@ from pydantic import BaseModel
 
 from agents.models import DocumentExtraction, MatchingResult, DocumentContext
 from agents.document_processor import process_document, process_document_from_email
-from agents.entity_matcher import match_entities
+from agents.entity_matcher import match_entities_with_candidates
+from services.db_pool import run_blocking
 from services.document_store import get_document_store
+from services.entity_candidates import get_entity_candidate_retriever
 from services.entity_resolver import resolve_from_filename, ResolvedEntity
 from services.extraction_feedback_service import get_feedback_service, ValidationResult
 
@@ -105,7 +107,10 @@ async def process_document_from_source(
         parsed_filename = None
 
         if filename:
-            resolved_property, resolved_org, parsed_filename = resolve_from_filename(filename)
+            # Resolver/feedback lookups are synchronous; keep them off the event loop
+            resolved_property, resolved_org, parsed_filename = await run_blocking(
+                resolve_from_filename, filename, tenant_id
+            )
             result.filename_parsed = parsed_filename
 
             if resolved_property:
@@ -187,7 +192,8 @@ This document is likely from or about this organization.
         # 2.5 Validate extraction against known entities (feedback loop)
         try:
             feedback_service = get_feedback_service()
-            validation_results = feedback_service.validate_extraction(
+            validation_results = await run_blocking(
+                feedback_service.validate_extraction,
                 extraction=extraction.model_dump(),
                 resolved_property=result.resolved_property,
                 resolved_org=result.resolved_organization,
@@ -226,14 +232,11 @@ This document is likely from or about this organization.
         # 3. Match entities (if not skipped)
         matching = None
         if not skip_matching and (extraction.companies or extraction.contacts or extraction.properties):
-            store = get_document_store()
-            existing_companies, existing_contacts, existing_properties = await store.get_existing_entities(tenant_id)
+            candidates = await get_entity_candidate_retriever().retrieve(extraction, tenant_id)
 
-            matching = await match_entities(
+            matching = await match_entities_with_candidates(
                 extraction=extraction,
-                existing_companies=existing_companies,
-                existing_contacts=existing_contacts,
-                existing_properties=existing_properties,
+                candidates=candidates,
             )
 
             result.matching = matching
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Chunking Benchmark
+Compares throughput and chunk quality of the available chunkers.
+
+Chunkers:
+- chunk_text       character windows with paragraph/sentence back-off
+- semantic         SemanticChunker (local, structure-aware)
+- llm              AgenticChunker (Claude) - only with --llm, costs tokens
+
+Quality metrics:
+- in_bounds        share of chunks within [min_chunk_size, max_chunk_size]
+- clean_ends       share of chunks ending at a sentence/line/table boundary
+- split_headings   chunks that end with a heading (heading separated from body)
+- split_table_rows chunks that start or end inside a table row
+
+Usage:
+    python scripts/benchmarks/chunking_benchmark.py                 # synthetic corpus
+    python scripts/benchmarks/chunking_benchmark.py docs/*.md       # your files
+    python scripts/benchmarks/chunking_benchmark.py --llm file.md   # include Claude
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import random
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add parent directory (00_AI_Brain) to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.chunking_service import SemanticChunker, chunk_text, _HEADING_RE
+
+MAX_CHUNK = 1000
+MIN_CHUNK = 400
+OVERLAP = 200
+
+
+def synthetic_document(sections: int = 40, seed: int = 7) -> str:
+    """Build a markdown document with headings, prose, lists and tables"""
+    rng = random.Random(seed)
+    words = ("policy coverage premium tenant lease property insurance renewal "
+             "notice payment escrow inspection roof water claim deductible").split()
+
+    def sentence() -> str:
+        body = " ".join(rng.choice(words) for _ in range(rng.randint(8, 22)))
+        return body.capitalize() + "."
+
+    parts = []
+    for s in range(sections):
+        parts.append(f"## Section {s}")
+        for _ in range(rng.randint(1, 4)):
+            parts.append(" ".join(sentence() for _ in range(rng.randint(2, 9))))
+        if s % 3 == 0:
+            parts.append("\n".join(f"- {sentence()}" for _ in range(rng.randint(3, 8))))
+        if s % 4 == 0:
+            rows = ["| Item | Amount | Due |", "|------|--------|-----|"]
+            rows += [f"| {rng.choice(words)} | ${rng.randint(10, 9999)} | 2025-{rng.randint(1, 12):02d}-01 |"
+                     for _ in range(rng.randint(5, 60))]
+            parts.append("\n".join(rows))
+    return "\n\n".join(parts)
+
+
+def quality(chunks: List[str]) -> Dict[str, float]:
+    """Compute chunk quality metrics"""
+    if not chunks:
+        return {}
+    in_bounds = sum(MIN_CHUNK <= len(c) <= MAX_CHUNK for c in chunks)
+    clean_ends = sum(c.rstrip()[-1:] in ".!?|`" or c.endswith("\n") for c in chunks)
+    split_headings = sum(bool(_HEADING_RE.match(c.rstrip().split("\n")[-1])) for c in chunks)
+    split_rows = 0
+    for c in chunks:
+        first, last = c.split("\n")[0], c.rstrip().split("\n")[-1]
+        if ("|" in first and not first.lstrip().startswith("|")) or \
+           ("|" in last and not last.rstrip().endswith("|")):
+            split_rows += 1
+    return {
+        "chunks": len(chunks),
+        "avg_len": round(sum(map(len, chunks)) / len(chunks)),
+        "max_len": max(map(len, chunks)),
+        "in_bounds": round(in_bounds / len(chunks), 3),
+        "clean_ends": round(clean_ends / len(chunks), 3),
+        "split_headings": split_headings,
+        "split_table_rows": split_rows,
+    }
+
+
+def bench(name: str, fn: Callable[[str], List[str]], docs: List[str], repeat: int) -> Dict:
+    """Time a chunker over the corpus and score its output"""
+    total_chars = sum(map(len, docs))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        chunks = [c for d in docs for c in fn(d)]
+    elapsed = (time.perf_counter() - start) / repeat
+    return {
+        "chunker": name,
+        "seconds": round(elapsed, 4),
+        "mb_per_s": round(total_chars / 1e6 / elapsed, 2) if elapsed else float("inf"),
+        **quality(chunks),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunkers")
+    parser.add_argument("files", nargs="*", help="Markdown/text files (default: synthetic corpus)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    parser.add_argument("--llm", action="store_true", help="Include the Claude chunker (costs tokens)")
+    args = parser.parse_args()
+
+    if args.files:
+        docs = [Path(f).read_text(errors="ignore") for f in args.files]
+    else:
+        docs = [synthetic_document(seed=i) for i in range(10)]
+    print(f"Corpus: {len(docs)} docs, {sum(map(len, docs)):,} chars\n")
+
+    semantic = SemanticChunker(MAX_CHUNK, MIN_CHUNK, OVERLAP)
+    results = [
+        bench("chunk_text", lambda d: chunk_text(d, MAX_CHUNK, OVERLAP), docs, args.repeat),
+        bench("semantic", semantic.split, docs, args.repeat),
+    ]
+
+    if args.llm:
+        if not os.getenv("ANTHROPIC_API_KEY"):
+            print("Skipping llm chunker: ANTHROPIC_API_KEY not set")
+        else:
+            from services.chunking_service import AgenticChunker
+            agentic = AgenticChunker(MAX_CHUNK, MIN_CHUNK)
+            results.append(bench("llm", lambda d: asyncio.run(agentic.chunk(d)), docs, 1))
+
+    columns = list(results[0].keys())
+    print("  ".join(f"{c:>16}" for c in columns))
+    for row in results:
+        print("  ".join(f"{str(row.get(c, '')):>16}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Entity Resolver Benchmark
+Compares the indexed EntityResolver against the previous linear scans.
+
+Builds a synthetic portfolio (default 10k properties, 2k organizations) and
+resolves a mix of queries: aliases, shorthands, full addresses with
+formatting differences, street fragments, organization names and misses.
+
+Reported per implementation:
+- build_s        time to build the indexes (indexed only)
+- per_query_us   mean resolution time per query
+- resolved       share of queries resolved to some entity
+- agreement      share of queries resolving to the same id as the linear scan
+                 (differences are addresses the scan misses because of
+                 comma/abbreviation formatting, which the index normalizes)
+
+Usage:
+    python scripts/benchmarks/entity_resolver_benchmark.py
+    python scripts/benchmarks/entity_resolver_benchmark.py --properties 50000 --queries 5000
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent directory (00_AI_Brain) to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.entity_resolver import EntityResolver
+
+STREETS = ("Main Oak Pine Maple Cedar Elm Prince Charles Lake Hill Park Sunset River "
+           "Forest Meadow Spring Ridge Valley Highland Orchard Willow Magnolia").split()
+SUFFIXES = [("Street", "St"), ("Drive", "Dr"), ("Avenue", "Ave"), ("Road", "Rd"),
+            ("Lane", "Ln"), ("Court", "Ct"), ("Boulevard", "Blvd")]
+CITIES = [("Davenport", "FL"), ("Orlando", "FL"), ("Austin", "TX"), ("Denver", "CO"),
+          ("Phoenix", "AZ"), ("Tampa", "FL"), ("Dallas", "TX")]
+ORG_WORDS = ("Acme Summit Harbor Pinnacle Keystone Liberty Beacon Atlas Crescent "
+             "Granite Sterling Evergreen Horizon Meridian").split()
+ORG_TYPES = ["owner", "hoa", "insurer", "lender", "vendor"]
+
+
+def synthetic_portfolio(n_properties: int, n_orgs: int, seed: int = 11):
+    """Properties with aliases/shorthands and organizations with aliases"""
+    rng = random.Random(seed)
+    properties = []
+    for i in range(n_properties):
+        number = rng.randint(100, 99999)
+        street = f"{rng.choice(STREETS)} {rng.choice(STREETS)}"
+        long_suffix, short_suffix = rng.choice(SUFFIXES)
+        city, state = rng.choice(CITIES)
+        properties.append({
+            "id": f"prop-{i}",
+            "shorthand": f"{number}{street.split()[0]}{i}",
+            "full_address": f"{number} {street} {short_suffix}, {city}, {state} {rng.randint(10000, 99999)}",
+            "street": f"{street} {long_suffix}",
+            "city": city,
+            "state": state,
+            "aliases": [f"{number} {street}", f"{street.split()[0]} House {i}"],
+        })
+    organizations = []
+    for i in range(n_orgs):
+        name = f"{rng.choice(ORG_WORDS)} {rng.choice(ORG_WORDS)} {i}"
+        organizations.append({
+            "id": f"org-{i}",
+            "name": f"{name} LLC",
+            "organization_type": rng.choice(ORG_TYPES),
+            "aliases": [name, "".join(w[0] for w in name.split()[:2]) + str(i)],
+        })
+    return properties, organizations
+
+
+def synthetic_queries(properties: List[Dict], organizations: List[Dict], n: int, seed: int = 5):
+    """(kind, query) pairs covering every resolution strategy"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        prop = rng.choice(properties)
+        org = rng.choice(organizations)
+        kind = rng.choice(["alias", "shorthand", "address", "street", "org_alias", "org_name", "miss"])
+        if kind == "alias":
+            queries.append(("property", rng.choice(prop["aliases"]).upper()))
+        elif kind == "shorthand":
+            queries.append(("property", prop["shorthand"]))
+        elif kind == "address":
+            queries.append(("property", prop["full_address"].replace(",", "")))
+        elif kind == "street":
+            queries.append(("property", prop["street"].split()[0] + " " + prop["street"].split()[1]))
+        elif kind == "org_alias":
+            queries.append(("organization", rng.choice(org["aliases"])))
+        elif kind == "org_name":
+            queries.append(("organization", org["name"].upper()))
+        else:
+            queries.append((rng.choice(["property", "organization"]), f"Unknown Place {rng.randint(0, 10**6)}"))
+    return queries
+
+
+# --- Previous implementation (linear scans), kept for comparison -------------
+
+def legacy_resolve_property(properties: List[Dict], query: str) -> Optional[str]:
+    query_lower = query.lower().strip()
+    for prop in properties:
+        if query_lower in [a.lower() for a in (prop.get('aliases') or [])]:
+            return prop['id']
+    for prop in properties:
+        if prop.get('shorthand', '').lower() == query_lower:
+            return prop['id']
+    for prop in properties:
+        full_addr = (prop.get('full_address') or '').lower()
+        street = (prop.get('street') or '').lower()
+        if query_lower in full_addr or full_addr in query_lower:
+            return prop['id']
+        if len(query_lower) > 3 and query_lower in street:
+            return prop['id']
+    return None
+
+
+def legacy_resolve_organization(organizations: List[Dict], query: str) -> Optional[str]:
+    query_lower = query.lower().strip()
+    for org in organizations:
+        aliases = [a.lower() for a in (org.get('aliases') or [])]
+        org_name = org.get('name', '').lower()
+        if query_lower in aliases or org_name == query_lower:
+            return org['id']
+        if query_lower in org_name or org_name in query_lower:
+            return org['id']
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entity resolution")
+    parser.add_argument("--properties", type=int, default=10000, help="Synthetic properties")
+    parser.add_argument("--organizations", type=int, default=2000, help="Synthetic organizations")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries to resolve")
+    parser.add_argument("--legacy-queries", type=int, default=300,
+                        help="Queries timed against the linear scan (it is slow)")
+    args = parser.parse_args()
+
+    properties, organizations = synthetic_portfolio(args.properties, args.organizations)
+    queries = synthetic_queries(properties, organizations, args.queries)
+    print(f"Portfolio: {len(properties):,} properties, {len(organizations):,} organizations; "
+          f"{len(queries):,} queries\n")
+
+    resolver = EntityResolver(supabase_client=object(), cache_ttl=float("inf"))
+    start = time.perf_counter()
+    resolver.prime_cache(properties, organizations)
+    build_s = time.perf_counter() - start
+
+    def indexed(kind: str, query: str) -> Optional[str]:
+        if kind == "property":
+            result = resolver.resolve_property(query)
+        else:
+            result = resolver.resolve_organization(query)
+        return result.entity_id if result else None
+
+    def legacy(kind: str, query: str) -> Optional[str]:
+        if kind == "property":
+            return legacy_resolve_property(properties, query)
+        return legacy_resolve_organization(organizations, query)
+
+    start = time.perf_counter()
+    indexed_ids = [indexed(kind, q) for kind, q in queries]
+    indexed_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+    sample = queries[:args.legacy_queries]
+    start = time.perf_counter()
+    legacy_ids = [legacy(kind, q) for kind, q in sample]
+    legacy_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+    agreement = sum(a == b for a, b in zip(indexed_ids, legacy_ids)) / len(sample)
+    resolved = sum(i is not None for i in indexed_ids[:len(sample)]) / len(sample)
+    legacy_resolved = sum(i is not None for i in legacy_ids) / len(sample)
+
+    print(f"{'implementation':>16}  {'build_s':>10}  {'per_query_us':>14}  {'resolved':>10}  {'agreement':>10}")
+    print(f"{'linear scan':>16}  {'-':>10}  {legacy_us:>14.1f}  {legacy_resolved:>10.3f}  {'-':>10}")
+    print(f"{'indexed':>16}  {build_s:>10.3f}  {indexed_us:>14.1f}  {resolved:>10.3f}  {agreement:>10.3f}")
+    print(f"\nSpeed-up: {legacy_us / indexed_us:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+PARA Index Benchmark
+Compares the PARA index against the previous per-request filesystem walks.
+
+Builds a synthetic vault (default 20k files) in a temporary directory, or
+uses an existing PARA root, and times the PARA browser's hot paths:
+
+- tree_ms        category trees to depth 2 (legacy: rglob at every node)
+- search_ms      mean filename search across all categories (legacy: rglob per query)
+- build_s        one-off index build (indexed only)
+- refresh_ms     poll with no changes / after touching a few folders (indexed only)
+- agreement      share of searches returning the same paths as the legacy walk
+
+Usage:
+    python scripts/benchmarks/para_index_benchmark.py
+    python scripts/benchmarks/para_index_benchmark.py --files 100000
+    python scripts/benchmarks/para_index_benchmark.py --root /root/flourisha
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory (00_AI_Brain) to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.para_index import PARAIndex, PARA_FOLDERS
+
+WORDS = ("meeting notes plan okr review budget design roadmap draft client "
+         "research summary invoice report weekly retro spec idea").split()
+QUERIES = ["okr", "notes", "plan-", "weekly review", "md", "zz-missing", "re"]
+
+
+def synthetic_vault(root: Path, n_files: int, seed: int = 5):
+    """Category folders with nested project folders and markdown notes"""
+    rng = random.Random(seed)
+    folders = []
+    for folder in PARA_FOLDERS.values():
+        for p in range(max(1, n_files // 400)):
+            base = root / folder / f"{rng.choice(WORDS)}-{p}"
+            for sub in range(3):
+                folders.append(base / f"{rng.choice(WORDS)}-{sub}" / rng.choice(WORDS))
+    for path in folders:
+        path.mkdir(parents=True, exist_ok=True)
+    for i in range(n_files):
+        name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{i}.md"
+        (rng.choice(folders) / name).touch()
+    return folders
+
+
+def legacy_count(folder: Path) -> int:
+    return sum(1 for p in folder.rglob("*") if p.is_file() and not p.name.startswith("."))
+
+
+def legacy_tree(folder: Path, depth: int) -> Dict:
+    """Old build_folder_tree: recursive rglob count at every node"""
+    children = []
+    if depth > 0:
+        for item in sorted(folder.iterdir()):
+            if item.is_dir() and not item.name.startswith("."):
+                children.append(legacy_tree(item, depth - 1))
+    return {"path": str(folder), "total_items": legacy_count(folder), "children": children}
+
+
+def legacy_search(root: Path, query: str, limit: int) -> List[str]:
+    """Old search_files: rglob every category per query"""
+    query = query.lower()
+    results = []
+    for folder in PARA_FOLDERS.values():
+        for path in (root / folder).rglob("*"):
+            if len(results) >= limit:
+                break
+            if path.is_file() and not path.name.startswith(".") and query in path.name.lower():
+                results.append(str(path.relative_to(root)))
+    return sorted(results)
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PARA index")
+    parser.add_argument("--root", help="Existing PARA root (default: synthetic vault)")
+    parser.add_argument("--files", type=int, default=20000, help="Synthetic vault size")
+    parser.add_argument("--limit", type=int, default=100000, help="Search result limit")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(args.root) if args.root else Path(tmp)
+        folders = []
+        if not args.root:
+            folders = synthetic_vault(root, args.files)
+
+        index = PARAIndex(str(root))
+        build_s = timed(index.build)
+        stats = index.get_stats()
+        print(f"Vault: {stats['files']:,} files in {stats['folders']:,} folders\n")
+
+        def index_tree():
+            for folder in PARA_FOLDERS.values():
+                index.tree(folder, depth=2)
+
+        def old_tree():
+            for folder in PARA_FOLDERS.values():
+                if (root / folder).exists():
+                    legacy_tree(root / folder, 2)
+
+        rows = [
+            ("legacy", timed(old_tree) * 1000,
+             timed(lambda: [legacy_search(root, q, args.limit) for q in QUERIES]) / len(QUERIES) * 1000),
+            ("indexed", timed(index_tree, 20) * 1000,
+             timed(lambda: [index.search(q, limit=args.limit) for q in QUERIES], 20) / len(QUERIES) * 1000),
+        ]
+
+        agreement = sum(
+            index.search(q, limit=args.limit) == legacy_search(root, q, args.limit) for q in QUERIES
+        ) / len(QUERIES)
+
+        refresh_noop = timed(index.refresh) * 1000
+        for path in folders[:10]:
+            (path / "added-okr-note.md").touch()
+        refresh_changed = timed(index.refresh) * 1000
+
+        print(f"{'mode':>10}  {'tree_ms':>10}  {'search_ms':>10}")
+        for mode, tree_ms, search_ms in rows:
+            print(f"{mode:>10}  {tree_ms:>10.2f}  {search_ms:>10.3f}")
+        print(f"\nbuild_s {build_s:.3f}  refresh_ms (no changes) {refresh_noop:.2f}  "
+              f"refresh_ms (10 folders changed) {refresh_changed:.2f}  agreement {agreement:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Transcription Benchmark
+Compares the old per-request Whisper model with the shared TranscriptionEngine.
+
+Modes:
+- per_request   new WhisperModel for every job, transcribed on the caller thread
+                (what TranscriptService used to do per API request)
+- engine        one warm model, jobs submitted to the engine worker pool
+- chunked       one warm model, each file split at silences into chunks that
+                run in parallel (ChunkedTranscriber; audio files only)
+
+Metrics:
+- cold_load_s   model load time (paid once by the engine, per job by per_request)
+- wall_s        wall-clock time for all jobs
+- rtf           wall-clock seconds per audio second (< 1 is faster than real time)
+- p50_s / p95_s per-job latency from submission to result
+
+Usage:
+    python scripts/benchmarks/transcription_benchmark.py                    # synthetic audio
+    python scripts/benchmarks/transcription_benchmark.py a.mp3 b.mp3       # your files
+    python scripts/benchmarks/transcription_benchmark.py --long --jobs 2   # hour-long inputs
+    python scripts/benchmarks/transcription_benchmark.py --chunked podcast.mp3
+"""
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory (00_AI_Brain) to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.chunked_transcription import ChunkedTranscriber
+from services.transcription_engine import EngineConfig, TranscriptionEngine
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_audio(seconds: float, seed: int = 7):
+    """Noise bursts separated by silence (exercises VAD without real speech)"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    burst = 3 * SAMPLE_RATE
+    for start in range(0, len(audio), 5 * SAMPLE_RATE):
+        audio[start:start + burst] = rng.normal(0, 0.1, len(audio[start:start + burst]))
+    return audio
+
+
+def audio_seconds(audio: Any) -> float:
+    if isinstance(audio, str):
+        from faster_whisper.audio import decode_audio
+        return len(decode_audio(audio, sampling_rate=SAMPLE_RATE)) / SAMPLE_RATE
+    return len(audio) / SAMPLE_RATE
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+
+def summarize(mode: str, latencies: List[float], wall: float, audio_total: float, load: float) -> Dict:
+    return {
+        "mode": mode,
+        "jobs": len(latencies),
+        "cold_load_s": round(load, 2),
+        "wall_s": round(wall, 2),
+        "rtf": round(wall / audio_total, 4) if audio_total else None,
+        "p50_s": percentile(latencies, 0.50),
+        "p95_s": percentile(latencies, 0.95),
+    }
+
+
+def bench_per_request(config: EngineConfig, inputs: List[Any], audio_total: float) -> Dict:
+    """Old behaviour: load a model per job, run jobs one after another"""
+    from faster_whisper import WhisperModel
+
+    latencies = []
+    loads = []
+    start = time.perf_counter()
+    for audio in inputs:
+        job_start = time.perf_counter()
+        model = WhisperModel(config.model_size, device=config.device, compute_type=config.compute_type)
+        loads.append(time.perf_counter() - job_start)
+        segments, _ = model.transcribe(audio, language="en", beam_size=5, vad_filter=True)
+        list(segments)
+        latencies.append(time.perf_counter() - job_start)
+    wall = time.perf_counter() - start
+    return summarize("per_request", latencies, wall, audio_total, sum(loads) / len(loads))
+
+
+def bench_engine(config: EngineConfig, inputs: List[Any], audio_total: float) -> Dict:
+    """Shared engine: one load, jobs run on the worker pool"""
+    engine = TranscriptionEngine(config)
+    load_start = time.perf_counter()
+    engine.warm_up()
+    load = time.perf_counter() - load_start
+
+    def job(audio):
+        job_start = time.perf_counter()
+        engine.transcribe(audio, language="en")
+        return time.perf_counter() - job_start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(inputs)) as callers:
+        latencies = list(callers.map(job, inputs))
+    wall = time.perf_counter() - start
+    engine.shutdown()
+    return summarize(f"engine x{config.workers}", latencies, wall, audio_total, load)
+
+
+def bench_chunked(config: EngineConfig, files: List[str], audio_total: float, chunk_seconds: float) -> Dict:
+    """Shared engine, each file split into parallel chunks (files run one after another)"""
+    engine = TranscriptionEngine(config)
+    load_start = time.perf_counter()
+    engine.warm_up()
+    load = time.perf_counter() - load_start
+
+    latencies = []
+    with tempfile.TemporaryDirectory() as checkpoints:
+        transcriber = ChunkedTranscriber(engine, checkpoints, chunk_seconds)
+        start = time.perf_counter()
+        for i, path in enumerate(files):
+            job_start = time.perf_counter()
+            transcriber.transcribe(path, job_id=f"bench-{i}", language="en")
+            latencies.append(time.perf_counter() - job_start)
+        wall = time.perf_counter() - start
+    engine.shutdown()
+    return summarize(f"chunked x{config.workers}", latencies, wall, audio_total, load)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Whisper transcription")
+    parser.add_argument("files", nargs="*", help="Audio files (default: synthetic audio)")
+    parser.add_argument("--jobs", type=int, default=4, help="Synthetic jobs to run")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Synthetic audio length")
+    parser.add_argument("--long", action="store_true", help="Use hour-long synthetic audio")
+    parser.add_argument("--model", default="tiny", help="Whisper model size")
+    parser.add_argument("--workers", type=int, default=2, help="Engine workers")
+    parser.add_argument("--skip-per-request", action="store_true", help="Only benchmark the engine")
+    parser.add_argument("--chunked", action="store_true", help="Also benchmark chunked transcription (files only)")
+    parser.add_argument("--chunk-seconds", type=float, default=300.0, help="Chunk length for --chunked")
+    args = parser.parse_args()
+
+    if args.files:
+        inputs = list(args.files)
+    else:
+        seconds = 3600.0 if args.long else args.seconds
+        inputs = [synthetic_audio(seconds, seed=i) for i in range(args.jobs)]
+    audio_total = sum(audio_seconds(a) for a in inputs)
+    print(f"Inputs: {len(inputs)} jobs, {audio_total:,.0f} audio seconds, model {args.model}\n")
+
+    base = EngineConfig.from_env(args.model)
+    config = EngineConfig(
+        model_size=args.model,
+        device=base.device,
+        compute_type=base.compute_type,
+        workers=args.workers,
+        cpu_threads=base.cpu_threads,
+        queue_size=max(len(inputs), args.workers),
+    )
+
+    results = []
+    if not args.skip_per_request:
+        results.append(bench_per_request(config, inputs, audio_total))
+    results.append(bench_engine(config, inputs, audio_total))
+    if args.chunked:
+        if args.files:
+            results.append(bench_chunked(config, inputs, audio_total, args.chunk_seconds))
+        else:
+            print("Skipping chunked: pass audio files")
+
+    columns = list(results[0].keys())
+    print("  ".join(f"{c:>14}" for c in columns))
+    for row in results:
+        print("  ".join(f"{str(row.get(c, '')):>14}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
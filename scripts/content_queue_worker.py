@@ -1,11 +1,39 @@
 """
 Background Processing Queue Worker
 Processes items from the processing_queue table
+
+Items are claimed atomically through the claim_queue_items RPC (FOR UPDATE
+SKIP LOCKED, migration 012), so any number of worker processes can share the
+queue. Each claim carries a lease that a heartbeat extends while the item is
+being processed; if a worker dies, its leases expire and the next claim puts
+those items back in the queue. Up to `concurrency` items run at once per
+worker, with per-source-type caps (playlist/channel expansion is cheap but
+fans out, video processing is expensive). Failures are retried with
+exponential backoff via scheduled_at.
+
+The worker does not poll on a short timer: producers signal the
+processing_queue channel (services/work_signals.py; with the postgres
+backend an insert trigger NOTIFYs, migration 013), and the worker claims as
+soon as it is woken. The poll interval is only a fallback, which also picks
+up retries once their backoff has elapsed.
+
+Videos run through a stage pipeline (services/stage_pipeline.py): after the
+processed_content row is created, the knowledge graph, embedding and
+markdown stages run concurrently. Stage timings are logged and checkpointed
+on the queue row, and a retry reruns only the stages that did not complete.
+
+Usage:
+    python scripts/content_queue_worker.py
+    python scripts/content_queue_worker.py --concurrency 8 --type-limits youtube_video=6,youtube_channel=1
 """
 import asyncio
+import argparse
 import os
+import signal
+import socket
 import sys
-from typing import Optional, Dict, Any
+import uuid
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 import traceback
 
@@ -13,12 +41,35 @@ import traceback
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.supabase_client import supabase_service
+from services.db_pool import run_query
+from services.work_signals import listen, QUEUE_CHANNEL
+from services.stage_pipeline import Stage, StagePipeline, StageFailedError
 from services.youtube_service import YouTubeService
 from services.knowledge_graph_service import get_knowledge_graph
 from services.embeddings_service import get_embeddings_service
 from services.file_storage_service import get_file_storage
 from agents.content_processor import ContentProcessorAgent
-from models.content import ProcessingStatus
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_POLL_INTERVAL = 60
+# Types not listed may use every slot
+DEFAULT_TYPE_LIMITS = {
+    'youtube_playlist': 1,
+    'youtube_channel': 1,
+}
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+
+def parse_type_limits(value: str) -> Dict[str, int]:
+    """Parse "youtube_video=4,youtube_channel=1" into a dict"""
+    limits = {}
+    for part in value.split(','):
+        if part.strip():
+            name, _, limit = part.partition('=')
+            limits[name.strip()] = int(limit)
+    return limits
 
 
 class QueueWorker:
@@ -27,15 +78,30 @@ class QueueWorker:
     Handles YouTube video processing, playlist monitoring, etc.
     """
 
-    def __init__(self, poll_interval: int = 10):
+    def __init__(
+        self,
+        poll_interval: int = DEFAULT_POLL_INTERVAL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        type_limits: Optional[Dict[str, int]] = None,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        worker_id: Optional[str] = None
+    ):
         """
         Initialize queue worker
 
         Args:
-            poll_interval: Seconds between queue checks
+            poll_interval: Fallback seconds between queue checks when no signal arrives
+            concurrency: Maximum items processed at once by this worker
+            type_limits: Per-source-type caps (default DEFAULT_TYPE_LIMITS)
+            lease_seconds: Lease length; heartbeats renew it every third of it
+            worker_id: Lease owner ID (default host:pid:random)
         """
         self.poll_interval = poll_interval
-        self.supabase = supabase_service.supabase
+        self.concurrency = concurrency
+        self.type_limits = dict(type_limits or DEFAULT_TYPE_LIMITS)
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.supabase = supabase_service.client
         self.youtube = YouTubeService()
         self.kg = get_knowledge_graph()
         self.embeddings = get_embeddings_service()
@@ -43,134 +109,363 @@ class QueueWorker:
         self.ai_processor = ContentProcessorAgent()
         self.running = False
 
+        self.video_pipeline = self._build_video_pipeline()
+
+        self.handlers = {
+            'youtube_video': self._process_youtube_video,
+            'youtube_playlist': self._process_youtube_playlist,
+            'youtube_channel': self._process_youtube_channel,
+        }
+        # item id -> (source_type, task)
+        self._active: Dict[str, tuple] = {}
+        self._wake = asyncio.Event()
+        self._signals = None
+
     async def start(self):
         """Start the worker loop"""
-        print(f"[QueueWorker] Starting worker (poll interval: {self.poll_interval}s)")
+        print(f"[QueueWorker] Starting worker {self.worker_id} "
+              f"(concurrency: {self.concurrency}, limits: {self.type_limits}, "
+              f"lease: {self.lease_seconds}s, poll interval: {self.poll_interval}s)")
         self.running = True
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        try:
+            self._signals = await listen(QUEUE_CHANNEL)
+        except Exception as e:
+            print(f"[QueueWorker] Work signals unavailable, polling every {self.poll_interval}s: {e}")
 
         try:
+            source_types = None
             while self.running:
-                await self._process_queue()
-                await asyncio.sleep(self.poll_interval)
+                claimed = await self._process_queue(source_types)
+                source_types = None
+                if not claimed or len(self._active) >= self.concurrency:
+                    # Idle or full: wait for a free slot, new work or the next poll
+                    source_types = await self._wait(self.poll_interval)
         except KeyboardInterrupt:
             print("[QueueWorker] Received shutdown signal")
         except Exception as e:
             print(f"[QueueWorker] Fatal error: {e}")
             traceback.print_exc()
         finally:
+            await self._drain()
+            heartbeat.cancel()
+            if self._signals:
+                await self._signals.close()
             await self.stop()
 
     async def stop(self):
         """Stop the worker"""
         print("[QueueWorker] Stopping worker")
         self.running = False
+        self._wake.set()
         await self.kg.close()
 
-    async def _process_queue(self):
-        """Process pending items from the queue"""
-        try:
-            # Get pending items (oldest first, max 10)
-            result = await self.supabase.table('processing_queue').select('*').eq(
-                'status', ProcessingStatus.PENDING.value
-            ).order('scheduled_at').limit(10).execute()
+    def request_stop(self):
+        """Stop claiming; in-flight items finish first (signal handler)"""
+        print("[QueueWorker] Shutdown requested, finishing in-flight items")
+        self.running = False
+        self._wake.set()
 
-            items = result.data if result.data else []
+    async def _wait(self, timeout: float) -> Optional[set]:
+        """
+        Wait for a freed slot, a work signal or the fallback timeout
 
-            if not items:
-                return
+        Returns:
+            Source types named by the signals received, or None to check all types
+        """
+        waiters = [asyncio.ensure_future(self._wake.wait())]
+        if self._signals:
+            waiters.append(asyncio.ensure_future(self._signals.wait(timeout)))
+        done, pending = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in pending:
+            waiter.cancel()
+        self._wake.clear()
+
+        if len(waiters) == 1 or waiters[0] in done or waiters[1] not in done:
+            return None
+        source_types = set()
+        for payload in waiters[1].result():
+            if not payload.get('source_types'):
+                return None
+            source_types.update(payload['source_types'])
+        return source_types or None
+
+    async def _drain(self):
+        """Let in-flight items finish (their leases stay heartbeated)"""
+        tasks = [task for _, task in self._active.values()]
+        if tasks:
+            print(f"[QueueWorker] Waiting for {len(tasks)} in-flight items")
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _free_slots(self) -> Dict[str, int]:
+        """Claimable items per source type given the global and per-type caps"""
+        running: Dict[str, int] = {}
+        for source_type, _ in self._active.values():
+            running[source_type] = running.get(source_type, 0) + 1
+
+        free = {}
+        total_free = self.concurrency - len(self._active)
+        for source_type in self.handlers:
+            limit = self.type_limits.get(source_type, self.concurrency)
+            slots = min(total_free, limit - running.get(source_type, 0))
+            if slots > 0:
+                free[source_type] = slots
+        return free
+
+    async def _process_queue(self, source_types: Optional[set] = None) -> int:
+        """
+        Claim due items for the free slots and start them
 
-            print(f"[QueueWorker] Processing {len(items)} queue items")
+        Args:
+            source_types: Only claim these types (from a work signal); None for all
 
-            for item in items:
-                await self._process_item(item)
+        Returns:
+            Number of items claimed
+        """
+        claimed = 0
+        try:
+            for source_type, slots in self._free_slots().items():
+                if source_types is not None and source_type not in source_types:
+                    continue
+                slots = min(slots, self.concurrency - len(self._active))
+                if slots <= 0:
+                    break
+                result = await run_query(self.supabase.rpc('claim_queue_items', {
+                    'worker_id': self.worker_id,
+                    'source_types': [source_type],
+                    'max_items': slots,
+                    'lease_seconds': self.lease_seconds,
+                }))
+                for item in result.data or []:
+                    task = asyncio.create_task(self._process_item(item))
+                    self._active[item['id']] = (source_type, task)
+                    claimed += 1
+
+            if claimed:
+                print(f"[QueueWorker] Claimed {claimed} queue items ({len(self._active)} in flight)")
 
         except Exception as e:
             print(f"[QueueWorker] Error processing queue: {e}")
             traceback.print_exc()
 
+        return claimed
+
+    async def _heartbeat_loop(self):
+        """Renew leases of in-flight items; abandon items whose lease was lost"""
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            item_ids = list(self._active)
+            if not item_ids:
+                continue
+            try:
+                result = await run_query(self.supabase.rpc('heartbeat_queue_items', {
+                    'worker_id': self.worker_id,
+                    'item_ids': item_ids,
+                    'lease_seconds': self.lease_seconds,
+                }))
+                renewed = {
+                    row if isinstance(row, str) else next(iter(row.values()))
+                    for row in result.data or []
+                }
+                for item_id in item_ids:
+                    if item_id not in renewed and item_id in self._active:
+                        # Another worker reclaimed it: stop so it isn't processed twice
+                        print(f"[QueueWorker] Lease lost for {item_id}, abandoning")
+                        self._active[item_id][1].cancel()
+            except Exception as e:
+                # Leases are long relative to the interval; retry next beat
+                print(f"[QueueWorker] Heartbeat failed: {e}")
+
     async def _process_item(self, item: Dict[str, Any]):
-        """Process a single queue item"""
+        """Process a single claimed queue item"""
         item_id = item['id']
         source_type = item['source_type']
         source_id = item['source_id']
-        tenant_id = item['tenant_id']
 
         print(f"[QueueWorker] Processing {source_type}: {source_id}")
 
         try:
-            # Mark as processing
-            await self.supabase.table('processing_queue').update({
-                'status': ProcessingStatus.PROCESSING.value
-            }).eq('id', item_id).execute()
-
-            # Process based on source type
-            if source_type == 'youtube_video':
-                await self._process_youtube_video(item)
-            elif source_type == 'youtube_playlist':
-                await self._process_youtube_playlist(item)
-            elif source_type == 'youtube_channel':
-                await self._process_youtube_channel(item)
-            else:
+            handler = self.handlers.get(source_type)
+            if handler is None:
                 raise ValueError(f"Unknown source type: {source_type}")
+            await handler(item)
 
-            # Mark as completed
-            await self.supabase.table('processing_queue').update({
-                'status': ProcessingStatus.COMPLETED.value,
-                'processed_at': datetime.utcnow().isoformat()
-            }).eq('id', item_id).execute()
+            # Mark as completed (no-op if the lease was lost meanwhile)
+            await run_query(self.supabase.rpc('complete_queue_item', {
+                'item_id': item_id,
+                'worker_id': self.worker_id,
+            }))
 
             print(f"[QueueWorker] Completed {source_type}: {source_id}")
 
+        except asyncio.CancelledError:
+            # Lease lost; the new owner handles the item
+            raise
+
         except Exception as e:
             error_msg = f"{type(e).__name__}: {str(e)}"
             print(f"[QueueWorker] Error processing {source_type} {source_id}: {error_msg}")
             traceback.print_exc()
 
-            # Increment retry count
-            retry_count = item.get('retry_count', 0) + 1
-            max_retries = 3
-
-            if retry_count >= max_retries:
-                # Mark as failed after max retries
-                await self.supabase.table('processing_queue').update({
-                    'status': ProcessingStatus.FAILED.value,
-                    'error_message': error_msg,
-                    'retry_count': retry_count
-                }).eq('id', item_id).execute()
-            else:
-                # Reset to pending for retry
-                await self.supabase.table('processing_queue').update({
-                    'status': ProcessingStatus.PENDING.value,
-                    'error_message': error_msg,
-                    'retry_count': retry_count
-                }).eq('id', item_id).execute()
+            # Retry later with backoff, or fail after max_retries
+            try:
+                result = await run_query(self.supabase.rpc('fail_queue_item', {
+                    'item_id': item_id,
+                    'worker_id': self.worker_id,
+                    'error_text': error_msg,
+                    'retry_base_seconds': RETRY_BASE_SECONDS,
+                    'retry_max_seconds': RETRY_MAX_SECONDS,
+                }))
+                print(f"[QueueWorker] {source_type} {source_id} is now {result.data}")
+            except Exception as update_error:
+                # Lease expiry will return the item to the queue
+                print(f"[QueueWorker] Could not record failure for {item_id}: {update_error}")
+
+        finally:
+            self._active.pop(item_id, None)
+            self._wake.set()
+
+    def _build_video_pipeline(self) -> StagePipeline:
+        """
+        Per-video ingestion stages
+
+        fetch -> analyze -> record, then graph, vector and file run
+        concurrently once the processed_content row exists.
+        """
+        return StagePipeline([
+            Stage('fetch', self._stage_fetch),
+            Stage('analyze', self._stage_analyze, after=('fetch',)),
+            Stage('record', self._stage_record, after=('analyze',)),
+            Stage('graph', self._stage_graph, after=('record',)),
+            Stage('vector', self._stage_vector, after=('record',)),
+            Stage('file', self._stage_file, after=('record',)),
+            Stage('file_link', self._stage_file_link, after=('file',)),
+        ])
 
     async def _process_youtube_video(self, item: Dict[str, Any]):
-        """Process a single YouTube video"""
+        """
+        Process a single YouTube video
+
+        Stage progress is checkpointed in the queue row's metadata.pipeline
+        once the content record exists, so a retry after a failed stage
+        (e.g. Neo4j down) reruns only the stages that did not complete.
+        """
+        completed = await self._restore_video_stages(item)
+        if completed:
+            print(f"[QueueWorker] Resuming video {item['source_id']} after stages: {', '.join(completed)}")
+
+        async def checkpoint(record, run):
+            await self._save_pipeline_checkpoint(item, run)
+
+        run = await self.video_pipeline.run({'item': item}, completed=completed, on_stage_done=checkpoint)
+
+        timings = ", ".join(
+            f"{name}={stage['elapsed_ms']}ms" if stage['status'] != 'restored' else f"{name}=restored"
+            for name, stage in run.summary().items()
+        )
+        print(f"[QueueWorker] Video {item['source_id']} stages in {run.elapsed_ms}ms: {timings}")
+
+        if not run.ok:
+            raise StageFailedError(run)
+
+        print(f"[QueueWorker] Saved content {run.context['record']['content_id']} to {run.context['file']}")
+
+    async def _restore_video_stages(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Stage outputs from an earlier attempt's checkpoint (empty if none)"""
+        checkpoint = (item.get('metadata') or {}).get('pipeline') or {}
+        content_id = checkpoint.get('content_id')
+        if not content_id:
+            return {}
+
+        content_result = await run_query(self.supabase.table('processed_content').select('*').eq(
+            'id', content_id
+        ).limit(1))
+        if not content_result.data:
+            # Record was deleted: start over
+            return {}
+        content = content_result.data[0]
+
+        project_name = None
+        if content.get('project_id'):
+            project_result = await run_query(self.supabase.table('projects').select('name').eq(
+                'id', content['project_id']
+            ).limit(1))
+            project_name = project_result.data[0]['name'] if project_result.data else None
+
+        # The record holds everything later stages need from fetch/analyze
+        completed = {
+            'fetch': None,
+            'analyze': None,
+            'record': {'content_id': content_id, 'content': content, 'project_name': project_name},
+        }
+        done = set(checkpoint.get('completed') or [])
+        for name in ('graph', 'vector'):
+            if name in done:
+                completed[name] = None
+        if 'file' in done and checkpoint.get('file_path'):
+            completed['file'] = checkpoint['file_path']
+            if 'file_link' in done:
+                completed['file_link'] = None
+        return completed
+
+    async def _save_pipeline_checkpoint(self, item: Dict[str, Any], run):
+        """Persist stage progress on the queue row (only once the record exists)"""
+        record = run.context.get('record')
+        if not record:
+            return
+
+        metadata = dict(item.get('metadata') or {})
+        metadata['pipeline'] = {
+            'content_id': record['content_id'],
+            'file_path': run.context.get('file'),
+            'completed': run.completed,
+            'stages': run.summary(),
+            'updated_at': datetime.utcnow().isoformat(),
+        }
+        try:
+            # Only while this worker still holds the lease
+            await run_query(self.supabase.table('processing_queue').update({
+                'metadata': metadata
+            }).eq('id', item['id']).eq('locked_by', self.worker_id))
+        except Exception as e:
+            print(f"[QueueWorker] Could not checkpoint {item['id']}: {e}")
+
+    async def _stage_fetch(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Video details, transcript and project config"""
+        item = ctx['item']
         video_id = item['source_id']
         tenant_id = item['tenant_id']
-        tenant_user_id = item.get('tenant_user_id')
         project_id = item.get('project_id')
 
-        # Get video details
-        video_info = await self.youtube.get_video_info(video_id)
-        transcript = await self.youtube.get_transcript(video_id)
+        async def get_project_config():
+            if not project_id:
+                return None
+            project_result = await run_query(self.supabase.table('projects').select('*').eq(
+                'id', project_id
+            ).eq('tenant_id', tenant_id).single())
+            return project_result.data if project_result.data else None
+
+        video_info, transcript, project_config = await asyncio.gather(
+            self.youtube.get_video_info(video_id),
+            self.youtube.get_transcript(video_id),
+            get_project_config()
+        )
 
         if not transcript:
             raise ValueError(f"No transcript available for video {video_id}")
 
-        # Get project config if specified
-        project_config = None
-        if project_id:
-            project_result = await self.supabase.table('projects').select('*').eq(
-                'id', project_id
-            ).eq('tenant_id', tenant_id).single().execute()
-            project_config = project_result.data if project_result.data else None
+        return {'video_info': video_info, 'transcript': transcript, 'project_config': project_config}
 
-        # Process with AI
-        ai_result = await self.ai_processor.process_content(
+    async def _stage_analyze(self, ctx: Dict[str, Any]):
+        """AI summary, insights and tags"""
+        fetched = ctx['fetch']
+        video_info = fetched['video_info']
+        project_config = fetched['project_config']
+
+        return await self.ai_processor.process_content(
             title=video_info['title'],
-            transcript=transcript,
+            transcript=fetched['transcript'],
             content_type='video',
             project_name=project_config['name'] if project_config else None,
             tech_stack=project_config['tech_stack'] if project_config else None,
@@ -182,16 +477,25 @@ class QueueWorker:
             }
         )
 
-        # Create content record
+    async def _stage_record(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Create (or, on a retry, update) the processed_content row"""
+        item = ctx['item']
+        video_id = item['source_id']
+        tenant_user_id = item.get('tenant_user_id')
+        project_id = item.get('project_id')
+        video_info = ctx['fetch']['video_info']
+        project_config = ctx['fetch']['project_config']
+        ai_result = ctx['analyze']
+
         content_data = {
-            'tenant_id': tenant_id,
+            'tenant_id': item['tenant_id'],
             'tenant_user_id': tenant_user_id,
             'created_by_user_id': tenant_user_id,
             'content_type': 'youtube_video',
             'title': video_info['title'],
             'source_url': f"https://www.youtube.com/watch?v={video_id}",
             'source_id': video_id,
-            'transcript': transcript,
+            'transcript': ctx['fetch']['transcript'],
             'raw_metadata': video_info,
             'summary': ai_result.summary,
             'key_insights': ai_result.key_insights,
@@ -202,130 +506,152 @@ class QueueWorker:
             'visibility': project_config.get('default_visibility', 'private') if project_config else 'private'
         }
 
-        content_result = await self.supabase.table('processed_content').insert(
-            content_data
-        ).execute()
-
-        content_id = content_result.data[0]['id']
+        # A retry after a lost checkpoint reuses the row the earlier attempt created
+        existing = await run_query(self.supabase.table('processed_content').select('id').eq(
+            'tenant_id', item['tenant_id']
+        ).eq('source_id', video_id).eq('content_type', 'youtube_video').limit(1))
+        if existing.data:
+            content_id = existing.data[0]['id']
+            await run_query(self.supabase.table('processed_content').update(
+                content_data
+            ).eq('id', content_id))
+        else:
+            content_result = await run_query(self.supabase.table('processed_content').insert(
+                content_data
+            ))
+            content_id = content_result.data[0]['id']
+
+        return {
+            'content_id': content_id,
+            'content': content_data,
+            'project_name': project_config['name'] if project_config else None,
+        }
 
-        # Store in knowledge graph
+    async def _stage_graph(self, ctx: Dict[str, Any]):
+        """Store in knowledge graph"""
+        record = ctx['record']
+        content = record['content']
         await self.kg.add_episode(
-            content_id=content_id,
-            tenant_id=tenant_id,
-            title=video_info['title'],
-            content=transcript,
-            summary=ai_result.summary,
-            source_description=f"YouTube video by {video_info.get('author', 'Unknown')}"
+            content_id=record['content_id'],
+            tenant_id=content['tenant_id'],
+            title=content['title'],
+            content=content['transcript'],
+            summary=content['summary'],
+            source_description=f"YouTube video by {(content.get('raw_metadata') or {}).get('author', 'Unknown')}"
         )
 
-        # Generate and store embeddings
-        embedding_text = f"{video_info['title']}\n\n{ai_result.summary}\n\n" + "\n".join(ai_result.key_insights)
+    async def _stage_vector(self, ctx: Dict[str, Any]):
+        """Generate and store embeddings"""
+        record = ctx['record']
+        content = record['content']
+        embedding_text = f"{content['title']}\n\n{content['summary']}\n\n" + "\n".join(content.get('key_insights') or [])
         await self.embeddings.store_content_embedding(
-            content_id=content_id,
-            tenant_id=tenant_id,
+            content_id=record['content_id'],
+            tenant_id=content['tenant_id'],
             text=embedding_text
         )
 
-        # Save as markdown file
-        file_path = self.storage.save_content(
-            content_id=content_id,
-            title=video_info['title'],
+    async def _stage_file(self, ctx: Dict[str, Any]) -> str:
+        """Save as markdown file in PARA"""
+        record = ctx['record']
+        content = record['content']
+        return await asyncio.to_thread(
+            self.storage.save_content,
+            content_id=record['content_id'],
+            title=content['title'],
             content_type='youtube_video',
-            summary=ai_result.summary,
-            key_insights=ai_result.key_insights,
-            action_items=ai_result.action_items,
-            tags=ai_result.tags,
-            source_url=f"https://www.youtube.com/watch?v={video_id}",
-            transcript=transcript,
-            metadata=video_info,
-            para_category='projects' if project_id else 'resources',
-            project_name=project_config['name'] if project_config else None
+            summary=content['summary'],
+            key_insights=content.get('key_insights') or [],
+            action_items=content.get('action_items') or [],
+            tags=content.get('tags') or [],
+            source_url=content['source_url'],
+            transcript=content['transcript'],
+            metadata=content.get('raw_metadata'),
+            para_category='projects' if content.get('project_id') else 'resources',
+            project_name=record['project_name']
         )
 
-        # Update content with file path
-        await self.supabase.table('processed_content').update({
-            'file_path': file_path
-        }).eq('id', content_id).execute()
+    async def _stage_file_link(self, ctx: Dict[str, Any]):
+        """Update content with file path"""
+        await run_query(self.supabase.table('processed_content').update({
+            'file_path': ctx['file']
+        }).eq('id', ctx['record']['content_id']))
+
+    async def _enqueue_videos(self, item: Dict[str, Any], videos: List[Dict[str, Any]]) -> int:
+        """
+        Queue the videos of an expanded playlist/channel in bulk
 
-        print(f"[QueueWorker] Saved content {content_id} to {file_path}")
+        Already processed and already queued videos are skipped by the
+        enqueue_queue_items RPC (migration 014), one round-trip per batch.
+
+        Returns:
+            Number of videos queued
+        """
+        queue_items = [{
+            'tenant_id': item['tenant_id'],
+            'tenant_user_id': item.get('tenant_user_id'),
+            'source_type': 'youtube_video',
+            'source_id': video['video_id'],
+            'project_id': item.get('project_id'),
+            'scheduled_at': datetime.utcnow().isoformat()
+        } for video in videos]
+
+        queued = await supabase_service.bulk_add_to_queue(queue_items)
+        print(f"[QueueWorker] Queued {len(queued)} new videos "
+              f"({len(queue_items) - len(queued)} already processed or queued)")
+        return len(queued)
 
     async def _process_youtube_playlist(self, item: Dict[str, Any]):
         """Process all videos in a YouTube playlist"""
         playlist_id = item['source_id']
-        tenant_id = item['tenant_id']
-        tenant_user_id = item.get('tenant_user_id')
-        project_id = item.get('project_id')
 
         # Get playlist videos
         videos = await self.youtube.get_playlist_videos(playlist_id)
 
         print(f"[QueueWorker] Found {len(videos)} videos in playlist {playlist_id}")
 
-        # Add each video to queue
-        for video in videos:
-            video_id = video['video_id']
-
-            # Check if already processed
-            existing = await self.supabase.table('processed_content').select('id').eq(
-                'source_id', video_id
-            ).eq('tenant_id', tenant_id).execute()
-
-            if existing.data:
-                print(f"[QueueWorker] Skipping already processed video: {video_id}")
-                continue
-
-            # Add to queue
-            await self.supabase.table('processing_queue').insert({
-                'tenant_id': tenant_id,
-                'tenant_user_id': tenant_user_id,
-                'source_type': 'youtube_video',
-                'source_id': video_id,
-                'project_id': project_id,
-                'status': ProcessingStatus.PENDING.value,
-                'scheduled_at': datetime.utcnow().isoformat()
-            }).execute()
-
-            print(f"[QueueWorker] Queued video: {video_id}")
+        await self._enqueue_videos(item, videos)
 
     async def _process_youtube_channel(self, item: Dict[str, Any]):
         """Process recent videos from a YouTube channel"""
         channel_id = item['source_id']
-        tenant_id = item['tenant_id']
-        tenant_user_id = item.get('tenant_user_id')
-        project_id = item.get('project_id')
 
         # Get channel videos (max 50 most recent)
         videos = await self.youtube.get_channel_videos(channel_id, max_results=50)
 
         print(f"[QueueWorker] Found {len(videos)} videos in channel {channel_id}")
 
-        # Add each video to queue
-        for video in videos:
-            video_id = video['video_id']
-
-            # Check if already processed
-            existing = await self.supabase.table('processed_content').select('id').eq(
-                'source_id', video_id
-            ).eq('tenant_id', tenant_id).execute()
-
-            if existing.data:
-                continue
-
-            # Add to queue
-            await self.supabase.table('processing_queue').insert({
-                'tenant_id': tenant_id,
-                'tenant_user_id': tenant_user_id,
-                'source_type': 'youtube_video',
-                'source_id': video_id,
-                'project_id': project_id,
-                'status': ProcessingStatus.PENDING.value,
-                'scheduled_at': datetime.utcnow().isoformat()
-            }).execute()
+        await self._enqueue_videos(item, videos)
 
 
 async def main():
     """Main entry point for worker"""
-    worker = QueueWorker(poll_interval=10)
+    parser = argparse.ArgumentParser(description="Process the content processing queue")
+    parser.add_argument("--poll-interval", type=int,
+                        default=int(os.getenv("QUEUE_POLL_INTERVAL", DEFAULT_POLL_INTERVAL)),
+                        help="Fallback seconds between queue checks (new items wake the worker)")
+    parser.add_argument("--concurrency", type=int,
+                        default=int(os.getenv("QUEUE_WORKER_CONCURRENCY", DEFAULT_CONCURRENCY)),
+                        help="Items processed at once by this worker")
+    parser.add_argument("--type-limits", type=parse_type_limits,
+                        default=parse_type_limits(os.getenv("QUEUE_WORKER_TYPE_LIMITS", "")),
+                        help="Per-source-type caps, e.g. youtube_video=4,youtube_playlist=1")
+    parser.add_argument("--lease-seconds", type=int,
+                        default=int(os.getenv("QUEUE_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)),
+                        help="Claim lease length (renewed by heartbeats)")
+    args = parser.parse_args()
+
+    worker = QueueWorker(
+        poll_interval=args.poll_interval,
+        concurrency=args.concurrency,
+        type_limits={**DEFAULT_TYPE_LIMITS, **args.type_limits},
+        lease_seconds=args.lease_seconds,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.request_stop)
+
     await worker.start()
 
 
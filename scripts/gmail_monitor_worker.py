@@ -1,8 +1,21 @@
 #!/usr/bin/env python3
 """
 Gmail Monitor Worker
-Polls Gmail for new messages with attachments and queues them for processing
+Ingests new labeled Gmail messages (bodies and attachments) into the AI Brain
 Runs as a background service (systemd)
+
+Gmail push notifications arrive at POST /api/webhooks/gmail, which signals
+the "gmail" work channel (services/work_signals.py). On a signal the worker
+fetches only the mailbox history since its last sync (users.history.list
+from the stored history ID), so new mail is ingested within seconds instead
+of on the next poll. A full label scan runs at startup and whenever the
+stored history ID has expired.
+
+Between pushes the worker is idle: with GMAIL_PUBSUB_TOPIC set and work
+signals available, the only periodic Gmail call is a safety-net label scan
+every GMAIL_FALLBACK_SCAN_INTERVAL (default 6 hours, for pushes lost in
+transit); the worker also renews the users.watch subscription daily.
+Without push delivery it scans every GMAIL_POLL_INTERVAL instead.
 """
 
 import asyncio
@@ -11,8 +24,10 @@ import os
 import sys
 import tempfile
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 import json
+import signal
+import time
 
 # Add parent directory (00_AI_Brain) to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,6 +40,7 @@ from services.chunking_service import chunk_text
 from services.knowledge_graph_service import get_knowledge_graph
 from services.file_storage_service import get_file_storage
 from services.knowledge_ingestion_service import get_ingestion_service
+from services.work_signals import listen, GMAIL_CHANNEL
 from agents.content_processor import ContentProcessorAgent
 
 # Configure logging
@@ -41,7 +57,11 @@ logger = logging.getLogger(__name__)
 # Configuration
 GMAIL_LABEL = os.getenv('GMAIL_MONITOR_LABEL', 'Flourisha/Unprocessed')
 GMAIL_PROCESSED_LABEL = os.getenv('GMAIL_PROCESSED_LABEL', 'Flourisha/Processed')
-POLL_INTERVAL = int(os.getenv('GMAIL_POLL_INTERVAL', '300'))  # 5 minutes
+POLL_INTERVAL = int(os.getenv('GMAIL_POLL_INTERVAL', '300'))  # Full scans when push delivery is not set up
+FALLBACK_SCAN_INTERVAL = int(os.getenv('GMAIL_FALLBACK_SCAN_INTERVAL', '21600'))  # Safety-net scan with pushes
+PUBSUB_TOPIC = os.getenv('GMAIL_PUBSUB_TOPIC')
+WATCH_RENEW_SECONDS = 24 * 3600  # Gmail watches expire after 7 days
+HISTORY_STATE_PATH = os.getenv('GMAIL_HISTORY_STATE', '/root/flourisha/00_AI_Brain/data/gmail_history.json')
 BATCH_SIZE = int(os.getenv('GMAIL_BATCH_SIZE', '10'))
 TENANT_ID = os.getenv('FLOURISHA_TENANT_ID', 'default')
 USER_ID = os.getenv('FLOURISHA_USER_ID', 'gmail-worker')
@@ -59,6 +79,11 @@ class GmailMonitorWorker:
         self.content_processor = None
         self.ingestion_service = None
         self.running = False
+        self.listener = None
+        self.history_id = None
+        self.label_id = None
+        self.processed_label_id = None
+        self._watch_renewed_at = 0.0
 
     async def initialize(self) -> bool:
         """Initialize services"""
@@ -73,6 +98,10 @@ class GmailMonitorWorker:
             self.content_processor = ContentProcessorAgent()
             self.ingestion_service = get_ingestion_service(tenant_id=TENANT_ID)
 
+            self.label_id = await self.gmail_service.get_label_id(GMAIL_LABEL)
+            self.processed_label_id = await self.gmail_service.get_label_id(GMAIL_PROCESSED_LABEL)
+            self.history_id = self._load_history_id()
+
             logger.info("Gmail monitor worker initialized successfully")
             return True
 
@@ -129,9 +158,9 @@ class GmailMonitorWorker:
             content_hash = hashlib.sha256(text.encode()).hexdigest()
 
             # Check if already processed
-            existing = supabase_service.supabase.table('document_metadata').select('*').eq(
+            existing = await supabase_service.execute(supabase_service.client.table('document_metadata').select('*').eq(
                 'content_hash', content_hash
-            ).eq('tenant_id', TENANT_ID).execute()
+            ).eq('tenant_id', TENANT_ID))
 
             if existing.data:
                 logger.info(f"Document already processed: {content_hash}")
@@ -156,7 +185,7 @@ class GmailMonitorWorker:
             }
 
             # Store in database
-            doc_response = supabase_service.supabase.table('document_metadata').insert(doc_data).execute()
+            doc_response = await supabase_service.execute(supabase_service.client.table('document_metadata').insert(doc_data))
             if not doc_response.data:
                 logger.error("Failed to create document record")
                 return False
@@ -206,7 +235,7 @@ class GmailMonitorWorker:
                     'tenant_id': TENANT_ID
                 })
 
-            chunks_response = supabase_service.supabase.table('documents_pg').insert(chunk_data).execute()
+            chunks_response = await supabase_service.execute(supabase_service.client.table('documents_pg').insert(chunk_data))
             if not chunks_response.data:
                 logger.error("Failed to store chunks")
                 return False
@@ -325,8 +354,148 @@ class GmailMonitorWorker:
             logger.error(f"Error processing email body: {str(e)}")
             return False
 
-    async def check_messages(self) -> None:
-        """Check for new labeled messages and process them (bodies + attachments)"""
+    async def process_message(self, message_id: str) -> None:
+        """Ingest one message (body + attachments) and mark it processed"""
+        try:
+            body_success = False
+            attachment_success_count = 0
+
+            # Get message details
+            subject = await self.gmail_service.get_message_subject(message_id)
+            sender = await self.gmail_service.get_message_sender(message_id)
+            recipients = await self.gmail_service.get_message_recipients(message_id)
+            date = await self.gmail_service.get_message_date(message_id)
+
+            logger.info(f"Processing message from {sender}: {subject}")
+
+            # Step 1: Process email body
+            body_success = await self.process_email_body(
+                message_id,
+                subject or "No subject",
+                sender or "Unknown",
+                recipients or "",
+                date or ""
+            )
+
+            # Step 2: Process attachments (if any)
+            attachments = await self.gmail_service.get_attachments(message_id)
+
+            if attachments:
+                logger.info(f"Message has {len(attachments)} attachments")
+                for attachment in attachments:
+                    if await self.process_attachment(
+                        message_id,
+                        attachment,
+                        subject or "No subject",
+                        sender or "Unknown"
+                    ):
+                        attachment_success_count += 1
+
+            # Mark as processed if we processed body or any attachments
+            if body_success or attachment_success_count > 0:
+                await self.gmail_service.mark_as_processed(message_id, GMAIL_PROCESSED_LABEL)
+                logger.info(
+                    f"Message {message_id} marked as processed "
+                    f"(body: {'yes' if body_success else 'no'}, "
+                    f"attachments: {attachment_success_count}/{len(attachments) if attachments else 0})"
+                )
+            else:
+                # Still mark as processed to avoid reprocessing
+                await self.gmail_service.mark_as_processed(message_id, GMAIL_PROCESSED_LABEL)
+                logger.info(f"Message {message_id} marked as processed (no content ingested)")
+
+        except Exception as e:
+            logger.error(f"Error processing message {message_id}: {str(e)}")
+
+    def _load_history_id(self) -> Optional[str]:
+        """Read the last synced history ID"""
+        try:
+            with open(HISTORY_STATE_PATH) as f:
+                return json.load(f).get('history_id')
+        except (OSError, ValueError):
+            return None
+
+    def _save_history_id(self, history_id: str) -> None:
+        """Persist the last synced history ID (atomic replace)"""
+        self.history_id = history_id
+        try:
+            os.makedirs(os.path.dirname(HISTORY_STATE_PATH), exist_ok=True)
+            tmp_path = f"{HISTORY_STATE_PATH}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'history_id': history_id, 'updated_at': datetime.utcnow().isoformat()}, f)
+            os.replace(tmp_path, HISTORY_STATE_PATH)
+        except OSError as e:
+            logger.warning(f"Failed to save Gmail history ID: {str(e)}")
+
+    async def full_sync(self) -> None:
+        """Scan the whole label backlog and restart incremental sync from the current history ID"""
+        # Taken before the scan so messages arriving during it are not missed
+        history_id = await self.gmail_service.get_history_id()
+        seen = set()
+        while True:
+            message_ids = await self.check_messages()
+            if message_ids is None:
+                return  # Listing failed: keep the old history ID, the next scan retries
+            if len(message_ids) < BATCH_SIZE or seen.issuperset(message_ids):
+                break  # Backlog drained (or only messages that keep failing are left)
+            seen.update(message_ids)
+        if history_id:
+            self._save_history_id(history_id)
+
+    async def sync_history(self) -> None:
+        """Process messages added to the monitored label since the last sync"""
+        if not self.history_id or not self.label_id:
+            if not self.label_id:
+                self.label_id = await self.gmail_service.get_label_id(GMAIL_LABEL)
+            await self.full_sync()
+            return
+
+        result = await self.gmail_service.list_history(self.history_id, label_id=self.label_id)
+        if result is None:
+            # History ID expired (or the request failed): rescan the label
+            await self.full_sync()
+            return
+
+        message_ids, latest_history_id = result
+        if not self.processed_label_id:
+            # Created by the first mark_as_processed
+            self.processed_label_id = await self.gmail_service.get_label_id(GMAIL_PROCESSED_LABEL)
+        if message_ids:
+            logger.info(f"History sync found {len(message_ids)} changed messages")
+
+        for message_id in message_ids:
+            label_ids = await self.gmail_service.get_message_label_ids(message_id)
+            if label_ids is None:
+                # Don't advance past a message we couldn't check
+                logger.warning(f"Label lookup failed for {message_id}, rescanning the label")
+                await self.full_sync()
+                return
+            if self.label_id not in label_ids:
+                continue  # Deleted or no longer labeled
+            if self.processed_label_id and self.processed_label_id in label_ids:
+                continue
+            await self.process_message(message_id)
+
+        self._save_history_id(latest_history_id)
+
+    async def renew_watch(self) -> None:
+        """Renew the Gmail push subscription once a day (if a topic is configured)"""
+        if not PUBSUB_TOPIC or time.monotonic() - self._watch_renewed_at < WATCH_RENEW_SECONDS:
+            return
+        label_ids = [self.label_id] if self.label_id else None
+        response = await self.gmail_service.watch(PUBSUB_TOPIC, label_ids=label_ids)
+        if response:
+            self._watch_renewed_at = time.monotonic()
+            logger.info(f"Gmail watch renewed (expires {response.get('expiration')})")
+
+    async def check_messages(self) -> Optional[List[str]]:
+        """
+        Check for new labeled messages and process them (bodies + attachments)
+
+        Returns:
+            IDs of the messages found (at most BATCH_SIZE), or None if
+            listing failed
+        """
         try:
             logger.info(f"Checking Gmail label: {GMAIL_LABEL}")
 
@@ -340,66 +509,18 @@ class GmailMonitorWorker:
 
             if not messages:
                 logger.debug("No new messages to process")
-                return
+                return []
 
             logger.info(f"Found {len(messages)} new messages to process")
 
             # Process each message
             for message in messages:
-                try:
-                    message_id = message['id']
-                    body_success = False
-                    attachment_success_count = 0
-
-                    # Get message details
-                    subject = await self.gmail_service.get_message_subject(message_id)
-                    sender = await self.gmail_service.get_message_sender(message_id)
-                    recipients = await self.gmail_service.get_message_recipients(message_id)
-                    date = await self.gmail_service.get_message_date(message_id)
-
-                    logger.info(f"Processing message from {sender}: {subject}")
-
-                    # Step 1: Process email body
-                    body_success = await self.process_email_body(
-                        message_id,
-                        subject or "No subject",
-                        sender or "Unknown",
-                        recipients or "",
-                        date or ""
-                    )
-
-                    # Step 2: Process attachments (if any)
-                    attachments = await self.gmail_service.get_attachments(message_id)
-
-                    if attachments:
-                        logger.info(f"Message has {len(attachments)} attachments")
-                        for attachment in attachments:
-                            if await self.process_attachment(
-                                message_id,
-                                attachment,
-                                subject or "No subject",
-                                sender or "Unknown"
-                            ):
-                                attachment_success_count += 1
-
-                    # Mark as processed if we processed body or any attachments
-                    if body_success or attachment_success_count > 0:
-                        await self.gmail_service.mark_as_processed(message_id, GMAIL_PROCESSED_LABEL)
-                        logger.info(
-                            f"Message {message_id} marked as processed "
-                            f"(body: {'yes' if body_success else 'no'}, "
-                            f"attachments: {attachment_success_count}/{len(attachments) if attachments else 0})"
-                        )
-                    else:
-                        # Still mark as processed to avoid reprocessing
-                        await self.gmail_service.mark_as_processed(message_id, GMAIL_PROCESSED_LABEL)
-                        logger.info(f"Message {message_id} marked as processed (no content ingested)")
-
-                except Exception as e:
-                    logger.error(f"Error processing message {message_id}: {str(e)}")
+                await self.process_message(message['id'])
+            return [message['id'] for message in messages]
 
         except Exception as e:
             logger.error(f"Error checking messages: {str(e)}")
+            return None
 
     async def run(self) -> None:
         """Main worker loop"""
@@ -412,17 +533,43 @@ class GmailMonitorWorker:
                 logger.error("Failed to initialize worker")
                 return
 
-            # Main loop
+            try:
+                self.listener = await listen(GMAIL_CHANNEL)
+            except Exception as e:
+                logger.warning(f"Push signals unavailable, polling every {POLL_INTERVAL}s: {str(e)}")
+
+            # Catch up on anything missed while stopped
+            try:
+                await self.renew_watch()
+                await self.full_sync()
+            except Exception as e:
+                logger.error(f"Error in initial sync: {str(e)}")
+
+            # Without a watch nothing pushes, so keep polling at the short interval
+            scan_interval = FALLBACK_SCAN_INTERVAL if self.listener and PUBSUB_TOPIC else POLL_INTERVAL
+            logger.info(f"Full label scan every {scan_interval}s")
+
+            # Main loop: history sync on push, full scan on fallback timeout
             while self.running:
+                if self.listener:
+                    # Wake at least daily so the watch is renewed
+                    pushes = await self.listener.wait(timeout=min(scan_interval, WATCH_RENEW_SECONDS))
+                else:
+                    await asyncio.sleep(POLL_INTERVAL)
+                    pushes = []
+                if not self.running:
+                    break
+
                 try:
-                    await self.check_messages()
+                    await self.renew_watch()
+                    if pushes:
+                        logger.info(f"Gmail push received ({len(pushes)} notifications), syncing history")
+                        await self.sync_history()
+                    else:
+                        await self.full_sync()
                 except Exception as e:
                     logger.error(f"Error in main loop: {str(e)}")
 
-                # Wait before next poll
-                logger.debug(f"Waiting {POLL_INTERVAL} seconds before next poll...")
-                await asyncio.sleep(POLL_INTERVAL)
-
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt, shutting down...")
             self.running = False
@@ -430,12 +577,16 @@ class GmailMonitorWorker:
             logger.error(f"Unexpected error: {str(e)}")
             self.running = False
         finally:
+            if self.listener:
+                await self.listener.close()
             logger.info("Gmail monitor worker stopped")
 
     def stop(self) -> None:
         """Stop the worker"""
         logger.info("Stopping worker...")
         self.running = False
+        if self.listener:
+            self.listener.wake()
 
 
 async def main():
@@ -443,14 +594,13 @@ async def main():
     worker = GmailMonitorWorker()
 
     # Handle shutdown
-    import signal
-
-    def signal_handler(sig, frame):
+    def signal_handler(sig):
         logger.info(f"Received signal {sig}")
         worker.stop()
 
-    signal.signal(signal.SIGTERM, signal_handler)
-    signal.signal(signal.SIGINT, signal_handler)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, signal_handler, sig)
 
     # Run worker
     await worker.run()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Migrate the JSON transcript cache into the SQLite transcript cache store
+
+The transcript API used to cache one pretty-printed JSON file per video in
+data/transcripts. This imports every unexpired file into the indexed store
+(services/transcript_cache.py), keeping the original cached_at/expires_at.
+
+Usage:
+    python3 migrate_transcript_cache.py [--source DIR] [--delete]
+
+Options:
+    --source    Legacy cache directory (default: data/transcripts)
+    --delete    Remove JSON files once imported or found expired (invalid files are kept)
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.transcript_cache import get_transcript_cache
+
+LEGACY_CACHE_DIR = Path('/root/flourisha/00_AI_Brain/data/transcripts')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import JSON transcript cache files into SQLite")
+    parser.add_argument("--source", default=str(LEGACY_CACHE_DIR), help="Legacy cache directory")
+    parser.add_argument("--delete", action="store_true", help="Delete JSON files after import")
+    args = parser.parse_args()
+
+    source = Path(args.source)
+    if not source.is_dir():
+        print(f"Nothing to migrate: {source} does not exist")
+        return
+
+    cache = get_transcript_cache()
+    counts = cache.import_json_dir(str(source), delete_files=args.delete)
+
+    print(f"Imported: {counts['imported']}")
+    print(f"Expired (skipped): {counts['expired']}")
+    print(f"Invalid (skipped): {counts['invalid']}")
+    print(f"Store: {cache.path}")
+    print(f"Stats: {cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,38 @@ Scans PARA folders for changes and analyzes project priorities.
 
 Trigger: Cron job every 4 hours
 Output: /root/flourisha/00_AI_Brain/history/para-analysis/YYYY-MM-DD-HHMM.json
+
+Change detection is incremental: a SQLite manifest keeps (size, mtime,
+inode, content hash) per file, and only files whose stat changed are
+re-hashed (in parallel). Renames/moves are matched by content hash.
+The detected changes are also applied to the PARA full-text search index
+(services/para_search.py).
 """
 
 import os
 import sys
 import json
+import sqlite3
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, NamedTuple, Set, Optional, Any, Tuple
 import logging
 from dotenv import load_dotenv
 
+try:
+    import xxhash
+except ImportError:  # Optional: fall back to BLAKE2b from the standard library
+    xxhash = None
+
+# Add parent directory (00_AI_Brain) to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Same ignore rules as the search index, so changes fed to apply_changes()
+# never cover files a full sync would drop
+from services.para_search import get_para_content_index, is_ignored_name
+
 # Load environment variables from .env
 load_dotenv(os.path.expanduser("~/.claude/.env"))
 
@@ -32,8 +52,12 @@ FLOURISHA_ROOT = Path("/root/flourisha")
 AI_BRAIN_ROOT = FLOURISHA_ROOT / "00_AI_Brain"
 HISTORY_DIR = AI_BRAIN_ROOT / "history" / "para-analysis"
 STATE_FILE = HISTORY_DIR / ".last_run_state.json"
+MANIFEST_FILE = HISTORY_DIR / ".file_manifest.sqlite3"
 HISTORY_DIR.mkdir(parents=True, exist_ok=True)
 
+HASH_WORKERS = min(32, (os.cpu_count() or 4) * 2)
+HASH_BLOCK_SIZE = 1024 * 1024
+
 PARA_FOLDERS = {
     "projects": FLOURISHA_ROOT / "01f_Flourisha_Projects",
     "areas": FLOURISHA_ROOT / "02f_Flourisha_Areas",
@@ -48,10 +72,73 @@ TRACKED_EXTENSIONS = {
     ".sh", ".sql", ".html", ".css"
 }
 
-IGNORED_PATTERNS = {
-    "node_modules", ".git", "__pycache__", ".venv",
-    "venv", "dist", "build", ".next", ".cache"
-}
+class ScannedFile(NamedTuple):
+    """A tracked file as seen by the scanner (one stat per file)"""
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+def hash_file(path: str) -> str:
+    """Content hash prefixed with its algorithm ('' if unreadable)"""
+    try:
+        if xxhash is not None:
+            digest, prefix = xxhash.xxh3_128(), "xxh3"
+        else:
+            digest, prefix = hashlib.blake2b(digest_size=16), "b2"
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        return f"{prefix}:{digest.hexdigest()}"
+    except OSError as e:
+        logger.debug(f"Could not hash {path}: {e}")
+        return ""
+
+
+class FileManifest:
+    """SQLite manifest of tracked files: path -> (category, size, mtime, inode, hash)"""
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                category TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                hash TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def load(self) -> Dict[str, Tuple[str, int, int, int, str]]:
+        """All entries: path -> (category, size, mtime_ns, inode, hash)"""
+        return {
+            row[0]: tuple(row[1:])
+            for row in self.conn.execute(
+                "SELECT path, category, size, mtime_ns, inode, hash FROM files"
+            )
+        }
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM files LIMIT 1").fetchone() is None
+
+    def apply(self, upserts: List[Tuple], deletes: List[str]) -> None:
+        """Write changed entries and drop removed ones in one transaction"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, category, size, mtime_ns, inode, hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                upserts,
+            )
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in deletes])
+
+    def close(self) -> None:
+        self.conn.close()
 
 
 class PARAAnalyzer:
@@ -62,6 +149,9 @@ class PARAAnalyzer:
         self.history_dir = HISTORY_DIR
         self.state_file = STATE_FILE
         self.last_run_state = self._load_last_run_state()
+        self.manifest = FileManifest(MANIFEST_FILE)
+        self.scan_stats: Dict[str, Any] = {}
+        self._pending_manifest: Optional[Tuple[List[Tuple], List[str]]] = None
 
     def _load_last_run_state(self) -> Dict[str, Any]:
         """Load state from last run."""
@@ -74,46 +164,46 @@ class PARAAnalyzer:
 
         return {
             "timestamp": None,
-            "file_checksums": {},
             "project_priorities": {}
         }
 
     def _save_run_state(self, state: Dict[str, Any]) -> None:
-        """Save current run state."""
+        """Save current run state (file state lives in the manifest)."""
+        state.pop("file_checksums", None)
         try:
             with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+                json.dump(state, f, separators=(',', ':'))
         except Exception as e:
             logger.error(f"Could not save run state: {e}")
 
-    def _should_track_file(self, file_path: Path) -> bool:
-        """Determine if file should be tracked."""
-        # Check if any ignored pattern in path
-        for pattern in IGNORED_PATTERNS:
-            if pattern in str(file_path):
-                return False
-
-        # Check extension
-        return file_path.suffix in TRACKED_EXTENSIONS
-
-    def _calculate_file_checksum(self, file_path: Path) -> str:
-        """Calculate MD5 checksum of file."""
-        try:
-            md5 = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b''):
-                    md5.update(chunk)
-            return md5.hexdigest()
-        except Exception as e:
-            logger.debug(f"Could not checksum {file_path}: {e}")
-            return ""
-
-    async def scan_para_folders(self) -> Dict[str, List[Path]]:
+    def _scan_tree(self, folder: str, found: List[ScannedFile]) -> None:
+        """Collect tracked files under folder, pruning ignored directories."""
+        stack = [folder]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if is_ignored_name(entry.name):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                if os.path.splitext(entry.name)[1] in TRACKED_EXTENSIONS:
+                                    st = entry.stat(follow_symlinks=False)
+                                    found.append(ScannedFile(entry.path, st.st_size, st.st_mtime_ns, st.st_ino))
+                        except OSError as e:
+                            logger.debug(f"Skipping {entry.path}: {e}")
+            except OSError as e:
+                logger.warning(f"Could not scan {current}: {e}")
+
+    async def scan_para_folders(self) -> Dict[str, List[ScannedFile]]:
         """
         Walk all PARA folders and collect tracked files.
 
         Returns:
-            Dictionary mapping PARA category to list of file paths
+            Dictionary mapping PARA category to list of scanned files
         """
         para_files = {
             "projects": [],
@@ -129,19 +219,7 @@ class PARAAnalyzer:
                     continue
 
                 logger.info(f"Scanning {category}: {folder_path}")
-
-                for root, dirs, files in os.walk(folder_path):
-                    # Remove ignored directories from traversal
-                    dirs[:] = [d for d in dirs if d not in IGNORED_PATTERNS]
-
-                    root_path = Path(root)
-
-                    for file_name in files:
-                        file_path = root_path / file_name
-
-                        if self._should_track_file(file_path):
-                            para_files[category].append(file_path)
-
+                self._scan_tree(str(folder_path), para_files[category])
                 logger.info(f"Found {len(para_files[category])} files in {category}")
 
         except Exception as e:
@@ -149,14 +227,39 @@ class PARAAnalyzer:
 
         return para_files
 
+    def _previous_entries(self) -> Dict[str, Tuple[str, int, int, int, str]]:
+        """Manifest entries, seeded once from a legacy JSON checksum map."""
+        legacy = self.last_run_state.get("file_checksums")
+        if legacy and self.manifest.is_empty():
+            # Legacy state has MD5 checksums and float mtimes but no inodes:
+            # keep stat data so unchanged files are recognised, no hashes
+            logger.info(f"Seeding file manifest from {len(legacy)} legacy checksums")
+            return {
+                path: (
+                    info.get("category", "unknown"),
+                    info.get("size", -1),
+                    int(info.get("modified", 0) * 1e9),
+                    -1,
+                    "",
+                )
+                for path, info in legacy.items()
+            }
+        return self.manifest.load()
+
     async def detect_changes(
         self,
-        current_files: Dict[str, List[Path]],
+        current_files: Dict[str, List[ScannedFile]],
         since_timestamp: Optional[datetime]
     ) -> Dict[str, Any]:
         """
         Detect changes since last run.
 
+        Only files whose (size, mtime, inode) differ from the manifest are
+        hashed. A new file whose hash matches a deleted file is a move.
+
+        The manifest is not updated here: call commit_manifest() once the
+        analysis is saved, so a crash in between re-detects the same changes.
+
         Args:
             current_files: Current file structure
             since_timestamp: Timestamp of last run
@@ -172,66 +275,116 @@ class PARAAnalyzer:
         }
 
         try:
-            # Get previous checksums
-            previous_checksums = self.last_run_state.get("file_checksums", {})
-            current_checksums = {}
+            previous = self._previous_entries()
+            seen: Set[str] = set()
+            to_hash: List[Tuple[str, ScannedFile]] = []
+            rehash_only: Set[str] = set()  # Stat unchanged, only the hash is missing
+            upserts: List[Tuple] = []
 
-            # Track all current files
-            all_current_files = set()
             for category, files in current_files.items():
-                for file_path in files:
-                    file_key = str(file_path)
-                    all_current_files.add(file_key)
-
-                    # Calculate current checksum
-                    checksum = self._calculate_file_checksum(file_path)
-                    current_checksums[file_key] = {
-                        "checksum": checksum,
-                        "modified": file_path.stat().st_mtime,
-                        "size": file_path.stat().st_size,
-                        "category": category
-                    }
-
-                    # Detect new files
-                    if file_key not in previous_checksums:
-                        changes["new_files"].append({
-                            "path": file_key,
+                for scanned in files:
+                    seen.add(scanned.path)
+                    prev = previous.get(scanned.path)
+                    if prev is None:
+                        to_hash.append((category, scanned))
+                        continue
+                    prev_category, prev_size, prev_mtime, prev_inode, prev_hash = prev
+                    # Legacy entries carry no inode (-1) and microsecond mtimes
+                    same_inode = prev_inode in (-1, scanned.inode)
+                    same_mtime = (
+                        prev_mtime == scanned.mtime_ns if prev_inode != -1
+                        else abs(prev_mtime - scanned.mtime_ns) < 1_000_000
+                    )
+                    if prev_size == scanned.size and same_mtime and same_inode:
+                        if prev_hash:
+                            if prev_category != category:
+                                upserts.append((scanned.path, category, scanned.size,
+                                                scanned.mtime_ns, scanned.inode, prev_hash))
+                            continue
+                        rehash_only.add(scanned.path)
+                    to_hash.append((category, scanned))
+
+            # Hash only new/changed files, in parallel (I/O and hashing release the GIL)
+            with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+                hashes = list(pool.map(lambda item: hash_file(item[1].path), to_hash))
+
+            deleted = {path: prev for path, prev in previous.items() if path not in seen}
+            deleted_by_hash: Dict[str, List[str]] = {}
+            for path, prev in deleted.items():
+                if prev[4]:
+                    deleted_by_hash.setdefault(prev[4], []).append(path)
+
+            for (category, scanned), content_hash in zip(to_hash, hashes):
+                upserts.append((scanned.path, category, scanned.size,
+                                scanned.mtime_ns, scanned.inode, content_hash))
+                prev = previous.get(scanned.path)
+                timestamp = datetime.fromtimestamp(scanned.mtime_ns / 1e9).isoformat()
+
+                if prev is None:
+                    origins = deleted_by_hash.get(content_hash) if content_hash else None
+                    if origins:
+                        origin = origins.pop()
+                        changes["moved_files"].append({
+                            "from": origin,
+                            "to": scanned.path,
+                            "from_category": deleted.pop(origin)[0],
                             "category": category,
-                            "size": file_path.stat().st_size,
-                            "created": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+                            "size": scanned.size
                         })
-
-                    # Detect modified files
-                    elif previous_checksums[file_key]["checksum"] != checksum:
-                        changes["modified_files"].append({
-                            "path": file_key,
+                    else:
+                        changes["new_files"].append({
+                            "path": scanned.path,
                             "category": category,
-                            "size": file_path.stat().st_size,
-                            "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+                            "size": scanned.size,
+                            "created": timestamp
                         })
+                elif scanned.path not in rehash_only and prev[4] != content_hash:
+                    changes["modified_files"].append({
+                        "path": scanned.path,
+                        "category": category,
+                        "size": scanned.size,
+                        "modified": timestamp
+                    })
 
-            # Detect deleted files
-            previous_files = set(previous_checksums.keys())
-            deleted_files = previous_files - all_current_files
-
-            for file_key in deleted_files:
+            for path, prev in deleted.items():
                 changes["deleted_files"].append({
-                    "path": file_key,
-                    "category": previous_checksums[file_key].get("category", "unknown")
+                    "path": path,
+                    "category": prev[0]
                 })
 
-            # Update state with current checksums
-            self.last_run_state["file_checksums"] = current_checksums
+            removed = [path for path in previous if path not in seen]
+            self._pending_manifest = (upserts, removed)
+            self.scan_stats = {
+                "files_hashed": len(to_hash),
+                "hash_algorithm": "xxh3_128" if xxhash is not None else "blake2b",
+            }
 
             logger.info(f"Changes detected: {len(changes['new_files'])} new, "
                        f"{len(changes['modified_files'])} modified, "
-                       f"{len(changes['deleted_files'])} deleted")
+                       f"{len(changes['deleted_files'])} deleted, "
+                       f"{len(changes['moved_files'])} moved "
+                       f"({len(to_hash)} files hashed)")
 
         except Exception as e:
             logger.error(f"Error detecting changes: {e}")
 
         return changes
 
+    def commit_manifest(self) -> None:
+        """Record the files seen by the last detect_changes() as processed."""
+        if self._pending_manifest is not None:
+            self.manifest.apply(*self._pending_manifest)
+            self._pending_manifest = None
+
+    def update_search_index(self, changes: Dict[str, Any]) -> None:
+        """Apply detected changes to the PARA full-text search index."""
+        try:
+            counts = get_para_content_index().apply_changes(changes)
+            self.scan_stats["search_index"] = counts
+            logger.info(f"Search index updated: {counts}")
+        except Exception as e:
+            logger.warning(f"Could not update PARA search index: {e}")
+
     async def calculate_project_priority(
         self,
         project_path: Path
@@ -408,6 +561,7 @@ class PARAAnalyzer:
                 current_files,
                 datetime.fromisoformat(since_last_run) if since_last_run else None
             )
+            self.update_search_index(changes)
 
             # Analyze project priorities
             project_activity = {}
@@ -415,7 +569,7 @@ class PARAAnalyzer:
 
             if projects_folder.exists():
                 for project_dir in projects_folder.iterdir():
-                    if project_dir.is_dir() and project_dir.name not in IGNORED_PATTERNS:
+                    if project_dir.is_dir() and not is_ignored_name(project_dir.name):
                         priority_data = await self.calculate_project_priority(project_dir)
                         activity_level = await self.analyze_activity_level(changes, project_dir)
 
@@ -468,8 +622,9 @@ class PARAAnalyzer:
                     ]
                 },
                 "metadata": {
-                    "analyzer_version": "1.0.0",
-                    "para_folders": {k: str(v) for k, v in PARA_FOLDERS.items()}
+                    "analyzer_version": "1.1.0",
+                    "para_folders": {k: str(v) for k, v in PARA_FOLDERS.items()},
+                    "scan": self.scan_stats
                 }
             }
 
@@ -495,6 +650,9 @@ class PARAAnalyzer:
             }
             self._save_run_state(self.last_run_state)
 
+            # Only now mark these changes as seen
+            self.commit_manifest()
+
             return analysis
 
         except Exception as e:
@@ -0,0 +1,393 @@
+"""
+Chunked Long-Audio Transcription
+Splits long audio at silences and transcribes the chunks in parallel
+
+A one-shot Whisper pass over a 60-minute podcast uses one worker and loses
+everything if the process dies near the end. Instead:
+1. Decode the audio once (16 kHz mono)
+2. Find speech with Silero VAD and cut chunks of ~WHISPER_CHUNK_SECONDS at
+   the silence gaps between speech regions (never mid-word)
+3. Transcribe the chunks concurrently on the shared TranscriptionEngine
+4. Checkpoint every finished chunk to disk, so a restart only transcribes
+   the chunks that are missing
+5. Merge the chunk segments, shifted to absolute timestamps
+
+Audio no longer than one chunk takes a single engine job, as before.
+
+Usage:
+    from services.chunked_transcription import get_chunked_transcriber
+
+    transcriber = get_chunked_transcriber()
+    with transcriber.job(video_id) as job_id:   # exclusive use of the checkpoint
+        output = transcriber.transcribe("/path/audio.mp3", job_id=job_id)
+    for segment in output.segments:
+        print(segment.start, segment.text)
+"""
+import os
+import json
+import time
+import fcntl
+import shutil
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from services.transcription_engine import (
+        TranscriptionEngine, TranscriptionOutput, TranscriptSegment, get_transcription_engine,
+    )
+except ImportError:
+    from transcription_engine import (
+        TranscriptionEngine, TranscriptionOutput, TranscriptSegment, get_transcription_engine,
+    )
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+DEFAULT_CHUNK_SECONDS = 300.0
+DEFAULT_CHECKPOINT_DIR = "/root/flourisha/00_AI_Brain/data/transcription_checkpoints"
+CHECKPOINT_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Held (flock) by the run using a job directory
+LOCK_FILE = ".lock"
+# How long a chunk waits for engine queue space before the job gives up
+ADMISSION_TIMEOUT_SECONDS = 600.0
+# Padding kept around speech when cutting (Whisper clips word onsets otherwise)
+SPEECH_PAD_SECONDS = 0.2
+
+
+@dataclass
+class AudioChunk:
+    """A span of the source audio transcribed as one engine job"""
+    index: int
+    start: float  # Seconds
+    end: float
+
+
+def plan_chunks(
+    speech: List[Tuple[float, float]],
+    duration: float,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS
+) -> List[AudioChunk]:
+    """
+    Group speech regions into chunks of about chunk_seconds
+
+    Chunks are cut midway through the silence between two speech regions.
+    A single region longer than 2 x chunk_seconds is hard-split.
+
+    Args:
+        speech: (start, end) speech regions in seconds, in order
+        duration: Total audio length in seconds
+        chunk_seconds: Target chunk length
+
+    Returns:
+        Chunks covering all speech, in order
+    """
+    spans: List[List[float]] = []
+    for start, end in speech:
+        if spans and end - spans[-1][0] <= chunk_seconds:
+            spans[-1][1] = end
+        else:
+            spans.append([start, end])
+
+    # Hard-split runaway regions (continuous speech with no usable gap)
+    limit = 2 * chunk_seconds
+    bounded: List[List[float]] = []
+    for start, end in spans:
+        while end - start > limit:
+            bounded.append([start, start + chunk_seconds])
+            start += chunk_seconds
+        bounded.append([start, end])
+
+    chunks = []
+    for i, (start, end) in enumerate(bounded):
+        # Extend each chunk into half of the neighbouring silence (capped by padding)
+        prev_end = bounded[i - 1][1] if i else 0.0
+        next_start = bounded[i + 1][0] if i + 1 < len(bounded) else duration
+        start = max(prev_end + (start - prev_end) / 2, start - SPEECH_PAD_SECONDS, 0.0)
+        end = min(end + (next_start - end) / 2, end + SPEECH_PAD_SECONDS, duration)
+        chunks.append(AudioChunk(index=i, start=round(start, 3), end=round(end, 3)))
+    return chunks
+
+
+def detect_speech(audio) -> List[Tuple[float, float]]:
+    """Speech regions (seconds) found by faster-whisper's Silero VAD"""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    regions = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    return [(r["start"] / SAMPLE_RATE, r["end"] / SAMPLE_RATE) for r in regions]
+
+
+class ChunkCheckpoint:
+    """
+    On-disk progress for one job: the chunk plan plus one file per finished chunk
+
+    Layout: {root}/{job_id}/manifest.json and chunk_NNNN.json. The job
+    directory is also where callers keep the source audio so that a resumed
+    job does not need to download it again.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.manifest_path = directory / "manifest.json"
+
+    def _write(self, path: Path, data: Dict):
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def load_plan(self, duration: float, model: str) -> Optional[List[AudioChunk]]:
+        """Saved chunk plan, if it was made for the same audio and model"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if abs(manifest.get("duration", -1) - duration) > 0.5 or manifest.get("model") != model:
+            return None
+        return [AudioChunk(**chunk) for chunk in manifest["chunks"]]
+
+    def save_plan(self, chunks: List[AudioChunk], duration: float, model: str):
+        """Start a fresh checkpoint for this plan (drops any stale chunk results)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stale in self.directory.glob("chunk_*.json"):
+            stale.unlink(missing_ok=True)
+        self._write(self.manifest_path, {
+            "duration": duration,
+            "model": model,
+            "chunks": [asdict(chunk) for chunk in chunks],
+        })
+
+    def completed(self) -> Dict[int, Tuple[str, List[TranscriptSegment]]]:
+        """Finished chunks: index -> (language, absolute-time segments)"""
+        done = {}
+        for path in self.directory.glob("chunk_*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                done[data["index"]] = (
+                    data["language"],
+                    [TranscriptSegment(**s) for s in data["segments"]],
+                )
+            except (OSError, json.JSONDecodeError, KeyError, TypeError):
+                continue  # Partial/corrupt file: transcribe that chunk again
+        return done
+
+    def save_chunk(self, index: int, language: str, segments: List[TranscriptSegment]):
+        self._write(self.directory / f"chunk_{index:04d}.json", {
+            "index": index,
+            "language": language,
+            "segments": [asdict(s) for s in segments],
+        })
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class ChunkedTranscriber:
+    """
+    Parallel, resumable transcription of long audio on the shared engine
+    """
+
+    def __init__(
+        self,
+        engine: Optional[TranscriptionEngine] = None,
+        checkpoint_root: Optional[str] = None,
+        chunk_seconds: Optional[float] = None
+    ):
+        """
+        Initialize chunked transcriber
+
+        Args:
+            engine: Transcription engine (defaults to the shared engine)
+            checkpoint_root: Directory for per-job checkpoints (WHISPER_CHECKPOINT_DIR)
+            chunk_seconds: Target chunk length (WHISPER_CHUNK_SECONDS, default 300)
+        """
+        self.engine = engine or get_transcription_engine()
+        self.checkpoint_root = Path(
+            checkpoint_root or os.getenv("WHISPER_CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR)
+        )
+        self.chunk_seconds = chunk_seconds or float(
+            os.getenv("WHISPER_CHUNK_SECONDS", DEFAULT_CHUNK_SECONDS)
+        )
+
+    def checkpoint(self, job_id: str) -> ChunkCheckpoint:
+        """Checkpoint for a job (e.g. a video ID)"""
+        return ChunkCheckpoint(self.checkpoint_root / job_id)
+
+    def job_dir(self, job_id: str) -> Path:
+        """Working directory for a job (created if missing)"""
+        directory = self.checkpoint_root / job_id
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def _lock(self, job_id: str):
+        """Open and exclusively lock a job's lock file; None if another run holds it"""
+        lock_file = open(self.job_dir(job_id) / LOCK_FILE, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    @contextmanager
+    def job(self, job_id: str) -> Iterator[str]:
+        """
+        Hold a job's directory exclusively for one run
+
+        Two runs for the same job (e.g. the API and the queue worker on one
+        video) would otherwise delete each other's chunk files. If the
+        directory is locked (flock, so also between threads), this run gets
+        a private directory instead and does not resume.
+
+        Yields:
+            Job ID to pass to job_dir() and transcribe()
+        """
+        lock_file = self._lock(job_id)
+        if lock_file is None:
+            private_id = f"{job_id}.{os.getpid()}-{threading.get_ident()}"
+            logger.info(f"Checkpoint for {job_id} is in use, transcribing in {private_id}")
+            job_id = private_id
+            lock_file = self._lock(job_id)
+        try:
+            yield job_id
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+    def prune_checkpoints(self, max_age_seconds: float = CHECKPOINT_MAX_AGE_SECONDS) -> int:
+        """Remove job directories untouched for max_age_seconds (abandoned jobs)"""
+        if not self.checkpoint_root.exists():
+            return 0
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for directory in self.checkpoint_root.iterdir():
+            if directory.is_dir() and directory.stat().st_mtime < cutoff:
+                lock_file = self._lock(directory.name)
+                if lock_file is None:
+                    continue  # A run is still using it
+                shutil.rmtree(directory, ignore_errors=True)
+                lock_file.close()
+                removed += 1
+        return removed
+
+    def _plan(self, audio, duration: float, checkpoint: ChunkCheckpoint) -> List[AudioChunk]:
+        model = self.engine.config.model_size
+        chunks = checkpoint.load_plan(duration, model)
+        if chunks is not None:
+            return chunks
+
+        if duration <= self.chunk_seconds:
+            chunks = [AudioChunk(index=0, start=0.0, end=duration)]
+        else:
+            chunks = plan_chunks(detect_speech(audio), duration, self.chunk_seconds)
+        checkpoint.save_plan(chunks, duration, model)
+        return chunks
+
+    def transcribe(self, audio_path: str, job_id: str, language: Optional[str] = "en") -> TranscriptionOutput:
+        """
+        Transcribe an audio file, resuming from any checkpoint for job_id
+
+        The checkpoint is removed once the whole job succeeds; on failure the
+        finished chunks stay on disk for the next attempt.
+
+        Args:
+            audio_path: Audio file (any format ffmpeg/PyAV can decode)
+            job_id: Stable job key, e.g. the YouTube video ID
+            language: Language code (None = auto-detect per chunk)
+
+        Returns:
+            TranscriptionOutput with absolute-time segments
+        """
+        from faster_whisper.audio import decode_audio
+
+        started = time.monotonic()
+        audio = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+        duration = len(audio) / SAMPLE_RATE
+
+        checkpoint = self.checkpoint(job_id)
+        chunks = self._plan(audio, duration, checkpoint)
+        results = checkpoint.completed()
+        resumed = len(results)
+        pending = [chunk for chunk in chunks if chunk.index not in results]
+        if resumed:
+            logger.info(f"Resuming {job_id}: {resumed}/{len(chunks)} chunks already transcribed")
+
+        # Keep at most one chunk per engine worker queued, so a long job
+        # doesn't fill the engine queue ahead of other callers
+        window = max(1, self.engine.config.workers)
+        in_flight = {}
+        error: Optional[BaseException] = None
+
+        while pending or in_flight:
+            while pending and len(in_flight) < window and error is None:
+                chunk = pending.pop(0)
+                samples = audio[int(chunk.start * SAMPLE_RATE):int(chunk.end * SAMPLE_RATE)]
+                try:
+                    future = self.engine.submit(
+                        samples, language, admission_timeout=ADMISSION_TIMEOUT_SECONDS
+                    )
+                except Exception as e:
+                    # e.g. TranscriptionQueueFull: checkpoint in-flight chunks, then fail
+                    error = e
+                    break
+                in_flight[future] = chunk
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk = in_flight.pop(future)
+                try:
+                    output = future.result()
+                except Exception as e:
+                    # Let in-flight chunks finish (and checkpoint), then fail
+                    logger.error(f"Chunk {chunk.index} of {job_id} failed: {e}")
+                    error = error or e
+                    continue
+                segments = [
+                    TranscriptSegment(
+                        start=round(chunk.start + s.start, 2),
+                        end=round(chunk.start + s.end, 2),
+                        text=s.text,
+                    )
+                    for s in output.segments
+                ]
+                checkpoint.save_chunk(chunk.index, output.language, segments)
+                results[chunk.index] = (output.language, segments)
+
+        if error is not None:
+            raise error
+
+        segments = [s for index in sorted(results) for s in results[index][1]]
+        languages = Counter(lang for lang, _ in results.values() if lang)
+        output = TranscriptionOutput(
+            text=" ".join(s.text for s in segments if s.text),
+            segments=segments,
+            language=languages.most_common(1)[0][0] if languages else (language or "en"),
+            duration=duration,
+            elapsed=time.monotonic() - started,
+            chunks=len(chunks),
+            resumed_chunks=resumed,
+        )
+        checkpoint.clear()
+        return output
+
+
+# Singleton instance
+_chunked_transcriber = None
+
+
+def get_chunked_transcriber() -> ChunkedTranscriber:
+    """Get or create chunked transcriber singleton (on the shared engine)"""
+    global _chunked_transcriber
+    if _chunked_transcriber is None:
+        _chunked_transcriber = ChunkedTranscriber()
+    return _chunked_transcriber
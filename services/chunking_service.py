@@ -1,19 +1,392 @@
 """
-Agentic Chunking Service
-Intelligent semantic chunking using Claude (adopted from n8n RAG pattern)
+Chunking Service
+Structure-aware semantic chunking for embeddings
+
+Two modes:
+- SemanticChunker (default): deterministic, local, streaming. Splits on
+  markdown headings, tables, lists, code fences and sentence boundaries, with
+  optional sentence-embedding similarity to detect topic shifts.
+- AgenticChunker (opt-in): asks Claude for split points (adopted from n8n
+  RAG pattern). Costs tokens proportional to the document.
 """
+import io
 import os
+import re
 import json
-from typing import List
-from anthropic import Anthropic
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+
+
+# =============================================================================
+# Local Semantic Chunker
+# =============================================================================
+
+_HEADING_RE = re.compile(r'^\s{0,3}#{1,6}\s+\S')
+_LIST_ITEM_RE = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+')
+_TABLE_ROW_RE = re.compile(r'^\s*\|')
+_TABLE_DIVIDER_RE = re.compile(r'^\s*\|?[\s:|-]+\|?\s*$')
+_FENCE_RE = re.compile(r'^\s*(```|~~~)')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])["\')\]]*\s+(?=["\'(\[]?[A-Z0-9])')
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+@dataclass
+class TextBlock:
+    """A structural unit of a document (heading, paragraph, list, table, code)"""
+    kind: str
+    text: str
+    topic_shift: bool = False
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[TextBlock]:
+    """
+    Parse lines of markdown/plain text into structural blocks (streaming)
+
+    Args:
+        lines: Any iterable of lines (file object, list, StringIO)
+
+    Yields:
+        TextBlock for each heading, paragraph, list, table or code fence
+    """
+    buf: List[str] = []
+    kind: Optional[str] = None
+    in_fence = False
+
+    def take() -> Optional[TextBlock]:
+        nonlocal buf, kind
+        block = TextBlock(kind, "\n".join(buf).strip("\n")) if buf and kind else None
+        buf, kind = [], None
+        return block
+
+    for raw in lines:
+        line = raw.rstrip("\r\n").rstrip()
+
+        if in_fence:
+            buf.append(line)
+            if _FENCE_RE.match(line):
+                in_fence = False
+                yield take()
+            continue
+
+        if _FENCE_RE.match(line):
+            block = take()
+            if block:
+                yield block
+            kind, buf, in_fence = "code", [line], True
+            continue
+
+        if not line.strip():
+            block = take()
+            if block:
+                yield block
+            continue
+
+        if _HEADING_RE.match(line):
+            block = take()
+            if block:
+                yield block
+            yield TextBlock("heading", line.strip())
+            continue
+
+        if _TABLE_ROW_RE.match(line):
+            new_kind = "table"
+        elif _LIST_ITEM_RE.match(line):
+            new_kind = "list"
+        elif kind == "list" and raw[:1] in (" ", "\t"):
+            new_kind = "list"  # Indented continuation of a list item
+        else:
+            new_kind = "paragraph"
+
+        if kind is not None and kind != new_kind:
+            block = take()
+            if block:
+                yield block
+        kind = new_kind
+        buf.append(line)
+
+    block = take()
+    if block:
+        yield block
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text on sentence boundaries (punctuation followed by a capital/digit)"""
+    return [s for s in _SENTENCE_SPLIT_RE.split(text.strip()) if s]
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SemanticChunker:
+    """
+    Deterministic, structure-aware chunker (no LLM calls)
+
+    Packs structural blocks into chunks of at most max_chunk_size characters,
+    starting new chunks at headings (once the current chunk reaches
+    min_chunk_size) and, when an embed_fn is provided, at topic shifts.
+    Oversized blocks are split along their own structure: table rows (the
+    header row is repeated), list items, code lines, then sentences.
+    """
+
+    def __init__(
+        self,
+        max_chunk_size: int = 1000,
+        min_chunk_size: int = 400,
+        chunk_overlap: int = 0,
+        embed_fn: Optional[EmbedFn] = None,
+        topic_threshold: float = 0.5,
+        topic_window: int = 64
+    ):
+        """
+        Initialize semantic chunker
+
+        Args:
+            max_chunk_size: Maximum characters per chunk
+            min_chunk_size: Minimum characters per chunk (except a short tail)
+            chunk_overlap: Characters carried over when a section is split
+            embed_fn: Optional sync function embedding a list of texts; enables
+                topic-boundary detection between consecutive blocks
+            topic_threshold: Cosine similarity below which blocks are a topic shift
+            topic_window: Blocks embedded per embed_fn call
+        """
+        self.max_chunk_size = max_chunk_size
+        self.min_chunk_size = min(min_chunk_size, max_chunk_size)
+        self.chunk_overlap = min(chunk_overlap, max_chunk_size // 2)
+        self.embed_fn = embed_fn
+        self.topic_threshold = topic_threshold
+        self.topic_window = topic_window
+
+    async def chunk(self, text: str) -> List[str]:
+        """
+        Split text into semantically coherent chunks
+
+        Async for interface parity with AgenticChunker; runs locally.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            List of chunks
+        """
+        return self.split(text)
+
+    def split(self, text: str) -> List[str]:
+        """Split text into chunks"""
+        return list(self.iter_chunks(text))
+
+    def iter_chunks(self, source: Union[str, Iterable[str]]) -> Iterator[str]:
+        """
+        Stream chunks from a string or any iterable of lines (e.g. an open file)
+
+        Args:
+            source: Text, or an iterable of lines for large inputs
+
+        Yields:
+            Chunks in document order
+        """
+        lines = io.StringIO(source) if isinstance(source, str) else source
+        blocks = iter_blocks(lines)
+        if self.embed_fn is not None:
+            blocks = self._mark_topic_shifts(blocks)
+
+        parts: List[str] = []
+        size = 0
+        pending: Optional[str] = None
+
+        def emit(chunk: str) -> Iterator[str]:
+            # Hold one chunk back so a short tail can be merged into it
+            nonlocal pending
+            if pending is not None:
+                yield pending
+            pending = chunk
+
+        def flush(carry_overlap: bool) -> Iterator[str]:
+            nonlocal parts, size
+            carried_headings: List[str] = []
+            while parts and _HEADING_RE.match(parts[-1]):
+                carried_headings.insert(0, parts.pop())  # Never end a chunk on a heading
+            if parts:
+                chunk = "\n\n".join(parts)
+                yield from emit(chunk)
+                parts = []
+                if carry_overlap and self.chunk_overlap:
+                    tail = self._overlap_tail(chunk)
+                    if tail:
+                        parts.append(tail)
+            parts[:0] = carried_headings
+            size = sum(len(p) for p in parts) + 2 * max(len(parts) - 1, 0)
+
+        for block in blocks:
+            if block.kind == "heading" or block.topic_shift:
+                if size >= self.min_chunk_size:
+                    yield from flush(carry_overlap=False)
+
+            limit = self.max_chunk_size - self.chunk_overlap
+            pieces = [block.text] if len(block.text) <= limit else self._split_block(block, limit)
+
+            queue = deque(pieces)
+            while queue:
+                piece = queue.popleft()
+                added = len(piece) + (2 if parts else 0)
+                if parts and size + added > self.max_chunk_size:
+                    # Overlap helps prose; for tables/code it would split rows
+                    yield from flush(carry_overlap=block.kind in ("paragraph", "list"))
+                    added = len(piece) + (2 if parts else 0)
+                    if parts and size + added > self.max_chunk_size:
+                        # Overlap does not fit with this piece; keep carried headings
+                        parts = [p for p in parts if _HEADING_RE.match(p)]
+                        size = sum(len(p) for p in parts) + 2 * max(len(parts) - 1, 0)
+                        added = len(piece) + (2 if parts else 0)
+                    if parts and size + added > self.max_chunk_size:
+                        room = self.max_chunk_size - size - 2
+                        if block.kind != "heading" and room >= self.max_chunk_size // 4:
+                            # Re-split the piece so the headings lead its first part
+                            first, *rest = self._split_block(TextBlock(block.kind, piece), room)
+                            queue.extendleft(reversed(rest))
+                            piece, added = first, len(first) + 2
+                        else:
+                            # Headings too long to share a chunk: emit them on their own
+                            yield from emit("\n\n".join(parts))
+                            parts, size, added = [], 0, len(piece)
+                parts.append(piece)
+                size += added
+
+        tail = "\n\n".join(parts) if parts else None
+        if tail and pending is not None and len(tail) < self.min_chunk_size \
+                and len(pending) + 2 + len(tail) <= self.max_chunk_size:
+            pending = pending + "\n\n" + tail
+            tail = None
+        if pending is not None:
+            yield pending
+        if tail:
+            yield tail
+
+    def _mark_topic_shifts(self, blocks: Iterator[TextBlock]) -> Iterator[TextBlock]:
+        """Flag blocks whose embedding diverges from the previous content block"""
+        previous: Optional[List[float]] = None
+        window: List[TextBlock] = []
+
+        def process(window: List[TextBlock]) -> Iterator[TextBlock]:
+            nonlocal previous
+            content = [b for b in window if b.kind != "heading"]
+            vectors = self.embed_fn([b.text for b in content]) if content else []
+            by_block = {id(b): v for b, v in zip(content, vectors)}
+            for block in window:
+                vector = by_block.get(id(block))
+                if vector is not None:
+                    if previous is not None and _cosine(previous, vector) < self.topic_threshold:
+                        block.topic_shift = True
+                    previous = vector
+                yield block
+
+        for block in blocks:
+            window.append(block)
+            if len(window) >= self.topic_window:
+                yield from process(window)
+                window = []
+        if window:
+            yield from process(window)
+
+    def _split_block(self, block: TextBlock, limit: int) -> List[str]:
+        """Split an oversized block along its own structure"""
+        if block.kind == "table":
+            rows = block.text.split("\n")
+            header: List[str] = []
+            if len(rows) > 2 and _TABLE_DIVIDER_RE.match(rows[1]):
+                header, rows = rows[:2], rows[2:]
+            header_text = "\n".join(header)
+            if header and len(header_text) < limit // 2:
+                body_limit = limit - len(header_text) - 1
+                return [header_text + "\n" + group for group in self._pack(rows, body_limit, "\n")]
+            return self._pack(block.text.split("\n"), limit, "\n")
+
+        if block.kind == "list":
+            items: List[str] = []
+            for line in block.text.split("\n"):
+                if _LIST_ITEM_RE.match(line) or not items:
+                    items.append(line)
+                else:
+                    items[-1] += "\n" + line
+            return self._pack(items, limit, "\n")
+
+        if block.kind == "code":
+            return self._pack(block.text.split("\n"), limit, "\n")
+
+        return self._pack(split_sentences(block.text), limit, " ")
+
+    def _pack(self, units: List[str], limit: int, joiner: str) -> List[str]:
+        """Greedily pack units into strings of at most limit characters"""
+        packed: List[str] = []
+        current = ""
+        for unit in units:
+            if len(unit) > limit:
+                if current:
+                    packed.append(current)
+                    current = ""
+                packed.extend(self._hard_split(unit, limit))
+                continue
+            candidate = current + joiner + unit if current else unit
+            if len(candidate) > limit:
+                packed.append(current)
+                current = unit
+            else:
+                current = candidate
+        if current:
+            packed.append(current)
+        return packed
+
+    def _hard_split(self, text: str, limit: int) -> List[str]:
+        """Split text with no usable structure at word boundaries"""
+        pieces = []
+        while len(text) > limit:
+            cut = text.rfind(" ", 0, limit)
+            if cut <= limit // 2:
+                cut = limit
+            pieces.append(text[:cut].rstrip())
+            text = text[cut:].lstrip()
+        if text:
+            pieces.append(text)
+        return pieces
+
+    def _overlap_tail(self, chunk: str) -> str:
+        """Last ~chunk_overlap characters of a chunk, starting at a sentence or word"""
+        if len(chunk) <= self.chunk_overlap:
+            return ""
+        tail = chunk[-self.chunk_overlap:]
+        sentence = _SENTENCE_SPLIT_RE.search(tail)
+        if sentence:
+            return tail[sentence.end():].strip()
+        newline = tail.find("\n")
+        if newline >= 0:
+            return tail[newline + 1:].strip()
+        space = tail.find(" ")
+        return tail[space + 1:].strip() if space >= 0 else tail.strip()
+
+
+# =============================================================================
+# LLM Chunker (opt-in)
+# =============================================================================
 
 
 class AgenticChunker:
     """
     Intelligent semantic chunking using Claude
     Adopted from n8n's proven LangChain agentic chunking approach
+
+    Opt-in only (get_chunker(mode="llm")): the model echoes the full text back,
+    so inputs longer than MAX_INPUT_CHARS are chunked locally instead of being
+    silently truncated by max_tokens.
     """
 
+    # max_tokens=4096 of output is roughly 14k characters of echoed text
+    MAX_INPUT_CHARS = 12000
+
     def __init__(
         self,
         max_chunk_size: int = 1000,
@@ -30,9 +403,12 @@ class AgenticChunker:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
 
-        self.client = Anthropic(api_key=self.api_key)
+        from .llm_gateway import get_llm_gateway
+
+        self.gateway = get_llm_gateway()
         self.max_chunk_size = max_chunk_size
         self.min_chunk_size = min_chunk_size
+        self._local = SemanticChunker(max_chunk_size, min_chunk_size)
 
     async def chunk(self, text: str) -> List[str]:
         """
@@ -54,8 +430,12 @@ class AgenticChunker:
         if len(text) < self.min_chunk_size:
             return [text]
 
+        # Output budget can't hold a full copy of long inputs
+        if len(text) > self.MAX_INPUT_CHARS:
+            return self._local.split(text)
+
         try:
-            response = self.client.messages.create(
+            response = await self.gateway.create_message(
                 model='claude-sonnet-4-5-20250929',
                 max_tokens=4096,
                 temperature=0,  # Deterministic splitting
@@ -145,7 +525,7 @@ OUTPUT FORMAT (JSON only, no markdown):
 
     def _fallback_chunk(self, text: str) -> List[str]:
         """
-        Simple paragraph-based chunking as fallback
+        Local structure-aware chunking as fallback
 
         Args:
             text: Text to chunk
@@ -153,36 +533,72 @@ OUTPUT FORMAT (JSON only, no markdown):
         Returns:
             List of chunks
         """
-        paragraphs = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
-
-        for para in paragraphs:
-            if len(current_chunk) + len(para) > self.max_chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = para
-            else:
-                current_chunk += "\n\n" + para if current_chunk else para
-
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-
-        return chunks
+        return self._local.split(text)
 
 
 # Singleton instance
 _chunker = None
 
 
-def get_chunker(max_chunk_size: int = 1000, min_chunk_size: int = 400) -> AgenticChunker:
-    """Get or create agentic chunker singleton"""
+def get_chunker(
+    max_chunk_size: int = 1000,
+    min_chunk_size: int = 400,
+    mode: Optional[str] = None
+) -> Union[SemanticChunker, AgenticChunker]:
+    """
+    Get or create chunker singleton
+
+    Args:
+        max_chunk_size: Maximum characters per chunk
+        min_chunk_size: Minimum characters per chunk
+        mode: "semantic" (local, default) or "llm" (Claude). Defaults to the
+            CHUNKER_MODE environment variable.
+
+    Returns:
+        Chunker exposing `async chunk(text) -> List[str]`
+    """
     global _chunker
-    if _chunker is None or _chunker.max_chunk_size != max_chunk_size:
-        _chunker = AgenticChunker(max_chunk_size, min_chunk_size)
+    mode = mode or os.getenv('CHUNKER_MODE', 'semantic')
+    chunker_class = AgenticChunker if mode == 'llm' else SemanticChunker
+    if (
+        not isinstance(_chunker, chunker_class)
+        or _chunker.max_chunk_size != max_chunk_size
+        or _chunker.min_chunk_size != min_chunk_size
+    ):
+        _chunker = chunker_class(max_chunk_size, min_chunk_size)
     return _chunker
 
 
+def semantic_chunk_text(
+    text: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    min_chunk_size: int = 400
+) -> List[str]:
+    """
+    Structure-aware chunking without AI.
+
+    Like chunk_text(), but splits on markdown headings, tables, lists and
+    sentence boundaries instead of raw character offsets.
+
+    Args:
+        text: Text to chunk
+        chunk_size: Maximum characters per chunk
+        chunk_overlap: Overlap carried into the next chunk of a split section
+        min_chunk_size: Minimum characters per chunk
+
+    Returns:
+        List of text chunks
+    """
+    if not text:
+        return []
+    return SemanticChunker(
+        max_chunk_size=chunk_size,
+        min_chunk_size=min_chunk_size,
+        chunk_overlap=chunk_overlap
+    ).split(text)
+
+
 def chunk_text(
     text: str,
     chunk_size: int = 1000,
@@ -0,0 +1,136 @@
+"""
+Async Database Access Layer
+
+The supabase-py client is synchronous: every `.execute()` performs a blocking
+HTTP round-trip to PostgREST. Calling it inline from `async def` code stalls
+the whole event loop, so concurrent API requests serialize behind each other.
+
+This module provides:
+- A single, process-wide Supabase client (one httpx connection pool with
+  keep-alive, shared by every service instead of one client per service)
+- A bounded thread-pool executor sized to that connection pool
+- `run_query()` / `run_blocking()` helpers that await blocking work off-loop
+
+Usage:
+    from services.db_pool import get_supabase_client, run_query
+
+    client = get_supabase_client()
+    response = await run_query(
+        client.table('processed_content').select('*').eq('id', content_id)
+    )
+"""
+
+import os
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# httpx keeps at most 20 idle keep-alive connections per pool by default, so
+# more worker threads than that would just churn TCP/TLS handshakes.
+DEFAULT_MAX_WORKERS = 20
+
+_executor: Optional[ThreadPoolExecutor] = None
+_client = None
+_lock = threading.Lock()
+
+
+def _load_env_file():
+    """Populate os.environ from ~/.claude/.env if Supabase vars are missing"""
+    env_file = os.path.expanduser("~/.claude/.env")
+    if not os.path.exists(env_file):
+        return
+    with open(env_file) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                k, v = line.split("=", 1)
+                os.environ.setdefault(k, v.strip('"').strip("'"))
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get or create the shared, bounded executor for blocking DB calls"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                max_workers = int(os.environ.get('SUPABASE_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix='supabase-db',
+                )
+                logger.info(f"Started DB executor with {max_workers} workers")
+    return _executor
+
+
+def get_supabase_client():
+    """
+    Get or create the process-wide Supabase client.
+
+    The underlying PostgREST session is an httpx.Client, which is thread-safe
+    and pools keep-alive connections, so sharing one client across services
+    and executor threads reuses connections instead of re-handshaking.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from supabase import create_client
+
+                url = os.environ.get('SUPABASE_URL')
+                key = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
+
+                if not url or not key:
+                    _load_env_file()
+                    url = os.environ.get('SUPABASE_URL')
+                    key = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
+
+                if not url or not key:
+                    raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+
+                _client = create_client(url, key)
+    return _client
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable on the shared DB executor.
+
+    Args:
+        func: Synchronous callable
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs) if (args or kwargs) else func
+    return await loop.run_in_executor(get_db_executor(), call)
+
+
+async def run_query(query) -> Any:
+    """
+    Execute a supabase-py query/RPC builder without blocking the event loop.
+
+    Args:
+        query: Any builder exposing `.execute()` (table queries, rpc calls)
+
+    Returns:
+        The APIResponse returned by `.execute()`
+    """
+    return await run_blocking(query.execute)
+
+
+def shutdown_db_executor(wait: bool = True) -> None:
+    """Shut down the DB executor (call from application shutdown)"""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
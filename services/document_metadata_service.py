@@ -48,9 +48,9 @@ class DocumentMetadataService:
             Document metadata record
         """
         # Check if document exists with same content hash
-        existing = await self.supabase.client.from_('document_metadata').select('*').eq(
+        existing = await self.supabase.execute(self.supabase.client.from_('document_metadata').select('*').eq(
             'id', file_id
-        ).eq('is_current', True).maybe_single().execute()
+        ).eq('is_current', True).maybe_single())
 
         if existing.data and existing.data.get('content_hash') == content_hash:
             # Content unchanged - return existing
@@ -61,11 +61,11 @@ class DocumentMetadataService:
 
         # Mark old version as not current
         if existing.data:
-            await self.supabase.client.from_('document_metadata').update({
+            await self.supabase.execute(self.supabase.client.from_('document_metadata').update({
                 'is_current': False,
                 'superseded_at': datetime.utcnow().isoformat(),
                 'updated_at': datetime.utcnow().isoformat()
-            }).eq('id', file_id).eq('is_current', True).execute()
+            }).eq('id', file_id).eq('is_current', True))
 
         # Create new version
         document_data = {
@@ -93,9 +93,9 @@ class DocumentMetadataService:
             if 'custom_tags' in metadata:
                 document_data['custom_tags'] = metadata['custom_tags']
 
-        result = await self.supabase.client.from_('document_metadata').insert(
+        result = await self.supabase.execute(self.supabase.client.from_('document_metadata').insert(
             document_data
-        ).execute()
+        ))
 
         return result.data[0] if result.data else None
 
@@ -114,11 +114,11 @@ class DocumentMetadataService:
         Returns:
             Document metadata or None
         """
-        result = await self.supabase.client.from_('document_metadata').select('*').eq(
+        result = await self.supabase.execute(self.supabase.client.from_('document_metadata').select('*').eq(
             'id', file_id
         ).eq('tenant_id', tenant_id).eq(
             'is_current', True
-        ).eq('is_deleted', False).maybe_single().execute()
+        ).eq('is_deleted', False).maybe_single())
 
         return result.data
 
@@ -139,19 +139,19 @@ class DocumentMetadataService:
         Returns:
             Success boolean
         """
-        await self.supabase.client.from_('document_metadata').update({
+        await self.supabase.execute(self.supabase.client.from_('document_metadata').update({
             'is_deleted': True,
             'deleted_at': datetime.utcnow().isoformat(),
             'deleted_by': deleted_by,
             'updated_at': datetime.utcnow().isoformat()
-        }).eq('id', file_id).eq('tenant_id', tenant_id).execute()
+        }).eq('id', file_id).eq('tenant_id', tenant_id))
 
         # Also soft delete associated chunks in documents_pg
-        await self.supabase.client.from_('documents_pg').update({
+        await self.supabase.execute(self.supabase.client.from_('documents_pg').update({
             'is_deleted': True,
             'deleted_at': datetime.utcnow().isoformat(),
             'deleted_by': deleted_by
-        }).eq('metadata->>file_id', file_id).eq('tenant_id', tenant_id).execute()
+        }).eq('metadata->>file_id', file_id).eq('tenant_id', tenant_id))
 
         return True
 
@@ -181,9 +181,9 @@ class DocumentMetadataService:
         if document_type:
             query = query.eq('document_type', document_type)
 
-        result = query.order('created_at', desc=True).range(
+        result = await self.supabase.execute(query.order('created_at', desc=True).range(
             offset, offset + limit - 1
-        ).execute()
+        ))
 
         return result.data if result.data else []
 
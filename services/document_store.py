@@ -20,6 +20,8 @@ from agents.models import (
     ExtractedProperty,
 )
 
+from .db_pool import get_supabase_client, run_query
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,26 +51,7 @@ class DocumentStore:
     def supabase(self):
         """Lazy load Supabase client"""
         if self._supabase is None:
-            import os
-            from supabase import create_client
-
-            # Load env if not already loaded
-            url = os.environ.get('SUPABASE_URL')
-            key = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
-
-            if not url or not key:
-                env_file = os.path.expanduser("~/.claude/.env")
-                if os.path.exists(env_file):
-                    with open(env_file) as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and not line.startswith("#") and "=" in line:
-                                k, v = line.split("=", 1)
-                                os.environ[k] = v.strip('"').strip("'")
-                    url = os.environ.get('SUPABASE_URL')
-                    key = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
-
-            self._supabase = create_client(url, key)
+            self._supabase = get_supabase_client()
         return self._supabase
 
     @property
@@ -110,7 +93,7 @@ class DocumentStore:
 
         # 1. Create the document record
         doc_record = self._build_document_record(extraction, tenant_id)
-        doc_response = self.supabase.table("mrl_documents").insert(doc_record).execute()
+        doc_response = await run_query(self.supabase.table("mrl_documents").insert(doc_record))
 
         if doc_response.data:
             doc_id = doc_response.data[0]["id"]
@@ -242,7 +225,7 @@ class DocumentStore:
         if company.email:
             record["primaryemail"] = {"value": company.email}
 
-        response = self.supabase.table("mrl_companies").insert(record).execute()
+        response = await run_query(self.supabase.table("mrl_companies").insert(record))
         if response.data:
             return response.data[0]["id"]
         return None
@@ -270,7 +253,7 @@ class DocumentStore:
             "sync_status": "local_only",
         }
 
-        response = self.supabase.table("mrl_contacts").insert(record).execute()
+        response = await run_query(self.supabase.table("mrl_contacts").insert(record))
         if response.data:
             return response.data[0]["id"]
         return None
@@ -301,7 +284,7 @@ class DocumentStore:
             "tenant_id": tenant_id,
         }
 
-        response = self.supabase.table("mrl_properties").insert(record).execute()
+        response = await run_query(self.supabase.table("mrl_properties").insert(record))
         if response.data:
             return response.data[0]["id"]
         return None
@@ -328,7 +311,7 @@ class DocumentStore:
         if agreement.value:
             record["agreementvalue"] = agreement.value
 
-        response = self.supabase.table("mrl_agreements").insert(record).execute()
+        response = await run_query(self.supabase.table("mrl_agreements").insert(record))
         if response.data:
             return response.data[0]["id"]
         return None
@@ -386,19 +369,19 @@ class DocumentStore:
             Tuple of (companies, contacts, properties)
         """
         # Use actual column names from mrl_companies schema
-        companies = self.supabase.table("mrl_companies").select(
+        companies = await run_query(self.supabase.table("mrl_companies").select(
             "id, airtable_id, compname, comptype, websiteurl, streetaddress, city, stateregion, primaryphone, primaryemail"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         # Use actual column names from mrl_contacts schema
-        contacts = self.supabase.table("mrl_contacts").select(
+        contacts = await run_query(self.supabase.table("mrl_contacts").select(
             "id, airtable_id, firstname, lastname, email, phonenumber"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         # Use actual column names from mrl_properties schema
-        properties = self.supabase.table("mrl_properties").select(
+        properties = await run_query(self.supabase.table("mrl_properties").select(
             "id, shorthand, full_address, city, state, zip, aliases"
-        ).eq("tenant_id", tenant_id).execute()
+        ).eq("tenant_id", tenant_id))
 
         return (
             companies.data or [],
@@ -408,7 +391,7 @@ class DocumentStore:
 
     async def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get a document by ID"""
-        response = self.supabase.table("mrl_documents").select("*").eq("id", doc_id).execute()
+        response = await run_query(self.supabase.table("mrl_documents").select("*").eq("id", doc_id))
         if response.data:
             return response.data[0]
         return None
@@ -429,7 +412,7 @@ class DocumentStore:
             query = query.eq("doccategory", category)
 
         query = query.order("created_at", desc=True).limit(limit)
-        response = query.execute()
+        response = await run_query(query)
 
         return response.data or []
 
@@ -444,7 +427,7 @@ class DocumentStore:
         if feedback:
             update_data["humndocfeedback"] = feedback
 
-        response = self.supabase.table("mrl_documents").update(update_data).eq("id", doc_id).execute()
+        response = await run_query(self.supabase.table("mrl_documents").update(update_data).eq("id", doc_id))
         return bool(response.data)
 
 
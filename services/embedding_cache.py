@@ -0,0 +1,299 @@
+"""
+Embedding Cache Service
+Content-addressed cache for embedding vectors
+
+Embeddings are deterministic for a given (model, text), so they are cached
+under sha256(model + normalized text):
+- In-process LRU for hot keys (repeated search queries, neighbour lookups)
+- On-disk SQLite store shared across processes and restarts (API, workers, crons)
+
+Vectors are stored as packed float32 blobs (~6 KB per 1536-dim vector).
+"""
+import os
+import array
+import asyncio
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "/root/flourisha/00_AI_Brain/data/embedding_cache.sqlite3"
+DEFAULT_MEMORY_ITEMS = 5000
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keying (trim and collapse whitespace)"""
+    return " ".join(text.split())
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    """Content address for an embedding: sha256(model + normalized text)"""
+    digest = hashlib.sha256()
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    return array.array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    values = array.array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """
+    Two-level (memory LRU + SQLite) embedding cache with hit/miss metrics
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_memory_items: int = DEFAULT_MEMORY_ITEMS
+    ):
+        """
+        Initialize embedding cache
+
+        Args:
+            path: SQLite file path (None disables the disk tier)
+            max_memory_items: Maximum vectors kept in the in-process LRU
+        """
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+        }
+
+        if path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        cache_key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        dimensions INTEGER NOT NULL,
+                        vector BLOB NOT NULL,
+                        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache unavailable ({path}): {e}")
+                self._conn = None
+
+    # Memory tier
+
+    def _memory_get(self, key: str) -> Optional[List[float]]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    # Tier lookups (memory under _lock, SQLite under _db_lock so a slow disk
+    # read never holds up memory hits on the event loop)
+
+    def _get_memory(self, model: str, texts: List[str]):
+        found: Dict[int, List[float]] = {}
+        pending: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = embedding_cache_key(model, text)
+                vector = self._memory_get(key)
+                if vector is not None:
+                    found[i] = vector
+                    self._stats["memory_hits"] += 1
+                else:
+                    pending.setdefault(key, []).append(i)
+        return found, pending
+
+    def _get_disk(self, found: Dict[int, List[float]], pending: Dict[str, List[int]]):
+        rows = []
+        if self._conn is not None:
+            keys = list(pending)
+            try:
+                with self._db_lock:
+                    # Stay under SQLite's bound-parameter limit
+                    for start in range(0, len(keys), 500):
+                        batch = keys[start:start + 500]
+                        rows.extend(self._conn.execute(
+                            f"SELECT cache_key, vector FROM embeddings "
+                            f"WHERE cache_key IN ({','.join('?' * len(batch))})",
+                            batch,
+                        ).fetchall())
+            except sqlite3.Error as e:
+                with self._lock:
+                    self._stats["errors"] += 1
+                logger.warning(f"Embedding cache read failed: {e}")
+
+        with self._lock:
+            for key, blob in rows:
+                vector = _unpack(blob)
+                self._memory_put(key, vector)
+                for i in pending.pop(key):
+                    found[i] = vector
+                    self._stats["disk_hits"] += 1
+            self._stats["misses"] += sum(len(indexes) for indexes in pending.values())
+
+    def _put_memory(self, model: str, texts: List[str], vectors: List[List[float]]) -> list:
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = embedding_cache_key(model, text)
+                self._memory_put(key, vector)
+                rows.append((key, model, len(vector), _pack(vector)))
+            self._stats["stores"] += len(rows)
+        return rows
+
+    def _put_disk(self, rows: list):
+        try:
+            with self._db_lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (cache_key, model, dimensions, vector) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    # Public API
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[int, List[float]]:
+        """
+        Look up cached embeddings
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            Mapping of input index -> cached vector (misses are omitted)
+        """
+        found, pending = self._get_memory(model, texts)
+        if pending:
+            self._get_disk(found, pending)
+        return found
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Look up a single cached embedding"""
+        return self.get_many(model, [text]).get(0)
+
+    def put_many(self, model: str, texts: List[str], vectors: List[List[float]]):
+        """
+        Store embeddings in both cache tiers
+
+        Args:
+            model: Embedding model name
+            texts: Texts that were embedded
+            vectors: Their embedding vectors (same order)
+        """
+        rows = self._put_memory(model, texts, vectors)
+        if rows and self._conn is not None:
+            self._put_disk(rows)
+
+    def put(self, model: str, text: str, vector: List[float]):
+        """Store a single embedding"""
+        self.put_many(model, [text], [vector])
+
+    # Async API: memory hits are served inline, SQLite work runs in a thread
+
+    async def aget_many(self, model: str, texts: List[str]) -> Dict[int, List[float]]:
+        """get_many() for async callers"""
+        found, pending = self._get_memory(model, texts)
+        if pending:
+            if self._conn is not None:
+                await asyncio.to_thread(self._get_disk, found, pending)
+            else:
+                self._get_disk(found, pending)
+        return found
+
+    async def aget(self, model: str, text: str) -> Optional[List[float]]:
+        """get() for async callers"""
+        return (await self.aget_many(model, [text])).get(0)
+
+    async def aput_many(self, model: str, texts: List[str], vectors: List[List[float]]):
+        """put_many() for async callers"""
+        rows = self._put_memory(model, texts, vectors)
+        if rows and self._conn is not None:
+            await asyncio.to_thread(self._put_disk, rows)
+
+    async def aput(self, model: str, text: str, vector: List[float]):
+        """put() for async callers"""
+        await self.aput_many(model, [text], [vector])
+
+    def clear(self):
+        """Drop all cached embeddings from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get hit/miss metrics
+
+        Returns:
+            Counters plus hit_rate and current tier sizes
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+        if self._conn is not None:
+            try:
+                with self._db_lock:
+                    stats["disk_items"] = self._conn.execute(
+                        "SELECT COUNT(*) FROM embeddings"
+                    ).fetchone()[0]
+            except sqlite3.Error:
+                stats["disk_items"] = None
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Singleton instance
+_embedding_cache = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create embedding cache singleton"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        path = os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH)
+        _embedding_cache = EmbeddingCache(
+            path=path or None,
+            max_memory_items=int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", DEFAULT_MEMORY_ITEMS)),
+        )
+    return _embedding_cache
@@ -3,9 +3,31 @@ Vector Embeddings Service using OpenAI + Supabase pgvector
 Generates and stores embeddings for semantic search
 """
 import os
+import random
+import asyncio
+import logging
+from pathlib import Path
 from typing import List, Dict, Any, Optional
-from openai import AsyncOpenAI
+from openai import (
+    AsyncOpenAI,
+    RateLimitError,
+    APITimeoutError,
+    APIConnectionError,
+    InternalServerError,
+)
 from .supabase_client import supabase_service
+from .embedding_cache import get_embedding_cache
+from .search_cache import get_search_cache
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying with backoff (429s, timeouts, transient 5xx)
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+# Request-size bounds for batched embedding calls. OpenAI accepts up to 2048
+# inputs / ~300k tokens per request; stay well under both.
+MAX_BATCH_INPUTS = 96
+MAX_BATCH_CHARS = 400_000
 
 
 class EmbeddingsService:
@@ -35,13 +57,25 @@ class EmbeddingsService:
         self.client = AsyncOpenAI(api_key=self.api_key)
         self.model = "text-embedding-3-small"  # 1536 dimensions, cost-effective
         self.supabase = supabase_service
+        self.cache = get_embedding_cache()
 
         self._initialized = True
 
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Call the OpenAI embeddings API (no cache)"""
+        response = await self.client.embeddings.create(
+            model=self.model,
+            input=texts
+        )
+        return [item.embedding for item in response.data]
+
     async def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a single text
 
+        Served from the embedding cache when this (model, text) was embedded
+        before.
+
         Args:
             text: Text to embed
 
@@ -53,17 +87,20 @@ class EmbeddingsService:
         if len(text) > max_chars:
             text = text[:max_chars]
 
-        response = await self.client.embeddings.create(
-            model=self.model,
-            input=text
-        )
+        cached = await self.cache.aget(self.model, text)
+        if cached is not None:
+            return cached
 
-        return response.data[0].embedding
+        embedding = (await self._request_embeddings([text]))[0]
+        await self.cache.aput(self.model, text, embedding)
+        return embedding
 
     async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts (batch processing)
 
+        Only cache misses are sent to the API.
+
         Args:
             texts: List of texts to embed
 
@@ -74,12 +111,103 @@ class EmbeddingsService:
         max_chars = 32000
         truncated_texts = [t[:max_chars] for t in texts]
 
-        response = await self.client.embeddings.create(
-            model=self.model,
-            input=truncated_texts
-        )
+        found = await self.cache.aget_many(self.model, truncated_texts)
+        missing = [i for i in range(len(truncated_texts)) if i not in found]
 
-        return [item.embedding for item in response.data]
+        if missing:
+            miss_texts = [truncated_texts[i] for i in missing]
+            vectors = await self._request_embeddings(miss_texts)
+            await self.cache.aput_many(self.model, miss_texts, vectors)
+            found.update(zip(missing, vectors))
+
+        return [found[i] for i in range(len(truncated_texts))]
+
+    async def generate_embeddings_batched(
+        self,
+        texts: List[str],
+        max_batch_inputs: int = MAX_BATCH_INPUTS,
+        max_batch_chars: int = MAX_BATCH_CHARS,
+        max_concurrency: int = 4,
+        max_retries: int = 5
+    ) -> List[List[float]]:
+        """
+        Embed an arbitrary number of texts in size-bounded batches
+
+        Cached texts are skipped and duplicate texts are embedded once. The
+        remaining batches are sent concurrently (bounded by max_concurrency)
+        and each batch is retried with exponential backoff + jitter on rate
+        limits and transient errors. Output order matches input order.
+
+        Args:
+            texts: Texts to embed
+            max_batch_inputs: Maximum texts per API request
+            max_batch_chars: Maximum total characters per API request
+            max_concurrency: Maximum in-flight API requests
+            max_retries: Retries per batch before giving up
+
+        Returns:
+            List of embedding vectors, one per input text
+        """
+        if not texts:
+            return []
+
+        max_chars = 32000
+        truncated_texts = [t[:max_chars] for t in texts]
+
+        found = await self.cache.aget_many(self.model, truncated_texts)
+
+        # Unique uncached texts -> input positions waiting on them
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(truncated_texts):
+            if i not in found:
+                pending.setdefault(text, []).append(i)
+
+        # Pack texts into batches bounded by count and total size
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_chars = 0
+        for text in pending:
+            if current and (
+                len(current) >= max_batch_inputs
+                or current_chars + len(text) > max_batch_chars
+            ):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(text)
+            current_chars += len(text)
+        if current:
+            batches.append(current)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                for attempt in range(max_retries + 1):
+                    try:
+                        vectors = await self._request_embeddings(batch)
+                        await self.cache.aput_many(self.model, batch, vectors)
+                        return vectors
+                    except RETRYABLE_ERRORS as e:
+                        if attempt == max_retries:
+                            raise
+                        delay = min(30.0, 2 ** attempt) + random.uniform(0, 1)
+                        logger.warning(
+                            f"Embedding batch of {len(batch)} failed ({type(e).__name__}), "
+                            f"retrying in {delay:.1f}s"
+                        )
+                        await asyncio.sleep(delay)
+
+        results = await asyncio.gather(*(embed_batch(b) for b in batches))
+        for batch, vectors in zip(batches, results):
+            for text, vector in zip(batch, vectors):
+                for i in pending[text]:
+                    found[i] = vector
+
+        return [found[i] for i in range(len(truncated_texts))]
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Embedding cache hit/miss metrics"""
+        return {"model": self.model, **self.cache.get_stats()}
 
     async def store_content_embedding(
         self,
@@ -105,11 +233,14 @@ class EmbeddingsService:
 
         # Store in Supabase
         # Update the processed_content table with the embedding
-        await self.supabase.table('processed_content').update({
+        await self.supabase.execute(self.supabase.client.table('processed_content').update({
             'embedding': embedding,
             'embedding_model': self.model,
             'embedding_text': text[:1000]  # Store first 1000 chars for reference
-        }).eq('id', content_id).eq('tenant_id', tenant_id).execute()
+        }).eq('id', content_id).eq('tenant_id', tenant_id))
+
+        # New searchable content: drop the tenant's cached search results
+        await asyncio.to_thread(get_search_cache().invalidate_tenant, tenant_id)
 
         return content_id
 
@@ -137,7 +268,7 @@ class EmbeddingsService:
 
         # Supabase pgvector similarity search
         # Using RPC function for vector similarity (needs to be created)
-        result = await self.supabase.rpc(
+        result = await self.supabase.execute(self.supabase.client.rpc(
             'search_content_by_embedding',
             {
                 'query_embedding': query_embedding,
@@ -145,7 +276,43 @@ class EmbeddingsService:
                 'match_threshold': similarity_threshold,
                 'match_count': limit
             }
-        ).execute()
+        ))
+
+        return result.data if result.data else []
+
+    async def search_by_vector(
+        self,
+        embedding: List[float],
+        tenant_id: str,
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+        exclude_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar content from an existing embedding vector
+
+        No embedding is generated, so this is a single DB round-trip.
+
+        Args:
+            embedding: Query vector (1536 dimensions)
+            tenant_id: Tenant ID for filtering
+            limit: Maximum results to return
+            similarity_threshold: Minimum similarity score (0-1)
+            exclude_id: Optional content ID to leave out (e.g. the source row)
+
+        Returns:
+            List of similar content with scores
+        """
+        result = await self.supabase.execute(self.supabase.client.rpc(
+            'search_content_by_vector',
+            {
+                'query_embedding': embedding,
+                'match_tenant_id': tenant_id,
+                'match_threshold': similarity_threshold,
+                'match_count': limit,
+                'exclude_id': exclude_id
+            }
+        ))
 
         return result.data if result.data else []
 
@@ -153,78 +320,90 @@ class EmbeddingsService:
         self,
         content_id: str,
         tenant_id: str,
-        limit: int = 5
+        limit: int = 5,
+        similarity_threshold: float = 0.7
     ) -> List[Dict[str, Any]]:
         """
         Get content pieces most similar to a given content
 
+        Uses the row's stored embedding inside the database (one RPC, no
+        OpenAI call). The source content itself is excluded.
+
         Args:
             content_id: Content ID to find neighbors for
             tenant_id: Tenant ID
             limit: Number of neighbors to return
+            similarity_threshold: Minimum similarity score (0-1)
 
         Returns:
             List of similar content
         """
-        # Get the content's embedding
-        result = await self.supabase.table('processed_content').select('embedding, embedding_text').eq(
-            'id', content_id
-        ).eq('tenant_id', tenant_id).single().execute()
+        result = await self.supabase.execute(self.supabase.client.rpc(
+            'match_content_neighbors',
+            {
+                'source_content_id': content_id,
+                'match_tenant_id': tenant_id,
+                'match_threshold': similarity_threshold,
+                'match_count': limit
+            }
+        ))
 
-        if not result.data or not result.data.get('embedding'):
-            return []
+        return result.data if result.data else []
 
-        # Use the embedding to find similar content
-        return await self.search_similar_content(
-            query=result.data['embedding_text'],
-            tenant_id=tenant_id,
-            limit=limit + 1  # +1 to exclude itself
-        )
+    async def get_content_neighbors_batch(
+        self,
+        content_ids: List[str],
+        tenant_id: str,
+        limit: int = 5,
+        similarity_threshold: float = 0.7
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get neighbors for many content IDs in one round-trip
+
+        Args:
+            content_ids: Content IDs to find neighbors for
+            tenant_id: Tenant ID
+            limit: Number of neighbors per content ID
+            similarity_threshold: Minimum similarity score (0-1)
+
+        Returns:
+            Mapping of content ID -> list of similar content (IDs without a
+            stored embedding map to an empty list)
+        """
+        neighbors: Dict[str, List[Dict[str, Any]]] = {cid: [] for cid in content_ids}
+        if not content_ids:
+            return neighbors
+
+        result = await self.supabase.execute(self.supabase.client.rpc(
+            'match_content_neighbors_batch',
+            {
+                'source_content_ids': content_ids,
+                'match_tenant_id': tenant_id,
+                'match_threshold': similarity_threshold,
+                'match_count': limit
+            }
+        ))
+
+        for row in result.data or []:
+            source_id = str(row.pop('source_id'))
+            neighbors.setdefault(source_id, []).append(row)
+
+        return neighbors
 
     async def create_embeddings_search_function(self):
         """
-        Create the Postgres function for vector similarity search
-        Should be run once during setup
+        SQL for the vector similarity search functions and ANN indexes
+        Should be run once during setup (outside a transaction: it builds
+        indexes CONCURRENTLY)
         """
-        sql = """
-        CREATE OR REPLACE FUNCTION search_content_by_embedding(
-            query_embedding vector(1536),
-            match_tenant_id text,
-            match_threshold float DEFAULT 0.7,
-            match_count int DEFAULT 10
+        migration = (
+            Path(__file__).resolve().parent.parent
+            / "database" / "migrations" / "011_vector_ann_indexes.sql"
         )
-        RETURNS TABLE (
-            id text,
-            title text,
-            content_type text,
-            summary text,
-            tags text[],
-            similarity float
-        )
-        LANGUAGE plpgsql
-        AS $$
-        BEGIN
-            RETURN QUERY
-            SELECT
-                pc.id,
-                pc.title,
-                pc.content_type,
-                pc.summary,
-                pc.tags,
-                1 - (pc.embedding <=> query_embedding) as similarity
-            FROM processed_content pc
-            WHERE pc.tenant_id = match_tenant_id
-                AND pc.embedding IS NOT NULL
-                AND 1 - (pc.embedding <=> query_embedding) > match_threshold
-            ORDER BY pc.embedding <=> query_embedding
-            LIMIT match_count;
-        END;
-        $$;
-        """
-
-        # Execute via Supabase SQL editor or migration
+
+        # Execute via Supabase SQL editor or psql -f
         # This is a setup function, not called during normal operation
-        return sql
+        return migration.read_text()
 
 
 # Singleton instance
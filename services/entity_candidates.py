@@ -0,0 +1,358 @@
+"""
+Entity Candidate Retrieval
+
+Shortlists existing companies, contacts and properties for each extracted
+entity before LLM matching, instead of sending the tenant's whole tables.
+
+For every extracted entity:
+1. Normalize name / email / phone / address
+2. Query indexed candidate RPCs (trigram, Double Metaphone, exact keys;
+   see database/migrations/009_entity_candidate_search.sql)
+3. Re-score candidates locally and flag unambiguous exact hits (same
+   email, phone or normalized address) so they skip the LLM entirely
+
+If the RPCs are not deployed, falls back to scoring the full entity lists
+in-process (same shortlist output, just without the indexes).
+"""
+
+import re
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .db_pool import get_supabase_client, run_query
+from .extraction_feedback_service import normalize_address
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 5
+
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "l l c", "corp", "corporation", "co",
+    "company", "ltd", "limited", "lp", "llp", "pllc", "pc", "the",
+}
+
+
+# =============================================================================
+# Normalization
+# =============================================================================
+
+def normalize_email(email: Optional[str]) -> str:
+    """Lowercase and trim an email address ('' if not an email)"""
+    if not email:
+        return ""
+    email = email.strip().lower()
+    if email.startswith("mailto:"):
+        email = email[7:]
+    return email if "@" in email else ""
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Last 10 digits of a phone number ('' if too short to be one)"""
+    if not phone:
+        return ""
+    digits = re.sub(r"\D", "", str(phone))
+    return digits[-10:] if len(digits) >= 7 else ""
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    if not name:
+        return ""
+    return " ".join(re.sub(r"[^\w\s]", " ", name.lower()).split())
+
+
+def normalize_company_name(name: Optional[str]) -> str:
+    """normalize_name() without legal suffixes (Inc, LLC, Corp, ...)"""
+    tokens = normalize_name(name).split()
+    while tokens and tokens[-1] in _COMPANY_SUFFIXES:
+        tokens.pop()
+    while tokens and tokens[0] == "the":
+        tokens.pop(0)
+    return " ".join(tokens)
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of character trigrams (same idea as pg_trgm)"""
+    if not a or not b:
+        return 0.0
+    ta, tb = _trigrams(a), _trigrams(b)
+    return len(ta & tb) / len(ta | tb)
+
+
+def _values(value: Any) -> List[str]:
+    """
+    Text values of a column that may be a scalar, a lookup list, or a
+    DocumentStore {"value": ...} object (alone or inside a list)
+    """
+    if value is None:
+        return []
+    items = value if isinstance(value, (list, tuple)) else [value]
+    values = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("value")
+        if item:
+            values.append(str(item))
+    return values
+
+
+# =============================================================================
+# Record accessors (live columns plus legacy Airtable-style names)
+# =============================================================================
+
+def company_record_name(record: Dict[str, Any]) -> str:
+    return record.get("compname") or record.get("name") or ""
+
+
+def company_record_emails(record: Dict[str, Any]) -> List[str]:
+    return _values(record.get("primaryemail")) + _values(record.get("compemail"))
+
+
+def company_record_phones(record: Dict[str, Any]) -> List[str]:
+    return _values(record.get("primaryphone")) + _values(record.get("compphone"))
+
+
+def contact_record_name(record: Dict[str, Any]) -> str:
+    first = record.get("firstname") or record.get("contactfirstname") or ""
+    last = record.get("lastname") or record.get("contactlastname") or ""
+    return f"{first} {last}".strip()
+
+
+def contact_record_emails(record: Dict[str, Any]) -> List[str]:
+    return _values(record.get("email")) + _values(record.get("contactemail"))
+
+
+def contact_record_phones(record: Dict[str, Any]) -> List[str]:
+    return _values(record.get("phonenumber")) + _values(record.get("contactphone"))
+
+
+def property_record_addresses(record: Dict[str, Any]) -> List[str]:
+    addresses = _values(record.get("full_address")) + _values(record.get("propertyaddress"))
+    addresses += _values(record.get("address")) + _values(record.get("aliases"))
+    return addresses
+
+
+# =============================================================================
+# Data Classes
+# =============================================================================
+
+@dataclass
+class EntityCandidates:
+    """Shortlisted existing records for one extracted entity"""
+    entity_type: str  # company, contact, property
+    extracted: Any  # ExtractedCompany / ExtractedContact / ExtractedProperty
+    candidates: List[Dict[str, Any]] = field(default_factory=list)  # best first, with '_score'
+    exact_match: Optional[Dict[str, Any]] = None
+    exact_reason: Optional[str] = None
+
+
+@dataclass
+class CandidateSet:
+    """Candidates for every extracted entity of a document (extraction order)"""
+    companies: List[EntityCandidates] = field(default_factory=list)
+    contacts: List[EntityCandidates] = field(default_factory=list)
+    properties: List[EntityCandidates] = field(default_factory=list)
+
+    @property
+    def exact_count(self) -> int:
+        return sum(1 for c in self.companies + self.contacts + self.properties if c.exact_match)
+
+    def records(self, groups: Iterable[EntityCandidates]) -> List[Dict[str, Any]]:
+        """Union of candidate records across entities, each record once"""
+        seen = set()
+        records = []
+        for group in groups:
+            for record in group.candidates:
+                key = str(record.get("id"))
+                if key not in seen:
+                    seen.add(key)
+                    records.append(record)
+        return records
+
+
+# =============================================================================
+# Retriever
+# =============================================================================
+
+class EntityCandidateRetriever:
+    """
+    Retrieves top-k existing-entity candidates per extracted entity.
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        """
+        Initialize retriever
+
+        Args:
+            top_k: Candidates kept per extracted entity
+        """
+        self.top_k = top_k
+        self._supabase = None
+
+    @property
+    def supabase(self):
+        """Shared Supabase client"""
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    async def _rpc(self, name: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        response = await run_query(self.supabase.rpc(name, params))
+        records = []
+        for row in response.data or []:
+            record = dict(row["record"])
+            record["_score"] = row.get("score") or 0.0
+            records.append(record)
+        return records
+
+    # --- Scoring -------------------------------------------------------------
+
+    def _score_company(self, company, record: Dict[str, Any]) -> tuple:
+        email = normalize_email(company.email)
+        phone = normalize_phone(company.phone)
+        if email and email in {normalize_email(e) for e in company_record_emails(record)}:
+            return 1.0, "email"
+        if phone and phone in {normalize_phone(p) for p in company_record_phones(record)}:
+            return 1.0, "phone"
+        name = normalize_company_name(company.name)
+        return trigram_similarity(name, normalize_company_name(company_record_name(record))), None
+
+    def _score_contact(self, contact, record: Dict[str, Any]) -> tuple:
+        email = normalize_email(contact.email)
+        phone = normalize_phone(contact.phone)
+        if email and email in {normalize_email(e) for e in contact_record_emails(record)}:
+            return 1.0, "email"
+        if phone and phone in {normalize_phone(p) for p in contact_record_phones(record)}:
+            return 1.0, "phone"
+        return trigram_similarity(normalize_name(contact.full_name), normalize_name(contact_record_name(record))), None
+
+    def _score_property(self, prop, record: Dict[str, Any]) -> tuple:
+        query = normalize_address(prop.address)
+        short = normalize_address(prop.short_address or "")
+        addresses = [normalize_address(a) for a in property_record_addresses(record)]
+        if query and query in addresses:
+            return 1.0, "address"
+        shorthand = normalize_address(record.get("shorthand") or "")
+        if short and short == shorthand:
+            return 0.9, None  # Shorthands are not unique enough to skip review
+        return max((trigram_similarity(query, a) for a in addresses), default=0.0), None
+
+    def _rank(self, entity_type: str, extracted, records: List[Dict[str, Any]]) -> EntityCandidates:
+        scorer = {
+            "company": self._score_company,
+            "contact": self._score_contact,
+            "property": self._score_property,
+        }[entity_type]
+
+        scored = []
+        exact = []
+        for record in records:
+            score, reason = scorer(extracted, record)
+            record = {**record, "_score": round(max(score, record.get("_score", 0.0)), 4)}
+            scored.append(record)
+            if reason:
+                exact.append((record, reason))
+
+        scored.sort(key=lambda r: r["_score"], reverse=True)
+        group = EntityCandidates(entity_type, extracted, scored[:self.top_k])
+
+        # Only auto-resolve when exactly one record shares the key
+        if len({str(r.get("id")) for r, _ in exact}) == 1:
+            group.exact_match, group.exact_reason = exact[0]
+        return group
+
+    # --- Indexed retrieval ---------------------------------------------------
+
+    async def _company_candidates(self, company, tenant_id: str) -> EntityCandidates:
+        records = await self._rpc("match_company_candidates", {
+            "filter_tenant": tenant_id,
+            "query_name": normalize_name(company.name),
+            "query_email": normalize_email(company.email) or None,
+            "query_phone": normalize_phone(company.phone) or None,
+            "match_count": self.top_k,
+        })
+        return self._rank("company", company, records)
+
+    async def _contact_candidates(self, contact, tenant_id: str) -> EntityCandidates:
+        records = await self._rpc("match_contact_candidates", {
+            "filter_tenant": tenant_id,
+            "query_name": normalize_name(contact.full_name),
+            "query_last_name": normalize_name(contact.last_name) or None,
+            "query_email": normalize_email(contact.email) or None,
+            "query_phone": normalize_phone(contact.phone) or None,
+            "match_count": self.top_k,
+        })
+        return self._rank("contact", contact, records)
+
+    async def _property_candidates(self, prop, tenant_id: str) -> EntityCandidates:
+        records = await self._rpc("match_property_candidates", {
+            "filter_tenant": tenant_id,
+            "query_address": " ".join(prop.address.lower().replace(",", " ").split()),
+            "query_short": (prop.short_address or "").strip().lower() or None,
+            "match_count": self.top_k,
+        })
+        return self._rank("property", prop, records)
+
+    async def _retrieve_indexed(self, extraction, tenant_id: str) -> CandidateSet:
+        groups = await asyncio.gather(
+            asyncio.gather(*[self._company_candidates(c, tenant_id) for c in extraction.companies]),
+            asyncio.gather(*[self._contact_candidates(c, tenant_id) for c in extraction.contacts]),
+            asyncio.gather(*[self._property_candidates(p, tenant_id) for p in extraction.properties]),
+        )
+        return CandidateSet(*(list(g) for g in groups))
+
+    # --- Fallback ------------------------------------------------------------
+
+    async def _retrieve_local(self, extraction, tenant_id: str) -> CandidateSet:
+        from .document_store import get_document_store
+
+        companies, contacts, properties = await get_document_store().get_existing_entities(tenant_id)
+        return CandidateSet(
+            companies=[self._rank("company", c, companies) for c in extraction.companies],
+            contacts=[self._rank("contact", c, contacts) for c in extraction.contacts],
+            properties=[self._rank("property", p, properties) for p in extraction.properties],
+        )
+
+    async def retrieve(self, extraction, tenant_id: str = "default") -> CandidateSet:
+        """
+        Shortlist existing records for every entity in an extraction
+
+        Args:
+            extraction: DocumentExtraction with companies/contacts/properties
+            tenant_id: Tenant whose records are searched
+
+        Returns:
+            CandidateSet in extraction order, with exact hits flagged
+        """
+        try:
+            candidates = await self._retrieve_indexed(extraction, tenant_id)
+        except Exception as e:
+            logger.warning(f"Indexed candidate search unavailable, scoring full entity lists: {e}")
+            candidates = await self._retrieve_local(extraction, tenant_id)
+
+        logger.info(
+            f"Entity candidates: {len(candidates.records(candidates.companies))} companies, "
+            f"{len(candidates.records(candidates.contacts))} contacts, "
+            f"{len(candidates.records(candidates.properties))} properties "
+            f"({candidates.exact_count} exact hits)"
+        )
+        return candidates
+
+
+# Singleton instance
+_candidate_retriever = None
+
+
+def get_entity_candidate_retriever() -> EntityCandidateRetriever:
+    """Get or create entity candidate retriever singleton"""
+    global _candidate_retriever
+    if _candidate_retriever is None:
+        _candidate_retriever = EntityCandidateRetriever()
+    return _candidate_retriever
@@ -10,12 +10,21 @@ even when they use shorthand names or variations.
 
 import os
 import re
+import time
 import logging
-from typing import Optional, Dict, Any, List, Tuple
-from dataclasses import dataclass
+import threading
+from typing import Optional, Dict, Any, List, Set, Tuple
+from dataclasses import dataclass, field
+
+from .db_pool import get_supabase_client
+from .extraction_feedback_service import normalize_address
 
 logger = logging.getLogger(__name__)
 
+# PostgREST caps responses (1000 rows by default), so entity loads are paged
+LOAD_PAGE_SIZE = 1000
+DEFAULT_CACHE_TTL_SECONDS = 300
+
 
 @dataclass
 class ResolvedEntity:
@@ -28,71 +37,248 @@ class ResolvedEntity:
     attributes: Dict[str, Any]
 
 
+def _ngrams(text: str, n: int = 3) -> Set[str]:
+    """Character n-grams of text (the whole string if shorter than n)"""
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SubstringIndex:
+    """
+    Trigram index answering "which entries contain this query as a substring"
+    and "which entries are contained in this query" without scanning all rows.
+
+    Entries are identified by their position in the source list, so callers
+    can keep first-in-list tie breaking.
+    """
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self._grams: Dict[str, Set[int]] = {}
+        self._exact: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            self._exact.setdefault(text, []).append(i)
+            for gram in _ngrams(text):
+                self._grams.setdefault(gram, set()).add(i)
+
+    def containing(self, query: str) -> Set[int]:
+        """Entries whose text contains query"""
+        if not query:
+            return set()
+        if len(query) < 3:
+            # Too short for a trigram: fall back to the scan this index replaces
+            return {i for i, text in enumerate(self.texts) if text and query in text}
+        postings = sorted((self._grams.get(g, set()) for g in _ngrams(query)), key=len)
+        candidates = set.intersection(*postings)
+        return {i for i in candidates if query in self.texts[i]}
+
+    def contained_in(self, query: str) -> Set[int]:
+        """Entries whose (non-empty) text is a substring of query"""
+        # Queries are short (filenames, addresses), so enumerating their
+        # substrings is cheaper than touching every posting list
+        hits: Set[int] = set()
+        for start in range(len(query)):
+            for end in range(start + 1, len(query) + 1):
+                positions = self._exact.get(query[start:end])
+                if positions:
+                    hits.update(positions)
+        return hits
+
+
+@dataclass
+class PropertyIndex:
+    """Lookup structures over one tenant's properties"""
+    properties: List[Dict]
+    by_alias: Dict[str, int] = field(default_factory=dict)
+    by_shorthand: Dict[str, int] = field(default_factory=dict)
+    by_address: Dict[str, int] = field(default_factory=dict)
+    addresses: Optional[SubstringIndex] = None
+    streets: Optional[SubstringIndex] = None
+
+    @classmethod
+    def build(cls, properties: List[Dict]) -> "PropertyIndex":
+        index = cls(properties)
+        full_addresses = []
+        streets = []
+        for i, prop in enumerate(properties):
+            # setdefault keeps the first row for duplicate keys, like the old scans
+            for alias in prop.get('aliases') or []:
+                index.by_alias.setdefault(alias.lower().strip(), i)
+            shorthand = (prop.get('shorthand') or '').lower().strip()
+            if shorthand:
+                index.by_shorthand.setdefault(shorthand, i)
+            normalized = normalize_address(prop.get('full_address') or '')
+            if normalized:
+                index.by_address.setdefault(normalized, i)
+            full_addresses.append(normalized)
+            streets.append((prop.get('street') or '').lower())
+        index.addresses = SubstringIndex(full_addresses)
+        index.streets = SubstringIndex(streets)
+        return index
+
+
+@dataclass
+class OrganizationIndex:
+    """Lookup structures over one tenant's organizations"""
+    organizations: List[Dict]
+    by_alias: Dict[str, List[int]] = field(default_factory=dict)
+    by_name: Dict[str, List[int]] = field(default_factory=dict)
+    names: Optional[SubstringIndex] = None
+
+    @classmethod
+    def build(cls, organizations: List[Dict]) -> "OrganizationIndex":
+        index = cls(organizations)
+        names = []
+        for i, org in enumerate(organizations):
+            for alias in org.get('aliases') or []:
+                index.by_alias.setdefault(alias.lower().strip(), []).append(i)
+            name = (org.get('name') or '').lower()
+            if name:
+                index.by_name.setdefault(name.strip(), []).append(i)
+            names.append(name)
+        index.names = SubstringIndex(names)
+        return index
+
+
+@dataclass
+class _CacheEntry:
+    index: Any
+    version: Optional[Tuple]
+    checked_at: float
+
+
 class EntityResolver:
     """
     Resolves entity references to known entities in Supabase.
 
     Uses multiple matching strategies:
     1. Exact alias match (highest confidence)
-    2. Exact name match
-    3. Partial address match (for properties)
-    4. Filename parsing (for document shorthand convention)
+    2. Exact name / shorthand match
+    3. Normalized address match (for properties)
+    4. Partial address / name containment
+    5. Filename parsing (for document shorthand convention)
+
+    Entities are loaded once per tenant into hash-map and trigram indexes.
+    After cache_ttl seconds a cheap version probe (row count + latest
+    updated_at) decides whether the tenant's index is rebuilt.
     """
 
-    def __init__(self, supabase_client=None):
+    def __init__(self, supabase_client=None, cache_ttl: Optional[float] = None):
         self._supabase = supabase_client
-        self._property_cache = None
-        self._org_cache = None
+        self.cache_ttl = cache_ttl if cache_ttl is not None else float(
+            os.getenv('ENTITY_RESOLVER_TTL_SECONDS', DEFAULT_CACHE_TTL_SECONDS)
+        )
+        self._property_cache: Dict[Optional[str], _CacheEntry] = {}
+        self._org_cache: Dict[Optional[str], _CacheEntry] = {}
+        self._lock = threading.Lock()
 
     @property
     def supabase(self):
         """Lazy load Supabase client"""
         if self._supabase is None:
-            import os
-            from supabase import create_client
-
-            # Load env if not already loaded
-            url = os.environ.get('SUPABASE_URL')
-            key = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
-
-            if not url or not key:
-                env_file = os.path.expanduser("~/.claude/.env")
-                if os.path.exists(env_file):
-                    with open(env_file) as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and not line.startswith("#") and "=" in line:
-                                k, v = line.split("=", 1)
-                                os.environ[k] = v.strip('"').strip("'")
-                    url = os.environ.get('SUPABASE_URL')
-                    key = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
-
-            self._supabase = create_client(url, key)
+            self._supabase = get_supabase_client()
         return self._supabase
 
-    def _load_properties(self) -> List[Dict]:
+    def _fetch_all(self, table: str, tenant_id: Optional[str]) -> List[Dict]:
+        """Load every row of table for the tenant, page by page"""
+        rows: List[Dict] = []
+        offset = 0
+        while True:
+            query = self.supabase.table(table).select('*')
+            if tenant_id:
+                query = query.eq('tenant_id', tenant_id)
+            page = query.order('id').range(offset, offset + LOAD_PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < LOAD_PAGE_SIZE:
+                return rows
+            offset += LOAD_PAGE_SIZE
+
+    def _table_version(self, table: str, tenant_id: Optional[str]) -> Optional[Tuple]:
+        """(row count, latest updated_at) for change detection; None if unavailable"""
+        try:
+            query = self.supabase.table(table).select('updated_at', count='exact')
+            if tenant_id:
+                query = query.eq('tenant_id', tenant_id)
+            result = query.order('updated_at', desc=True).limit(1).execute()
+            latest = result.data[0].get('updated_at') if result.data else None
+            return (result.count, latest)
+        except Exception as e:
+            logger.debug(f"Version probe on {table} failed, rebuilding on TTL: {e}")
+            return None
+
+    def _get_index(self, cache: Dict, table: str, builder, tenant_id: Optional[str]):
+        """Return the tenant's index, rebuilding it if expired and changed"""
+        now = time.monotonic()
+        entry = cache.get(tenant_id)
+        if entry is not None and now - entry.checked_at < self.cache_ttl:
+            return entry.index
+
+        with self._lock:
+            entry = cache.get(tenant_id)
+            if entry is not None and now - entry.checked_at < self.cache_ttl:
+                return entry.index
+
+            version = self._table_version(table, tenant_id)
+            if entry is not None and version is not None and version == entry.version:
+                entry.checked_at = now
+                return entry.index
+
+            started = time.monotonic()
+            rows = self._fetch_all(table, tenant_id)
+            index = builder(rows)
+            cache[tenant_id] = _CacheEntry(index=index, version=version, checked_at=time.monotonic())
+            logger.info(
+                f"Built {table} resolver index for tenant {tenant_id or '*'}: "
+                f"{len(rows)} rows in {time.monotonic() - started:.2f}s"
+            )
+            return index
+
+    def _property_index(self, tenant_id: Optional[str] = None) -> PropertyIndex:
+        return self._get_index(self._property_cache, 'mrl_properties', PropertyIndex.build, tenant_id)
+
+    def _organization_index(self, tenant_id: Optional[str] = None) -> OrganizationIndex:
+        return self._get_index(self._org_cache, 'mrl_organizations', OrganizationIndex.build, tenant_id)
+
+    def _load_properties(self, tenant_id: Optional[str] = None) -> List[Dict]:
         """Load all properties with aliases"""
-        if self._property_cache is None:
-            result = self.supabase.table('mrl_properties').select('*').execute()
-            self._property_cache = result.data or []
-        return self._property_cache
+        return self._property_index(tenant_id).properties
 
-    def _load_organizations(self) -> List[Dict]:
+    def _load_organizations(self, tenant_id: Optional[str] = None) -> List[Dict]:
         """Load all organizations with aliases"""
-        if self._org_cache is None:
-            result = self.supabase.table('mrl_organizations').select('*').execute()
-            self._org_cache = result.data or []
-        return self._org_cache
+        return self._organization_index(tenant_id).organizations
 
-    def invalidate_cache(self):
+    def prime_cache(
+        self,
+        properties: Optional[List[Dict]] = None,
+        organizations: Optional[List[Dict]] = None,
+        tenant_id: Optional[str] = None,
+    ):
+        """Build indexes from rows already in hand (bulk imports, benchmarks)"""
+        now = time.monotonic()
+        with self._lock:
+            if properties is not None:
+                self._property_cache[tenant_id] = _CacheEntry(PropertyIndex.build(properties), None, now)
+            if organizations is not None:
+                self._org_cache[tenant_id] = _CacheEntry(OrganizationIndex.build(organizations), None, now)
+
+    def invalidate_cache(self, tenant_id: Optional[str] = None):
         """Clear cached entities (call after adding new entities)"""
-        self._property_cache = None
-        self._org_cache = None
+        with self._lock:
+            if tenant_id is None:
+                self._property_cache.clear()
+                self._org_cache.clear()
+            else:
+                self._property_cache.pop(tenant_id, None)
+                self._org_cache.pop(tenant_id, None)
 
     def resolve_property(
         self,
         query: str,
         context: Optional[Dict[str, Any]] = None,
+        tenant_id: Optional[str] = None,
     ) -> Optional[ResolvedEntity]:
         """
         Resolve a property reference to a known property.
@@ -100,64 +286,46 @@ class EntityResolver:
         Args:
             query: The property reference (shorthand, address, etc.)
             context: Optional context (e.g., filename, document content)
+            tenant_id: Restrict to one tenant's properties (None = all)
 
         Returns:
             ResolvedEntity if found, None otherwise
         """
-        properties = self._load_properties()
+        index = self._property_index(tenant_id)
         query_lower = query.lower().strip()
 
+        def resolved(i: int, matched_via: str, confidence: float) -> ResolvedEntity:
+            prop = index.properties[i]
+            return ResolvedEntity(
+                entity_type='property',
+                entity_id=prop['id'],
+                name=prop['full_address'],
+                matched_via=matched_via,
+                confidence=confidence,
+                attributes=prop,
+            )
+
         # Strategy 1: Exact alias match
-        for prop in properties:
-            aliases = [a.lower() for a in (prop.get('aliases') or [])]
-            if query_lower in aliases:
-                return ResolvedEntity(
-                    entity_type='property',
-                    entity_id=prop['id'],
-                    name=prop['full_address'],
-                    matched_via='alias',
-                    confidence=1.0,
-                    attributes=prop,
-                )
+        if query_lower in index.by_alias:
+            return resolved(index.by_alias[query_lower], 'alias', 1.0)
 
         # Strategy 2: Shorthand match
-        for prop in properties:
-            if prop.get('shorthand', '').lower() == query_lower:
-                return ResolvedEntity(
-                    entity_type='property',
-                    entity_id=prop['id'],
-                    name=prop['full_address'],
-                    matched_via='shorthand',
-                    confidence=1.0,
-                    attributes=prop,
-                )
-
-        # Strategy 3: Address contains match
-        for prop in properties:
-            full_addr = (prop.get('full_address') or '').lower()
-            street = (prop.get('street') or '').lower()
-
-            # Check if query contains key address parts
-            if query_lower in full_addr or full_addr in query_lower:
-                return ResolvedEntity(
-                    entity_type='property',
-                    entity_id=prop['id'],
-                    name=prop['full_address'],
-                    matched_via='address',
-                    confidence=0.9,
-                    attributes=prop,
-                )
-
-            # Check street name
-            if len(query_lower) > 3 and query_lower in street:
-                return ResolvedEntity(
-                    entity_type='property',
-                    entity_id=prop['id'],
-                    name=prop['full_address'],
-                    matched_via='street',
-                    confidence=0.8,
-                    attributes=prop,
-                )
+        if query_lower in index.by_shorthand:
+            return resolved(index.by_shorthand[query_lower], 'shorthand', 1.0)
+
+        # Strategy 3: Address match (normalized: "Drive, " == "dr ")
+        query_address = normalize_address(query)
+        if query_address in index.by_address:
+            return resolved(index.by_address[query_address], 'address', 0.95)
+
+        # Strategy 4: Address containment, then street containment, first row wins
+        address_hits = index.addresses.containing(query_address) | index.addresses.contained_in(query_address)
+        street_hits = index.streets.containing(query_lower) if len(query_lower) > 3 else set()
+        if address_hits or street_hits:
+            first = min(address_hits | street_hits)
+            if first in address_hits:
+                return resolved(first, 'address', 0.9)
+            return resolved(first, 'street', 0.8)
 
         return None
 
@@ -165,6 +333,7 @@ class EntityResolver:
         self,
         query: str,
         org_type: Optional[str] = None,
+        tenant_id: Optional[str] = None,
     ) -> Optional[ResolvedEntity]:
         """
         Resolve an organization reference to a known organization.
@@ -172,50 +341,35 @@ class EntityResolver:
         Args:
             query: The organization name or alias
             org_type: Optional filter by type (owner, hoa, insurer, etc.)
+            tenant_id: Restrict to one tenant's organizations (None = all)
 
         Returns:
             ResolvedEntity if found, None otherwise
         """
-        organizations = self._load_organizations()
+        index = self._organization_index(tenant_id)
         query_lower = query.lower().strip()
 
-        for org in organizations:
-            # Filter by type if specified
-            if org_type and org.get('organization_type') != org_type:
-                continue
-
-            # Check aliases
-            aliases = [a.lower() for a in (org.get('aliases') or [])]
-            if query_lower in aliases:
-                return ResolvedEntity(
-                    entity_type='organization',
-                    entity_id=org['id'],
-                    name=org['name'],
-                    matched_via='alias',
-                    confidence=1.0,
-                    attributes=org,
-                )
-
-            # Check name
-            if org.get('name', '').lower() == query_lower:
-                return ResolvedEntity(
-                    entity_type='organization',
-                    entity_id=org['id'],
-                    name=org['name'],
-                    matched_via='name',
-                    confidence=1.0,
-                    attributes=org,
-                )
-
-            # Partial name match
-            org_name = org.get('name', '').lower()
-            if query_lower in org_name or org_name in query_lower:
+        def matching(positions) -> List[int]:
+            return sorted(
+                i for i in positions
+                if not org_type or index.organizations[i].get('organization_type') == org_type
+            )
+
+        candidates = [
+            (matching(index.by_alias.get(query_lower, [])), 'alias', 1.0),
+            (matching(index.by_name.get(query_lower, [])), 'name', 1.0),
+            (matching(index.names.containing(query_lower) | index.names.contained_in(query_lower)), 'partial_name', 0.8),
+        ]
+
+        for positions, matched_via, confidence in candidates:
+            if positions:
+                org = index.organizations[positions[0]]
                 return ResolvedEntity(
                     entity_type='organization',
                     entity_id=org['id'],
                     name=org['name'],
-                    matched_via='partial_name',
-                    confidence=0.8,
+                    matched_via=matched_via,
+                    confidence=confidence,
                     attributes=org,
                 )
 
@@ -271,12 +425,14 @@ class EntityResolver:
     def resolve_from_filename(
         self,
         filename: str,
+        tenant_id: Optional[str] = None,
     ) -> Tuple[Optional[ResolvedEntity], Optional[ResolvedEntity], Dict]:
         """
         Resolve entities from a filename using the standard convention.
 
         Args:
             filename: The document filename
+            tenant_id: Restrict to one tenant's entities (None = all)
 
         Returns:
             Tuple of (property, organization, parsed_components)
@@ -288,11 +444,11 @@ class EntityResolver:
 
         # Try to resolve property from shorthand
         if parsed['property']:
-            property_entity = self.resolve_property(parsed['property'])
+            property_entity = self.resolve_property(parsed['property'], tenant_id=tenant_id)
 
         # Try to resolve company
         if parsed['company']:
-            org_entity = self.resolve_organization(parsed['company'])
+            org_entity = self.resolve_organization(parsed['company'], tenant_id=tenant_id)
 
         return property_entity, org_entity, parsed
 
@@ -300,6 +456,7 @@ class EntityResolver:
         self,
         query: str,
         entity_types: Optional[List[str]] = None,
+        tenant_id: Optional[str] = None,
     ) -> List[ResolvedEntity]:
         """
         Try to resolve a query against all entity types.
@@ -307,6 +464,7 @@ class EntityResolver:
         Args:
             query: The search query
             entity_types: Optional list of types to search ('property', 'organization')
+            tenant_id: Restrict to one tenant's entities (None = all)
 
         Returns:
             List of all matching entities
@@ -315,12 +473,12 @@ class EntityResolver:
         types = entity_types or ['property', 'organization']
 
         if 'property' in types:
-            prop = self.resolve_property(query)
+            prop = self.resolve_property(query, tenant_id=tenant_id)
             if prop:
                 results.append(prop)
 
         if 'organization' in types:
-            org = self.resolve_organization(query)
+            org = self.resolve_organization(query, tenant_id=tenant_id)
             if org:
                 results.append(org)
 
@@ -346,16 +504,19 @@ def get_entity_resolver() -> EntityResolver:
 # Convenience Functions
 # =============================================================================
 
-def resolve_property(query: str) -> Optional[ResolvedEntity]:
+def resolve_property(query: str, tenant_id: Optional[str] = None) -> Optional[ResolvedEntity]:
     """Resolve a property reference"""
-    return get_entity_resolver().resolve_property(query)
+    return get_entity_resolver().resolve_property(query, tenant_id=tenant_id)
 
 
-def resolve_organization(query: str) -> Optional[ResolvedEntity]:
+def resolve_organization(query: str, tenant_id: Optional[str] = None) -> Optional[ResolvedEntity]:
     """Resolve an organization reference"""
-    return get_entity_resolver().resolve_organization(query)
+    return get_entity_resolver().resolve_organization(query, tenant_id=tenant_id)
 
 
-def resolve_from_filename(filename: str) -> Tuple[Optional[ResolvedEntity], Optional[ResolvedEntity], Dict]:
+def resolve_from_filename(
+    filename: str,
+    tenant_id: Optional[str] = None,
+) -> Tuple[Optional[ResolvedEntity], Optional[ResolvedEntity], Dict]:
     """Resolve entities from filename convention"""
-    return get_entity_resolver().resolve_from_filename(filename)
+    return get_entity_resolver().resolve_from_filename(filename, tenant_id=tenant_id)
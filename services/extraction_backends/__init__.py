@@ -3,13 +3,14 @@ Extraction Backends
 Pluggable document extraction backends for the AI Brain
 """
 
-from .base import ExtractionBackend, ExtractionResult
+from .base import ExtractionBackend, ExtractionResult, BatchExtractionItem
 from .claude_backend import ClaudeExtractionBackend
 from .docling_backend import DoclingExtractionBackend
 
 __all__ = [
     'ExtractionBackend',
     'ExtractionResult',
+    'BatchExtractionItem',
     'ClaudeExtractionBackend',
     'DoclingExtractionBackend'
 ]
@@ -3,12 +3,18 @@ Base Extraction Backend
 Abstract interface for document extraction backends
 """
 
+import time
+import random
+import asyncio
+import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class ExtractionConfidence(Enum):
     """Confidence level of extraction"""
@@ -101,6 +107,20 @@ class ExtractionResult:
         }
 
 
+@dataclass
+class BatchExtractionItem:
+    """One completed file from a streamed batch extraction"""
+    index: int  # Position in the input file list
+    file_path: str
+    result: ExtractionResult
+    attempts: int = 1
+    elapsed_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.result.is_valid()
+
+
 class ExtractionBackend(ABC):
     """
     Abstract base class for extraction backends.
@@ -110,8 +130,19 @@ class ExtractionBackend(ABC):
     - DoclingExtractionBackend (using Docling API)
     - TesseractBackend (basic OCR fallback)
     - VisionBackend (for image-heavy documents)
+
+    Batch extraction is shared: files run concurrently under a semaphore with
+    per-file timeouts and rate-limit-aware retries. Backends tune it through
+    the class attributes below and is_retryable_error()/retry_after().
     """
 
+    # Batch extraction defaults (overridable per backend and per call)
+    batch_concurrency: int = 4
+    batch_file_timeout: float = 300.0
+    batch_max_retries: int = 3
+    batch_backoff_base: float = 2.0
+    batch_backoff_max: float = 60.0
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -145,25 +176,143 @@ class ExtractionBackend(ABC):
         """
         pass
 
-    @abstractmethod
     async def extract_batch(
         self,
         file_paths: List[str],
         extract_entities: bool = True,
-        entity_types: Optional[List[str]] = None
+        entity_types: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        file_timeout: Optional[float] = None
     ) -> List[ExtractionResult]:
         """
-        Extract content from multiple documents.
+        Extract content from multiple documents concurrently.
 
         Args:
             file_paths: List of paths to documents
             extract_entities: Whether to extract structured entities
             entity_types: Optional list of entity types to extract
+            max_concurrency: Files in flight at once (default: batch_concurrency)
+            file_timeout: Seconds allowed per attempt (default: batch_file_timeout)
 
         Returns:
-            List of ExtractionResults
+            List of ExtractionResults in input order (failed files carry
+            validation_errors instead of raising)
         """
-        pass
+        results: List[Optional[ExtractionResult]] = [None] * len(file_paths)
+        async for item in self.extract_batch_stream(
+            file_paths,
+            extract_entities=extract_entities,
+            entity_types=entity_types,
+            max_concurrency=max_concurrency,
+            file_timeout=file_timeout
+        ):
+            results[item.index] = item.result
+        return results
+
+    async def extract_batch_stream(
+        self,
+        file_paths: List[str],
+        extract_entities: bool = True,
+        entity_types: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        file_timeout: Optional[float] = None
+    ) -> AsyncIterator[BatchExtractionItem]:
+        """
+        Extract multiple documents concurrently, yielding each as it completes.
+
+        Retryable failures (rate limits, timeouts, transient server errors) are
+        retried with exponential backoff and full jitter. A rate-limit response
+        pauses new attempts across the whole batch until its retry-after.
+
+        Args:
+            file_paths: List of paths to documents
+            extract_entities: Whether to extract structured entities
+            entity_types: Optional list of entity types to extract
+            max_concurrency: Files in flight at once (default: batch_concurrency)
+            file_timeout: Seconds allowed per attempt (default: batch_file_timeout)
+
+        Yields:
+            BatchExtractionItem in completion order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.batch_concurrency)
+        timeout = file_timeout or self.batch_file_timeout
+        pause_until = 0.0
+
+        async def run(index: int, file_path: str) -> BatchExtractionItem:
+            nonlocal pause_until
+            started = time.monotonic()
+            attempt = 0
+            async with semaphore:
+                while True:
+                    attempt += 1
+                    wait = pause_until - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    try:
+                        result = await asyncio.wait_for(
+                            self.extract(file_path, extract_entities, entity_types),
+                            timeout=timeout
+                        )
+                        break
+                    except Exception as e:
+                        retryable = isinstance(e, asyncio.TimeoutError) or self.is_retryable_error(e)
+                        if not retryable or attempt > self.batch_max_retries:
+                            logger.error(f"Failed to extract {file_path}: {e!r}")
+                            result = self._failed_result(file_path, e)
+                            break
+
+                        delay = self.retry_after(e)
+                        if delay is not None:
+                            pause_until = max(pause_until, time.monotonic() + delay)
+                        else:
+                            ceiling = min(self.batch_backoff_max, self.batch_backoff_base ** attempt)
+                            delay = random.uniform(0, ceiling)
+                        logger.warning(
+                            f"Extraction of {file_path} failed ({type(e).__name__}), "
+                            f"retry {attempt}/{self.batch_max_retries} in {delay:.1f}s"
+                        )
+                        await asyncio.sleep(delay)
+
+            return BatchExtractionItem(
+                index=index,
+                file_path=file_path,
+                result=result,
+                attempts=attempt,
+                elapsed_seconds=time.monotonic() - started
+            )
+
+        tasks = [asyncio.create_task(run(i, path)) for i, path in enumerate(file_paths)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Whether a failed extraction is worth retrying (override per backend)"""
+        return False
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """Server-requested delay in seconds for rate-limit errors, if any"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is None or getattr(response, "status_code", None) != 429:
+            return None
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    def _failed_result(self, file_path: str, error: Exception) -> ExtractionResult:
+        """Placeholder result for a file that could not be extracted"""
+        return ExtractionResult(
+            raw_text="",
+            backend_name=self.name,
+            confidence=ExtractionConfidence.LOW,
+            metadata={"file_path": file_path},
+            validation_errors=[f"Extraction failed: {str(error) or type(error).__name__}"]
+        )
 
     @abstractmethod
     async def validate_extraction(
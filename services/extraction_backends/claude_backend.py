@@ -9,8 +9,15 @@ import logging
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
-from anthropic import Anthropic
+from anthropic import (
+    AsyncAnthropic,
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    RateLimitError
+)
 
+from ..llm_gateway import get_llm_gateway
 from .base import (
     ExtractionBackend,
     ExtractionResult,
@@ -73,6 +80,9 @@ class ClaudeExtractionBackend(ExtractionBackend):
     - Requires API access
     """
 
+    # Each file is a large multimodal request; keep well under org rate limits
+    batch_concurrency = int(os.getenv("CLAUDE_EXTRACTION_CONCURRENCY", "4"))
+
     def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-20250514"):
         """
         Initialize Claude backend.
@@ -86,7 +96,12 @@ class ClaudeExtractionBackend(ExtractionBackend):
             raise ValueError("ANTHROPIC_API_KEY not found")
 
         self.model = model
-        self.client = Anthropic(api_key=self.api_key)
+        self.gateway = get_llm_gateway()
+        # The gateway's per-event-loop client serves the default key; only
+        # a different key needs a client of its own
+        self.client = (
+            AsyncAnthropic(api_key=self.api_key) if self.api_key != self.gateway.api_key else None
+        )
 
     @property
     def name(self) -> str:
@@ -94,7 +109,7 @@ class ClaudeExtractionBackend(ExtractionBackend):
 
     @property
     def supports_batch(self) -> bool:
-        return True  # Can process multiple, but sequentially
+        return True  # Concurrent, bounded by batch_concurrency
 
     def _read_file_as_base64(self, file_path: str) -> tuple[str, str]:
         """Read file and return base64 content with media type"""
@@ -178,10 +193,11 @@ Respond with just the markdown content."""
 
         # Call Claude
         try:
-            response = self.client.messages.create(
+            response = await self.gateway.create_message(
                 model=self.model,
                 max_tokens=16000,
-                messages=messages
+                messages=messages,
+                client=self.client
             )
 
             response_text = response.content[0].text
@@ -280,32 +296,13 @@ Respond with just the markdown content."""
             validation_warnings=data.get("warnings", [])
         )
 
-    async def extract_batch(
-        self,
-        file_paths: List[str],
-        extract_entities: bool = True,
-        entity_types: Optional[List[str]] = None
-    ) -> List[ExtractionResult]:
-        """
-        Extract from multiple documents sequentially.
-
-        For true parallel processing, consider using Docling backend.
-        """
-        results = []
-        for file_path in file_paths:
-            try:
-                result = await self.extract(file_path, extract_entities, entity_types)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to extract {file_path}: {e}")
-                results.append(ExtractionResult(
-                    raw_text="",
-                    backend_name=self.name,
-                    confidence=ExtractionConfidence.LOW,
-                    validation_errors=[f"Extraction failed: {str(e)}"]
-                ))
-
-        return results
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Rate limits, overload (529), 5xx and network errors are transient"""
+        if isinstance(error, (RateLimitError, APITimeoutError, APIConnectionError)):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code == 429 or error.status_code >= 500
+        return False
 
     async def validate_extraction(
         self,
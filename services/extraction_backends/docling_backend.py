@@ -41,6 +41,8 @@ class DoclingExtractionBackend(ExtractionBackend):
     - When cost is a concern
     """
 
+    batch_concurrency = int(os.getenv("DOCLING_EXTRACTION_CONCURRENCY", "8"))
+
     def __init__(
         self,
         api_url: Optional[str] = None,
@@ -58,6 +60,26 @@ class DoclingExtractionBackend(ExtractionBackend):
             "https://docling.leadingai.info"
         )
         self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client so batch requests reuse connections"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                verify=False,
+                limits=httpx.Limits(
+                    max_connections=self.batch_concurrency,
+                    max_keepalive_connections=self.batch_concurrency
+                )
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @property
     def name(self) -> str:
@@ -92,22 +114,22 @@ class DoclingExtractionBackend(ExtractionBackend):
 
         endpoint = f"{self.api_url}/v1/convert/file"
 
-        async with httpx.AsyncClient(timeout=self.timeout, verify=False) as client:
-            with open(file_path, 'rb') as f:
-                files = {'files': (Path(file_path).name, f)}
+        client = self._get_client()
+        with open(file_path, 'rb') as f:
+            files = {'files': (Path(file_path).name, f)}
 
-                try:
-                    response = await client.post(endpoint, files=files)
-                    response.raise_for_status()
+            try:
+                response = await client.post(endpoint, files=files)
+                response.raise_for_status()
 
-                    data = response.json()
+                data = response.json()
 
-                except httpx.HTTPStatusError as e:
-                    logger.error(f"Docling API error: {e}")
-                    raise
-                except Exception as e:
-                    logger.error(f"Docling request failed: {e}")
-                    raise
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Docling API error: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"Docling request failed: {e}")
+                raise
 
         # Parse Docling response
         document = data.get("document", {})
@@ -140,34 +162,13 @@ class DoclingExtractionBackend(ExtractionBackend):
 
         return result
 
-    async def extract_batch(
-        self,
-        file_paths: List[str],
-        extract_entities: bool = True,
-        entity_types: Optional[List[str]] = None
-    ) -> List[ExtractionResult]:
-        """
-        Extract from multiple documents.
-
-        Docling can handle multiple files more efficiently than Claude
-        for pure text extraction.
-        """
-        results = []
-
-        for file_path in file_paths:
-            try:
-                result = await self.extract(file_path, extract_entities, entity_types)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to extract {file_path}: {e}")
-                results.append(ExtractionResult(
-                    raw_text="",
-                    backend_name=self.name,
-                    confidence=ExtractionConfidence.LOW,
-                    validation_errors=[f"Extraction failed: {str(e)}"]
-                ))
-
-        return results
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Network errors and 429/502/503/504 from the Docling service are transient"""
+        if isinstance(error, httpx.TransportError):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in (429, 502, 503, 504)
+        return False
 
     async def validate_extraction(
         self,
@@ -197,9 +198,8 @@ class DoclingExtractionBackend(ExtractionBackend):
     async def health_check(self) -> bool:
         """Check if Docling API is available"""
         try:
-            async with httpx.AsyncClient(timeout=10, verify=False) as client:
-                response = await client.get(f"{self.api_url}/health")
-                return response.status_code == 200
+            response = await self._get_client().get(f"{self.api_url}/health", timeout=10)
+            return response.status_code == 200
         except Exception:
             return False
 
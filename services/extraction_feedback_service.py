@@ -7,7 +7,6 @@ Enables continuous improvement of document extraction through:
 3. Automated validation - cross-check against known entities
 """
 
-import os
 import json
 import logging
 import re
@@ -15,6 +14,8 @@ from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
+from .db_pool import get_supabase_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -144,24 +145,7 @@ class ExtractionFeedbackService:
     def supabase(self):
         """Lazy load Supabase client"""
         if self._supabase is None:
-            from supabase import create_client
-
-            url = os.environ.get('SUPABASE_URL')
-            key = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
-
-            if not url or not key:
-                env_file = os.path.expanduser("~/.claude/.env")
-                if os.path.exists(env_file):
-                    with open(env_file) as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and not line.startswith("#") and "=" in line:
-                                k, v = line.split("=", 1)
-                                os.environ[k] = v.strip('"').strip("'")
-                    url = os.environ.get('SUPABASE_URL')
-                    key = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
-
-            self._supabase = create_client(url, key)
+            self._supabase = get_supabase_client()
         return self._supabase
 
     # =========================================================================
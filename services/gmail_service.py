@@ -17,6 +17,8 @@ from googleapiclient.errors import HttpError
 from email.mime.text import MIMEText
 import mimetypes
 
+from .db_pool import run_query
+
 logger = logging.getLogger(__name__)
 
 # Gmail API scopes
@@ -134,12 +136,12 @@ class GmailService:
             if query:
                 full_query += f" {query}"
 
-            results = self.service.users().messages().list(
+            results = await run_query(self.service.users().messages().list(
                 userId='me',
                 q=full_query,
                 maxResults=max_results,
                 fields='messages(id,threadId)'
-            ).execute()
+            ))
 
             return results.get('messages', [])
 
@@ -147,6 +149,161 @@ class GmailService:
             logger.error(f"Gmail list error: {error}")
             return []
 
+    async def get_label_id(self, label_name: str) -> Optional[str]:
+        """
+        Look up a label ID by name
+
+        Args:
+            label_name: Label name (e.g., "Flourisha/Unprocessed")
+
+        Returns:
+            Label ID or None if the label does not exist
+        """
+        if not self.service:
+            logger.error("Gmail service not authenticated")
+            return None
+
+        try:
+            labels_result = await run_query(self.service.users().labels().list(userId='me'))
+            for label in labels_result.get('labels', []):
+                if label['name'] == label_name:
+                    return label['id']
+            return None
+
+        except HttpError as error:
+            logger.error(f"Gmail labels error: {error}")
+            return None
+
+    async def get_history_id(self) -> Optional[str]:
+        """Get the mailbox's current history ID (starting point for list_history)"""
+        if not self.service:
+            logger.error("Gmail service not authenticated")
+            return None
+
+        try:
+            profile = await run_query(self.service.users().getProfile(userId='me'))
+            return profile.get('historyId')
+
+        except HttpError as error:
+            logger.error(f"Gmail profile error: {error}")
+            return None
+
+    async def list_history(
+        self,
+        start_history_id: str,
+        label_id: Optional[str] = None
+    ) -> Optional[Tuple[List[str], str]]:
+        """
+        List messages added to (or labeled into) the mailbox since a history ID
+
+        Args:
+            start_history_id: History ID from a previous sync or push notification
+            label_id: Only return changes involving this label
+
+        Returns:
+            (message IDs, latest history ID), or None if start_history_id is
+            too old and a full sync is needed
+        """
+        if not self.service:
+            logger.error("Gmail service not authenticated")
+            return None
+
+        message_ids: List[str] = []
+        latest_history_id = start_history_id
+        page_token = None
+
+        try:
+            while True:
+                params = {
+                    'userId': 'me',
+                    'startHistoryId': start_history_id,
+                    'historyTypes': ['messageAdded', 'labelAdded'],
+                }
+                if label_id:
+                    params['labelId'] = label_id
+                if page_token:
+                    params['pageToken'] = page_token
+
+                results = await run_query(self.service.users().history().list(**params))
+
+                for record in results.get('history', []):
+                    added = list(record.get('messagesAdded', []))
+                    # Ignore other labels being added (e.g. the processed label)
+                    added += [
+                        change for change in record.get('labelsAdded', [])
+                        if not label_id or label_id in change.get('labelIds', [])
+                    ]
+                    for change in added:
+                        message_id = change.get('message', {}).get('id')
+                        if message_id and message_id not in message_ids:
+                            message_ids.append(message_id)
+
+                latest_history_id = results.get('historyId', latest_history_id)
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    return message_ids, latest_history_id
+
+        except HttpError as error:
+            if error.resp.status == 404:
+                logger.info(f"Gmail history {start_history_id} expired, full sync needed")
+            else:
+                logger.error(f"Gmail history error: {error}")
+            return None
+
+    async def watch(self, topic_name: str, label_ids: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Start (or renew) push notifications to a Pub/Sub topic
+
+        Gmail stops pushing after 7 days, so call this at least daily.
+
+        Args:
+            topic_name: Full topic name (projects/<project>/topics/<topic>)
+            label_ids: Only push changes involving these labels
+
+        Returns:
+            Watch response with historyId and expiration, or None
+        """
+        if not self.service:
+            logger.error("Gmail service not authenticated")
+            return None
+
+        try:
+            body = {'topicName': topic_name}
+            if label_ids:
+                body['labelIds'] = label_ids
+                body['labelFilterBehavior'] = 'include'
+            return await run_query(self.service.users().watch(userId='me', body=body))
+
+        except HttpError as error:
+            logger.error(f"Gmail watch error: {error}")
+            return None
+
+    async def get_message_label_ids(self, message_id: str) -> Optional[List[str]]:
+        """
+        Get the label IDs currently on a message
+
+        Returns:
+            Label IDs ([] if the message was deleted), or None if the lookup
+            failed
+        """
+        if not self.service:
+            logger.error("Gmail service not authenticated")
+            return None
+
+        try:
+            message = await run_query(self.service.users().messages().get(
+                userId='me',
+                id=message_id,
+                format='minimal'
+            ))
+            return message.get('labelIds', [])
+
+        except HttpError as error:
+            if error.resp.status == 404:
+                return []
+            logger.error(f"Gmail get message error: {error}")
+            return None
+
     async def get_message(self, message_id: str) -> Optional[Dict]:
         """
         Get full message details
@@ -162,11 +319,11 @@ class GmailService:
             return None
 
         try:
-            message = self.service.users().messages().get(
+            message = await run_query(self.service.users().messages().get(
                 userId='me',
                 id=message_id,
                 format='full'
-            ).execute()
+            ))
 
             return message
 
@@ -243,11 +400,11 @@ class GmailService:
             return None
 
         try:
-            attachment = self.service.users().messages().attachments().get(
+            attachment = await run_query(self.service.users().messages().attachments().get(
                 userId='me',
                 messageId=message_id,
                 id=attachment_id
-            ).execute()
+            ))
 
             data = attachment.get('data', '')
             if data:
@@ -280,7 +437,7 @@ class GmailService:
 
         try:
             # Try to get or create the label
-            labels_result = self.service.users().labels().list(userId='me').execute()
+            labels_result = await run_query(self.service.users().labels().list(userId='me'))
             labels = labels_result.get('labels', [])
 
             label_id = None
@@ -296,18 +453,18 @@ class GmailService:
                     'labelListVisibility': 'labelShow',
                     'messageLis Visibility': 'show'
                 }
-                created_label = self.service.users().labels().create(
+                created_label = await run_query(self.service.users().labels().create(
                     userId='me',
                     body=label_body
-                ).execute()
+                ))
                 label_id = created_label['id']
 
             # Add label to message
-            self.service.users().messages().modify(
+            await run_query(self.service.users().messages().modify(
                 userId='me',
                 id=message_id,
                 body={'addLabelIds': [label_id]}
-            ).execute()
+            ))
 
             logger.info(f"Marked message {message_id} as processed")
             return True
@@ -0,0 +1,337 @@
+"""
+Hybrid Search Engine
+Keyword + vector + graph retrieval fused with reciprocal-rank fusion
+
+Embeddings are weak for exact names (people, properties, products), and the
+vector and graph stores used to be queried separately. One search runs
+three stages concurrently, so the slowest stage sets the latency instead of
+their sum:
+
+- fulltext: Postgres tsvector search over processed_content
+  (search_content_fulltext, migration 010)
+- vector:   query embedding + pgvector search (search_content_by_vector)
+- graph:    Graphiti search over the tenant's knowledge graph (facts)
+
+Each stage returns its own ranked list. The lists are fused with
+reciprocal-rank fusion (score = sum of weight / (k + rank)), so raw scores
+never need to be on the same scale. A stage that fails or times out is
+reported and skipped; the other stages still return results.
+
+Optionally the top fused candidates are re-scored by a local cross-encoder
+(sentence-transformers, if installed). Every stage's latency is reported.
+
+Usage:
+    from services.hybrid_search import get_hybrid_search_engine
+
+    engine = get_hybrid_search_engine()
+    response = await engine.search("Prince Charles Drive inspection", tenant_id="t1")
+    print(response["timings_ms"], response["results"][0])
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RRF_K = 60
+DEFAULT_STAGE_TIMEOUT = 10.0
+DEFAULT_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+# Candidates fetched per stage: limit * multiplier, capped
+CANDIDATE_MULTIPLIER = 3
+MIN_CANDIDATES = 20
+MAX_CANDIDATES = 100
+
+# Fused candidates passed to the cross-encoder
+RERANK_CANDIDATES = 30
+
+STAGE_WEIGHTS = {"fulltext": 1.0, "vector": 1.0, "graph": 1.0}
+
+
+@dataclass
+class StageResult:
+    """Ranked hits from one retrieval stage"""
+    name: str
+    hits: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    timings_ms: Dict[str, float] = field(default_factory=dict)  # Sub-step timings
+    error: Optional[str] = None
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Dict[str, List[str]],
+    k: int = DEFAULT_RRF_K,
+    weights: Optional[Dict[str, float]] = None
+) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked lists of keys with reciprocal-rank fusion
+
+    Args:
+        ranked_lists: Stage name -> keys, best first
+        k: RRF constant (higher flattens the advantage of top ranks)
+        weights: Stage name -> weight (default 1.0)
+
+    Returns:
+        (key, score) pairs, best first; ties keep the best single rank first
+    """
+    scores: Dict[str, float] = {}
+    best_rank: Dict[str, int] = {}
+    for stage, keys in ranked_lists.items():
+        weight = (weights or {}).get(stage, 1.0)
+        for rank, key in enumerate(keys, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+            best_rank[key] = min(best_rank.get(key, rank), rank)
+    return sorted(scores.items(), key=lambda item: (-item[1], best_rank[item[0]]))
+
+
+def _as_list(value: Any) -> List[str]:
+    return [str(v) for v in value] if isinstance(value, list) else []
+
+
+def _content_hit(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "key": f"content:{row['id']}",
+        "id": str(row["id"]),
+        "title": row.get("title") or "Untitled",
+        "content_type": row.get("content_type") or "unknown",
+        "summary": row.get("summary"),
+        "tags": _as_list(row.get("tags")),
+        "source_url": row.get("source_url"),
+    }
+
+
+class HybridSearchEngine:
+    """
+    Concurrent fulltext/vector/graph retrieval with RRF fusion and optional rerank
+    """
+
+    def __init__(
+        self,
+        rrf_k: int = DEFAULT_RRF_K,
+        stage_timeout: float = DEFAULT_STAGE_TIMEOUT,
+        rerank_model: str = DEFAULT_RERANK_MODEL,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize hybrid search engine
+
+        Args:
+            rrf_k: Reciprocal-rank fusion constant
+            stage_timeout: Seconds before a stage is abandoned
+            rerank_model: sentence-transformers cross-encoder name or path
+            weights: Per-stage fusion weights (default STAGE_WEIGHTS)
+        """
+        self.rrf_k = rrf_k
+        self.stage_timeout = stage_timeout
+        self.rerank_model = rerank_model
+        self.weights = dict(weights or STAGE_WEIGHTS)
+        self._cross_encoder = None
+        self._cross_encoder_lock = threading.Lock()
+
+    # --- Stages --------------------------------------------------------------
+
+    async def _fulltext(self, query: str, tenant_id: str, count: int, stage: StageResult):
+        from .supabase_client import supabase_service
+
+        result = await supabase_service.execute(supabase_service.client.rpc(
+            'search_content_fulltext',
+            {
+                'query_text': query,
+                'match_tenant_id': tenant_id,
+                'match_count': count
+            }
+        ))
+        for row in result.data or []:
+            stage.hits.append({**_content_hit(row), "text_rank": row.get("rank")})
+
+    async def _vector(self, query: str, tenant_id: str, count: int, threshold: float, stage: StageResult):
+        from .embeddings_service import get_embeddings_service
+
+        embeddings = get_embeddings_service()
+        started = time.perf_counter()
+        query_embedding = await embeddings.generate_embedding(query)
+        stage.timings_ms["embed"] = round((time.perf_counter() - started) * 1000, 1)
+
+        started = time.perf_counter()
+        rows = await embeddings.search_by_vector(
+            query_embedding,
+            tenant_id=tenant_id,
+            limit=count,
+            similarity_threshold=threshold,
+        )
+        stage.timings_ms["ann"] = round((time.perf_counter() - started) * 1000, 1)
+        for row in rows:
+            stage.hits.append({**_content_hit(row), "similarity": row.get("similarity")})
+
+    async def _graph(self, query: str, tenant_id: str, count: int, stage: StageResult):
+        from .knowledge_graph_service import get_knowledge_graph
+
+        facts = await get_knowledge_graph().search_similar_content(
+            query=query,
+            tenant_id=tenant_id,
+            limit=count,
+        )
+        for fact in facts:
+            text = fact.get("fact") or ""
+            stage.hits.append({
+                "key": f"graph:{fact['uuid']}",
+                "id": str(fact["uuid"]),
+                "title": fact.get("name") or text[:80] or "Graph fact",
+                "content_type": "graph_fact",
+                "summary": text or None,
+                "tags": [],
+                "source_url": None,
+            })
+
+    async def _run_stage(self, name: str, runner, *args) -> StageResult:
+        """Run one stage with a timeout, recording latency and any error"""
+        stage = StageResult(name=name)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(runner(*args, stage), timeout=self.stage_timeout)
+        except asyncio.TimeoutError:
+            stage.error = f"timed out after {self.stage_timeout}s"
+            stage.hits = []
+        except Exception as e:
+            stage.error = str(e) or type(e).__name__
+            stage.hits = []
+        stage.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        if stage.error:
+            logger.warning(f"Hybrid search stage {name} failed: {stage.error}")
+        return stage
+
+    # --- Rerank --------------------------------------------------------------
+
+    def _get_cross_encoder(self):
+        """Load the cross-encoder once (raises ImportError without sentence-transformers)"""
+        if self._cross_encoder is None:
+            with self._cross_encoder_lock:
+                if self._cross_encoder is None:
+                    from sentence_transformers import CrossEncoder
+
+                    logger.info(f"Loading rerank model {self.rerank_model}")
+                    self._cross_encoder = CrossEncoder(self.rerank_model)
+        return self._cross_encoder
+
+    def _rerank(self, query: str, items: List[Dict[str, Any]]) -> List[float]:
+        """Cross-encoder relevance for each item (title + summary)"""
+        pairs = [
+            (query, f"{item['title']}. {(item.get('summary') or '')[:1000]}")
+            for item in items
+        ]
+        return [float(score) for score in self._get_cross_encoder().predict(pairs)]
+
+    # --- Search --------------------------------------------------------------
+
+    async def search(
+        self,
+        query: str,
+        tenant_id: str,
+        limit: int = 10,
+        threshold: float = 0.7,
+        include_graph: bool = True,
+        rerank: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Hybrid search across full-text, vector and graph stores
+
+        Args:
+            query: Search text
+            tenant_id: Tenant ID for isolation
+            limit: Maximum fused results
+            threshold: Minimum similarity for the vector stage (0-1)
+            include_graph: Also search the knowledge graph
+            rerank: Re-score the top fused candidates with the cross-encoder
+
+        Returns:
+            Dict with results (best first; each with score, matched_by,
+            similarity, and rerank_score when reranked), timings_ms per
+            stage, stage_errors and per-stage hit counts
+        """
+        started = time.perf_counter()
+        count = min(MAX_CANDIDATES, max(MIN_CANDIDATES, limit * CANDIDATE_MULTIPLIER))
+
+        runs = [
+            self._run_stage("fulltext", self._fulltext, query, tenant_id, count),
+            self._run_stage("vector", self._vector, query, tenant_id, count, threshold),
+        ]
+        if include_graph:
+            runs.append(self._run_stage("graph", self._graph, query, tenant_id, count))
+        stages: List[StageResult] = await asyncio.gather(*runs)
+
+        timings: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+        for stage in stages:
+            timings[stage.name] = stage.elapsed_ms
+            for step, ms in stage.timings_ms.items():
+                timings[f"{stage.name}_{step}"] = ms
+            if stage.error:
+                errors[stage.name] = stage.error
+
+        # Fuse: first stage to return an item supplies its fields; later
+        # stages add their own signals (similarity, text rank)
+        fuse_started = time.perf_counter()
+        items: Dict[str, Dict[str, Any]] = {}
+        for stage in stages:
+            for hit in stage.hits:
+                item = items.setdefault(hit["key"], {**hit, "matched_by": []})
+                item["matched_by"].append(stage.name)
+                for signal in ("similarity", "text_rank"):
+                    if hit.get(signal) is not None:
+                        item[signal] = hit[signal]
+        fused = reciprocal_rank_fusion(
+            {stage.name: [hit["key"] for hit in stage.hits] for stage in stages},
+            k=self.rrf_k,
+            weights=self.weights,
+        )
+        results = []
+        for key, score in fused:
+            item = items[key]
+            item["score"] = round(score, 6)
+            results.append(item)
+        timings["fusion"] = round((time.perf_counter() - fuse_started) * 1000, 2)
+
+        if rerank and results:
+            rerank_started = time.perf_counter()
+            head = results[:max(limit, RERANK_CANDIDATES)]
+            try:
+                scores = await asyncio.to_thread(self._rerank, query, head)
+                for item, rerank_score in zip(head, scores):
+                    item["rerank_score"] = round(rerank_score, 4)
+                head.sort(key=lambda item: -item["rerank_score"])
+                results = head + results[len(head):]
+            except Exception as e:
+                errors["rerank"] = str(e) or type(e).__name__
+                logger.warning(f"Rerank skipped: {errors['rerank']}")
+            timings["rerank"] = round((time.perf_counter() - rerank_started) * 1000, 1)
+
+        timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+        return {
+            "results": [
+                {k: v for k, v in item.items() if k != "key"}
+                for item in results[:limit]
+            ],
+            "timings_ms": timings,
+            "stage_errors": errors,
+            "stage_hits": {stage.name: len(stage.hits) for stage in stages},
+        }
+
+
+# Singleton instance
+_hybrid_search_engine = None
+
+
+def get_hybrid_search_engine() -> HybridSearchEngine:
+    """Get or create hybrid search engine singleton"""
+    global _hybrid_search_engine
+    if _hybrid_search_engine is None:
+        _hybrid_search_engine = HybridSearchEngine(
+            rrf_k=int(os.getenv("HYBRID_SEARCH_RRF_K", DEFAULT_RRF_K)),
+            stage_timeout=float(os.getenv("HYBRID_SEARCH_STAGE_TIMEOUT", DEFAULT_STAGE_TIMEOUT)),
+            rerank_model=os.getenv("SEARCH_RERANK_MODEL", DEFAULT_RERANK_MODEL),
+        )
+    return _hybrid_search_engine
@@ -3,10 +3,12 @@ Neo4j Knowledge Graph Service using Graphiti
 Temporally-aware knowledge graph for content intelligence
 """
 import os
+import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from graphiti_core import Graphiti
 
+from .search_cache import get_search_cache
 from .ontology import get_ontology, ENTITY_TYPES, EDGE_TYPES, EDGE_TYPE_MAP
 
 
@@ -98,6 +100,9 @@ class KnowledgeGraphService:
             edge_type_map=EDGE_TYPE_MAP  # Which edges connect which entity types
         )
 
+        # New graph facts: drop the tenant's cached search results
+        await asyncio.to_thread(get_search_cache().invalidate_tenant, tenant_id)
+
         return content_id
 
     async def add_entities_and_relationships(
@@ -7,6 +7,7 @@ Orchestrates document processing and ingestion into all knowledge stores:
 """
 
 import os
+import asyncio
 import logging
 import hashlib
 from typing import Dict, List, Optional, Any
@@ -20,9 +21,11 @@ from .document_processor import (
 )
 from .extraction_backends.base import ExtractionResult, ExtractedEntity
 from .knowledge_graph_service import get_knowledge_graph
-from .chunking_service import chunk_text
+from .chunking_service import semantic_chunk_text
 from .embeddings_service import get_embeddings_service as get_embeddings
 from .supabase_client import supabase_service
+from .db_pool import run_query
+from .search_cache import get_search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +42,11 @@ class KnowledgeIngestionService:
     5. Chunk and embed for semantic search (Vector)
     """
 
+    # Chunking for document_chunks embeddings
+    CHUNK_SIZE = 1000
+    CHUNK_OVERLAP = 200
+    CHUNK_INSERT_BATCH = 100
+
     def __init__(
         self,
         tenant_id: str = "default",
@@ -157,6 +165,9 @@ class KnowledgeIngestionService:
             result["status"] = "failed"
             result["errors"].append(str(e))
 
+        if result["stores"]:
+            await self._invalidate_search_cache()
+
         # Calculate duration
         result["duration_seconds"] = (datetime.utcnow() - start_time).total_seconds()
 
@@ -241,11 +252,13 @@ class KnowledgeIngestionService:
             }
 
             # Step 1: Store raw content
+            db_id = None
             if store_raw:
                 raw_result = await self._store_raw_text(
                     document_id, source, source_id, text, title, full_metadata
                 )
                 result["stores"]["raw"] = raw_result
+                db_id = raw_result.get("document_id")
 
             # Step 2: Store in knowledge graph
             if store_in_graph:
@@ -257,7 +270,7 @@ class KnowledgeIngestionService:
             # Step 3: Store in vector database
             if store_in_vector:
                 vector_result = await self._store_in_vector(
-                    document_id, extraction, document_type, full_metadata
+                    document_id, extraction, document_type, full_metadata, db_id=db_id
                 )
                 result["stores"]["vector"] = vector_result
                 result["chunks_created"] = vector_result.get("chunks_stored", 0)
@@ -267,9 +280,29 @@ class KnowledgeIngestionService:
             result["status"] = "failed"
             result["errors"].append(str(e))
 
+        if result["stores"]:
+            await self._invalidate_search_cache()
+
         result["duration_seconds"] = (datetime.utcnow() - start_time).total_seconds()
         return result
 
+    async def _find_document_pg_id(self, source: str, source_id: str) -> Optional[int]:
+        """
+        Look up a documents_pg row id by (tenant_id, source, source_id).
+
+        Served by idx_documents_pg_source_lookup (migration 006), so this is a
+        single keyed lookup rather than a scan of every tenant document.
+        """
+        supabase = supabase_service.client
+        response = await run_query(
+            supabase.table("documents_pg").select("id").eq(
+                "tenant_id", self.tenant_id
+            ).eq("metadata->>source", source).eq(
+                "metadata->>source_id", str(source_id)
+            ).limit(1)
+        )
+        return response.data[0]["id"] if response.data else None
+
     async def _store_raw_text(
         self,
         document_id: str,
@@ -283,23 +316,15 @@ class KnowledgeIngestionService:
         try:
             supabase = supabase_service.client
 
-            # Check if document already exists (by source_id in metadata)
-            existing = supabase.table("documents_pg").select("id").eq(
-                "tenant_id", self.tenant_id
-            ).execute()
-
-            # Check for duplicate in existing records
-            for row in existing.data:
-                check = supabase.table("documents_pg").select("metadata").eq("id", row["id"]).execute()
-                if check.data:
-                    existing_meta = check.data[0].get("metadata", {})
-                    if existing_meta.get("source_id") == source_id and existing_meta.get("source") == source:
-                        return {
-                            "status": "success",
-                            "document_id": row["id"],
-                            "stored_bytes": len(text),
-                            "note": "already_exists"
-                        }
+            # Check if document already exists (indexed lookup on source/source_id)
+            existing_id = await self._find_document_pg_id(source, source_id)
+            if existing_id is not None:
+                return {
+                    "status": "success",
+                    "document_id": existing_id,
+                    "stored_bytes": len(text),
+                    "note": "already_exists"
+                }
 
             # Build metadata including source info
             full_metadata = {
@@ -320,7 +345,7 @@ class KnowledgeIngestionService:
                 "version_number": 1
             }
 
-            result = supabase.table("documents_pg").insert(doc_record).execute()
+            result = await run_query(supabase.table("documents_pg").insert(doc_record))
             new_id = result.data[0]["id"] if result.data else None
 
             return {
@@ -391,7 +416,7 @@ class KnowledgeIngestionService:
             }
 
             # Insert into documents table
-            result = supabase.table("documents").upsert(doc_record).execute()
+            result = await run_query(supabase.table("documents").upsert(doc_record))
 
             return {
                 "status": "success",
@@ -444,62 +469,151 @@ class KnowledgeIngestionService:
         document_id: str,
         extraction: ExtractionResult,
         document_type: Optional[str],
-        metadata: Optional[Dict]
+        metadata: Optional[Dict],
+        db_id: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Generate embedding and update document in vector database"""
+        """
+        Chunk and embed the full document, then store the vectors.
+
+        The whole text is split with semantic_chunk_text() (headings, tables,
+        lists, sentences), every chunk is embedded (batched, in one pass
+        together with the document-level embedding) and the chunks are
+        bulk-inserted into document_chunks. The documents_pg row, when found,
+        still gets a document-level embedding of the first ~8000 characters
+        for match_documents().
+
+        Args:
+            db_id: documents_pg row id returned by _store_raw_text. When
+                omitted, the row is looked up by (source, source_id).
+        """
         try:
             supabase = supabase_service.client
             embeddings_service = get_embeddings()
 
-            # For documents under embedding limit, embed the whole thing
-            # For larger docs, embed a summary/beginning
+            # Document-level embedding covers the beginning of the document
             text_to_embed = extraction.raw_text
             if len(text_to_embed) > 8000:
                 # Use first ~8000 chars for embedding (roughly 2000 tokens)
                 text_to_embed = text_to_embed[:8000]
 
-            # Generate embedding
-            embedding = await embeddings_service.generate_embedding(text_to_embed)
-
-            # Find the document by source_id in metadata
-            source_id = metadata.get("source_id") or metadata.get("message_id") if metadata else None
-            source = metadata.get("source") if metadata else None
-
-            if source_id and source:
-                # Find document by metadata (more reliable than hash ID)
-                existing = supabase.table("documents_pg").select("id, metadata").eq(
-                    "tenant_id", self.tenant_id
-                ).execute()
-
-                db_id = None
-                for row in existing.data:
-                    row_meta = row.get("metadata", {})
-                    if row_meta.get("source_id") == source_id and row_meta.get("source") == source:
-                        db_id = row["id"]
-                        break
-
-                if db_id:
-                    supabase.table("documents_pg").update({
-                        "embedding": embedding
-                    }).eq("id", db_id).execute()
-
-                    return {
-                        "status": "success",
-                        "embedded": True,
-                        "db_id": db_id,
-                        "total_characters": len(extraction.raw_text),
-                        "embedded_characters": len(text_to_embed)
-                    }
+            chunks = semantic_chunk_text(
+                extraction.raw_text,
+                chunk_size=self.CHUNK_SIZE,
+                chunk_overlap=self.CHUNK_OVERLAP
+            )
+
+            # One batched pass: [document, chunk_0, chunk_1, ...]
+            embeddings = await embeddings_service.generate_embeddings_batched(
+                [text_to_embed] + chunks
+            )
+            embedding, chunk_embeddings = embeddings[0], embeddings[1:]
+
+            if db_id is None and metadata:
+                # Find the document by source_id in metadata (indexed lookup)
+                source_id = metadata.get("source_id") or metadata.get("message_id")
+                source = metadata.get("source")
+                if source_id and source:
+                    db_id = await self._find_document_pg_id(source, source_id)
+
+            chunks_stored = await self._store_chunks(
+                document_id,
+                chunks,
+                chunk_embeddings,
+                embeddings_service.model,
+                db_id=db_id,
+                metadata={
+                    "document_type": document_type,
+                    "title": (metadata or {}).get("title"),
+                    "source": (metadata or {}).get("source"),
+                }
+            )
+
+            if db_id is not None:
+                await run_query(supabase.table("documents_pg").update({
+                    "embedding": embedding
+                }).eq("id", db_id))
+
+            if db_id is None and not chunks_stored:
+                return {
+                    "status": "failed",
+                    "error": "Could not find document to update with embedding"
+                }
 
             return {
-                "status": "failed",
-                "error": "Could not find document to update with embedding"
+                "status": "success",
+                "embedded": db_id is not None,
+                "db_id": db_id,
+                "chunks_stored": chunks_stored,
+                "total_characters": len(extraction.raw_text),
+                "embedded_characters": len(text_to_embed)
             }
 
         except Exception as e:
             logger.error(f"Vector storage failed: {e}")
             return {"status": "failed", "error": str(e)}
 
+    async def _store_chunks(
+        self,
+        document_id: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        model: str,
+        db_id: Optional[int] = None,
+        metadata: Optional[Dict] = None
+    ) -> int:
+        """
+        Bulk-upsert chunk embeddings into document_chunks.
+
+        Rows are keyed by (tenant_id, document_id, chunk_index), so re-ingesting
+        a document overwrites its chunks; any trailing chunks left over from a
+        longer previous version are removed.
+
+        Returns:
+            Number of chunks stored
+        """
+        if not chunks:
+            return 0
+
+        supabase = supabase_service.client
+        rows = [
+            {
+                "tenant_id": self.tenant_id,
+                "document_id": document_id,
+                "documents_pg_id": db_id,
+                "chunk_index": i,
+                "content": chunk,
+                "char_count": len(chunk),
+                "embedding": embedding,
+                "embedding_model": model,
+                "metadata": metadata or {},
+            }
+            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+        ]
+
+        # Each row carries a 1536-float vector, so keep request bodies bounded
+        for start in range(0, len(rows), self.CHUNK_INSERT_BATCH):
+            await run_query(
+                supabase.table("document_chunks").upsert(
+                    rows[start:start + self.CHUNK_INSERT_BATCH],
+                    on_conflict="tenant_id,document_id,chunk_index"
+                )
+            )
+
+        await run_query(
+            supabase.table("document_chunks").delete().eq(
+                "tenant_id", self.tenant_id
+            ).eq("document_id", document_id).gte("chunk_index", len(rows))
+        )
+
+        return len(rows)
+
+    async def _invalidate_search_cache(self):
+        """Expire this tenant's cached search results after new content was stored"""
+        try:
+            await asyncio.to_thread(get_search_cache().invalidate_tenant, self.tenant_id)
+        except Exception as e:
+            logger.warning(f"Search cache invalidation failed: {e}")
+
     async def query_knowledge(
         self,
         query: str,
@@ -517,8 +631,27 @@ class KnowledgeIngestionService:
             limit: Maximum results per store
 
         Returns:
-            Combined results from all stores
+            Combined results from all stores (cached briefly per tenant;
+            results with a store error are not cached)
         """
+        stores = (["vector"] if search_vector else []) + (["graph"] if search_graph else [])
+        response, _ = await get_search_cache().get_or_compute(
+            "knowledge", self.tenant_id, query,
+            lambda: self._query_stores(query, search_vector, search_graph, limit),
+            cacheable=lambda results: not ("vector_error" in results or "graph_error" in results),
+            limit=limit,
+            stores=stores,
+        )
+        return {**response, "query": query}
+
+    async def _query_stores(
+        self,
+        query: str,
+        search_vector: bool,
+        search_graph: bool,
+        limit: int
+    ) -> Dict[str, Any]:
+        """Run query_knowledge against the vector and graph stores (uncached)"""
         results = {
             "query": query,
             "vector_results": [],
@@ -531,17 +664,17 @@ class KnowledgeIngestionService:
                 supabase = supabase_service.client
 
                 # Embed query
-                query_embedding = await embeddings_service.embed(query)
+                query_embedding = await embeddings_service.generate_embedding(query)
 
-                # Search using pgvector
-                vector_results = supabase.rpc(
+                # Search chunk embeddings using pgvector
+                vector_results = await run_query(supabase.rpc(
                     "match_document_chunks",
                     {
                         "query_embedding": query_embedding,
                         "match_count": limit,
                         "filter_tenant": self.tenant_id
                     }
-                ).execute()
+                ))
 
                 results["vector_results"] = vector_results.data
 
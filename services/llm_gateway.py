@@ -0,0 +1,344 @@
+"""
+LLM Call Gateway
+Shared, bounded access point for Anthropic API calls
+
+Every LLM call made from async code goes through one gateway so that:
+- Calls never block the event loop (AsyncAnthropic, one client per loop)
+- In-flight calls per model are capped by a semaphore
+- Requests and input tokens per minute are paced by per-model token buckets
+- Latency and token usage are recorded per model
+
+Usage:
+    from services.llm_gateway import get_llm_gateway
+
+    gateway = get_llm_gateway()
+    response = await gateway.create_message(
+        model="claude-sonnet-4-5-20250929",
+        max_tokens=1024,
+        messages=[{"role": "user", "content": prompt}],
+    )
+
+Code that drives its own client (e.g. pydantic-ai agents) can still share
+the limits and metrics:
+
+    async with gateway.slot(model, estimated_input_tokens) as call:
+        result = await agent.run(prompt)
+        call.record_usage(input_tokens, output_tokens)
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_INPUT_TOKENS_PER_MINUTE = 40000
+
+# Rough token costs used before the API reports actual usage
+CHARS_PER_TOKEN = 4
+IMAGE_TOKEN_ESTIMATE = 1600
+PDF_PAGE_TOKEN_ESTIMATE = 2000
+BASE64_CHARS_PER_PDF_PAGE = 100_000
+
+
+@dataclass
+class ModelLimits:
+    """Concurrency and rate limits applied to one model"""
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE
+    input_tokens_per_minute: float = DEFAULT_INPUT_TOKENS_PER_MINUTE
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket using reservations
+
+    reserve() always succeeds and returns how long the caller must wait before
+    proceeding; the balance may go negative (debt), which paces later callers.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount tokens, returning seconds to wait until they are available"""
+        if self.rate <= 0:
+            return 0.0
+        # A single request larger than the bucket would otherwise never fit
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def adjust(self, delta: float):
+        """Correct a reservation once the real cost is known (+ refunds, - charges)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + delta)
+
+
+@dataclass
+class ModelMetrics:
+    """Rolling call metrics for one model"""
+    calls: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    throttled_seconds: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "latency_avg_s": round(sum(ordered) / len(ordered), 3) if ordered else None,
+            "latency_p50_s": percentile(0.50),
+            "latency_p95_s": percentile(0.95),
+        }
+
+
+class LLMCall:
+    """Handle for an in-progress call; report actual usage via record_usage()"""
+
+    def __init__(self, model: str, estimated_input_tokens: int):
+        self.model = model
+        self.estimated_input_tokens = estimated_input_tokens
+        self.input_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+
+    def record_usage(self, input_tokens: Optional[int], output_tokens: Optional[int]):
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+
+
+def estimate_input_tokens(messages: List[Dict[str, Any]], system: Any = None) -> int:
+    """
+    Estimate input tokens for a Messages API request
+
+    Text is counted at ~4 chars/token; images and PDFs use flat per-item
+    estimates. The gateway corrects its buckets with real usage afterwards.
+    """
+    chars = 0
+    extra = 0
+
+    def count(content: Any):
+        nonlocal chars, extra
+        if isinstance(content, str):
+            chars += len(content)
+            return
+        for block in content or []:
+            block_type = block.get("type")
+            if block_type == "text":
+                chars += len(block.get("text", ""))
+            elif block_type == "image":
+                extra += IMAGE_TOKEN_ESTIMATE
+            elif block_type == "document":
+                data = block.get("source", {}).get("data", "")
+                pages = max(1, len(data) // BASE64_CHARS_PER_PDF_PAGE)
+                extra += pages * PDF_PAGE_TOKEN_ESTIMATE
+
+    count(system)
+    for message in messages:
+        count(message.get("content"))
+    return chars // CHARS_PER_TOKEN + extra
+
+
+def _load_model_limits() -> Dict[str, ModelLimits]:
+    """Per-model overrides from LLM_MODEL_LIMITS (JSON: {model: {field: value}})"""
+    raw = os.getenv("LLM_MODEL_LIMITS")
+    if not raw:
+        return {}
+    try:
+        return {model: ModelLimits(**values) for model, values in json.loads(raw).items()}
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Ignoring invalid LLM_MODEL_LIMITS: {e}")
+        return {}
+
+
+class LLMGateway:
+    """
+    Bounded, rate-limited, metered gateway for Anthropic calls
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        default_limits: Optional[ModelLimits] = None,
+        model_limits: Optional[Dict[str, ModelLimits]] = None
+    ):
+        """
+        Initialize LLM gateway
+
+        Args:
+            api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
+            default_limits: Limits for models without an explicit entry
+            model_limits: Per-model limit overrides
+        """
+        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.default_limits = default_limits or ModelLimits(
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)),
+            input_tokens_per_minute=float(os.getenv("LLM_INPUT_TOKENS_PER_MINUTE", DEFAULT_INPUT_TOKENS_PER_MINUTE)),
+        )
+        self.model_limits = model_limits if model_limits is not None else _load_model_limits()
+
+        self._lock = threading.Lock()
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._metrics: Dict[str, ModelMetrics] = {}
+        # asyncio primitives and httpx connection pools are bound to one event loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    def limits_for(self, model: str) -> ModelLimits:
+        return self.model_limits.get(model, self.default_limits)
+
+    def _buckets(self, model: str) -> tuple:
+        with self._lock:
+            if model not in self._request_buckets:
+                limits = self.limits_for(model)
+                self._request_buckets[model] = TokenBucket(limits.requests_per_minute)
+                self._token_buckets[model] = TokenBucket(limits.input_tokens_per_minute)
+                self._metrics[model] = ModelMetrics()
+            return self._request_buckets[model], self._token_buckets[model], self._metrics[model]
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._semaphores.setdefault(loop, {})
+            if model not in per_loop:
+                per_loop[model] = asyncio.Semaphore(self.limits_for(model).max_concurrency)
+            return per_loop[model]
+
+    def get_client(self):
+        """AsyncAnthropic client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                if not self.api_key:
+                    raise ValueError("ANTHROPIC_API_KEY not found in environment")
+                from anthropic import AsyncAnthropic
+
+                client = AsyncAnthropic(api_key=self.api_key)
+                self._clients[loop] = client
+            return client
+
+    @asynccontextmanager
+    async def slot(self, model: str, estimated_input_tokens: int = 0) -> AsyncIterator[LLMCall]:
+        """
+        Acquire capacity for one call to model
+
+        Waits for a concurrency slot, then for request and input-token budget.
+        On exit records latency/usage and reconciles the token bucket with the
+        usage reported through LLMCall.record_usage().
+
+        Args:
+            model: Model name (limits and metrics are keyed by it)
+            estimated_input_tokens: Expected prompt size in tokens
+
+        Yields:
+            LLMCall handle
+        """
+        requests, tokens, metrics = self._buckets(model)
+        call = LLMCall(model, estimated_input_tokens)
+
+        async with self._semaphore(model):
+            wait = max(requests.reserve(1), tokens.reserve(estimated_input_tokens))
+            if wait > 0:
+                metrics.throttled_seconds += wait
+                logger.debug(f"LLM gateway throttling {model} for {wait:.2f}s")
+                await asyncio.sleep(wait)
+
+            metrics.in_flight += 1
+            started = time.monotonic()
+            try:
+                yield call
+            except BaseException:
+                metrics.errors += 1
+                raise
+            finally:
+                metrics.in_flight -= 1
+                metrics.calls += 1
+                metrics.latencies.append(time.monotonic() - started)
+                if call.input_tokens is not None:
+                    metrics.input_tokens += call.input_tokens
+                    tokens.adjust(estimated_input_tokens - call.input_tokens)
+                if call.output_tokens is not None:
+                    metrics.output_tokens += call.output_tokens
+
+    async def create_message(self, *, model: str, messages: List[Dict[str, Any]], client=None, **kwargs):
+        """
+        Call messages.create through the gateway
+
+        Args:
+            model: Model name
+            messages: Messages API message list
+            client: Optional AsyncAnthropic client (e.g. with a different API key)
+            **kwargs: Remaining messages.create arguments (max_tokens, system, ...)
+
+        Returns:
+            anthropic Message
+        """
+        client = client or self.get_client()
+        estimate = estimate_input_tokens(messages, kwargs.get("system"))
+
+        async with self.slot(model, estimate) as call:
+            response = await client.messages.create(model=model, messages=messages, **kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                call.record_usage(usage.input_tokens, usage.output_tokens)
+            return response
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-model call metrics
+
+        Returns:
+            Mapping of model -> counters, token totals and latency percentiles
+        """
+        with self._lock:
+            models = dict(self._metrics)
+        return {model: metrics.snapshot() for model, metrics in models.items()}
+
+
+# Singleton instance
+_llm_gateway = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get or create LLM gateway singleton"""
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway()
+    return _llm_gateway
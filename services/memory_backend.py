@@ -0,0 +1,785 @@
+"""
+Memory Backend
+Shared Mem0 client with a persistent, vector-backed local fallback
+
+The memory API built a new Mem0 client on every request (for self-hosted
+Mem0 that meant opening the Qdrant collection and creating LLM and embedder
+clients each time), and without Mem0 it kept memories in a process-local
+dict searched by substring, so they vanished on restart and "semantic"
+search only matched exact phrases.
+
+MemoryBackend creates the Mem0 client once per process and health-checks it
+with a cheap call, both in a worker thread (they are blocking network calls).
+Calls report success or failure back; after MEM0_MAX_FAILURES consecutive
+failures the backend switches to the local store and retries Mem0 after
+MEM0_RETRY_SECONDS. Only one coroutine runs a connection attempt: callers
+wait for the first one, and during a reconnect they keep using the local
+store instead of queueing behind it.
+
+Memories written to the local store while Mem0 is connected-but-failing or
+down are copied into Mem0 once it answers again (after a reconnect or the
+next successful call following a failure), oldest first, and then removed
+locally. A row is marked claimed while it is being copied and deleted only
+after Mem0 accepted it, so a crash mid-copy can duplicate a memory in Mem0
+but never lose it; claims older than CLAIM_TIMEOUT_SECONDS are released
+when a store opens the file. Mem0 assigns them new IDs. Until the copy finishes, Mem0 searches
+don't see them. Without Mem0 installed or configured the local store is the
+only store and nothing is copied.
+
+LocalMemoryStore is the fallback:
+- SQLite (WAL) rows with float32 embedding blobs, shared across processes;
+  SQLite work runs in a worker thread, only embedding requests run on the loop
+- Per-user, L2-normalized embedding matrices cached in memory; search is a
+  single matrix-vector product plus top-k (NumPy if installed, pure Python
+  otherwise)
+- Embeddings from OpenAI through the embedding cache when OPENAI_API_KEY is
+  set, otherwise a local hashed n-gram embedder; rows embedded by another
+  model are re-embedded when the user's index is next built
+- Search thresholds use Mem0's scale and are rescaled per embedder
+  (HASH_THRESHOLD_SCALE for the hashed embedder)
+
+Usage:
+    from services.memory_backend import get_memory_backend
+
+    backend = get_memory_backend()
+    client, mode = await backend.get_client()   # (None, "local") when Mem0 is unavailable
+    hits = await backend.local.search("user-1", "coffee preferences", limit=5)
+"""
+import os
+import re
+import json
+import time
+import uuid
+import array
+import asyncio
+import sqlite3
+import hashlib
+import operator
+import logging
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python scoring
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCAL_PATH = "/root/flourisha/00_AI_Brain/data/memories.sqlite3"
+DEFAULT_RETRY_SECONDS = 300
+DEFAULT_MAX_FAILURES = 3
+
+# Local rows copied into Mem0 per pass
+SYNC_BATCH = 100
+
+# A claim older than this belongs to a process that died mid-copy
+CLAIM_TIMEOUT_SECONDS = 600
+
+HASH_EMBEDDING_DIMS = 512
+HASH_MODEL = f"hash-ngram-{HASH_EMBEDDING_DIMS}"
+
+# Search thresholds are given on Mem0's 0-1 scale (API default 0.7). Hashed
+# n-gram cosines are much lower: relevant memories score about 0.1-0.4 and
+# unrelated ones under 0.1, so the threshold is multiplied by this factor
+# (0.7 -> 0.091) for that embedder.
+HASH_THRESHOLD_SCALE = 0.13
+
+MEM0_SELF_HOSTED_CONFIG = {
+    "vector_store": {
+        "provider": "qdrant",
+        "config": {
+            "collection_name": "flourisha_memories",
+            "embedding_model_dims": 1536,
+            "on_disk": True,
+        }
+    },
+    "llm": {
+        "provider": "anthropic",
+        "config": {
+            "model": "claude-sonnet-4-20250514",
+            "temperature": 0.1,
+        }
+    },
+    "embedder": {
+        "provider": "openai",
+        "config": {
+            "model": "text-embedding-3-small",
+        }
+    }
+}
+
+HEALTHCHECK_USER_ID = "__healthcheck__"
+
+# Ignored by the hashing embedder; they would dominate short texts
+STOPWORDS = frozenset("""
+a an and are as at be but by do does for from had has have how i if in is it its
+me my no not of on or so than that the their them then there these they this to
+was we were what when where which who why will with you your
+""".split())
+
+
+def _pack(vector: List[float]) -> bytes:
+    return array.array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    values = array.array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = sum(v * v for v in vector) ** 0.5
+    return [v / norm for v in vector] if norm else list(vector)
+
+
+def _timestamp() -> str:
+    return datetime.now(ZoneInfo("America/Los_Angeles")).isoformat()
+
+
+class HashingEmbedder:
+    """
+    Local embedder: signed feature hashing of words, word bigrams and
+    character trigrams (stopwords removed)
+
+    Not as strong as a neural model, but rankings are meaningful (shared
+    terms, phrases and word stems, any word order) and it needs no service
+    at all.
+    """
+
+    model = HASH_MODEL
+    threshold_scale = HASH_THRESHOLD_SCALE
+
+    def __init__(self, dims: int = HASH_EMBEDDING_DIMS):
+        self.dims = dims
+
+    def _embed(self, text: str) -> List[float]:
+        tokens = [token for token in re.findall(r"\w+", text.lower()) if token not in STOPWORDS]
+        features = [(token, 1.0) for token in tokens]
+        features += [(f"{a} {b}", 1.0) for a, b in zip(tokens, tokens[1:])]
+        for token in tokens:
+            padded = f"^{token}$"
+            features += [(padded[i:i + 3], 0.25) for i in range(len(padded) - 2)]
+
+        vector = [0.0] * self.dims
+        for feature, weight in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dims
+            vector[bucket] += weight if digest[4] & 1 else -weight
+        return vector
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+
+class OpenAIEmbedder:
+    """Embeddings from EmbeddingsService (served from the embedding cache when possible)"""
+
+    threshold_scale = 1.0
+
+    def __init__(self, service):
+        self.service = service
+        self.model = service.model
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return await self.service.generate_embeddings_batch(texts)
+
+
+def _default_embedder():
+    """OpenAI if configured (MEMORY_LOCAL_EMBEDDER=auto|openai|hash), else hashing"""
+    choice = os.getenv("MEMORY_LOCAL_EMBEDDER", "auto").lower()
+    if choice != "hash":
+        try:
+            try:
+                from .embeddings_service import get_embeddings_service
+            except ImportError:
+                from embeddings_service import get_embeddings_service
+            return OpenAIEmbedder(get_embeddings_service())
+        except Exception as e:
+            if choice == "openai":
+                raise
+            logger.info(f"Local memory store using hashed embeddings ({e})")
+    return HashingEmbedder()
+
+
+class LocalMemoryStore:
+    """
+    Persistent memory store with cosine top-k search
+    """
+
+    def __init__(self, path: Optional[str] = None, embedder=None, claim_timeout: float = CLAIM_TIMEOUT_SECONDS):
+        """
+        Initialize local store
+
+        Args:
+            path: SQLite file path (None keeps the store in memory)
+            embedder: Object with `model`, `async embed(texts)` and optionally
+                `threshold_scale` (default: see _default_embedder)
+            claim_timeout: Age in seconds after which a claim left by a copy
+                into Mem0 is released when the store opens
+        """
+        self.embedder = embedder or _default_embedder()
+        self._lock = threading.Lock()
+        # user_id -> (memories, matrix with L2-normalized rows), rebuilt after writes
+        self._index: Dict[str, Tuple[List[Dict[str, Any]], Any]] = {}
+        self._generations: Dict[str, int] = {}
+        self._data_version = None
+        self._epoch = 0  # Bumped when another process changed the file
+        self._stats = {"searches": 0, "index_builds": 0, "reembedded": 0, "search_ms": 0.0}
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS memories (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                memory TEXT NOT NULL,
+                metadata TEXT NOT NULL DEFAULT '{}',
+                embedding BLOB,
+                embedding_model TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                claimed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_memories_user ON memories (user_id, created_at);
+        """)
+        # Release claims of copies that never finished
+        self._conn.execute(
+            "UPDATE memories SET claimed_at = NULL WHERE claimed_at < ?",
+            (time.time() - claim_timeout,)
+        )
+        self._conn.commit()
+
+    # Rows
+
+    def _invalidate(self, user_id: str):
+        """Drop a user's cached index (call with the lock held)"""
+        self._index.pop(user_id, None)
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "user_id": row["user_id"],
+            "memory": row["memory"],
+            "metadata": json.loads(row["metadata"] or "{}"),
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    async def _embed(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embed texts; None if the embedder is unavailable (rows are embedded later)"""
+        try:
+            return await self.embedder.embed(texts)
+        except Exception as e:
+            logger.warning(f"Memory embedding failed: {e}")
+            return None
+
+    async def add_many(self, user_id: str, items: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        Add memories with one embedding request
+
+        Args:
+            user_id: Owner
+            items: (content, metadata) pairs
+
+        Returns:
+            Stored memories
+        """
+        vectors = await self._embed([content for content, _ in items])
+        now = _timestamp()
+        stored = [
+            {
+                "id": f"mem_{uuid.uuid4().hex[:12]}",
+                "user_id": user_id,
+                "memory": content,
+                "metadata": metadata or {},
+                "created_at": now,
+                "updated_at": now,
+            }
+            for content, metadata in items
+        ]
+        await asyncio.to_thread(self._insert, user_id, stored, vectors)
+        return stored
+
+    def _insert(self, user_id: str, memories: List[Dict[str, Any]], vectors: Optional[List[List[float]]]):
+        with self._lock:
+            for i, memory in enumerate(memories):
+                self._conn.execute(
+                    "INSERT INTO memories (id, user_id, memory, metadata, embedding, embedding_model, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (memory["id"], user_id, memory["memory"], json.dumps(memory["metadata"]),
+                     _pack(vectors[i]) if vectors else None,
+                     self.embedder.model if vectors else None,
+                     memory["created_at"], memory["updated_at"])
+                )
+            self._conn.commit()
+            self._invalidate(user_id)
+
+    async def add(self, user_id: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Add one memory"""
+        return (await self.add_many(user_id, [(content, metadata)]))[0]
+
+    def get(self, memory_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a memory owned by user_id"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM memories WHERE id = ? AND user_id = ?", (memory_id, user_id)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def get_all(self, user_id: str) -> List[Dict[str, Any]]:
+        """All memories of a user, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM memories WHERE user_id = ? ORDER BY created_at, id", (user_id,)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    async def update(
+        self,
+        memory_id: str,
+        user_id: str,
+        content: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Update content (re-embedded) and/or replace metadata; None if not found"""
+        if await asyncio.to_thread(self.get, memory_id, user_id) is None:
+            return None
+
+        vectors = await self._embed([content]) if content else None
+        return await asyncio.to_thread(self._update, memory_id, user_id, content, metadata, vectors)
+
+    def _update(
+        self,
+        memory_id: str,
+        user_id: str,
+        content: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+        vectors: Optional[List[List[float]]]
+    ) -> Optional[Dict[str, Any]]:
+        now = _timestamp()
+        with self._lock:
+            if content:
+                self._conn.execute(
+                    "UPDATE memories SET memory = ?, embedding = ?, embedding_model = ?, updated_at = ? "
+                    "WHERE id = ? AND user_id = ?",
+                    (content, _pack(vectors[0]) if vectors else None,
+                     self.embedder.model if vectors else None, now, memory_id, user_id)
+                )
+            if metadata is not None:
+                self._conn.execute(
+                    "UPDATE memories SET metadata = ?, updated_at = ? WHERE id = ? AND user_id = ?",
+                    (json.dumps(metadata), now, memory_id, user_id)
+                )
+            self._conn.commit()
+            self._invalidate(user_id)
+        return self.get(memory_id, user_id)
+
+    def delete(self, memory_id: str, user_id: str) -> bool:
+        """Delete a memory owned by user_id"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM memories WHERE id = ? AND user_id = ?", (memory_id, user_id)
+            )
+            self._conn.commit()
+            self._invalidate(user_id)
+        return cursor.rowcount > 0
+
+    def delete_all(self, user_id: str) -> int:
+        """Delete every memory of a user; returns the count"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM memories WHERE user_id = ?", (user_id,))
+            self._conn.commit()
+            self._invalidate(user_id)
+        return cursor.rowcount
+
+    # Reconciliation
+
+    def pending_ids(self, limit: int = SYNC_BATCH) -> List[str]:
+        """IDs of unclaimed memories not yet copied into Mem0, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM memories WHERE claimed_at IS NULL ORDER BY created_at, id LIMIT ?", (limit,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def claim(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a memory as being copied into Mem0; None if gone or claimed by another process"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE memories SET claimed_at = ? WHERE id = ? AND claimed_at IS NULL",
+                (time.time(), memory_id)
+            )
+            self._conn.commit()
+            if not cursor.rowcount:
+                return None
+            row = self._conn.execute("SELECT * FROM memories WHERE id = ?", (memory_id,)).fetchone()
+        return dict(row) if row else None
+
+    def finish(self, record: Dict[str, Any]):
+        """Remove a claimed memory after Mem0 accepted it"""
+        with self._lock:
+            self._conn.execute("DELETE FROM memories WHERE id = ?", (record["id"],))
+            self._conn.commit()
+            self._invalidate(record["user_id"])
+
+    def restore(self, record: Dict[str, Any]):
+        """Release the claim on a memory whose copy failed"""
+        with self._lock:
+            self._conn.execute("UPDATE memories SET claimed_at = NULL WHERE id = ?", (record["id"],))
+            self._conn.commit()
+
+    # Search
+
+    def _load_rows(self, user_id: str) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT * FROM memories WHERE user_id = ?", (user_id,)
+            ).fetchall()
+
+    def _store_vectors(self, fresh_vectors: Dict[str, List[float]]):
+        with self._lock:
+            for memory_id, vector in fresh_vectors.items():
+                self._conn.execute(
+                    "UPDATE memories SET embedding = ?, embedding_model = ? WHERE id = ?",
+                    (_pack(vector), self.embedder.model, memory_id)
+                )
+            self._conn.commit()
+
+    async def _build_index(self, user_id: str) -> Tuple[List[Dict[str, Any]], Any]:
+        """Load (and re-embed stale) vectors for a user into a normalized matrix"""
+        rows = await asyncio.to_thread(self._load_rows, user_id)
+
+        stale = [row for row in rows if row["embedding"] is None or row["embedding_model"] != self.embedder.model]
+        fresh_vectors: Dict[str, List[float]] = {}
+        if stale:
+            vectors = await self._embed([row["memory"] for row in stale])
+            if vectors:
+                fresh_vectors = {row["id"]: vector for row, vector in zip(stale, vectors)}
+                await asyncio.to_thread(self._store_vectors, fresh_vectors)
+                self._stats["reembedded"] += len(stale)
+
+        return await asyncio.to_thread(self._assemble, rows, fresh_vectors)
+
+    def _assemble(self, rows: List[sqlite3.Row], fresh_vectors: Dict[str, List[float]]) -> Tuple[List[Dict[str, Any]], Any]:
+        """Decode embeddings into a matrix with L2-normalized rows"""
+        memories: List[Dict[str, Any]] = []
+        vectors_out: List[List[float]] = []
+        for row in rows:
+            if row["id"] in fresh_vectors:
+                vector = fresh_vectors[row["id"]]
+            elif row["embedding"] is not None and row["embedding_model"] == self.embedder.model:
+                vector = _unpack(row["embedding"])
+            else:
+                continue  # Not embeddable right now
+            memories.append(self._row_to_dict(row))
+            vectors_out.append(vector)
+
+        if np is not None:
+            matrix = np.asarray(vectors_out, dtype=np.float32).reshape(len(vectors_out), -1)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        else:
+            matrix = [_normalize(vector) for vector in vectors_out]
+
+        self._stats["index_builds"] += 1
+        return memories, matrix
+
+    def _cached_index(self, user_id: str) -> Tuple[Optional[Tuple[List[Dict[str, Any]], Any]], Tuple[int, int]]:
+        """A user's cached index (None if stale or missing) and its generation"""
+        with self._lock:
+            # Changes only when another process committed to the file
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                self._data_version = data_version
+                self._epoch += 1
+                self._index.clear()
+            return self._index.get(user_id), (self._epoch, self._generations.get(user_id, 0))
+
+    def _scores(self, matrix: Any, query_vector: List[float]) -> List[float]:
+        if np is not None:
+            query = np.asarray(_normalize(query_vector), dtype=np.float32)
+            return (matrix @ query).tolist() if len(matrix) else []
+        query = _normalize(query_vector)
+        return [sum(map(operator.mul, row, query)) for row in matrix]
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 10,
+        threshold: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Cosine top-k over the user's memories
+
+        Args:
+            user_id: Owner
+            query: Search text
+            limit: Maximum results
+            threshold: Minimum similarity on Mem0's 0-1 scale; multiplied by
+                the embedder's threshold_scale before comparing cosines
+            filters: Metadata values that must match (memory_type, session_id, agent_id)
+
+        Returns:
+            Memories with a "score", best first
+        """
+        started = time.perf_counter()
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        min_score = threshold * getattr(self.embedder, "threshold_scale", 1.0)
+
+        index, generation = await asyncio.to_thread(self._cached_index, user_id)
+        if index is None:
+            index = await self._build_index(user_id)
+            with self._lock:
+                # Don't cache an index a concurrent write already made stale
+                if (self._epoch, self._generations.get(user_id, 0)) == generation:
+                    self._index[user_id] = index
+        memories, matrix = index
+
+        query_vectors = await self._embed([query]) if memories else None
+        if not query_vectors:
+            return []
+        scores = self._scores(matrix, query_vectors[0])
+
+        results = []
+        for i in sorted(range(len(scores)), key=scores.__getitem__, reverse=True):
+            if scores[i] < min_score or len(results) >= limit:
+                break
+            memory = memories[i]
+            if any(memory["metadata"].get(key) != value for key, value in filters.items()):
+                continue
+            results.append({**memory, "score": round(float(scores[i]), 4)})
+
+        self._stats["searches"] += 1
+        self._stats["search_ms"] += (time.perf_counter() - started) * 1000
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store size and search metrics"""
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+        searches = self._stats["searches"]
+        return {
+            "memories": total,
+            "embedding_model": self.embedder.model,
+            "threshold_scale": getattr(self.embedder, "threshold_scale", 1.0),
+            "vector_math": "numpy" if np is not None else "python",
+            "indexed_users": len(self._index),
+            "searches": searches,
+            "index_builds": self._stats["index_builds"],
+            "reembedded": self._stats["reembedded"],
+            "avg_search_ms": round(self._stats["search_ms"] / searches, 2) if searches else 0.0,
+        }
+
+
+class MemoryBackend:
+    """
+    Process-wide Mem0 client (created once, health-checked) with local fallback
+    """
+
+    def __init__(
+        self,
+        local: Optional[LocalMemoryStore] = None,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+        max_failures: int = DEFAULT_MAX_FAILURES
+    ):
+        """
+        Initialize backend (the Mem0 client is created on first use)
+
+        Args:
+            local: Fallback store
+            retry_seconds: Wait before retrying Mem0 after it failed
+            max_failures: Consecutive call failures before falling back
+        """
+        self.local = local or LocalMemoryStore(os.getenv("MEMORY_LOCAL_PATH", DEFAULT_LOCAL_PATH))
+        self.retry_seconds = retry_seconds
+        self.max_failures = max_failures
+        self._client = None
+        self._mode = "local"
+        self._lock = threading.Lock()
+        self._created = False
+        self._connecting: Optional[asyncio.Future] = None
+        self._wait_for_connect = False
+        self._unavailable_until = 0.0
+        self._failures = 0
+        self._sync_task: Optional[asyncio.Future] = None
+        self._sync_pending = True
+        self.synced = 0
+        self.last_error: Optional[str] = None
+
+    def _create_client(self) -> Tuple[Any, str]:
+        """Build and health-check a Mem0 client (cloud if MEM0_API_KEY is set, else self-hosted)"""
+        mem0_api_key = os.getenv("MEM0_API_KEY")
+        if mem0_api_key:
+            from mem0 import MemoryClient
+            client, mode = MemoryClient(api_key=mem0_api_key), "cloud"
+        else:
+            from mem0 import Memory
+            client, mode = Memory.from_config(MEM0_SELF_HOSTED_CONFIG), "self-hosted"
+
+        # Cheap round-trip through the vector store / API
+        client.get_all(user_id=HEALTHCHECK_USER_ID)
+        return client, mode
+
+    async def _connect(self):
+        """Run one connection attempt off the event loop and record the outcome"""
+        try:
+            client, mode = await asyncio.to_thread(self._create_client)
+        except ImportError:
+            self.last_error = "mem0 not installed"
+            self._unavailable_until = float("inf")
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            self._unavailable_until = time.monotonic() + self.retry_seconds
+            logger.warning(f"Mem0 unavailable, using local memory store: {self.last_error}")
+        else:
+            self._client, self._mode = client, mode
+            self._failures = 0
+            self.last_error = None
+            logger.info(f"Mem0 client ready ({self._mode})")
+            self._schedule_sync()
+        finally:
+            self._connecting = None
+
+    async def get_client(self) -> Tuple[Any, str]:
+        """
+        Get the shared Mem0 client
+
+        Returns:
+            (client, "cloud" | "self-hosted"), or (None, "local") while Mem0 is
+            not installed, not configured, failing or reconnecting
+        """
+        if self._client is not None:
+            return self._client, self._mode
+
+        connecting = self._connecting
+        if connecting is None:
+            if self._created and time.monotonic() < self._unavailable_until:
+                return None, "local"
+            # No await between the check and registering the attempt
+            self._wait_for_connect = not self._created
+            self._created = True
+            connecting = self._connecting = asyncio.ensure_future(self._connect())
+
+        # Everyone waits for the first attempt; reconnects don't hold up requests
+        if self._wait_for_connect:
+            await asyncio.shield(connecting)
+
+        if self._client is not None:
+            return self._client, self._mode
+        return None, "local"
+
+    def _schedule_sync(self):
+        """Start copying local memories into Mem0 unless a copy is running"""
+        if self._client is None or self._sync_task is not None:
+            return
+        self._sync_pending = False
+        self._sync_task = asyncio.ensure_future(self.sync_local())
+
+    async def sync_local(self) -> int:
+        """
+        Copy memories from the local store into Mem0, oldest first
+
+        Each row is claimed before it is added to Mem0, removed once the add
+        succeeded and released if it fails, so processes sharing the SQLite
+        file don't copy a row twice and a crash mid-copy never loses it.
+        Stops at the first failure (reported via record_failure).
+
+        Returns:
+            Number of memories copied
+        """
+        copied = 0
+        try:
+            while self._client is not None:
+                ids = await asyncio.to_thread(self.local.pending_ids)
+                if not ids:
+                    break
+                for memory_id in ids:
+                    client = self._client
+                    if client is None:
+                        break
+                    record = await asyncio.to_thread(self.local.claim, memory_id)
+                    if record is None:
+                        continue
+                    try:
+                        await asyncio.to_thread(
+                            client.add,
+                            record["memory"],
+                            user_id=record["user_id"],
+                            metadata=json.loads(record["metadata"] or "{}"),
+                        )
+                    except Exception as e:
+                        await asyncio.to_thread(self.local.restore, record)
+                        self.record_failure(e)
+                        return copied
+                    await asyncio.to_thread(self.local.finish, record)
+                    copied += 1
+                    self.synced += 1
+        finally:
+            self._sync_task = None
+            if copied:
+                logger.info(f"Copied {copied} local memories into Mem0")
+        return copied
+
+    def record_success(self):
+        """Report a successful Mem0 call (copies memories stored locally after a failure)"""
+        self._failures = 0
+        if self._sync_pending:
+            self._schedule_sync()
+
+    def record_failure(self, error: Exception):
+        """Report a failed Mem0 call; falls back to local after max_failures in a row"""
+        if self._client is None:
+            return  # Local store error, not a Mem0 failure
+        # The caller may have written to the local store instead
+        self._sync_pending = True
+        self._failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        if self._failures >= self.max_failures and self._client is not None:
+            logger.warning(f"Mem0 failed {self._failures} times, using local memory store "
+                           f"for {self.retry_seconds}s: {self.last_error}")
+            with self._lock:
+                self._client = None
+                self._mode = "local"
+                self._unavailable_until = time.monotonic() + self.retry_seconds
+                self._failures = 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Current mode, last error and local store stats"""
+        return {
+            "mode": self._mode if self._client is not None else "local",
+            "mem0_connected": self._client is not None,
+            "consecutive_failures": self._failures,
+            "synced_to_mem0": self.synced,
+            "syncing": self._sync_task is not None,
+            "last_error": self.last_error,
+            "local": self.local.get_stats(),
+        }
+
+
+_memory_backend = None
+
+
+def get_memory_backend() -> MemoryBackend:
+    """Get or create the memory backend singleton"""
+    global _memory_backend
+    if _memory_backend is None:
+        _memory_backend = MemoryBackend(
+            retry_seconds=float(os.getenv("MEM0_RETRY_SECONDS", DEFAULT_RETRY_SECONDS)),
+            max_failures=int(os.getenv("MEM0_MAX_FAILURES", DEFAULT_MAX_FAILURES)),
+        )
+    return _memory_backend
@@ -2,18 +2,22 @@
 OKR Tracker Service
 Manages quarterly Objectives and Key Results with weekly measurement and progress tracking
 """
-import os
 import yaml
 import json
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from supabase import create_client, Client
+from supabase import Client
 from dotenv import load_dotenv
 import asyncio
 import logging
 
+try:
+    from services.db_pool import get_supabase_client, run_query
+except ImportError:
+    from db_pool import get_supabase_client, run_query
+
 # Load environment variables
 load_dotenv('/root/.claude/.env')
 
@@ -126,12 +130,9 @@ class OKRTrackerService:
     def __init__(self):
         """Initialize OKR tracker"""
         if not self._initialized:
-            url = os.getenv('SUPABASE_URL')
-            key = os.getenv('SUPABASE_SERVICE_KEY', os.getenv('SUPABASE_KEY'))
-
-            if url and key:
-                self._client = create_client(url, key)
-            else:
+            try:
+                self._client = get_supabase_client()
+            except ValueError:
                 logger.warning("Supabase credentials not found, running in offline mode")
 
             self._initialized = True
@@ -168,9 +169,9 @@ class OKRTrackerService:
         # Try Supabase first
         if self._client:
             try:
-                result = self._client.table('okr_tracking').select('*').eq(
+                result = await run_query(self._client.table('okr_tracking').select('*').eq(
                     'tenant_id', tenant_id
-                ).eq('quarter', quarter).execute()
+                ).eq('quarter', quarter))
 
                 if result.data:
                     # Group by objective_id
@@ -568,13 +569,13 @@ class OKRTrackerService:
 
         try:
             # Update the okr_tracking record
-            result = self._client.table('okr_tracking').update({
+            result = await run_query(self._client.table('okr_tracking').update({
                 'key_result_current': new_value
             }).eq('tenant_id', tenant_id).eq(
                 'objective_id', objective_id
             ).eq('key_result_id', kr_id).eq(
                 'quarter', self._quarter
-            ).execute()
+            ))
 
             if result.data:
                 logger.info(f"Persisted KR update to Supabase: {objective_id}/{kr_id}")
@@ -583,13 +584,13 @@ class OKRTrackerService:
                 try:
                     db_id = result.data[0].get('id') if result.data else None
                     if db_id:
-                        self._client.table('okr_progress_history').insert({
+                        await run_query(self._client.table('okr_progress_history').insert({
                             'okr_tracking_id': db_id,
                             'previous_value': old_value,
                             'new_value': new_value,
                             'change_type': 'progress_update',
                             'notes': notes
-                        }).execute()
+                        }))
                 except Exception:
                     # okr_progress_history table may not exist yet
                     pass
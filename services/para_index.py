@@ -0,0 +1,484 @@
+"""
+PARA Filesystem Index
+In-memory index of the PARA folders behind the PARA browser endpoints
+
+The PARA router used to walk the vault on every request: the tree endpoint
+ran a full rglob at every node and file search ran a full rglob per query.
+This index is built once and then kept current incrementally:
+
+- One node per folder with its direct files, subfolders and a recursive
+  file count (maintained by propagating deltas up to the category root)
+- Changes are found by polling directory mtimes (one stat per folder);
+  only folders whose mtime moved are re-listed, new subtrees are scanned,
+  removed subtrees are dropped
+- File names are indexed by trigram for substring search and kept in a
+  sorted list for prefix search
+- Sizes and modification times are not cached; callers stat the handful
+  of files they return
+
+Dot-files and dot-folders are skipped, like the PARA browser always did
+for listings. Symlinked folders are not followed.
+
+Usage:
+    from services.para_index import get_para_index
+
+    index = get_para_index()
+    index.ensure_fresh()
+    tree = index.tree("01f_Flourisha_Projects", depth=2)
+    paths = index.search("okr", limit=20)
+"""
+import os
+import time
+import bisect
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PARA_ROOT = "/root/flourisha"
+
+# PARA category -> folder under PARA_ROOT
+PARA_FOLDERS = {
+    "projects": "01f_Flourisha_Projects",
+    "areas": "02f_Flourisha_Areas",
+    "resources": "03f_Flourisha_Resources",
+    "archives": "04f_Flourisha_Archives",
+}
+
+DEFAULT_REFRESH_SECONDS = 5.0
+
+# A folder modified this recently may change again within the same mtime
+# tick; don't trust its mtime yet so the next poll re-lists it
+RACY_MTIME_NS = 2_000_000_000
+
+NGRAM = 3
+
+
+def name_grams(name: str) -> Set[str]:
+    """Distinct trigrams of a lowercased name"""
+    return {name[i:i + NGRAM] for i in range(len(name) - NGRAM + 1)}
+
+
+@dataclass(eq=False)
+class FolderNode:
+    """One indexed folder"""
+    name: str
+    rel: str  # Path relative to the PARA root
+    parent: Optional["FolderNode"] = field(default=None, repr=False)
+    mtime_ns: int = -1
+    files: Set[str] = field(default_factory=set)
+    children: Dict[str, "FolderNode"] = field(default_factory=dict, repr=False)
+    total_files: int = 0  # Files in this folder and all subfolders
+    detached: bool = False
+
+
+class PARAIndex:
+    """
+    Incrementally maintained index of the PARA folder tree and file names
+    """
+
+    def __init__(
+        self,
+        root: str = PARA_ROOT,
+        folders: Optional[Dict[str, str]] = None,
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS
+    ):
+        """
+        Initialize PARA index (nothing is scanned until build/ensure_fresh)
+
+        Args:
+            root: Directory containing the PARA category folders
+            folders: Category key -> folder name (default: PARA_FOLDERS)
+            refresh_seconds: Maximum age before reads trigger a refresh
+        """
+        self.root = str(root)
+        self.folders = dict(folders or PARA_FOLDERS)
+        self.refresh_seconds = refresh_seconds
+
+        self._lock = threading.RLock()
+        self._roots: Dict[str, Optional[FolderNode]] = {name: None for name in self.folders.values()}
+        self._built = False
+        self._refreshed_at = 0.0
+
+        # File name index: id -> (lowercased name, relative path)
+        self._next_id = 0
+        self._file_ids: Dict[str, int] = {}
+        self._entries: Dict[int, Tuple[str, str]] = {}
+        self._grams: Dict[str, Set[int]] = {}
+        self._sorted_names: List[Tuple[str, int]] = []
+
+        self._poller: Optional[threading.Thread] = None
+        self._stop_poller = threading.Event()
+        self._stats = {
+            "build_seconds": None,
+            "refreshes": 0,
+            "folders_rescanned": 0,
+            "last_refresh_seconds": None,
+        }
+
+    # --- File name index -----------------------------------------------------
+
+    def _add_file(self, rel: str, name: str):
+        file_id = self._next_id
+        self._next_id += 1
+        lower = name.lower()
+        self._file_ids[rel] = file_id
+        self._entries[file_id] = (lower, rel)
+        for gram in name_grams(lower):
+            self._grams.setdefault(gram, set()).add(file_id)
+        bisect.insort(self._sorted_names, (lower, file_id))
+
+    def _remove_file(self, rel: str):
+        file_id = self._file_ids.pop(rel, None)
+        if file_id is None:
+            return
+        lower, _ = self._entries.pop(file_id)
+        for gram in name_grams(lower):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(file_id)
+                if not postings:
+                    del self._grams[gram]
+        i = bisect.bisect_left(self._sorted_names, (lower, file_id))
+        if i < len(self._sorted_names) and self._sorted_names[i] == (lower, file_id):
+            del self._sorted_names[i]
+
+    # --- Scanning ------------------------------------------------------------
+
+    def _abs(self, rel: str) -> str:
+        return os.path.join(self.root, rel)
+
+    @staticmethod
+    def _propagate(node: FolderNode, delta: int):
+        while node is not None and delta:
+            node.total_files += delta
+            node = node.parent
+
+    def _drop(self, node: FolderNode):
+        """Remove a subtree from the name index"""
+        for name in node.files:
+            self._remove_file(f"{node.rel}/{name}")
+        for child in node.children.values():
+            self._drop(child)
+        node.detached = True
+
+    def _scan(self, node: FolderNode) -> int:
+        """
+        Re-list one folder, reconciling its files and subfolders
+
+        New subfolders are scanned recursively; count changes are propagated
+        to every ancestor.
+
+        Returns:
+            Number of folders listed
+        """
+        path = self._abs(node.rel)
+        files: Set[str] = set()
+        dirs: Set[str] = set()
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.add(entry.name)
+                        elif entry.is_file():
+                            files.add(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            # Gone or unreadable: index as empty (a vanished folder is
+            # dropped when its parent is re-listed)
+            mtime_ns = -1
+
+        node.mtime_ns = -1 if time.time_ns() - mtime_ns < RACY_MTIME_NS else mtime_ns
+
+        delta = 0
+        for name in node.files - files:
+            self._remove_file(f"{node.rel}/{name}")
+            delta -= 1
+        for name in files - node.files:
+            self._add_file(f"{node.rel}/{name}", name)
+            delta += 1
+        node.files = files
+
+        for name in set(node.children) - dirs:
+            child = node.children.pop(name)
+            delta -= child.total_files
+            self._drop(child)
+        self._propagate(node, delta)
+
+        listed = 1
+        for name in dirs - set(node.children):
+            child = FolderNode(name=name, rel=f"{node.rel}/{name}", parent=node)
+            node.children[name] = child
+            listed += self._scan(child)
+        return listed
+
+    def _walk(self) -> Iterable[FolderNode]:
+        stack = [node for node in self._roots.values() if node is not None]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children.values())
+
+    def build(self):
+        """Scan all PARA folders from scratch"""
+        started = time.monotonic()
+        with self._lock:
+            for root in self._roots.values():
+                if root is not None:
+                    self._drop(root)
+            self._roots = {name: None for name in self.folders.values()}
+            self._file_ids.clear()
+            self._entries.clear()
+            self._grams.clear()
+            self._sorted_names.clear()
+
+            for name in self._roots:
+                if os.path.isdir(self._abs(name)):
+                    root = FolderNode(name=name, rel=name)
+                    self._roots[name] = root
+                    self._scan(root)
+
+            self._built = True
+            self._refreshed_at = time.monotonic()
+            self._stats["build_seconds"] = round(time.monotonic() - started, 3)
+        logger.info(
+            f"PARA index built: {len(self._entries)} files in "
+            f"{self._stats['build_seconds']}s"
+        )
+
+    def refresh(self) -> int:
+        """
+        Pick up filesystem changes since the last build/refresh
+
+        Stats every indexed folder and re-lists only those whose mtime changed.
+
+        Returns:
+            Number of folders re-listed
+        """
+        if not self._built:
+            self.build()
+            return 0
+
+        started = time.monotonic()
+        rescanned = 0
+        with self._lock:
+            for name, root in self._roots.items():
+                exists = os.path.isdir(self._abs(name))
+                if root is None and exists:
+                    root = FolderNode(name=name, rel=name)
+                    self._roots[name] = root
+                    rescanned += self._scan(root)
+                elif root is not None and not exists:
+                    self._drop(root)
+                    self._roots[name] = None
+
+            for node in list(self._walk()):
+                if node.detached:
+                    continue
+                try:
+                    mtime_ns = os.stat(self._abs(node.rel)).st_mtime_ns
+                except OSError:
+                    mtime_ns = -1
+                if mtime_ns != node.mtime_ns:
+                    rescanned += self._scan(node)
+
+            self._refreshed_at = time.monotonic()
+            self._stats["refreshes"] += 1
+            self._stats["folders_rescanned"] += rescanned
+            self._stats["last_refresh_seconds"] = round(time.monotonic() - started, 4)
+        return rescanned
+
+    def needs_refresh(self) -> bool:
+        """Whether reads should build or refresh first"""
+        return not self._built or time.monotonic() - self._refreshed_at >= self.refresh_seconds
+
+    def ensure_fresh(self):
+        """Build on first use, then refresh when older than refresh_seconds"""
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build()
+        elif self.needs_refresh():
+            self.refresh()
+
+    # --- Background polling --------------------------------------------------
+
+    def _poll_loop(self, interval: float):
+        while not self._stop_poller.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"PARA index refresh failed: {e}")
+
+    def start_poller(self, interval_seconds: Optional[float] = None):
+        """Build, then refresh every interval_seconds on a daemon thread"""
+        if self._poller and self._poller.is_alive():
+            return
+        self._stop_poller.clear()
+        self.ensure_fresh()
+        self._poller = threading.Thread(
+            target=self._poll_loop,
+            args=(interval_seconds or self.refresh_seconds,),
+            name="para-index-poller",
+            daemon=True,
+        )
+        self._poller.start()
+
+    def stop_poller(self):
+        """Stop the background refresh"""
+        self._stop_poller.set()
+
+    # --- Reads ---------------------------------------------------------------
+
+    def _node(self, rel: str) -> Optional[FolderNode]:
+        parts = [p for p in rel.strip("/").split("/") if p]
+        if not parts:
+            return None
+        node = self._roots.get(parts[0])
+        for part in parts[1:]:
+            if node is None:
+                return None
+            node = node.children.get(part)
+        return node
+
+    def is_indexed(self, rel: str) -> bool:
+        """Whether a folder (path relative to the PARA root) is in the index"""
+        with self._lock:
+            return self._node(rel) is not None
+
+    @staticmethod
+    def _describe(node: FolderNode, depth: int) -> Dict[str, Any]:
+        return {
+            "name": node.name,
+            "path": node.rel,
+            "file_count": len(node.files),
+            "subfolder_count": len(node.children),
+            "total_items": node.total_files,
+            "children": [
+                PARAIndex._describe(node.children[name], depth - 1)
+                for name in sorted(node.children)
+            ] if depth > 0 else [],
+        }
+
+    def tree(self, rel: str, depth: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Get a folder summary with subfolders down to depth levels
+
+        Returns:
+            Dict with name, path, file_count, subfolder_count, total_items
+            and children (same shape), or None if the folder is not indexed
+        """
+        with self._lock:
+            node = self._node(rel)
+            return self._describe(node, depth) if node is not None else None
+
+    def listing(self, rel: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the direct contents of a folder, sorted by name
+
+        Returns:
+            Folder summaries (depth 0) and {"name", "path", "is_dir": False}
+            entries for files, or None if the folder is not indexed
+        """
+        with self._lock:
+            node = self._node(rel)
+            if node is None:
+                return None
+            items = []
+            for name in sorted(set(node.files) | set(node.children)):
+                child = node.children.get(name)
+                if child is not None:
+                    items.append({**self._describe(child, 0), "is_dir": True})
+                else:
+                    items.append({"name": name, "path": f"{node.rel}/{name}", "is_dir": False})
+            return items
+
+    def search(
+        self,
+        query: str,
+        folders: Optional[List[str]] = None,
+        limit: int = 50,
+        prefix: bool = False
+    ) -> List[str]:
+        """
+        Find files whose name contains (or starts with) the query, ignoring case
+
+        Args:
+            query: Text to match against file names
+            folders: Only return files under these folders (relative paths)
+            limit: Maximum results
+            prefix: Match name prefixes instead of substrings
+
+        Returns:
+            Matching paths relative to the PARA root, sorted
+        """
+        query = query.lower()
+        scopes = tuple(f"{f.strip('/')}/" for f in folders) if folders else None
+
+        with self._lock:
+            if prefix:
+                start = bisect.bisect_left(self._sorted_names, (query, -1))
+                candidates = []
+                for lower, file_id in self._sorted_names[start:]:
+                    if not lower.startswith(query):
+                        break
+                    candidates.append(file_id)
+            elif len(query) >= NGRAM:
+                postings = sorted(
+                    (self._grams.get(g, set()) for g in name_grams(query)),
+                    key=len,
+                )
+                matched = set(postings[0]).intersection(*postings[1:])
+                candidates = [i for i in matched if query in self._entries[i][0]]
+            else:
+                candidates = [i for i, (lower, _) in self._entries.items() if query in lower]
+
+            paths = [self._entries[i][1] for i in candidates]
+
+        if scopes:
+            paths = [p for p in paths if p.startswith(scopes)]
+        paths.sort()
+        return paths[:limit]
+
+    # --- Stats ---------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index size and refresh metrics
+
+        Returns:
+            Folder/file/trigram counts, build time, refresh counters
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["built"] = self._built
+            stats["folders"] = sum(1 for _ in self._walk())
+            stats["files"] = len(self._entries)
+            stats["trigrams"] = len(self._grams)
+            stats["seconds_since_refresh"] = (
+                round(time.monotonic() - self._refreshed_at, 2) if self._built else None
+            )
+        stats["polling"] = bool(self._poller and self._poller.is_alive())
+        stats["refresh_seconds"] = self.refresh_seconds
+        return stats
+
+
+# Singleton instance
+_para_index = None
+
+
+def get_para_index() -> PARAIndex:
+    """Get or create PARA index singleton"""
+    global _para_index
+    if _para_index is None:
+        _para_index = PARAIndex(
+            refresh_seconds=float(os.getenv("PARA_INDEX_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS)),
+        )
+    return _para_index
@@ -0,0 +1,501 @@
+"""
+PARA Content Search
+Persistent full-text index over the markdown/text files in the PARA folders
+
+SQLite FTS5 (BM25 ranking, porter stemming) with one row per document:
+- Keyword search needs no embedding call and returns highlighted snippets
+- Results can be filtered by PARA category
+- Updates are incremental: sync() stats every candidate file and re-reads
+  only those whose (size, mtime) changed; a content hash skips re-indexing
+  files that were only touched
+- para-analyzer.py feeds its detected changes (new/modified/deleted/moved)
+  straight into apply_changes() so moves keep their index rows
+
+Usage:
+    from services.para_search import get_para_content_index
+
+    index = get_para_content_index()
+    index.sync()
+    hits = index.search("quarterly okr review", categories=["projects"])
+    for hit in hits:
+        print(hit["path"], hit["score"], hit["snippet"])
+"""
+import os
+import re
+import html
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from services.para_index import PARA_ROOT, PARA_FOLDERS
+except ImportError:
+    from para_index import PARA_ROOT, PARA_FOLDERS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "/root/flourisha/00_AI_Brain/data/para_search.sqlite3"
+DEFAULT_SYNC_SECONDS = 300
+
+INDEXED_EXTENSIONS = {".md", ".markdown", ".txt"}
+# Never indexed (and pruned by para-analyzer.py): these directories and any dot-entry
+IGNORED_DIRS = {"node_modules", "__pycache__", "venv", "dist", "build"}
+MAX_DOCUMENT_BYTES = 2 * 1024 * 1024
+SYNC_BATCH_SIZE = 200
+
+# Title matches count more than body matches
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    title TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_category ON documents (category);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title,
+    body,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+_TERMS = re.compile(r'"([^"]*)"|(\w+)')
+_WORDS = re.compile(r"\w+")
+_HEADING = re.compile(r"^#\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+# Private-use characters marking matches until the text has been escaped
+_HIT_START, _HIT_END = "\ue000", "\ue001"
+
+
+def mark_hits(text: str, highlight: Tuple[str, str]) -> str:
+    """HTML-escape FTS output and turn the private hit markers into highlight markup"""
+    return html.escape(text, quote=False).replace(_HIT_START, highlight[0]).replace(_HIT_END, highlight[1])
+
+
+def match_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query
+
+    Every word must match (implicit AND); "quoted text" must match as a
+    phrase. Operators and punctuation are not passed through.
+    """
+    terms = []
+    for phrase, word in _TERMS.findall(text):
+        words = _WORDS.findall(phrase) if phrase else [word]
+        if words:
+            terms.append('"' + " ".join(words) + '"')
+    return " ".join(terms)
+
+
+def is_ignored_name(name: str) -> bool:
+    """True for a file or directory name excluded from indexing and change detection"""
+    return name.startswith(".") or name in IGNORED_DIRS
+
+
+def document_title(rel_path: str, body: str) -> str:
+    """First level-1 heading, else the file name without extension"""
+    match = _HEADING.search(body[:4096])
+    return match.group(1) if match else Path(rel_path).stem
+
+
+class PARAContentIndex:
+    """
+    SQLite FTS5 index of PARA document contents
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, root: str = PARA_ROOT):
+        """
+        Initialize content index
+
+        Args:
+            path: SQLite file path
+            root: Directory containing the PARA category folders
+        """
+        self.path = path
+        self.root = str(root)
+        self._categories = {folder: category for category, folder in PARA_FOLDERS.items()}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._syncer: Optional[threading.Thread] = None
+        self._stop_syncer = threading.Event()
+        self._last_sync: Dict[str, Any] = {}
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # --- Paths ---------------------------------------------------------------
+
+    def _relative(self, path: str) -> Optional[str]:
+        """Path relative to the PARA root, or None if outside it"""
+        rel = os.path.relpath(path, self.root) if os.path.isabs(path) else path
+        return None if rel.startswith("..") else rel.replace(os.sep, "/")
+
+    def _category(self, rel_path: str) -> Optional[str]:
+        return self._categories.get(rel_path.split("/", 1)[0])
+
+    @staticmethod
+    def is_indexable(path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in INDEXED_EXTENSIONS
+
+    def _covers(self, rel_path: Optional[str]) -> bool:
+        """Whether sync() would index this path (same rules as _scan)"""
+        if not rel_path or not self.is_indexable(rel_path):
+            return False
+        folder, *parts = rel_path.split("/")
+        return folder in self._categories and bool(parts) and not any(is_ignored_name(part) for part in parts)
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Indexable files under the category folders: rel path -> (size, mtime_ns)"""
+        found = {}
+        stack = [folder for folder in self._categories if os.path.isdir(os.path.join(self.root, folder))]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(os.path.join(self.root, current)) as entries:
+                    for entry in entries:
+                        if is_ignored_name(entry.name):
+                            continue
+                        rel = f"{current}/{entry.name}"
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(rel)
+                            elif entry.is_file() and self.is_indexable(entry.name):
+                                st = entry.stat()
+                                found[rel] = (st.st_size, st.st_mtime_ns)
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.warning(f"Could not scan {current}: {e}")
+        return found
+
+    def _read(self, rel_path: str) -> Optional[Tuple[int, int, str, str, str]]:
+        """Read a document: (size, mtime_ns, hash, title, body), None if unreadable"""
+        full_path = os.path.join(self.root, rel_path)
+        try:
+            st = os.stat(full_path)
+            if st.st_size > MAX_DOCUMENT_BYTES:
+                logger.debug(f"Skipping {rel_path}: {st.st_size} bytes")
+                return None
+            with open(full_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.debug(f"Could not read {rel_path}: {e}")
+            return None
+        body = data.decode("utf-8", errors="replace")
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return st.st_size, st.st_mtime_ns, digest, document_title(rel_path, body), body
+
+    # --- Writes (caller holds self._lock) -------------------------------------
+
+    def _upsert_locked(self, rel_path: str, category: str, document: Tuple[int, int, str, str, str]) -> bool:
+        """Insert or update a document; returns False if only its stat data changed"""
+        size, mtime_ns, digest, title, body = document
+        row = self._conn.execute(
+            "SELECT id, hash FROM documents WHERE path = ?", (rel_path,)
+        ).fetchone()
+        if row is None:
+            cursor = self._conn.execute(
+                "INSERT INTO documents (path, category, title, size, mtime_ns, hash, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (rel_path, category, title, size, mtime_ns, digest, time.time()),
+            )
+            self._conn.execute(
+                "INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)",
+                (cursor.lastrowid, title, body),
+            )
+            return True
+
+        doc_id, old_hash = row
+        if old_hash == digest:
+            self._conn.execute(
+                "UPDATE documents SET category = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                (category, size, mtime_ns, doc_id),
+            )
+            return False
+        self._conn.execute(
+            "UPDATE documents SET category = ?, title = ?, size = ?, mtime_ns = ?, hash = ?, indexed_at = ? "
+            "WHERE id = ?",
+            (category, title, size, mtime_ns, digest, time.time(), doc_id),
+        )
+        self._conn.execute(
+            "UPDATE documents_fts SET title = ?, body = ? WHERE rowid = ?", (title, body, doc_id)
+        )
+        return True
+
+    def _delete_locked(self, rel_path: str) -> bool:
+        row = self._conn.execute("SELECT id FROM documents WHERE path = ?", (rel_path,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", row)
+        self._conn.execute("DELETE FROM documents WHERE id = ?", row)
+        return True
+
+    # --- Updates -------------------------------------------------------------
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM documents LIMIT 1").fetchone() is None
+
+    def _index_paths(self, rel_paths: List[str], counts: Dict[str, int]):
+        """Read documents in batches (outside the lock) and write each batch in one transaction"""
+        for start in range(0, len(rel_paths), SYNC_BATCH_SIZE):
+            batch = [(rel, self._read(rel)) for rel in rel_paths[start:start + SYNC_BATCH_SIZE]]
+            with self._lock, self._conn:
+                for rel, document in batch:
+                    category = self._category(rel)
+                    if document is None or category is None:
+                        counts["removed"] += self._delete_locked(rel)
+                    elif self._upsert_locked(rel, category, document):
+                        counts["indexed"] += 1
+                    else:
+                        counts["unchanged"] += 1
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Bring the index in line with the PARA folders
+
+        Only files whose size or mtime differ from the index are read.
+
+        Returns:
+            Counts of indexed, unchanged (touched only) and removed documents
+        """
+        with self._sync_lock:
+            started = time.monotonic()
+            found = self._scan()
+            with self._lock:
+                known = {
+                    path: (size, mtime_ns)
+                    for path, size, mtime_ns in self._conn.execute(
+                        "SELECT path, size, mtime_ns FROM documents"
+                    )
+                }
+
+            counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+            removed = [path for path in known if path not in found]
+            with self._lock, self._conn:
+                for path in removed:
+                    counts["removed"] += self._delete_locked(path)
+
+            changed = [path for path, stat in found.items() if known.get(path) != stat]
+            self._index_paths(changed, counts)
+
+            self._last_sync = {
+                **counts,
+                "scanned": len(found),
+                "seconds": round(time.monotonic() - started, 3),
+                "finished_at": time.time(),
+            }
+            if changed or removed:
+                logger.info(f"PARA content index synced: {self._last_sync}")
+            return counts
+
+    def apply_changes(self, changes: Dict[str, List[Dict[str, Any]]]) -> Dict[str, int]:
+        """
+        Apply changes detected by para-analyzer.py
+
+        Args:
+            changes: Dict with new_files, modified_files, deleted_files and
+                moved_files entries as produced by PARAAnalyzer.detect_changes
+
+        Returns:
+            Counts of indexed, unchanged, removed and moved documents
+        """
+        if self.is_empty():
+            # First run (or a fresh index file): the analyzer only reports
+            # differences from its own manifest, so index everything once
+            return {**self.sync(), "moved": 0}
+
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0, "moved": 0}
+        to_index = []
+
+        with self._sync_lock:
+            with self._lock, self._conn:
+                for item in changes.get("deleted_files", []):
+                    rel = self._relative(item["path"])
+                    if self._covers(rel):
+                        counts["removed"] += self._delete_locked(rel)
+
+                for item in changes.get("moved_files", []):
+                    old, new = self._relative(item["from"]), self._relative(item["to"])
+                    if not (self._covers(old) and self._covers(new)):
+                        if self._covers(new):
+                            to_index.append(new)
+                        if self._covers(old):
+                            counts["removed"] += self._delete_locked(old)
+                        continue
+                    category = self._category(new)
+                    if category is not None and old != new:
+                        # Another sync (API or watcher) may have indexed the destination already
+                        self._delete_locked(new)
+                    moved = category is not None and self._conn.execute(
+                        "UPDATE documents SET path = ?, category = ? WHERE path = ?",
+                        (new, category, old),
+                    ).rowcount
+                    if moved:
+                        counts["moved"] += 1
+                    else:
+                        to_index.append(new)
+
+            for key in ("new_files", "modified_files"):
+                for item in changes.get(key, []):
+                    rel = self._relative(item["path"])
+                    if self._covers(rel):
+                        to_index.append(rel)
+
+            self._index_paths(to_index, counts)
+        return counts
+
+    # --- Search --------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        categories: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+        highlight: Tuple[str, str] = ("<mark>", "</mark>"),
+        snippet_tokens: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search ranked by BM25
+
+        Args:
+            query: Free text; all words must match, "quoted text" as a phrase
+            categories: Only return documents in these PARA categories
+            limit: Maximum results
+            offset: Results to skip (pagination)
+            highlight: Markup placed around matched terms in title and snippet
+                (the document text itself is HTML-escaped)
+            snippet_tokens: Approximate snippet length in tokens
+
+        Returns:
+            Hits with path, category, title, snippet, score (higher is
+            better), size_bytes and modified (Unix time)
+        """
+        expression = match_query(query)
+        if not expression:
+            return []
+
+        sql = (
+            "SELECT d.path, d.category, "
+            "highlight(documents_fts, 0, ?, ?), "
+            "snippet(documents_fts, 1, ?, ?, '…', ?), "
+            f"bm25(documents_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS rank, "
+            "d.size, d.mtime_ns "
+            "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ?"
+        )
+        markers = (_HIT_START, _HIT_END)
+        params: List[Any] = [*markers, *markers, max(1, min(snippet_tokens, 64)), expression]
+        if categories:
+            sql += f" AND d.category IN ({', '.join('?' for _ in categories)})"
+            params.extend(categories)
+        sql += " ORDER BY rank LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            {
+                "path": path,
+                "name": path.rsplit("/", 1)[-1],
+                "category": category,
+                "title": mark_hits(title, highlight),
+                "snippet": mark_hits(snippet, highlight),
+                "score": round(-rank, 6),
+                "size_bytes": size,
+                "modified": mtime_ns / 1e9,
+            }
+            for path, category, title, snippet, rank, size, mtime_ns in rows
+        ]
+
+    # --- Background sync -----------------------------------------------------
+
+    def _sync_loop(self, interval: float):
+        while True:
+            try:
+                self.sync()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"PARA content index sync failed: {e}")
+            if self._stop_syncer.wait(interval):
+                return
+
+    def start_sync_loop(self, interval_seconds: float = DEFAULT_SYNC_SECONDS):
+        """Sync now and then every interval_seconds on a daemon thread"""
+        if self._syncer and self._syncer.is_alive():
+            return
+        self._stop_syncer.clear()
+        self._syncer = threading.Thread(
+            target=self._sync_loop,
+            args=(interval_seconds,),
+            name="para-content-sync",
+            daemon=True,
+        )
+        self._syncer.start()
+
+    def stop_sync_loop(self):
+        """Stop the background sync"""
+        self._stop_syncer.set()
+
+    # --- Stats ---------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Returns:
+            Document counts (total and per category), database size and
+            the result of the last sync
+        """
+        with self._lock:
+            by_category = dict(self._conn.execute(
+                "SELECT category, COUNT(*) FROM documents GROUP BY category"
+            ).fetchall())
+        try:
+            db_bytes = os.path.getsize(self.path)
+        except OSError:
+            db_bytes = 0
+        return {
+            "documents": sum(by_category.values()),
+            "by_category": by_category,
+            "db_bytes": db_bytes,
+            "last_sync": dict(self._last_sync) or None,
+            "syncing": bool(self._syncer and self._syncer.is_alive()),
+        }
+
+    def close(self):
+        """Stop the background sync and close the database"""
+        self.stop_sync_loop()
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance
+_para_content_index = None
+
+
+def get_para_content_index() -> PARAContentIndex:
+    """Get or create PARA content index singleton"""
+    global _para_content_index
+    if _para_content_index is None:
+        _para_content_index = PARAContentIndex(
+            path=os.getenv("PARA_SEARCH_INDEX_PATH", DEFAULT_INDEX_PATH),
+        )
+    return _para_content_index
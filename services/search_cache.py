@@ -0,0 +1,463 @@
+"""
+Search Result Cache Service
+Short-TTL cache for search responses, invalidated per tenant on ingestion
+
+/api/search, /api/graph/search, query_knowledge and the MCP search tool
+embed the query and hit pgvector/Neo4j on every call, even when the
+dashboard and an agent issue the same query seconds apart. Responses are
+cached under sha256(scope, tenant, normalized query, limit, threshold,
+store set):
+- In-process TTL/LRU for hot queries
+- On-disk SQLite store shared by the API, MCP server and workers
+
+Each tenant has a generation counter. Entries remember the generation they
+were computed under; ingesting content for a tenant bumps the counter, so
+every cached result for that tenant goes stale at once (in every process
+sharing the SQLite file) without scanning keys. A generation read before
+the search starts is the one stored, so a result computed while an
+ingestion lands is never served afterwards.
+
+Per-scope hits, misses and miss latency give hit rate and estimated time
+saved (hits x mean miss latency - time spent serving hits).
+
+Usage:
+    from services.search_cache import get_search_cache
+
+    cache = get_search_cache()
+    response, hit = await cache.get_or_compute(
+        "search", tenant_id, query, lambda: run_search(query),
+        limit=10, threshold=0.7, stores=["vector", "graph"],
+    )
+    # after ingesting content (touches SQLite, so off the event loop)
+    await asyncio.to_thread(cache.invalidate_tenant, tenant_id)
+"""
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "/root/flourisha/00_AI_Brain/data/search_cache.sqlite3"
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_MEMORY_ITEMS = 2000
+
+# Expired disk rows are purged every N stores
+PURGE_EVERY = 200
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache keying (casefold, trim, collapse whitespace)"""
+    return " ".join(query.casefold().split())
+
+
+def search_cache_key(scope: str, tenant_id: str, query: str, params: Dict[str, Any]) -> str:
+    """Cache key: sha256 of scope, tenant, normalized query and sorted parameters"""
+    normalized = {
+        name: sorted(value) if isinstance(value, (list, tuple, set, frozenset)) else value
+        for name, value in params.items()
+    }
+    payload = json.dumps(
+        [scope, tenant_id, normalize_query(query), normalized],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchResultCache:
+    """
+    Two-level (memory TTL/LRU + SQLite) search result cache with tenant generations
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_memory_items: int = DEFAULT_MEMORY_ITEMS
+    ):
+        """
+        Initialize search result cache
+
+        Args:
+            path: SQLite file path (None disables the disk tier; generations
+                are then per-process)
+            ttl_seconds: Default lifetime of a cached result (0 disables caching)
+            max_memory_items: Maximum results kept in the in-process LRU
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_items = max_memory_items
+        # key -> (tenant_id, generation, expires_at, value)
+        self._memory: "OrderedDict[str, Tuple[str, int, float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        # key -> (tenant_id, computation task shared by identical misses)
+        self._inflight: Dict[str, Tuple[str, asyncio.Task]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stores = 0
+        self._scopes: Dict[str, Dict[str, float]] = {}
+        self._stats = {
+            "invalidations": 0,
+            "stale_drops": 0,
+            "errors": 0,
+        }
+
+        if path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS results (
+                        cache_key TEXT PRIMARY KEY,
+                        tenant_id TEXT NOT NULL,
+                        generation INTEGER NOT NULL,
+                        expires_at REAL NOT NULL,
+                        body TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_results_tenant ON results(tenant_id);
+                    CREATE INDEX IF NOT EXISTS idx_results_expires ON results(expires_at);
+                    CREATE TABLE IF NOT EXISTS tenant_generations (
+                        tenant_id TEXT PRIMARY KEY,
+                        generation INTEGER NOT NULL
+                    );
+                    """
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Search result disk cache unavailable ({path}): {e}")
+                self._conn = None
+
+    # Metrics
+
+    def _scope(self, scope: str) -> Dict[str, float]:
+        return self._scopes.setdefault(scope, {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "hit_ms": 0.0,
+            "miss_ms": 0.0,
+        })
+
+    # Generations
+
+    def generation(self, tenant_id: str) -> int:
+        """Current invalidation generation for a tenant"""
+        with self._lock:
+            return self._generation(tenant_id)
+
+    def _generation(self, tenant_id: str) -> int:
+        if self._conn is not None:
+            try:
+                row = self._conn.execute(
+                    "SELECT generation FROM tenant_generations WHERE tenant_id = ?",
+                    (tenant_id,),
+                ).fetchone()
+                return row[0] if row else 0
+            except sqlite3.Error as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Search cache generation read failed: {e}")
+        return self._generations.get(tenant_id, 0)
+
+    def invalidate_tenant(self, tenant_id: str):
+        """
+        Expire every cached result for a tenant (call after ingesting content)
+
+        Args:
+            tenant_id: Tenant whose results are now stale
+        """
+        with self._lock:
+            self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+            for key in [k for k, entry in self._memory.items() if entry[0] == tenant_id]:
+                del self._memory[key]
+            # Later requests must not join computations started before this
+            for key in [k for k, (owner, _) in self._inflight.items() if owner == tenant_id]:
+                del self._inflight[key]
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT INTO tenant_generations (tenant_id, generation) VALUES (?, 1) "
+                        "ON CONFLICT(tenant_id) DO UPDATE SET generation = generation + 1",
+                        (tenant_id,),
+                    )
+                    self._conn.execute("DELETE FROM results WHERE tenant_id = ?", (tenant_id,))
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    self._stats["errors"] += 1
+                    logger.warning(f"Search cache invalidation failed: {e}")
+            self._stats["invalidations"] += 1
+
+    # Public API
+
+    def get(self, scope: str, tenant_id: str, key: str) -> Optional[Any]:
+        """
+        Look up a cached result
+
+        Args:
+            scope: Caller scope for metrics (e.g. "search", "graph")
+            tenant_id: Tenant the result belongs to
+            key: search_cache_key(...)
+
+        Returns:
+            Cached value, or None on a miss (expired and stale entries are misses)
+        """
+        return self._lookup(scope, tenant_id, key)[0]
+
+    def _lookup(self, scope: str, tenant_id: str, key: str) -> Tuple[Optional[Any], int]:
+        """Cached value (or None) plus the tenant generation it was checked against"""
+        started = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            generation = self._generation(tenant_id)
+            stats = self._scope(scope)
+
+            entry = self._memory.get(key)
+            if entry is not None:
+                _, entry_generation, expires_at, value = entry
+                if expires_at > now and entry_generation == generation:
+                    self._memory.move_to_end(key)
+                    stats["memory_hits"] += 1
+                    stats["hit_ms"] += (time.perf_counter() - started) * 1000
+                    return value, generation
+                del self._memory[key]
+                if entry_generation != generation:
+                    self._stats["stale_drops"] += 1
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT generation, expires_at, body FROM results WHERE cache_key = ?",
+                        (key,),
+                    ).fetchone()
+                    if row and row[1] > now and row[0] == generation:
+                        value = json.loads(row[2])
+                        self._memory_put(key, (tenant_id, generation, row[1], value))
+                        stats["disk_hits"] += 1
+                        stats["hit_ms"] += (time.perf_counter() - started) * 1000
+                        return value, generation
+                except (sqlite3.Error, ValueError) as e:
+                    self._stats["errors"] += 1
+                    logger.warning(f"Search cache read failed: {e}")
+
+        return None, generation
+
+    def put(
+        self,
+        scope: str,
+        tenant_id: str,
+        key: str,
+        value: Any,
+        generation: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Store a result in both cache tiers
+
+        Args:
+            scope: Caller scope for metrics
+            tenant_id: Tenant the result belongs to
+            key: search_cache_key(...)
+            value: JSON-serializable result (other values are stored via str())
+            generation: Tenant generation read before computing the value
+                (default: current)
+            ttl_seconds: Override the default TTL
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+
+        with self._lock:
+            if generation is None:
+                generation = self._generation(tenant_id)
+            self._memory_put(key, (tenant_id, generation, expires_at, value))
+            self._scope(scope)["stores"] += 1
+            self._stores += 1
+
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO results (cache_key, tenant_id, generation, expires_at, body) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, tenant_id, generation, expires_at, json.dumps(value, default=str)),
+                    )
+                    if self._stores % PURGE_EVERY == 0:
+                        self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+                    self._conn.commit()
+                except (sqlite3.Error, TypeError, ValueError) as e:
+                    self._stats["errors"] += 1
+                    logger.warning(f"Search cache write failed: {e}")
+
+    def _memory_put(self, key: str, entry: Tuple[str, int, float, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        scope: str,
+        tenant_id: str,
+        query: str,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+        ttl_seconds: Optional[float] = None,
+        **params
+    ) -> Tuple[Any, bool]:
+        """
+        Return a cached result or compute, cache and return it
+
+        Concurrent identical misses in one process share a single computation
+        (counted as "coalesced", not as hits). It runs in a task owned by the
+        cache, so a caller that is cancelled (client disconnect) doesn't
+        cancel it for the others; invalidate_tenant detaches computations
+        already running for the tenant. SQLite reads and writes run in a
+        worker thread so the event loop never blocks on the disk tier.
+
+        Args:
+            scope: Caller scope (part of the key and of the metrics)
+            tenant_id: Tenant ID
+            query: Search text (normalized for the key)
+            compute: Coroutine factory producing the result on a miss
+            cacheable: Predicate deciding whether a computed result is stored
+                (e.g. skip partial results after a store failed)
+            ttl_seconds: Override the default TTL
+            **params: Remaining key parts (limit, threshold, stores, ...)
+
+        Returns:
+            (result, cache_hit); callers that shared another caller's
+            computation get cache_hit=False
+        """
+        key = search_cache_key(scope, tenant_id, query, params)
+        # The generation read with the lookup is the one the result is stored under
+        value, generation = await asyncio.to_thread(self._lookup, scope, tenant_id, key)
+        if value is not None:
+            return value, True
+
+        # No await between checking and registering the in-flight computation
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None:
+                self._scope(scope)["coalesced"] += 1
+            else:
+                task = asyncio.ensure_future(self._compute(
+                    scope, tenant_id, key, compute, cacheable, ttl_seconds, generation
+                ))
+                # Mark retrieved so a failure nobody awaits anymore isn't logged
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                entry = self._inflight[key] = (tenant_id, task)
+        return await asyncio.shield(entry[1]), False
+
+    async def _compute(
+        self,
+        scope: str,
+        tenant_id: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]],
+        ttl_seconds: Optional[float],
+        generation: int
+    ) -> Any:
+        """Run a miss's computation and store the result (shared by coalesced callers)"""
+        started = time.perf_counter()
+        try:
+            value = await compute()
+        finally:
+            with self._lock:
+                # invalidate_tenant may have replaced or dropped the entry
+                entry = self._inflight.get(key)
+                if entry is not None and entry[1] is asyncio.current_task():
+                    del self._inflight[key]
+
+        with self._lock:
+            stats = self._scope(scope)
+            stats["misses"] += 1
+            stats["miss_ms"] += (time.perf_counter() - started) * 1000
+
+        if value is not None and (cacheable is None or cacheable(value)):
+            await asyncio.to_thread(
+                self.put, scope, tenant_id, key, value,
+                generation=generation, ttl_seconds=ttl_seconds,
+            )
+        return value
+
+    def clear(self):
+        """Drop all cached results from both tiers (generations are kept)"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM results")
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss metrics
+
+        Returns:
+            Totals and per-scope counters with hit_rate, avg_miss_ms,
+            avg_hit_ms and estimated saved_ms, plus current tier sizes
+        """
+        with self._lock:
+            scopes = {name: dict(counters) for name, counters in self._scopes.items()}
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["ttl_seconds"] = self.ttl_seconds
+            stats["memory_items"] = len(self._memory)
+            if self._conn is not None:
+                try:
+                    stats["disk_items"] = self._conn.execute(
+                        "SELECT COUNT(*) FROM results WHERE expires_at > ?", (time.time(),)
+                    ).fetchone()[0]
+                except sqlite3.Error:
+                    stats["disk_items"] = None
+
+        totals = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "stores": 0, "hit_ms": 0.0, "miss_ms": 0.0}
+        for counters in scopes.values():
+            for name in totals:
+                totals[name] += counters[name]
+            _summarize(counters)
+        stats.update(_summarize(totals))
+        stats["scopes"] = scopes
+        return stats
+
+
+def _summarize(counters: Dict[str, float]) -> Dict[str, float]:
+    """Add hit_rate, mean latencies and estimated time saved to a counter dict"""
+    hits = counters["memory_hits"] + counters["disk_hits"]
+    lookups = hits + counters["misses"]
+    avg_miss_ms = counters["miss_ms"] / counters["misses"] if counters["misses"] else 0.0
+    avg_hit_ms = counters["hit_ms"] / hits if hits else 0.0
+    counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+    counters["avg_miss_ms"] = round(avg_miss_ms, 2)
+    counters["avg_hit_ms"] = round(avg_hit_ms, 3)
+    counters["saved_ms"] = round(max(0.0, hits * avg_miss_ms - counters["hit_ms"]), 1)
+    counters["hit_ms"] = round(counters["hit_ms"], 2)
+    counters["miss_ms"] = round(counters["miss_ms"], 1)
+    return counters
+
+
+# Singleton instance
+_search_cache = None
+
+
+def get_search_cache() -> SearchResultCache:
+    """Get or create search result cache singleton"""
+    global _search_cache
+    if _search_cache is None:
+        path = os.getenv("SEARCH_CACHE_PATH", DEFAULT_CACHE_PATH)
+        _search_cache = SearchResultCache(
+            path=path or None,
+            ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            max_memory_items=int(os.getenv("SEARCH_CACHE_MEMORY_ITEMS", DEFAULT_MEMORY_ITEMS)),
+        )
+    return _search_cache
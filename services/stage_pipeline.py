@@ -0,0 +1,242 @@
+"""
+Stage Pipeline
+Dependency-ordered (DAG) executor for multi-stage ingestion jobs
+
+Ingestion used to run every step in sequence, although after the content
+record exists the graph, vector and file-storage steps are independent, and
+a failure in any of them (e.g. Neo4j down) failed the whole job, so the
+retry redid the transcript fetch and LLM analysis too.
+
+A pipeline is a list of stages with dependencies. Each stage starts as soon
+as everything it depends on has completed, so independent stages run
+concurrently and the critical path sets the latency. Every stage records
+its status and elapsed time. A failed stage does not stop unrelated
+stages; only stages depending on it are skipped.
+
+Retries resume instead of restarting: pass the outputs of stages that
+already completed (from a checkpoint) as `completed`, and only the missing
+stages run. `on_stage_done` is called after every stage so callers can
+persist such a checkpoint as they go.
+
+Usage:
+    from services.stage_pipeline import Stage, StagePipeline
+
+    pipeline = StagePipeline([
+        Stage("fetch", fetch),
+        Stage("record", record, after=("fetch",)),
+        Stage("graph", graph, after=("record",)),
+        Stage("vector", vector, after=("record",)),
+    ])
+    run = await pipeline.run({"item": item}, completed={"fetch": ..., "record": ...})
+    if not run.ok:
+        print(run.failed, run.summary())
+
+Each stage function receives the shared context dict: the initial inputs
+plus every completed stage's output under the stage name.
+"""
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stage statuses
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+RESTORED = "restored"    # Completed in an earlier attempt (from a checkpoint)
+FAILED = "failed"
+SKIPPED = "skipped"      # A dependency failed
+
+DONE_STATUSES = (COMPLETED, RESTORED)
+
+
+@dataclass
+class Stage:
+    """One pipeline step"""
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    after: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+
+
+@dataclass
+class StageRecord:
+    """Outcome of one stage in a run"""
+    name: str
+    status: str = PENDING
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class PipelineRun:
+    """Outcome of a pipeline run"""
+    context: Dict[str, Any]
+    stages: Dict[str, StageRecord] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(record.status in DONE_STATUSES for record in self.stages.values())
+
+    @property
+    def completed(self) -> List[str]:
+        return [name for name, record in self.stages.items() if record.status in DONE_STATUSES]
+
+    @property
+    def failed(self) -> List[str]:
+        return [name for name, record in self.stages.items() if record.status == FAILED]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage status, timing and error (JSON-serializable)"""
+        return {
+            name: {"status": record.status, "elapsed_ms": record.elapsed_ms, "error": record.error}
+            for name, record in self.stages.items()
+        }
+
+    def error_message(self) -> str:
+        """One-line description of the failed stages"""
+        return "; ".join(f"{name}: {self.stages[name].error}" for name in self.failed)
+
+
+class StageFailedError(Exception):
+    """Raised by callers when a run has failed stages (carries the run)"""
+
+    def __init__(self, run: PipelineRun):
+        self.run = run
+        super().__init__(f"Stages failed: {run.error_message()}")
+
+
+class StagePipeline:
+    """
+    Runs stages in dependency order, independent stages concurrently
+    """
+
+    def __init__(self, stages: List[Stage]):
+        """
+        Initialize pipeline
+
+        Args:
+            stages: Stages in any order; dependencies must name other stages
+
+        Raises:
+            ValueError: Duplicate names, unknown dependencies or a cycle
+        """
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+
+        for stage in stages:
+            for dependency in stage.after:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dependency}")
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        visiting = set()
+
+        def visit(name: str):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle through {name}")
+            visiting.add(name)
+            for dependency in self.stages[name].after:
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    async def run(
+        self,
+        inputs: Optional[Dict[str, Any]] = None,
+        completed: Optional[Dict[str, Any]] = None,
+        on_stage_done: Optional[Callable[[StageRecord, PipelineRun], Awaitable[None]]] = None
+    ) -> PipelineRun:
+        """
+        Run every stage that has not already completed
+
+        Args:
+            inputs: Initial context values (must not collide with stage names)
+            completed: Outputs of stages completed in an earlier attempt
+            on_stage_done: Awaited after each stage finishes (completed or failed)
+
+        Returns:
+            PipelineRun with the context and per-stage records. Stage failures
+            are recorded, not raised; cancellation cancels running stages
+            and propagates.
+        """
+        context: Dict[str, Any] = dict(inputs or {})
+        run = PipelineRun(context=context)
+        started = time.perf_counter()
+
+        for name in self.order:
+            run.stages[name] = StageRecord(name=name)
+        for name, output in (completed or {}).items():
+            if name in self.stages:
+                context[name] = output
+                run.stages[name].status = RESTORED
+
+        running: Dict[asyncio.Task, str] = {}
+
+        def start_ready():
+            for name in self.order:
+                record = run.stages[name]
+                if record.status != PENDING:
+                    continue
+                statuses = [run.stages[dependency].status for dependency in self.stages[name].after]
+                if any(status in (FAILED, SKIPPED) for status in statuses):
+                    record.status = SKIPPED
+                    record.error = "dependency failed"
+                elif all(status in DONE_STATUSES for status in statuses):
+                    record.status = RUNNING
+                    running[asyncio.create_task(self._run_stage(self.stages[name], context, record))] = name
+
+        try:
+            start_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    record = run.stages[name]
+                    if record.status == COMPLETED:
+                        context[name] = task.result()
+                    if on_stage_done:
+                        await on_stage_done(record, run)
+                start_ready()
+        except asyncio.CancelledError:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+
+        run.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return run
+
+    async def _run_stage(self, stage: Stage, context: Dict[str, Any], record: StageRecord) -> Any:
+        """Run one stage, recording status, latency and any error"""
+        started = time.perf_counter()
+        output = None
+        try:
+            output = await asyncio.wait_for(stage.run(context), timeout=stage.timeout)
+            record.status = COMPLETED
+        except asyncio.TimeoutError:
+            record.status = FAILED
+            record.error = f"timed out after {stage.timeout}s"
+        except Exception as e:
+            record.status = FAILED
+            record.error = f"{type(e).__name__}: {e}"
+        record.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        if record.error:
+            logger.warning(f"Pipeline stage {stage.name} failed: {record.error}")
+        return output
@@ -2,14 +2,22 @@
 Supabase Client Service
 Centralized Supabase connection and operations
 """
-import os
 from typing import Optional, Dict, Any, List
-from supabase import create_client, Client
+from supabase import Client
 from dotenv import load_dotenv
 
+from .db_pool import get_supabase_client, run_query, run_blocking
+from .work_signals import notify_queue
+
 # Load environment variables
 load_dotenv('/root/.claude/.env')
 
+# Postgres SQLSTATE for unique_violation
+UNIQUE_VIOLATION = '23505'
+
+# Job states covered by the one-active-job-per-item index
+ACTIVE_QUEUE_STATUSES = ['pending', 'queued', 'processing']
+
 
 class SupabaseService:
     """Supabase client service for database operations"""
@@ -26,49 +34,51 @@ class SupabaseService:
     def __init__(self):
         """Initialize Supabase client"""
         if self._client is None:
-            url = os.getenv('SUPABASE_URL')
-            key = os.getenv('SUPABASE_SERVICE_KEY')  # Use service key for backend
-
-            if not url or not key:
-                raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
-
-            self._client = create_client(url, key)
+            self._client = get_supabase_client()
 
     @property
     def client(self) -> Client:
         """Get Supabase client instance"""
         return self._client
 
+    async def execute(self, query):
+        """Execute a query builder on the shared DB executor (non-blocking)"""
+        return await run_query(query)
+
+    async def run(self, func, *args, **kwargs):
+        """Run any blocking callable on the shared DB executor"""
+        return await run_blocking(func, *args, **kwargs)
+
     # Projects operations
     async def get_project(self, project_id: str, tenant_id: str) -> Optional[Dict[str, Any]]:
         """Get project by ID"""
-        response = self.client.table('projects').select('*').eq('id', project_id).eq('tenant_id', tenant_id).single().execute()
+        response = await self.execute(self.client.table('projects').select('*').eq('id', project_id).eq('tenant_id', tenant_id).single())
         return response.data if response.data else None
 
     async def list_projects(self, tenant_id: str) -> List[Dict[str, Any]]:
         """List all projects for a tenant"""
-        response = self.client.table('projects').select('*').eq('tenant_id', tenant_id).execute()
+        response = await self.execute(self.client.table('projects').select('*').eq('tenant_id', tenant_id))
         return response.data if response.data else []
 
     async def create_project(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new project"""
-        response = self.client.table('projects').insert(project_data).execute()
+        response = await self.execute(self.client.table('projects').insert(project_data))
         return response.data[0] if response.data else None
 
     async def update_project(self, project_id: str, tenant_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update a project"""
-        response = self.client.table('projects').update(updates).eq('id', project_id).eq('tenant_id', tenant_id).execute()
+        response = await self.execute(self.client.table('projects').update(updates).eq('id', project_id).eq('tenant_id', tenant_id))
         return response.data[0] if response.data else None
 
     async def delete_project(self, project_id: str, tenant_id: str) -> bool:
         """Delete a project"""
-        response = self.client.table('projects').delete().eq('id', project_id).eq('tenant_id', tenant_id).execute()
+        response = await self.execute(self.client.table('projects').delete().eq('id', project_id).eq('tenant_id', tenant_id))
         return bool(response.data)
 
     # Processed content operations
     async def get_content(self, content_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get content by ID (respects RLS policies)"""
-        response = self.client.table('processed_content').select('*').eq('id', content_id).execute()
+        response = await self.execute(self.client.table('processed_content').select('*').eq('id', content_id))
         return response.data[0] if response.data else None
 
     async def list_content(
@@ -88,23 +98,23 @@ class SupabaseService:
             query = query.eq('content_type', content_type)
 
         query = query.order('created_at', desc=True).limit(limit).offset(offset)
-        response = query.execute()
+        response = await self.execute(query)
         return response.data if response.data else []
 
     async def create_content(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create processed content"""
-        response = self.client.table('processed_content').insert(content_data).execute()
+        response = await self.execute(self.client.table('processed_content').insert(content_data))
         return response.data[0] if response.data else None
 
     async def update_content(self, content_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update content"""
-        response = self.client.table('processed_content').update(updates).eq('id', content_id).execute()
+        response = await self.execute(self.client.table('processed_content').update(updates).eq('id', content_id))
         return response.data[0] if response.data else None
 
     # YouTube subscriptions
     async def create_youtube_subscription(self, subscription_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create YouTube playlist/channel subscription"""
-        response = self.client.table('youtube_subscriptions').insert(subscription_data).execute()
+        response = await self.execute(self.client.table('youtube_subscriptions').insert(subscription_data))
         return response.data[0] if response.data else None
 
     async def list_youtube_subscriptions(self, tenant_id: str, source_type: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -114,28 +124,76 @@ class SupabaseService:
         if source_type:
             query = query.eq('source_type', source_type)
 
-        response = query.execute()
+        response = await self.execute(query)
         return response.data if response.data else []
 
     async def get_youtube_subscription(self, subscription_id: str) -> Optional[Dict[str, Any]]:
         """Get YouTube subscription by ID"""
-        response = self.client.table('youtube_subscriptions').select('*').eq('id', subscription_id).single().execute()
+        response = await self.execute(self.client.table('youtube_subscriptions').select('*').eq('id', subscription_id).single())
         return response.data if response.data else None
 
     async def delete_youtube_subscription(self, subscription_id: str, tenant_id: str) -> bool:
         """Delete YouTube subscription"""
-        response = self.client.table('youtube_subscriptions').delete().eq('id', subscription_id).eq('tenant_id', tenant_id).execute()
+        response = await self.execute(self.client.table('youtube_subscriptions').delete().eq('id', subscription_id).eq('tenant_id', tenant_id))
         return bool(response.data)
 
     # Processing queue
     async def add_to_queue(self, queue_item: Dict[str, Any]) -> Dict[str, Any]:
-        """Add item to processing queue"""
-        response = self.client.table('processing_queue').insert(queue_item).execute()
+        """
+        Add item to processing queue (wakes queue workers)
+
+        If the item already has an active job (idx_queue_active_source,
+        migration 014), that job is returned instead.
+        """
+        try:
+            response = await self.execute(self.client.table('processing_queue').insert(queue_item))
+        except Exception as e:
+            if getattr(e, 'code', None) != UNIQUE_VIOLATION or not queue_item.get('source_id'):
+                raise
+            existing = await self.execute(
+                self.client.table('processing_queue').select('*')
+                .eq('tenant_id', queue_item.get('tenant_id'))
+                .eq('source_type', queue_item.get('source_type'))
+                .eq('source_id', queue_item['source_id'])
+                .in_('status', ACTIVE_QUEUE_STATUSES)
+                .limit(1)
+            )
+            return existing.data[0] if existing.data else None
+        if response.data and queue_item.get('status', 'pending') == 'pending':
+            await notify_queue([queue_item.get('source_type')])
         return response.data[0] if response.data else None
 
+    async def bulk_add_to_queue(self, queue_items: List[Dict[str, Any]], batch_size: int = 500) -> List[str]:
+        """
+        Add many items to the processing queue, skipping duplicates (wakes queue workers)
+
+        Items already in processed_content or already queued for the tenant
+        are skipped inside the enqueue_queue_items RPC, so each batch is one
+        round-trip.
+
+        Args:
+            queue_items: processing_queue rows (tenant_id, source_type, source_id, ...)
+            batch_size: Items per RPC call
+
+        Returns:
+            source_ids that were queued
+        """
+        queued: List[str] = []
+        for start in range(0, len(queue_items), batch_size):
+            response = await self.execute(self.client.rpc(
+                'enqueue_queue_items',
+                {'items': queue_items[start:start + batch_size]}
+            ))
+            for row in response.data or []:
+                queued.append(row if isinstance(row, str) else next(iter(row.values())))
+
+        if queued:
+            await notify_queue([item.get('source_type') for item in queue_items])
+        return queued
+
     async def get_pending_queue_items(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get pending items from processing queue"""
-        response = self.client.table('processing_queue').select('*').eq('status', 'pending').order('scheduled_at').limit(limit).execute()
+        response = await self.execute(self.client.table('processing_queue').select('*').eq('status', 'pending').order('scheduled_at').limit(limit))
         return response.data if response.data else []
 
     async def update_queue_status(self, queue_id: str, status: str, error_message: Optional[str] = None) -> Dict[str, Any]:
@@ -146,7 +204,7 @@ class SupabaseService:
         if status == 'completed':
             updates['processed_at'] = 'now()'
 
-        response = self.client.table('processing_queue').update(updates).eq('id', queue_id).execute()
+        response = await self.execute(self.client.table('processing_queue').update(updates).eq('id', queue_id))
         return response.data[0] if response.data else None
 
 
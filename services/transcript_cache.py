@@ -0,0 +1,407 @@
+"""
+Transcript Cache Store
+Indexed SQLite store for extracted YouTube transcripts
+
+Replaces the one-JSON-file-per-video cache under data/transcripts:
+- One row per video with an index of source / language / cached_at /
+  expires_at / last access / size, so lookups and stats are index queries
+- Transcript bodies are zstd-compressed (zlib when zstandard is not installed)
+- Running entry count and byte total are kept by triggers (O(1) stats)
+- Expired rows are removed by a background sweep, not only on read
+- Total compressed size is bounded; least recently used rows are evicted
+
+Existing JSON cache files can be migrated with import_json_dir()
+(see scripts/migrate_transcript_cache.py).
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+try:
+    import zstandard
+except ImportError:  # Optional: fall back to zlib
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+PACIFIC = ZoneInfo("America/Los_Angeles")
+
+DEFAULT_CACHE_PATH = "/root/flourisha/00_AI_Brain/data/transcripts.sqlite3"
+DEFAULT_EXPIRY_DAYS = 30
+DEFAULT_MAX_MB = 1024
+DEFAULT_SWEEP_SECONDS = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    language TEXT NOT NULL,
+    cached_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    expires_ts REAL NOT NULL,
+    last_access REAL NOT NULL,
+    char_count INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    body BLOB NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_transcripts_expires ON transcripts (expires_ts);
+CREATE INDEX IF NOT EXISTS idx_transcripts_last_access ON transcripts (last_access);
+CREATE INDEX IF NOT EXISTS idx_transcripts_source ON transcripts (source);
+CREATE INDEX IF NOT EXISTS idx_transcripts_cached_at ON transcripts (cached_at);
+
+CREATE TABLE IF NOT EXISTS cache_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_totals (id, entries, size_bytes) VALUES (1, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS transcripts_totals_insert AFTER INSERT ON transcripts
+BEGIN
+    UPDATE cache_totals SET entries = entries + 1, size_bytes = size_bytes + NEW.size_bytes WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_totals_delete AFTER DELETE ON transcripts
+BEGIN
+    UPDATE cache_totals SET entries = entries - 1, size_bytes = size_bytes - OLD.size_bytes WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_totals_update AFTER UPDATE OF size_bytes ON transcripts
+BEGIN
+    UPDATE cache_totals SET size_bytes = size_bytes - OLD.size_bytes + NEW.size_bytes WHERE id = 1;
+END;
+"""
+
+
+def _compress(text: str) -> tuple:
+    data = text.encode("utf-8")
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=6).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, blob: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed transcripts")
+        return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+    return zlib.decompress(blob).decode("utf-8")
+
+
+class TranscriptCache:
+    """
+    SQLite transcript cache with expiry, size-bounded LRU eviction and O(1) stats
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        expiry_days: int = DEFAULT_EXPIRY_DAYS,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024
+    ):
+        """
+        Initialize transcript cache
+
+        Args:
+            path: SQLite file path
+            expiry_days: Days before a cached transcript expires
+            max_bytes: Compressed size budget (0 = unbounded)
+        """
+        self.path = path
+        self.expiry_days = expiry_days
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # --- Entries -------------------------------------------------------------
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached transcript
+
+        Returns:
+            Dict with video_id, transcript, source, language, cached_at,
+            expires_at and metadata, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source, language, cached_at, expires_at, expires_ts, codec, body, metadata "
+                "FROM transcripts WHERE video_id = ?",
+                (video_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            source, language, cached_at, expires_at, expires_ts, codec, body, metadata = row
+            if expires_ts <= now:
+                self._conn.execute("DELETE FROM transcripts WHERE video_id = ?", (video_id,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE transcripts SET last_access = ? WHERE video_id = ?", (now, video_id)
+            )
+            self._conn.commit()
+
+        return {
+            "video_id": video_id,
+            "transcript": _decompress(codec, body),
+            "source": source,
+            "language": language,
+            "cached_at": cached_at,
+            "expires_at": expires_at,
+            "metadata": json.loads(metadata),
+        }
+
+    def put(
+        self,
+        video_id: str,
+        transcript: str,
+        source: str,
+        language: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        cached_at: Optional[datetime] = None,
+        expires_at: Optional[datetime] = None
+    ):
+        """
+        Store a transcript (replacing any existing entry), then enforce the size budget
+
+        Args:
+            video_id: YouTube video ID
+            transcript: Transcript text
+            source: Where the transcript came from (youtube_api, whisper)
+            language: Language code
+            metadata: Extra metadata (duration, audio size, ...)
+            cached_at: Cache time (default now; set when importing)
+            expires_at: Expiry time (default cached_at + expiry_days)
+        """
+        cached_at = cached_at or datetime.now(PACIFIC)
+        expires_at = expires_at or cached_at + timedelta(days=self.expiry_days)
+        codec, body = _compress(transcript)
+        metadata_json = json.dumps(metadata or {}, ensure_ascii=False)
+
+        with self._lock:
+            # Upsert (not INSERT OR REPLACE) so the totals triggers see the change
+            self._conn.execute(
+                "INSERT INTO transcripts "
+                "(video_id, source, language, cached_at, expires_at, expires_ts, last_access, "
+                " char_count, size_bytes, codec, body, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (video_id) DO UPDATE SET "
+                "source = excluded.source, language = excluded.language, "
+                "cached_at = excluded.cached_at, expires_at = excluded.expires_at, "
+                "expires_ts = excluded.expires_ts, last_access = excluded.last_access, "
+                "char_count = excluded.char_count, size_bytes = excluded.size_bytes, "
+                "codec = excluded.codec, body = excluded.body, metadata = excluded.metadata",
+                (
+                    video_id, source, language, cached_at.isoformat(), expires_at.isoformat(),
+                    expires_at.timestamp(), time.time(), len(transcript),
+                    len(body) + len(metadata_json), codec, body, metadata_json,
+                ),
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def entry(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Index data for a cached transcript (no body), or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source, language, cached_at, expires_at, char_count, size_bytes "
+                "FROM transcripts WHERE video_id = ? AND expires_ts > ?",
+                (video_id, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        source, language, cached_at, expires_at, char_count, size_bytes = row
+        return {
+            "video_id": video_id,
+            "source": source,
+            "language": language,
+            "cached_at": cached_at,
+            "expires_at": expires_at,
+            "char_count": char_count,
+            "size_bytes": size_bytes,
+        }
+
+    def delete(self, video_id: str) -> bool:
+        """Delete a cached transcript; returns whether it existed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM transcripts WHERE video_id = ?", (video_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def clear(self, expired_only: bool = True) -> int:
+        """Delete expired (or all) entries; returns the number deleted"""
+        if expired_only:
+            return self.sweep_expired()
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM transcripts")
+            self._conn.commit()
+        return cursor.rowcount
+
+    # --- Expiry and eviction -------------------------------------------------
+
+    def sweep_expired(self) -> int:
+        """Delete all expired entries; returns the number deleted"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM transcripts WHERE expires_ts <= ?", (time.time(),)
+            )
+            self._conn.commit()
+        if cursor.rowcount:
+            logger.info(f"Transcript cache: swept {cursor.rowcount} expired entries")
+        return cursor.rowcount
+
+    def _evict_locked(self):
+        """Drop least recently used entries until under max_bytes (caller holds the lock)"""
+        if not self.max_bytes:
+            return
+        total = self._conn.execute("SELECT size_bytes FROM cache_totals WHERE id = 1").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for video_id, size in self._conn.execute(
+            "SELECT video_id, size_bytes FROM transcripts ORDER BY last_access"
+        ):
+            if total <= self.max_bytes:
+                break
+            victims.append((video_id,))
+            total -= size
+        self._conn.executemany("DELETE FROM transcripts WHERE video_id = ?", victims)
+        logger.info(f"Transcript cache: evicted {len(victims)} least recently used entries")
+
+    def _sweep_loop(self, interval: float):
+        while not self._stop_sweeper.wait(interval):
+            try:
+                self.sweep_expired()
+            except sqlite3.Error as e:
+                logger.warning(f"Transcript cache sweep failed: {e}")
+
+    def start_expiry_sweeper(self, interval_seconds: float = DEFAULT_SWEEP_SECONDS):
+        """Sweep expired entries every interval_seconds on a daemon thread"""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        self._stop_sweeper.clear()
+        self.sweep_expired()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop,
+            args=(interval_seconds,),
+            name="transcript-cache-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def stop_expiry_sweeper(self):
+        """Stop the background sweep"""
+        self._stop_sweeper.set()
+
+    # --- Stats ---------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            total_entries, total_size_bytes (compressed), oldest_entry,
+            newest_entry and by_source counts
+        """
+        with self._lock:
+            entries, size_bytes = self._conn.execute(
+                "SELECT entries, size_bytes FROM cache_totals WHERE id = 1"
+            ).fetchone()
+            oldest, newest = self._conn.execute(
+                "SELECT MIN(cached_at), MAX(cached_at) FROM transcripts"
+            ).fetchone()
+            by_source = dict(self._conn.execute(
+                "SELECT source, COUNT(*) FROM transcripts GROUP BY source"
+            ).fetchall())
+        return {
+            "total_entries": entries,
+            "total_size_bytes": size_bytes,
+            "oldest_entry": oldest,
+            "newest_entry": newest,
+            "by_source": by_source,
+        }
+
+    # --- Migration -----------------------------------------------------------
+
+    def import_json_dir(self, directory: str, delete_files: bool = False) -> Dict[str, int]:
+        """
+        Import a legacy JSON-file cache directory
+
+        Args:
+            directory: Directory of {video_id}_{hash}.json cache files
+            delete_files: Remove each file once imported (or found expired)
+
+        Returns:
+            Counts of imported, expired and invalid files
+        """
+        counts = {"imported": 0, "expired": 0, "invalid": 0}
+        now = datetime.now(PACIFIC)
+
+        for path in sorted(Path(directory).glob("*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                cached_at = datetime.fromisoformat(data["cached_at"])
+                expires_at = datetime.fromisoformat(data["expires_at"])
+                if expires_at <= now:
+                    counts["expired"] += 1
+                else:
+                    self.put(
+                        video_id=data["video_id"],
+                        transcript=data["transcript"],
+                        source=data.get("source", "unknown"),
+                        language=data.get("language", "en"),
+                        metadata=data.get("metadata"),
+                        cached_at=cached_at,
+                        expires_at=expires_at,
+                    )
+                    counts["imported"] += 1
+            except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
+                logger.warning(f"Skipping invalid cache file {path.name}: {e}")
+                counts["invalid"] += 1
+                continue
+
+            if delete_files:
+                path.unlink(missing_ok=True)
+
+        return counts
+
+    def close(self):
+        """Stop the sweeper and close the database"""
+        self.stop_expiry_sweeper()
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance
+_transcript_cache = None
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """Get or create transcript cache singleton"""
+    global _transcript_cache
+    if _transcript_cache is None:
+        _transcript_cache = TranscriptCache(
+            path=os.getenv("TRANSCRIPT_CACHE_PATH", DEFAULT_CACHE_PATH),
+            expiry_days=int(os.getenv("TRANSCRIPT_CACHE_EXPIRY_DAYS", DEFAULT_EXPIRY_DAYS)),
+            max_bytes=int(float(os.getenv("TRANSCRIPT_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+        )
+    return _transcript_cache
@@ -4,13 +4,19 @@ Tier 1: YouTube Transcript API via Tor Proxy
 Tier 2: Audio download + Whisper transcription (failover)
 """
 import os
-import tempfile
 import subprocess
 import logging
 from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from services.transcription_engine import get_transcription_engine, TranscriptionQueueFull
+    from services.chunked_transcription import ChunkedTranscriber
+except ImportError:
+    from transcription_engine import get_transcription_engine, TranscriptionQueueFull
+    from chunked_transcription import ChunkedTranscriber
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -41,6 +47,13 @@ class TranscriptService:
 
     Tier 1: YouTube Transcript API via Tor SOCKS proxy
     Tier 2: yt-dlp audio download + faster-whisper transcription
+
+    Whisper runs on the shared TranscriptionEngine (one warm model per
+    process, bounded worker pool), so instances are cheap to create. Long
+    audio is split at silences and transcribed in parallel chunks that are
+    checkpointed, so a retried video resumes where it stopped.
+
+    Successful results carry timestamped segments in metadata["segments"].
     """
 
     # Tor SOCKS5 proxy configuration
@@ -50,26 +63,18 @@ class TranscriptService:
     }
 
     # Whisper model size (tiny, base, small, medium, large-v3)
-    # Using 'base' as good balance of speed/accuracy
-    WHISPER_MODEL = "base"
+    # Using 'base' as good balance of speed/accuracy (override with WHISPER_MODEL)
+    WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
 
     def __init__(self, whisper_model: str = None):
         """Initialize transcript service"""
         self.whisper_model = whisper_model or self.WHISPER_MODEL
-        self._whisper_instance = None
+        self.engine = get_transcription_engine(self.whisper_model)
+        self.chunked = ChunkedTranscriber(self.engine)
 
     def _get_whisper_model(self):
-        """Lazy-load Whisper model"""
-        if self._whisper_instance is None:
-            from faster_whisper import WhisperModel
-            logger.info(f"Loading Whisper model: {self.whisper_model}")
-            # Use CPU by default, switch to cuda if available
-            self._whisper_instance = WhisperModel(
-                self.whisper_model,
-                device="cpu",
-                compute_type="int8"
-            )
-        return self._whisper_instance
+        """Shared, already-warm Whisper model"""
+        return self.engine.get_model()
 
     def _try_youtube_api(self, video_id: str, languages: list = None) -> TranscriptResult:
         """
@@ -121,6 +126,14 @@ class TranscriptService:
             # Fetch the transcript content
             fetched = transcript.fetch()
             full_text = " ".join([snippet.text for snippet in fetched.snippets])
+            segments = [
+                {
+                    "start": round(snippet.start, 2),
+                    "end": round(snippet.start + snippet.duration, 2),
+                    "text": snippet.text,
+                }
+                for snippet in fetched.snippets
+            ]
 
             logger.info(f"Successfully fetched transcript via YouTube API ({len(full_text)} chars)")
 
@@ -130,7 +143,7 @@ class TranscriptService:
                 source=TranscriptSource.YOUTUBE_API,
                 video_id=video_id,
                 language=transcript.language_code,
-                metadata={"char_count": len(full_text)}
+                metadata={"char_count": len(full_text), "segments": segments}
             )
 
         except Exception as e:
@@ -151,12 +164,23 @@ class TranscriptService:
         """
         logger.info(f"Initiating Whisper fallback for {video_id}")
 
-        # Create temp directory for audio file
-        with tempfile.TemporaryDirectory() as tmpdir:
-            audio_path = os.path.join(tmpdir, f"{video_id}.mp3")
+        # Audio lives next to the chunk checkpoints so a retry can resume
+        # without downloading again; both are removed once transcription succeeds.
+        # The job directory is locked for the run (a concurrent run for the
+        # same video gets a private one)
+        self.chunked.prune_checkpoints()
+        with self.chunked.job(video_id) as job_id:
+            return self._run_whisper_job(video_id, job_id)
+
+    def _run_whisper_job(self, video_id: str, job_id: str) -> TranscriptResult:
+        """Download (unless already on disk) and transcribe in the job directory"""
+        audio_path = str(self.chunked.job_dir(job_id) / "audio.mp3")
 
-            try:
-                # Step 1: Download audio with yt-dlp
+        try:
+            # Step 1: Download audio with yt-dlp (skipped when resuming)
+            if os.path.exists(audio_path):
+                logger.info(f"Reusing downloaded audio for {video_id}")
+            else:
                 logger.info(f"Downloading audio for {video_id}")
 
                 video_url = f"https://www.youtube.com/watch?v={video_id}"
@@ -182,55 +206,68 @@ class TranscriptService:
                 if not os.path.exists(audio_path):
                     raise Exception("Audio file not created")
 
-                file_size = os.path.getsize(audio_path)
-                logger.info(f"Audio downloaded: {file_size / 1024 / 1024:.1f} MB")
+            file_size = os.path.getsize(audio_path)
+            logger.info(f"Audio ready: {file_size / 1024 / 1024:.1f} MB")
 
-                # Step 2: Transcribe with Whisper
-                logger.info("Transcribing with Whisper...")
+            # Step 2: Transcribe with Whisper (VAD-split chunks in parallel)
+            logger.info("Transcribing with Whisper...")
 
-                model = self._get_whisper_model()
-                segments, info = model.transcribe(
-                    audio_path,
-                    language="en",
-                    beam_size=5,
-                    vad_filter=True  # Voice activity detection
-                )
-
-                # Combine all segments
-                full_text = " ".join([segment.text.strip() for segment in segments])
+            output = self.chunked.transcribe(audio_path, job_id=job_id, language="en")
+            full_text = output.text
 
-                logger.info(f"Whisper transcription complete ({len(full_text)} chars)")
+            logger.info(
+                f"Whisper transcription complete ({len(full_text)} chars, "
+                f"{output.chunks} chunks, {output.resumed_chunks} resumed, "
+                f"RTF {output.real_time_factor})"
+            )
 
-                return TranscriptResult(
-                    success=True,
-                    transcript=full_text,
-                    source=TranscriptSource.WHISPER,
-                    video_id=video_id,
-                    language=info.language,
-                    metadata={
-                        "char_count": len(full_text),
-                        "duration": info.duration,
-                        "audio_size_mb": file_size / 1024 / 1024
-                    }
-                )
+            return TranscriptResult(
+                success=True,
+                transcript=full_text,
+                source=TranscriptSource.WHISPER,
+                video_id=video_id,
+                language=output.language,
+                metadata={
+                    "char_count": len(full_text),
+                    "duration": output.duration,
+                    "audio_size_mb": file_size / 1024 / 1024,
+                    "transcribe_seconds": round(output.elapsed, 2),
+                    "real_time_factor": output.real_time_factor,
+                    "chunks": output.chunks,
+                    "resumed_chunks": output.resumed_chunks,
+                    "segments": [
+                        {"start": s.start, "end": s.end, "text": s.text}
+                        for s in output.segments
+                    ]
+                }
+            )
 
-            except subprocess.TimeoutExpired:
-                return TranscriptResult(
-                    success=False,
-                    transcript=None,
-                    source=TranscriptSource.WHISPER,
-                    video_id=video_id,
-                    error="Audio download timed out"
-                )
-            except Exception as e:
-                logger.error(f"Whisper fallback failed: {e}")
-                return TranscriptResult(
-                    success=False,
-                    transcript=None,
-                    source=TranscriptSource.WHISPER,
-                    video_id=video_id,
-                    error=str(e)
-                )
+        except subprocess.TimeoutExpired:
+            return TranscriptResult(
+                success=False,
+                transcript=None,
+                source=TranscriptSource.WHISPER,
+                video_id=video_id,
+                error="Audio download timed out"
+            )
+        except TranscriptionQueueFull as e:
+            logger.warning(f"Whisper fallback rejected for {video_id}: {e}")
+            return TranscriptResult(
+                success=False,
+                transcript=None,
+                source=TranscriptSource.WHISPER,
+                video_id=video_id,
+                error=str(e)
+            )
+        except Exception as e:
+            logger.error(f"Whisper fallback failed: {e}")
+            return TranscriptResult(
+                success=False,
+                transcript=None,
+                source=TranscriptSource.WHISPER,
+                video_id=video_id,
+                error=str(e)
+            )
 
     def get_transcript(
         self,
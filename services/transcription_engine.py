@@ -0,0 +1,311 @@
+"""
+Shared Whisper Transcription Engine
+
+One faster-whisper model per process, loaded once and kept warm, with
+transcriptions running on a dedicated worker pool instead of the caller's
+thread (or the event loop).
+
+- Model size, device, compute_type and CPU-thread budget come from env vars
+- Concurrent transcriptions share the model (CTranslate2 `num_workers`) and
+  split the CPU budget between them
+- Admission is bounded: when running + queued jobs reach the queue limit,
+  new jobs fail fast with TranscriptionQueueFull instead of piling up
+
+CTranslate2 releases the GIL while decoding, so worker threads give real
+parallelism without paying for a second copy of the model per process.
+
+Usage:
+    from services.transcription_engine import get_transcription_engine
+
+    engine = get_transcription_engine()
+    output = await engine.transcribe_async("/tmp/audio.mp3", language="en")
+    print(output.text, output.real_time_factor)
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_SIZE = "base"
+DEFAULT_DEVICE = "cpu"
+DEFAULT_COMPUTE_TYPE = "int8"
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 8
+
+
+class TranscriptionQueueFull(RuntimeError):
+    """Raised when the engine already has its maximum of queued jobs"""
+
+
+@dataclass
+class TranscriptSegment:
+    """One timed segment of a transcription"""
+    start: float
+    end: float
+    text: str
+
+
+@dataclass
+class TranscriptionOutput:
+    """Result of one transcription job"""
+    text: str
+    segments: List[TranscriptSegment]
+    language: str
+    duration: float  # Audio seconds
+    elapsed: float  # Wall-clock seconds spent transcribing
+    chunks: int = 1  # Chunks transcribed (chunked long-audio jobs)
+    resumed_chunks: int = 0  # Chunks restored from a checkpoint instead of transcribed
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """Processing time / audio time (lower is faster; < 1 is faster than real time)"""
+        return round(self.elapsed / self.duration, 4) if self.duration else None
+
+
+@dataclass
+class EngineConfig:
+    """Whisper engine configuration"""
+    model_size: str = DEFAULT_MODEL_SIZE
+    device: str = DEFAULT_DEVICE
+    compute_type: str = DEFAULT_COMPUTE_TYPE
+    workers: int = DEFAULT_WORKERS
+    cpu_threads: int = field(default_factory=lambda: os.cpu_count() or 4)
+    queue_size: int = DEFAULT_QUEUE_SIZE
+
+    @classmethod
+    def from_env(cls, model_size: Optional[str] = None) -> "EngineConfig":
+        return cls(
+            model_size=model_size or os.getenv("WHISPER_MODEL", DEFAULT_MODEL_SIZE),
+            device=os.getenv("WHISPER_DEVICE", DEFAULT_DEVICE),
+            compute_type=os.getenv("WHISPER_COMPUTE_TYPE", DEFAULT_COMPUTE_TYPE),
+            workers=int(os.getenv("WHISPER_WORKERS", DEFAULT_WORKERS)),
+            cpu_threads=int(os.getenv("WHISPER_CPU_THREADS", os.cpu_count() or 4)),
+            queue_size=int(os.getenv("WHISPER_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)),
+        )
+
+    @property
+    def threads_per_worker(self) -> int:
+        return max(1, self.cpu_threads // max(1, self.workers))
+
+
+class TranscriptionEngine:
+    """
+    Process-wide Whisper model plus a bounded transcription worker pool
+    """
+
+    def __init__(self, config: Optional[EngineConfig] = None):
+        """
+        Initialize transcription engine (the model loads on first use)
+
+        Args:
+            config: Engine configuration (defaults to EngineConfig.from_env())
+        """
+        self.config = config or EngineConfig.from_env()
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, self.config.workers),
+            thread_name_prefix="whisper",
+        )
+        # Running + waiting jobs; acquired without blocking so overload fails fast
+        self._capacity = max(self.config.queue_size, self.config.workers)
+        self._slots = threading.BoundedSemaphore(self._capacity)
+        self._pending = 0
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "jobs_rejected": 0,
+            "jobs_active": 0,
+            "audio_seconds": 0.0,
+            "processing_seconds": 0.0,
+            "model_load_seconds": None,
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Maximum running + queued jobs before submissions are rejected"""
+        return self._capacity
+
+    # --- Model ---------------------------------------------------------------
+
+    def get_model(self):
+        """Load the Whisper model once and return it"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from faster_whisper import WhisperModel
+
+                    started = time.monotonic()
+                    logger.info(
+                        f"Loading Whisper model {self.config.model_size} "
+                        f"({self.config.device}/{self.config.compute_type}, "
+                        f"{self.config.workers} workers x {self.config.threads_per_worker} threads)"
+                    )
+                    self._model = WhisperModel(
+                        self.config.model_size,
+                        device=self.config.device,
+                        compute_type=self.config.compute_type,
+                        cpu_threads=self.config.threads_per_worker,
+                        num_workers=max(1, self.config.workers),
+                    )
+                    self._stats["model_load_seconds"] = round(time.monotonic() - started, 3)
+        return self._model
+
+    def warm_up(self):
+        """Load the model ahead of the first request"""
+        self.get_model()
+
+    # --- Jobs ----------------------------------------------------------------
+
+    def _run(self, audio: Any, options: Dict[str, Any]) -> TranscriptionOutput:
+        """Transcribe on a worker thread (segments are decoded lazily, so drain here)"""
+        with self._stats_lock:
+            self._stats["jobs_active"] += 1
+        started = time.monotonic()
+        try:
+            segments_iter, info = self.get_model().transcribe(audio, **options)
+            segments = [
+                TranscriptSegment(start=round(s.start, 2), end=round(s.end, 2), text=s.text.strip())
+                for s in segments_iter
+            ]
+            output = TranscriptionOutput(
+                text=" ".join(s.text for s in segments if s.text),
+                segments=segments,
+                language=info.language,
+                duration=info.duration,
+                elapsed=time.monotonic() - started,
+            )
+            with self._stats_lock:
+                self._stats["jobs_completed"] += 1
+                self._stats["audio_seconds"] += output.duration or 0.0
+                self._stats["processing_seconds"] += output.elapsed
+            return output
+        except Exception:
+            with self._stats_lock:
+                self._stats["jobs_failed"] += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self._stats["jobs_active"] -= 1
+
+    def _admit(self, timeout: Optional[float] = None):
+        acquired = (
+            self._slots.acquire(blocking=False) if timeout is None
+            else self._slots.acquire(timeout=timeout)
+        )
+        if not acquired:
+            with self._stats_lock:
+                self._stats["jobs_rejected"] += 1
+            raise TranscriptionQueueFull(
+                f"Transcription queue full ({self._capacity} jobs); retry later"
+            )
+        with self._stats_lock:
+            self._pending += 1
+
+    def _release(self, _future=None):
+        with self._stats_lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def submit(
+        self,
+        audio: Any,
+        language: Optional[str] = "en",
+        admission_timeout: Optional[float] = None,
+        **options
+    ):
+        """
+        Queue a transcription on the worker pool
+
+        Args:
+            audio: Audio file path or 16 kHz float32 numpy array
+            language: Language code (None = auto-detect)
+            admission_timeout: Seconds to wait for queue space (None = fail fast)
+            **options: Extra faster-whisper transcribe() options
+
+        Returns:
+            concurrent.futures.Future resolving to TranscriptionOutput
+
+        Raises:
+            TranscriptionQueueFull: If the queue stays full (past admission_timeout)
+        """
+        options = {"language": language, "beam_size": 5, "vad_filter": True, **options}
+        self._admit(admission_timeout)
+        try:
+            future = self._executor.submit(self._run, audio, options)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def transcribe(self, audio: Any, language: Optional[str] = "en", **options) -> TranscriptionOutput:
+        """Transcribe and wait (for synchronous callers running off the event loop)"""
+        return self.submit(audio, language, **options).result()
+
+    async def transcribe_async(self, audio: Any, language: Optional[str] = "en", **options) -> TranscriptionOutput:
+        """Transcribe without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(audio, language, **options))
+
+    # --- Introspection -------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get engine configuration and throughput metrics
+
+        Returns:
+            Job counters, audio/processing totals, mean real-time factor,
+            queue depth and model load time
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats["queued"] = max(0, self._pending - stats["jobs_active"])
+        stats["model_loaded"] = self._model is not None
+        stats["real_time_factor"] = (
+            round(stats["processing_seconds"] / stats["audio_seconds"], 4)
+            if stats["audio_seconds"] else None
+        )
+        stats["config"] = {
+            "model_size": self.config.model_size,
+            "device": self.config.device,
+            "compute_type": self.config.compute_type,
+            "workers": self.config.workers,
+            "cpu_threads": self.config.cpu_threads,
+            "queue_size": self.config.queue_size,
+        }
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        self._executor.shutdown(wait=wait)
+
+
+# Engines keyed by model size (normally just one)
+_engines: Dict[Tuple[str, ...], TranscriptionEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_transcription_engine(model_size: Optional[str] = None) -> TranscriptionEngine:
+    """Get or create the shared engine for a model size (default: WHISPER_MODEL)"""
+    config = EngineConfig.from_env(model_size)
+    key = (config.model_size, config.device, config.compute_type)
+    if key not in _engines:
+        with _engines_lock:
+            if key not in _engines:
+                _engines[key] = TranscriptionEngine(config)
+    return _engines[key]
+
+
+def shutdown_transcription_engines(wait: bool = False):
+    """Stop all engine worker pools (call from application shutdown)"""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.shutdown(wait=wait)
+        _engines.clear()
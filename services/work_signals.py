@@ -0,0 +1,279 @@
+"""
+Work Signals
+Cross-process wakeups for background workers
+
+Workers used to sleep a fixed interval between scans, so new work waited
+up to a full interval (5 minutes for Gmail) and idle workers kept polling.
+Now a worker opens a listener on a channel and waits on it, with its poll
+interval only as a fallback timeout; producers call notify_work() after
+creating work, and the worker wakes immediately.
+
+Backends (WORK_SIGNAL_BACKEND):
+- local (default): one Unix datagram socket per listener under
+  WORK_SIGNAL_DIR. Same host only, no dependencies; notifying a channel
+  with no listeners is a no-op.
+- postgres: LISTEN/NOTIFY. Listeners need asyncpg and
+  WORK_SIGNAL_DATABASE_URL (direct Postgres DSN); producers notify through
+  the notify_work RPC. The processing_queue insert trigger (migration 013)
+  also notifies, so rows inserted by any client or host wake workers.
+
+Signals are only wakeups: a lost signal costs one fallback interval, never
+work, because workers always re-read their source of truth.
+
+Channels:
+- processing_queue: new queue rows ({"source_types": [...]})
+- gmail: Gmail push notifications ({"email_address": ..., "history_id": ...})
+
+Usage:
+    from services.work_signals import listen, notify_queue, notify_work
+
+    listener = await listen("processing_queue")
+    payloads = await listener.wait(timeout=60)   # [] on timeout
+    ...
+    await notify_queue(["youtube_video"])            # after inserting queue rows
+    await notify_work("gmail", {"history_id": ...})  # any other channel
+"""
+import os
+import json
+import uuid
+import socket
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIGNAL_DIR = "/root/flourisha/00_AI_Brain/data/signals"
+
+# NOTIFY payloads are limited to 8000 bytes; keep datagrams small as well
+MAX_PAYLOAD_BYTES = 4000
+
+QUEUE_CHANNEL = "processing_queue"
+GMAIL_CHANNEL = "gmail"
+
+
+def _backend() -> str:
+    return os.getenv("WORK_SIGNAL_BACKEND", "local").lower()
+
+
+def _signal_dir(channel: str) -> Path:
+    return Path(os.getenv("WORK_SIGNAL_DIR", DEFAULT_SIGNAL_DIR)) / channel
+
+
+def _encode(payload: Optional[Dict[str, Any]]) -> str:
+    data = json.dumps(payload or {}, default=str)
+    if len(data.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+        # Payloads are hints; an oversized one degrades to a bare wakeup
+        data = "{}"
+    return data
+
+
+def _decode(data: str) -> Dict[str, Any]:
+    try:
+        payload = json.loads(data) if data else {}
+        return payload if isinstance(payload, dict) else {"value": payload}
+    except ValueError:
+        return {}
+
+
+class WorkListener:
+    """
+    Receives wakeups for one channel
+    """
+
+    def __init__(self, channel: str, backend: Optional[str] = None):
+        """
+        Initialize listener (call start() before wait())
+
+        Args:
+            channel: Channel name (e.g. "processing_queue", "gmail")
+            backend: "local" or "postgres" (default WORK_SIGNAL_BACKEND)
+        """
+        self.channel = channel
+        self.backend = backend or _backend()
+        self._event = asyncio.Event()
+        self._pending: List[Dict[str, Any]] = []
+        self._sock: Optional[socket.socket] = None
+        self._path: Optional[Path] = None
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> "WorkListener":
+        """Start receiving signals (falls back to local if postgres is unavailable)"""
+        self._loop = asyncio.get_running_loop()
+        if self.backend == "postgres":
+            try:
+                await self._connect_postgres()
+                return self
+            except Exception as e:
+                logger.warning(f"Postgres LISTEN unavailable for {self.channel} ({e}); using local signals")
+                self.backend = "local"
+        self._bind_local()
+        return self
+
+    # Local backend
+
+    def _bind_local(self):
+        directory = _signal_dir(self.channel)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._path = directory / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock"
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._sock.bind(str(self._path))
+        self._loop.add_reader(self._sock.fileno(), self._on_readable)
+
+    def _on_readable(self):
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            self._deliver(data.decode("utf-8", "replace"))
+
+    # Postgres backend
+
+    async def _connect_postgres(self):
+        import asyncpg
+
+        dsn = os.getenv("WORK_SIGNAL_DATABASE_URL") or os.getenv("DATABASE_URL")
+        if not dsn:
+            raise ValueError("WORK_SIGNAL_DATABASE_URL is not set")
+        self._conn = await asyncpg.connect(dsn)
+        await self._conn.add_listener(self.channel, self._on_notify)
+        self._conn.add_termination_listener(self._on_terminated)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._deliver(payload)
+
+    def _on_terminated(self, connection):
+        # Wake the worker so it rescans; wait() reconnects
+        logger.warning(f"LISTEN connection for {self.channel} closed")
+        self._conn = None
+        self._deliver("{}")
+
+    # Public API
+
+    def _deliver(self, data: str):
+        self._pending.append(_decode(data))
+        self._event.set()
+
+    async def wait(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Wait for signals
+
+        Args:
+            timeout: Seconds to wait (the worker's fallback poll interval)
+
+        Returns:
+            Payloads received since the last call ([] on timeout)
+        """
+        if self.backend == "postgres" and self._conn is None:
+            try:
+                await self._connect_postgres()
+            except Exception as e:
+                logger.warning(f"LISTEN reconnect for {self.channel} failed: {e}")
+
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._event.clear()
+        payloads, self._pending = self._pending, []
+        return payloads
+
+    def wake(self):
+        """Make a pending wait() return early (e.g. on shutdown)"""
+        self._event.set()
+
+    async def close(self):
+        """Stop listening and remove the socket"""
+        if self._sock is not None:
+            self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+            try:
+                self._path.unlink()
+            except FileNotFoundError:
+                pass
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+
+async def listen(channel: str) -> WorkListener:
+    """Open and start a listener for a channel"""
+    return await WorkListener(channel).start()
+
+
+def notify_local(channel: str, payload: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Wake every local listener on a channel
+
+    Returns:
+        Number of listeners signalled
+    """
+    directory = _signal_dir(channel)
+    if not directory.is_dir():
+        return 0
+
+    data = _encode(payload).encode("utf-8")
+    delivered = 0
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.setblocking(False)
+        for path in directory.glob("*.sock"):
+            try:
+                sock.sendto(data, str(path))
+                delivered += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Listener exited without cleaning up
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            except (BlockingIOError, OSError):
+                # Receiver's buffer is full: it already has a wakeup pending
+                delivered += 1
+    return delivered
+
+
+async def notify_work(channel: str, payload: Optional[Dict[str, Any]] = None):
+    """
+    Signal that work is available on a channel (never raises)
+
+    Args:
+        channel: Channel name
+        payload: Small JSON-serializable hint for the listener
+    """
+    try:
+        if _backend() == "postgres":
+            try:
+                from .supabase_client import supabase_service
+            except ImportError:
+                from supabase_client import supabase_service
+
+            await supabase_service.execute(supabase_service.client.rpc(
+                'notify_work',
+                {'channel': channel, 'payload': _encode(payload)}
+            ))
+        else:
+            notify_local(channel, payload)
+    except Exception as e:
+        logger.warning(f"Work signal {channel} not sent: {e}")
+
+
+async def notify_queue(source_types: List[str]):
+    """
+    Wake queue workers after inserting pending processing_queue rows
+
+    With the postgres backend the insert trigger already notifies, so this
+    only signals local listeners.
+    """
+    if _backend() != "postgres":
+        try:
+            notify_local(QUEUE_CHANNEL, {"source_types": sorted(set(source_types))})
+        except Exception as e:
+            logger.warning(f"Work signal {QUEUE_CHANNEL} not sent: {e}")
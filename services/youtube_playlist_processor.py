@@ -10,8 +10,10 @@ Usage:
 """
 
 import os
+import importlib.util
 import sys
 import json
+import asyncio
 import argparse
 import re
 from pathlib import Path
@@ -30,12 +32,15 @@ except ImportError:
     TRANSCRIPT_SERVICE_AVAILABLE = False
     print("Warning: transcript_service not available - using fallback")
 
+# The SDK is only used through the LLM gateway
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not ANTHROPIC_AVAILABLE:
+    print("Warning: anthropic not installed - AI summaries unavailable")
+
 try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
+    from services.llm_gateway import get_llm_gateway
 except ImportError:
-    ANTHROPIC_AVAILABLE = False
-    print("Warning: anthropic not installed - AI summaries unavailable")
+    from llm_gateway import get_llm_gateway
 
 
 class PlaylistProcessor:
@@ -53,12 +58,10 @@ class PlaylistProcessor:
         self.channel_name = channel_name
         self.output_base = Path('/root/flourisha')
 
-        # Initialize Anthropic client if available
-        self.anthropic_client = None
-        if ANTHROPIC_AVAILABLE:
-            api_key = os.getenv('ANTHROPIC_API_KEY')
-            if api_key:
-                self.anthropic_client = anthropic.Anthropic(api_key=api_key)
+        # Claude calls go through the shared async LLM gateway
+        self.llm_gateway = None
+        if ANTHROPIC_AVAILABLE and os.getenv('ANTHROPIC_API_KEY'):
+            self.llm_gateway = get_llm_gateway()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load template configuration."""
@@ -157,15 +160,15 @@ class PlaylistProcessor:
             print(f"    TranscriptService not available")
             return None
 
-    def _generate_summary(self, prompt: str) -> Optional[str]:
+    async def _generate_summary(self, prompt: str) -> Optional[str]:
         """Generate AI summary using Claude (model from config)."""
-        if not self.anthropic_client:
+        if not self.llm_gateway:
             return None
 
         model = self.config.get('settings', {}).get('model', 'claude-opus-4-20250514')
 
         try:
-            message = self.anthropic_client.messages.create(
+            message = await self.llm_gateway.create_message(
                 model=model,
                 max_tokens=4000,
                 messages=[
@@ -177,7 +180,7 @@ class PlaylistProcessor:
             print(f"    AI summary error: {e}")
             return None
 
-    def process_video(
+    async def process_video(
         self,
         video: Dict[str, Any],
         template: Dict[str, Any],
@@ -203,7 +206,7 @@ class PlaylistProcessor:
 
         # Get transcript
         print(f"    Fetching transcript...")
-        transcript = self._get_transcript(video_id)
+        transcript = await asyncio.to_thread(self._get_transcript, video_id)
 
         if not transcript:
             if self.config['settings'].get('fallback_to_description') and description:
@@ -227,7 +230,7 @@ class PlaylistProcessor:
 
         # Generate summary
         print(f"    Generating summary...")
-        summary = self._generate_summary(prompt)
+        summary = await self._generate_summary(prompt)
 
         if not summary:
             result['status'] = 'error'
@@ -294,7 +297,7 @@ class PlaylistProcessor:
 
         return result
 
-    def process_playlist(
+    async def process_playlist(
         self,
         playlist_name: str,
         limit: int = 10,
@@ -302,7 +305,7 @@ class PlaylistProcessor:
     ) -> Dict[str, Any]:
         """Process videos from a playlist."""
         # Find playlist
-        playlists = self.channel_manager.get_playlists(self.channel_name)
+        playlists = await asyncio.to_thread(self.channel_manager.get_playlists, self.channel_name)
         playlist = next((p for p in playlists if p['title'] == playlist_name), None)
 
         if not playlist:
@@ -322,7 +325,8 @@ class PlaylistProcessor:
         print(f"   Output: {template.get('output_dir')}")
 
         # Get videos
-        videos = self.channel_manager.get_playlist_videos(
+        videos = await asyncio.to_thread(
+            self.channel_manager.get_playlist_videos,
             playlist['id'],
             channel_name=self.channel_name,
             max_results=limit
@@ -340,7 +344,7 @@ class PlaylistProcessor:
         for i, video in enumerate(videos, 1):
             print(f"\n[{i}/{len(videos)}] {video['title'][:50]}...")
 
-            result = self.process_video(video, template, dry_run)
+            result = await self.process_video(video, template, dry_run)
 
             if result['status'] == 'success' or result['status'] == 'dry_run':
                 results['processed'].append(result)
@@ -398,11 +402,11 @@ def main():
         print(json.dumps(result, indent=2))
 
     elif args.command == 'process':
-        result = processor.process_playlist(
+        result = asyncio.run(processor.process_playlist(
             args.playlist,
             limit=args.limit,
             dry_run=args.dry_run
-        )
+        ))
 
         print(f"\n{'='*60}")
         print(f"Summary for: {result.get('playlist')}")
@@ -8,6 +8,8 @@ from googleapiclient.discovery import build
 from youtube_transcript_api import YouTubeTranscriptApi
 from dotenv import load_dotenv
 
+from .db_pool import run_query
+
 load_dotenv('/root/.claude/.env')
 load_dotenv('/root/flourisha/00_AI_Brain/.env')
 
@@ -66,7 +68,7 @@ class YouTubeService:
                 pageToken=next_page_token
             )
 
-            response = request.execute()
+            response = await run_query(request)
 
             for item in response.get('items', []):
                 video_data = {
@@ -108,7 +110,7 @@ class YouTubeService:
             id=video_id
         )
 
-        response = request.execute()
+        response = await run_query(request)
 
         if not response.get('items'):
             raise ValueError(f"Video not found: {video_id}")
@@ -191,7 +193,7 @@ class YouTubeService:
                 pageToken=next_page_token
             )
 
-            response = request.execute()
+            response = await run_query(request)
 
             for item in response.get('items', []):
                 video_data = {
@@ -224,7 +226,7 @@ class YouTubeService:
             id=playlist_id
         )
 
-        response = request.execute()
+        response = await run_query(request)
 
         if not response.get('items'):
             raise ValueError(f"Playlist not found: {playlist_id}")
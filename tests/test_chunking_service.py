@@ -0,0 +1,76 @@
+"""
+Tests for the local SemanticChunker
+
+Usage:
+    python -m pytest tests/test_chunking_service.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.chunking_service import SemanticChunker
+
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu".split()
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 30))).capitalize() + "."
+
+
+def _document(rng: random.Random) -> str:
+    """Random markdown: headings, prose, lists and tables"""
+    blocks = []
+    for _ in range(rng.randint(1, 12)):
+        kind = rng.random()
+        if kind < 0.3:
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 8))).title()
+            blocks.append("#" * rng.randint(1, 3) + " " + title)
+        elif kind < 0.7:
+            blocks.append(" ".join(_sentence(rng) for _ in range(rng.randint(1, 12))))
+        elif kind < 0.85:
+            blocks.append("\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(1, 8))))
+        else:
+            rows = "\n".join(f"| {rng.choice(WORDS)} | {_sentence(rng)} |" for _ in range(rng.randint(1, 10)))
+            blocks.append("| A | B |\n|---|---|\n" + rows)
+    return "\n\n".join(blocks)
+
+
+def _lines(chunks):
+    return {line.strip() for chunk in chunks for line in chunk.split("\n")}
+
+
+def test_heading_kept_when_next_piece_fills_chunk():
+    """Carried headings lead the next chunk even when the following block nearly fills it"""
+    prose = " ".join(f"Point {i} covers the budget review." for i in range(5)) + " Closing remarks end here."
+    assert 190 < len(prose) <= 200
+    text = "Intro paragraph that is long enough to be flushed. " * 3 + "\n\n# Title\n\n## Sub\n\n" + prose
+
+    chunks = SemanticChunker(max_chunk_size=200, min_chunk_size=100).split(text)
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    with_title = [chunk for chunk in chunks if "# Title" in chunk]
+    assert len(with_title) == 1
+    assert with_title[0].startswith("# Title\n\n## Sub\n\nPoint 0")
+    assert chunks[-1] == "Closing remarks end here."
+
+
+def test_fuzzed_documents_keep_every_heading():
+    for seed in range(500):
+        rng = random.Random(seed)
+        max_size = rng.choice([120, 200, 300, 500, 1000])
+        chunker = SemanticChunker(
+            max_chunk_size=max_size,
+            min_chunk_size=rng.choice([50, 100, 400]),
+            chunk_overlap=rng.choice([0, 0, 50]),
+        )
+        text = _document(rng)
+        chunks = chunker.split(text)
+
+        headings = [line for line in text.split("\n") if line.startswith("#")]
+        missing = [heading for heading in headings if heading not in _lines(chunks)]
+        assert not missing, f"seed {seed}: dropped {missing}"
+        assert all(len(chunk) <= max_size for chunk in chunks), f"seed {seed}: oversized chunk"
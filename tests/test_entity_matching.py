@@ -0,0 +1,124 @@
+"""
+Tests for entity candidate shortlisting and candidate-based matching
+
+Usage:
+    python -m pytest tests/test_entity_matching.py
+
+The matcher tests need pydantic-ai installed and are skipped otherwise.
+"""
+
+import asyncio
+import importlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.entity_candidates import (
+    CandidateSet,
+    EntityCandidateRetriever,
+    EntityCandidates,
+    company_record_emails,
+    company_record_phones,
+)
+
+# Company row as written by DocumentStore.create_company()
+STORED_COMPANY = {
+    "id": "c-1",
+    "compname": "Acme Roofing LLC",
+    "primaryphone": {"value": "(555) 123-4567"},
+    "primaryemail": {"value": "Office@AcmeRoofing.com"},
+}
+
+# Company row synced from Airtable (lookup columns)
+SYNCED_COMPANY = {
+    "id": "c-2",
+    "compname": "Bolt Electric",
+    "primaryphone": ["555-987-6543"],
+    "primaryemail": [{"value": "hello@bolt.example"}],
+}
+
+
+def test_record_values_unwrap_stored_objects():
+    assert company_record_phones(STORED_COMPANY) == ["(555) 123-4567"]
+    assert company_record_emails(STORED_COMPANY) == ["Office@AcmeRoofing.com"]
+    assert company_record_phones(SYNCED_COMPANY) == ["555-987-6543"]
+    assert company_record_emails(SYNCED_COMPANY) == ["hello@bolt.example"]
+
+
+def test_exact_email_and_phone_match_stored_rows():
+    retriever = EntityCandidateRetriever()
+    records = [STORED_COMPANY, SYNCED_COMPANY]
+
+    by_email = SimpleNamespace(name="Acme Roofing", email="office@acmeroofing.com", phone=None)
+    group = retriever._rank("company", by_email, records)
+    assert group.exact_match["id"] == "c-1"
+    assert group.exact_reason == "email"
+
+    by_phone = SimpleNamespace(name="Bolt", email=None, phone="+1 555 987 6543")
+    group = retriever._rank("company", by_phone, records)
+    assert group.exact_match["id"] == "c-2"
+    assert group.exact_reason == "phone"
+
+
+def test_existing_company_accepts_stored_row_shape():
+    pytest.importorskip("pydantic_ai")
+    from agents.entity_matcher import ExistingCompany, _first_value
+
+    company = ExistingCompany(
+        id=STORED_COMPANY["id"],
+        name=STORED_COMPANY["compname"],
+        phone=_first_value(STORED_COMPANY["primaryphone"]),
+        email=_first_value(STORED_COMPANY["primaryemail"]),
+    )
+    assert company.phone == "(555) 123-4567"
+    assert company.email == "Office@AcmeRoofing.com"
+    assert _first_value(SYNCED_COMPANY["primaryemail"]) == "hello@bolt.example"
+    assert _first_value([]) is None
+
+
+def test_llm_matches_merge_by_extracted_name(monkeypatch):
+    pytest.importorskip("pydantic_ai")
+    # agents/__init__ re-exports an `entity_matcher` agent object, so fetch the module itself
+    entity_matcher = importlib.import_module("agents.entity_matcher")
+    from agents.models import DocumentExtraction, EntityMatch, ExtractedCompany, MatchingResult
+
+    names = ["Acme Roofing", "Bolt Electric", "Cedar Plumbing"]
+    extraction = DocumentExtraction(
+        document_name="invoice",
+        category="other",
+        summary="Invoice",
+        companies=[ExtractedCompany(name=name) for name in names],
+        extraction_confidence=0.9,
+    )
+    candidates = CandidateSet(companies=[
+        EntityCandidates("company", company) for company in extraction.companies
+    ])
+
+    async def fake_match_entities(remaining, companies, contacts, properties):
+        # Reordered, one entity dropped, names echoed with different case
+        return MatchingResult(company_matches=[
+            EntityMatch(
+                entity_type="company", extracted_name="cedar plumbing", matched_id="c-3",
+                match_confidence=0.95, is_new_entity=False, suggested_action="link_existing",
+            ),
+            EntityMatch(
+                entity_type="company", extracted_name="Acme  Roofing", matched_id="c-1",
+                match_confidence=0.92, is_new_entity=False, suggested_action="link_existing",
+            ),
+        ])
+
+    monkeypatch.setattr(entity_matcher, "match_entities", fake_match_entities)
+    result = asyncio.run(entity_matcher.match_entities_with_candidates(extraction, candidates))
+
+    assert [m.extracted_name for m in result.company_matches] == [
+        "Acme  Roofing", "Bolt Electric", "cedar plumbing"
+    ]
+    assert [m.matched_id for m in result.company_matches] == ["c-1", None, "c-3"]
+    assert result.company_matches[1].suggested_action == "needs_review"
+    assert result.auto_linkable == 2
+    assert result.needs_review == 1
@@ -0,0 +1,219 @@
+"""
+Tests for the memory backend and its local fallback store
+
+Usage:
+    python -m pytest tests/test_memory_backend.py
+
+The endpoint tests need FastAPI installed and are skipped otherwise.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+API_DIR = Path(__file__).parent.parent / "api"
+
+from services.memory_backend import HashingEmbedder, LocalMemoryStore, MemoryBackend
+
+MEMORIES = [
+    "I prefer dark roast coffee in the morning",
+    "My daughter's birthday is March 3rd",
+    "Works as a roofing contractor in Portland",
+    "Likes hiking on weekends in the Cascades",
+]
+
+
+def _local_backend() -> MemoryBackend:
+    """Backend with an in-memory hashed store and Mem0 marked unavailable"""
+    backend = MemoryBackend(local=LocalMemoryStore(None, HashingEmbedder()))
+    backend._created = True
+    backend._unavailable_until = float("inf")
+    return backend
+
+
+class SlowBackend(MemoryBackend):
+    """Backend whose Mem0 client creation blocks like a network round-trip"""
+
+    def __init__(self, fail: bool = False):
+        super().__init__(local=LocalMemoryStore(None, HashingEmbedder()), retry_seconds=0)
+        self.fail = fail
+        self.attempts = 0
+        self.threads = set()
+
+    def _create_client(self):
+        self.attempts += 1
+        self.threads.add(threading.get_ident())
+        time.sleep(0.2)
+        if self.fail:
+            raise ConnectionError("mem0 down")
+        return object(), "cloud"
+
+
+def test_client_created_once_off_the_event_loop():
+    backend = SlowBackend()
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        results = await asyncio.gather(ticker(), *[backend.get_client() for _ in range(5)])
+        return ticks, results[1:]
+
+    ticks, results = asyncio.run(run())
+
+    assert backend.attempts == 1
+    assert threading.get_ident() not in backend.threads
+    assert ticks == 10
+    assert {mode for _, mode in results} == {"cloud"}
+
+
+def test_reconnect_does_not_hold_up_requests():
+    backend = SlowBackend(fail=True)
+
+    async def run():
+        first = await backend.get_client()
+        backend.fail = False
+        started = time.perf_counter()
+        during = await asyncio.gather(*[backend.get_client() for _ in range(5)])
+        waited = time.perf_counter() - started
+        await asyncio.sleep(0.3)
+        return first, during, waited, await backend.get_client()
+
+    first, during, waited, after = asyncio.run(run())
+
+    assert first == (None, "local")
+    assert during == [(None, "local")] * 5
+    assert waited < 0.1
+    assert backend.attempts == 2
+    assert after[1] == "cloud"
+
+
+class FakeMem0:
+    """Mem0 client stand-in recording adds"""
+
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.added = []
+
+    def get_all(self, user_id):
+        return []
+
+    def add(self, content, user_id, metadata=None):
+        if content == self.fail_on:
+            raise ConnectionError("mem0 down")
+        self.added.append((user_id, content, metadata))
+        return {"id": f"m0-{len(self.added)}"}
+
+
+def test_local_memories_copied_into_mem0_on_reconnect():
+    backend = MemoryBackend(local=LocalMemoryStore(None, HashingEmbedder()))
+    mem0 = FakeMem0()
+    backend._create_client = lambda: (mem0, "cloud")
+
+    async def run():
+        await backend.local.add("u-1", MEMORIES[0], {"memory_type": "user"})
+        await backend.local.add("u-2", MEMORIES[1], {"memory_type": "session", "session_id": "s-1"})
+        await backend.get_client()
+        await backend._sync_task
+
+    asyncio.run(run())
+
+    assert mem0.added == [
+        ("u-1", MEMORIES[0], {"memory_type": "user"}),
+        ("u-2", MEMORIES[1], {"memory_type": "session", "session_id": "s-1"}),
+    ]
+    assert backend.local.pending_ids() == []
+    assert backend.get_status()["synced_to_mem0"] == 2
+
+
+def test_failed_copy_keeps_memory_local():
+    backend = MemoryBackend(local=LocalMemoryStore(None, HashingEmbedder()))
+    mem0 = FakeMem0(fail_on=MEMORIES[1])
+    backend._create_client = lambda: (mem0, "cloud")
+
+    async def run():
+        for memory in MEMORIES[:3]:
+            await backend.local.add("u-1", memory)
+        await backend.get_client()
+        await backend._sync_task
+        remaining = backend.local.get_all("u-1")
+        hits = await backend.local.search("u-1", "birthday", threshold=0.7)
+        return remaining, hits
+
+    remaining, hits = asyncio.run(run())
+
+    assert [memory for _, memory, _ in mem0.added] == [MEMORIES[0]]
+    assert [row["memory"] for row in remaining] == MEMORIES[1:3]
+    assert [hit["memory"] for hit in hits] == [MEMORIES[1]]
+    assert backend.get_status()["consecutive_failures"] == 1
+
+
+def test_claim_left_by_crashed_copy_is_released(tmp_path):
+    path = str(tmp_path / "memories.sqlite3")
+    store = LocalMemoryStore(path, HashingEmbedder())
+    asyncio.run(store.add("u-1", MEMORIES[0]))
+
+    # Process dies after claiming, before Mem0 answered
+    record = store.claim(store.pending_ids()[0])
+
+    assert record is not None
+    assert store.pending_ids() == []
+    assert [row["memory"] for row in store.get_all("u-1")] == [MEMORIES[0]]
+
+    assert LocalMemoryStore(path, HashingEmbedder()).pending_ids() == []
+    reopened = LocalMemoryStore(path, HashingEmbedder(), claim_timeout=0)
+    assert reopened.pending_ids() == [record["id"]]
+
+
+def test_hash_store_rescales_default_threshold():
+    store = LocalMemoryStore(None, HashingEmbedder())
+
+    async def run():
+        await store.add_many("u-1", [(memory, None) for memory in MEMORIES])
+        return await store.search("u-1", "coffee preferences", threshold=0.7)
+
+    results = asyncio.run(run())
+
+    assert [result["memory"] for result in results] == [MEMORIES[0]]
+    assert results[0]["score"] < 0.7
+
+
+def test_search_endpoint_default_threshold_finds_local_memories(monkeypatch):
+    pytest.importorskip("fastapi")
+    # Routers import api/models and api/middleware as top-level packages
+    monkeypatch.syspath_prepend(str(API_DIR))
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from middleware.auth import UserContext, get_current_user
+    from middleware.timing import TimingMiddleware
+    from routers import memory
+
+    backend = _local_backend()
+    monkeypatch.setattr(memory, "get_memory_backend", lambda: backend)
+
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware)
+    app.include_router(memory.router)
+    app.dependency_overrides[get_current_user] = lambda: UserContext(uid="u-1", tenant_id="t-1")
+    client = TestClient(app)
+
+    for content in MEMORIES:
+        assert client.post("/api/memory/add", json={"content": content}).json()["success"]
+
+    # No threshold in the body: the request model's 0.7 default applies
+    response = client.post("/api/memory/search", json={"query": "weekend hiking"}).json()
+
+    assert [item["memory"] for item in response["data"]["memories"]] == [MEMORIES[3]]
@@ -0,0 +1,109 @@
+"""
+Tests for the search result cache
+
+Usage:
+    python -m pytest tests/test_search_cache.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.search_cache import SearchResultCache
+
+
+def test_coalesced_callers_report_uncached(tmp_path):
+    cache = SearchResultCache(path=str(tmp_path / "cache.sqlite3"))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"results": ["a"]}
+
+    async def run():
+        first = await asyncio.gather(*[
+            cache.get_or_compute("search", "t-1", "Roof  Leak", compute, limit=10)
+            for _ in range(3)
+        ])
+        second = await cache.get_or_compute("search", "t-1", "roof leak", compute, limit=10)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [hit for _, hit in first] == [False, False, False]
+    assert second == ({"results": ["a"]}, True)
+    stats = cache.get_stats()["scopes"]["search"]
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 2
+    assert stats["memory_hits"] == 1
+
+
+def test_disk_tier_shared_and_invalidated(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SearchResultCache(path=path)
+    reader = SearchResultCache(path=path)
+
+    async def compute():
+        return ["fresh"]
+
+    async def run():
+        await writer.get_or_compute("search", "t-1", "query", compute)
+        hit = await reader.get_or_compute("search", "t-1", "query", compute)
+        await asyncio.to_thread(writer.invalidate_tenant, "t-1")
+        miss = await reader.get_or_compute("search", "t-1", "query", compute)
+        return hit, miss
+
+    hit, miss = asyncio.run(run())
+
+    assert hit == (["fresh"], True)
+    assert miss == (["fresh"], False)
+    assert reader.get_stats()["scopes"]["search"]["disk_hits"] == 1
+
+
+def test_cancelled_leader_does_not_cancel_followers(tmp_path):
+    cache = SearchResultCache(path=str(tmp_path / "cache.sqlite3"))
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return ["a"]
+
+    async def run():
+        leader = asyncio.ensure_future(cache.get_or_compute("search", "t-1", "query", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.get_or_compute("search", "t-1", "query", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()  # Client disconnected
+        return await follower, leader.cancelled()
+
+    result, leader_cancelled = asyncio.run(run())
+
+    assert leader_cancelled
+    assert result == (["a"], False)
+
+
+def test_invalidation_detaches_inflight_computation(tmp_path):
+    cache = SearchResultCache(path=str(tmp_path / "cache.sqlite3"))
+    versions = iter(["old", "new"])
+
+    async def compute():
+        value = next(versions)
+        await asyncio.sleep(0.05)
+        return [value]
+
+    async def run():
+        before = asyncio.ensure_future(cache.get_or_compute("search", "t-1", "query", compute))
+        await asyncio.sleep(0.01)
+        await asyncio.to_thread(cache.invalidate_tenant, "t-1")
+        after = await cache.get_or_compute("search", "t-1", "query", compute)
+        return await before, after, await cache.get_or_compute("search", "t-1", "query", compute)
+
+    before, after, cached = asyncio.run(run())
+
+    assert before == (["old"], False)
+    assert after == (["new"], False)
+    assert cached == (["new"], True)
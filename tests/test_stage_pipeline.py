@@ -0,0 +1,87 @@
+"""
+Tests for the DAG stage pipeline
+
+Usage:
+    python -m pytest tests/test_stage_pipeline.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.stage_pipeline import Stage, StagePipeline
+
+
+def _pipeline(calls, fail=(), running=None):
+    """fetch -> record -> (graph, vector), graph -> file; records concurrent stages"""
+    running = running if running is not None else {"now": 0, "max": 0}
+
+    def stage(name, delay=0.0):
+        async def run(ctx):
+            calls.append(name)
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(delay)
+            running["now"] -= 1
+            if name in fail:
+                raise ConnectionError(f"{name} down")
+            return f"{name}-output"
+        return run
+
+    return StagePipeline([
+        Stage("fetch", stage("fetch")),
+        Stage("record", stage("record"), after=("fetch",)),
+        Stage("graph", stage("graph", 0.1), after=("record",)),
+        Stage("vector", stage("vector", 0.1), after=("record",)),
+        Stage("file", stage("file"), after=("graph",)),
+    ])
+
+
+def test_independent_stages_run_concurrently():
+    calls = []
+    running = {"now": 0, "max": 0}
+
+    run = asyncio.run(_pipeline(calls, running=running).run({"item": "v-1"}))
+
+    assert run.ok
+    assert calls[:2] == ["fetch", "record"]
+    assert sorted(calls[2:4]) == ["graph", "vector"]
+    # graph and vector both started before either finished
+    assert running["max"] == 2
+    assert run.context["vector"] == "vector-output"
+    assert run.context["item"] == "v-1"
+    assert run.summary()["graph"]["elapsed_ms"] >= 90
+
+
+def test_failed_stage_skips_only_its_dependents():
+    calls = []
+    done = []
+
+    async def on_stage_done(record, run):
+        done.append((record.name, record.status))
+
+    run = asyncio.run(_pipeline(calls, fail={"graph"}).run(on_stage_done=on_stage_done))
+
+    assert not run.ok
+    assert run.failed == ["graph"]
+    assert run.stages["file"].status == "skipped"
+    assert run.stages["vector"].status == "completed"
+    assert "file" not in calls
+    assert ("graph", "failed") in done
+    assert "ConnectionError: graph down" in run.error_message()
+
+
+def test_retry_runs_only_the_failed_stage():
+    first = asyncio.run(_pipeline([], fail={"graph"}).run())
+    restored = {name: first.context[name] for name in first.completed}
+
+    calls = []
+    retry = asyncio.run(_pipeline(calls).run(completed=restored))
+
+    assert retry.ok
+    assert sorted(calls) == ["file", "graph"]
+    assert retry.stages["record"].status == "restored"
+    assert retry.context["record"] == "record-output"
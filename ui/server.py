@@ -53,18 +53,23 @@ class AIBrainServer:
         """
         try:
             from services.embeddings_service import get_embeddings_service
+            from services.search_cache import get_search_cache
 
-            embeddings_service = await get_embeddings_service()
+            embeddings_service = get_embeddings_service()
 
-            # Generate embedding for query
-            query_embedding = await embeddings_service.generate_embedding(query)
-
-            # Search documents_pg
-            results = await embeddings_service.search_similar_content(
-                embedding=query_embedding,
-                tenant_id=self.tenant_id,
+            # Same cache entry as a vector-mode /api/search for this tenant,
+            # so dashboard and agent queries share results
+            results, _ = await get_search_cache().get_or_compute(
+                "search", self.tenant_id, query,
+                lambda: embeddings_service.search_similar_content(
+                    query=query,
+                    tenant_id=self.tenant_id,
+                    limit=limit,
+                    similarity_threshold=threshold
+                ),
                 limit=limit,
-                threshold=threshold
+                threshold=threshold,
+                stores=["vector"],
             )
 
             return {
@@ -172,7 +177,7 @@ class AIBrainServer:
             }
 
             # Insert to database
-            response = supabase_service.supabase.table('document_metadata').insert(doc_data).execute()
+            response = await supabase_service.execute(supabase_service.client.table('document_metadata').insert(doc_data))
 
             if not response.data:
                 return {